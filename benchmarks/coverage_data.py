@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Benchmark for `brownie.project.compiler.solidity._generate_coverage_data`.
+
+Compiles the Solidity contracts of the test project and times the generation of
+the pcMap, statement map and branch map for each contract, using both the current
+implementation and the one at a baseline commit. The baseline is read from git, so
+this must be run from a clone of the repository. The output is checked against
+known-good data by `tests/project/compiler/test_pc_map.py`.
+
+Usage:
+
+    python benchmarks/coverage_data.py [--solc VERSION] [--via-ir] [--repeat N]
+        [--baseline COMMIT] [PATH ...]
+
+PATH may be a Solidity file or a folder of them. The test project's contracts are
+used if no paths are given. The requested solc version is installed if required.
+"""
+
+import argparse
+import subprocess
+import time
+from pathlib import Path
+from types import ModuleType
+
+from brownie.project import compiler
+from brownie.project.compiler import solidity
+
+REPO_ROOT = Path(__file__).parents[1]
+TEST_PROJECT = REPO_ROOT.joinpath("tests/data/brownie-test-project/contracts")
+# the last commit before source nodes were indexed when generating the pcMap
+BASELINE = "25781d4^"
+
+
+def _get_sources(paths: list[str]) -> dict[str, str]:
+    files: list[Path] = []
+    for path in map(Path, paths or [str(TEST_PROJECT)]):
+        files.extend(sorted(path.glob("**/*.sol")) if path.is_dir() else [path])
+    return {i.as_posix(): i.read_text() for i in files}
+
+
+def _get_targets(contract_sources: dict[str, str], version: str, via_ir: bool) -> list[tuple]:
+    solidity.install_solc(version)
+    solidity.set_solc_version(version)
+    input_json = compiler.generate_input_json(contract_sources, optimize=True, viaIR=via_ir)
+    output_json = compiler.compile_from_input_json(input_json)
+    source_nodes, stmt_nodes, branch_nodes = solidity._get_nodes(output_json)
+
+    targets = []
+    for path, contracts in output_json["contracts"].items():
+        source_node = next(i for i in source_nodes if i.absolutePath == path)
+        for name, data in contracts.items():
+            deployed = data["evm"]["deployedBytecode"]
+            if not deployed["object"]:
+                continue
+            bytecode = solidity._remove_metadata(deployed["object"])
+            args = (
+                deployed["sourceMap"],
+                deployed["opcodes"],
+                source_node[name],
+                stmt_nodes,
+                branch_nodes,
+                any(i["type"] == "fallback" for i in data["abi"]),
+                len(bytecode) // 2,
+            )
+            targets.append((name, args))
+    return targets
+
+
+def _load_baseline(commit: str) -> ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{commit}:brownie/project/compiler/solidity.py"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    # the module is not loaded as part of the package, so relative imports must be absolute
+    source = source.replace("from . import sources", "from brownie.project import sources")
+    module = ModuleType("baseline_solidity")
+    exec(compile(source, f"{commit}:solidity.py", "exec"), module.__dict__)
+    return module
+
+
+def _time(fn, args: tuple, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", help="Solidity files or folders to compile")
+    parser.add_argument("--solc", default="0.8.30", help="solc version (default: 0.8.30)")
+    parser.add_argument("--via-ir", action="store_true", help="compile via the IR pipeline")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per contract (default: 5)")
+    parser.add_argument(
+        "--baseline", default=BASELINE, help=f"commit to compare against (default: {BASELINE})"
+    )
+    args = parser.parse_args()
+
+    baseline = _load_baseline(args.baseline)
+    targets = _get_targets(_get_sources(args.paths), args.solc, args.via_ir)
+    print(f"{'contract':<24}{'opcodes':>9}{'baseline':>12}{'current':>12}{'speedup':>10}")
+    totals = [0.0, 0.0]
+    for name, target_args in targets:
+        old = _time(baseline._generate_coverage_data, target_args, args.repeat)
+        new = _time(solidity._generate_coverage_data, target_args, args.repeat)
+        totals[0] += old
+        totals[1] += new
+        opcodes = len(target_args[1].split(" "))
+        print(f"{name:<24}{opcodes:>9}{old * 1000:>10.2f}ms{new * 1000:>10.2f}ms{old / new:>9.1f}x")
+    old, new = totals
+    print(f"{'total':<33}{old * 1000:>10.2f}ms{new * 1000:>10.2f}ms{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
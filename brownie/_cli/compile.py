@@ -4,8 +4,9 @@ import shutil
 from typing import Final
 
 from brownie import project
-from brownie._config import _load_project_structure_config
+from brownie._config import CONFIG, _get_data_folder, _load_project_structure_config
 from brownie.exceptions import ProjectNotFound
+from brownie.project.compiler.cache import get_compiler_cache
 from brownie.utils import color
 from brownie.utils._color import bright_red, bright_yellow
 from brownie.utils.docopt import docopt
@@ -20,6 +21,8 @@ Arguments
 Options:
   --all -a              Recompile all contracts
   --size -s             Show deployed bytecode sizes contracts
+  --jobs -j <num>       Number of compiler versions to run in parallel
+  --cache-stats         Show compiler output cache statistics
   --help -h             Display this message
 
 Compiles the contract source files for this project and saves the results
@@ -49,6 +52,12 @@ def main():
             if path.exists():
                 path.unlink()
 
+    if args["--jobs"]:
+        CONFIG.argv["jobs"] = int(args["--jobs"])
+
+    if args["--cache-stats"]:
+        initial_stats = get_compiler_cache().get_stats()
+
     proj = project.load()
 
     if args["--size"]:
@@ -65,4 +74,39 @@ def main():
             print(f"  {name:<{indent}}  -  {size:>6,}B  ({pct_color}{pct:.2%}{color})")
         print()
 
+    if args["--cache-stats"]:
+        _print_cache_stats(initial_stats, get_compiler_cache().get_stats())
+
     print(f"Project has been compiled. Build artifacts saved at {contract_artifact_path}")
+
+
+def _print_cache_stats(initial: dict, stats: dict) -> None:
+    config = CONFIG.settings["compiler_cache"]
+    print("============ Compiler Output Cache ============")
+    print(f"  Location:  {_get_data_folder().joinpath('compilers.db')}")
+    if not config["enabled"]:
+        print(f"  {bright_yellow}Disabled{color} (set `compiler_cache.enabled` to enable)")
+    print(
+        f"  Entries:   {stats['entries']:,} ({_format_size(stats['size'])}"
+        f" of {_format_size(config['max_size'] * 1024**2)})"
+    )
+    hits, misses = stats["hits"], stats["misses"]
+    ratio = f" ({hits / (hits + misses):.1%} hit rate)" if hits + misses else ""
+    print(f"  Lookups:   {hits:,} hits, {misses:,} misses{ratio}")
+    print(f"  This run:  {hits - initial['hits']:,} hits, {misses - initial['misses']:,} misses")
+    print(f"  Evicted:   {stats['evictions']:,}")
+    if stats["versions"]:
+        indent = max(len(f"{k[0]} {k[1]}") for k in stats["versions"])
+        print("  By compiler version:")
+        for (language, version), (entries, size) in stats["versions"].items():
+            name = f"{language} {version}"
+            print(f"    {name:<{indent}}  -  {entries:>5,} entries  {_format_size(size):>10}")
+    print()
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:,.1f} {unit}" if unit != "B" else f"{size:,} B"
+        size /= 1024  # type: ignore [assignment]
+    return f"{size:,.1f} GB"
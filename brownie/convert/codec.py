@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+
+from collections.abc import Sequence
+from typing import Any, Final, final
+
+from eth_typing import ABIComponent
+from faster_eth_abi.abi import registry
+from faster_eth_abi.io import ContextFramesBytesIO
+
+from .datatypes import ReturnValue
+from .normalize import AnyListOrTuple, compile_plan, format_input_plan, format_output_plan
+from .utils import get_type_strings
+
+
+@final
+class FunctionCodec:
+    """
+    Encoder, decoder and formatter for the inputs and outputs of a contract
+    function, compiled once from the ABI.
+
+    Type strings are generated, parsed and resolved to `faster_eth_abi` encoder
+    and decoder objects when the codec is created, so encoding or decoding a
+    value only applies the compiled objects.
+
+    Arguments
+    ---------
+    name : str
+        Name of the function, used in error messages
+    inputs : Sequence[dict]
+        ABI of the function inputs
+    outputs : Sequence[dict]
+        ABI of the function outputs
+    """
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Sequence[ABIComponent],
+        outputs: Sequence[ABIComponent] = (),
+    ) -> None:
+        self.name: Final = name
+        self.outputs: Final = outputs
+        input_types = get_type_strings(inputs)
+        output_types = get_type_strings(outputs)
+        self.input_plan: Final = compile_plan(input_types)
+        self.output_plan: Final = compile_plan(output_types)
+        self._encoder: Final = registry.get_tuple_encoder(*input_types)
+        self._input_decoder: Final = registry.get_tuple_decoder(*input_types)
+        self._output_decoder: Final = registry.get_tuple_decoder(*output_types)
+
+    def encode_input(self, args: AnyListOrTuple) -> bytes:
+        """Format and ABI encode the inputs, without a selector."""
+        return self._encoder.encode(format_input_plan(self.name, self.input_plan, args))
+
+    def decode_input(self, data: bytes) -> list[Any]:
+        """ABI decode and format the inputs, given calldata without a selector."""
+        values = self._input_decoder.decode(ContextFramesBytesIO(data))
+        return format_input_plan(self.name, self.input_plan, values)
+
+    def decode_output(self, data: bytes) -> ReturnValue:
+        """ABI decode and format the returned data."""
+        values = self._output_decoder.decode(ContextFramesBytesIO(data))
+        return format_output_plan(self.outputs, self.output_plan, values)
@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 
 from collections.abc import Iterator, Sequence
-from typing import Any, Final, TypeAlias, cast
+from typing import Any, Final, TypeAlias, cast, final
 
 from eth_event.main import DecodedEvent, EventData, NonDecodedEvent
 from eth_typing import ABIComponent, ABIFunction
@@ -21,25 +21,111 @@ _TupleType: Final = TupleType
 
 _parse: Final = parse
 
+# Conversions applied by a `FormatStep`. Each type string is checked once when
+# the step is compiled, rather than every time a value is formatted.
+_UINT: Final = 0
+_INT: Final = 1
+_DECIMAL: Final = 2
+_BOOL: Final = 3
+_ADDRESS: Final = 4
+_BYTES: Final = 5
+_STRING: Final = 6
+_UNKNOWN: Final = 7
+_ARRAY: Final = 8
+_TUPLE: Final = 9
+
+
+@final
+class FormatStep:
+    """
+    Formatting plan for a single ABI type.
+
+    Arguments
+    ---------
+    code : int
+        Conversion applied to the value
+    type_str : str
+        Type string of the value
+    length : int, optional
+        Expected length of a fixed size array
+    children : tuple
+        Step for the items of an array, or for each component of a tuple
+    """
+
+    def __init__(
+        self,
+        code: int,
+        type_str: str,
+        length: int | None = None,
+        children: tuple["FormatStep", ...] = (),
+    ) -> None:
+        self.code: Final = code
+        self.type_str: Final = type_str
+        self.length: Final = length
+        self.children: Final = children
+
+
+# compiled plans, as {type strings: steps}
+_plans: Final[dict[tuple[str, ...], tuple[FormatStep, ...]]] = {}
+
+
+def compile_plan(type_strs: Sequence[str]) -> tuple[FormatStep, ...]:
+    """
+    Compiles a formatting plan for a sequence of ABI types.
+
+    Plans are cached, so the types are only parsed once.
+
+    Arguments
+    ---------
+    type_strs : Sequence[str]
+        ABI type strings, as returned by `get_type_strings`
+
+    Returns
+    -------
+    tuple
+        A `FormatStep` for each type
+    """
+    key = tuple(type_strs)
+    if (plan := _plans.get(key)) is not None:
+        return plan
+    if key:
+        tuple_type = cast(TupleType, _parse(f"({','.join(key)})"))
+        plan = tuple(_compile_step(i) for i in tuple_type.components)
+    else:
+        plan = ()
+    _plans[key] = plan
+    return plan
+
 
 def format_input(abi: ABIFunction, inputs: AnyListOrTuple) -> list[Any]:
     """Format contract inputs based on ABI types."""
     abi_inputs = abi["inputs"]
-    if len(inputs) and not len(abi_inputs):
-        raise TypeError(f"{abi['name']} requires no arguments")
-    abi_types = _get_abi_types(abi_inputs)
+    plan = compile_plan(get_type_strings(abi_inputs)) if abi_inputs else ()
+    return format_input_plan(abi["name"], plan, inputs)
+
+
+def format_input_plan(name: str, plan: tuple[FormatStep, ...], inputs: AnyListOrTuple) -> list[Any]:
+    """Format contract inputs using a plan compiled with `compile_plan`."""
+    if len(inputs) and not plan:
+        raise TypeError(f"{name} requires no arguments")
     try:
-        return _format_tuple(abi_types, inputs)
+        return _format_tuple(plan, inputs)
     except Exception as e:
-        raise type(e)(f"{abi['name']} {e}") from None
+        raise type(e)(f"{name} {e}") from None
 
 
 def format_output(abi: ABIFunction, outputs: AnyListOrTuple) -> ReturnValue:
     """Format contract outputs based on ABI types."""
     abi_outputs = abi["outputs"]
-    abi_types = _get_abi_types(abi_outputs)
-    result = _format_tuple(abi_types, outputs)
-    return ReturnValue(result, abi_outputs)
+    plan = compile_plan(get_type_strings(abi_outputs)) if abi_outputs else ()
+    return ReturnValue(_format_tuple(plan, outputs), abi_outputs)
+
+
+def format_output_plan(
+    abi_outputs: Sequence[ABIComponent], plan: tuple[FormatStep, ...], outputs: AnyListOrTuple
+) -> ReturnValue:
+    """Format contract outputs using a plan compiled with `compile_plan`."""
+    return ReturnValue(_format_tuple(plan, outputs), abi_outputs)
 
 
 def format_event(event: DecodedEvent | NonDecodedEvent) -> FormattedEvent:
@@ -59,64 +145,83 @@ def format_event(event: DecodedEvent | NonDecodedEvent) -> FormattedEvent:
         if not e["decoded"]:
             e["type"] = "bytes32"
             e["name"] += " (indexed)"
-    abi_types = _get_abi_types(cast(Sequence[ABIComponent], data))
+    abi_params = cast(Sequence[ABIComponent], data)
+    plan = compile_plan(get_type_strings(abi_params)) if data else ()
     event_values = [i["value"] for i in data]
-    values = ReturnValue(
-        _format_tuple(abi_types, event_values),
-        cast(Sequence[ABIComponent], data),
-    )
+    values = ReturnValue(_format_tuple(plan, event_values), abi_params)
     for e, value in zip(data, values):
         e["value"] = value
     return cast(FormattedEvent, event)
 
 
-def _format_tuple(abi_types: Sequence[ABIType], values: AnyListOrTuple) -> list[Any]:
+def _compile_step(abi_type: ABIType) -> FormatStep:
+    if abi_type.is_array:
+        arrlast = cast(tuple[tuple[int, ...], ...], abi_type.arrlist)[-1]
+        item_step = _compile_step(abi_type.item_type)
+        return FormatStep(_ARRAY, "", arrlast[0] if arrlast else None, (item_step,))
+    if isinstance(abi_type, _TupleType):
+        return FormatStep(_TUPLE, "", None, tuple(_compile_step(i) for i in abi_type.components))
+    type_str = abi_type.to_type_str()
+    return FormatStep(_get_code(type_str), type_str)
+
+
+def _get_code(type_str: str) -> int:
+    if "uint" in type_str:
+        return _UINT
+    elif "int" in type_str:
+        return _INT
+    elif type_str == "fixed168x10":
+        return _DECIMAL
+    elif type_str == "bool":
+        return _BOOL
+    elif type_str == "address":
+        return _ADDRESS
+    elif "byte" in type_str:
+        return _BYTES
+    elif "string" in type_str:
+        return _STRING
+    return _UNKNOWN
+
+
+def _format_tuple(plan: tuple[FormatStep, ...], values: AnyListOrTuple) -> list[Any]:
     result = []
-    _check_array(values, len(abi_types))
-    for type_, value in zip(abi_types, values):
+    _check_array(values, len(plan))
+    for step, value in zip(plan, values):
         try:
-            if type_.is_array:
-                result.append(_format_array(type_, value))
-            elif isinstance(type_, _TupleType):
-                result.append(_format_tuple(type_.components, value))
-            else:
-                result.append(_format_single(type_.to_type_str(), value))
+            result.append(_format_value(step, value))
         except Exception as e:
             raise type(e)(f"'{value}' - {e}") from None
     return result
 
 
-def _format_array(abi_type: ABIType, values: AnyListOrTuple) -> list[Any]:
-    arrlist = cast(tuple[tuple[int, ...], ...], abi_type.arrlist)
-    arrlast = arrlist[-1]
-    _check_array(values, arrlast[0] if arrlast else None)
-    item_type = abi_type.item_type
-    if item_type.is_array:
-        return [_format_array(item_type, i) for i in values]
-    elif isinstance(item_type, _TupleType):
-        item_type_components = item_type.components
-        return [_format_tuple(item_type_components, i) for i in values]
-    item_type_str = item_type.to_type_str()
-    return [_format_single(item_type_str, i) for i in values]
+def _format_value(step: FormatStep, value: Any) -> Any:
+    code = step.code
+    if code == _UINT:
+        return to_uint(value, step.type_str)
+    elif code == _INT:
+        return to_int(value, step.type_str)
+    elif code == _ADDRESS:
+        return EthAddress(value)
+    elif code == _BOOL:
+        return to_bool(value)
+    elif code == _BYTES:
+        return HexString(value, step.type_str)
+    elif code == _STRING:
+        return to_string(value)
+    elif code == _DECIMAL:
+        return to_decimal(value)
+    elif code == _ARRAY:
+        _check_array(value, step.length)
+        item_step = step.children[0]
+        return [_format_value(item_step, i) for i in value]
+    elif code == _TUPLE:
+        return _format_tuple(step.children, value)
+    raise TypeError(f"Unknown type: {step.type_str}")
 
 
 def _format_single(type_str: str, value: Any) -> Any:
     # Apply standard formatting to a single value
-    if "uint" in type_str:
-        return to_uint(value, type_str)
-    elif "int" in type_str:
-        return to_int(value, type_str)
-    elif type_str == "fixed168x10":
-        return to_decimal(value)
-    elif type_str == "bool":
-        return to_bool(value)
-    elif type_str == "address":
-        return EthAddress(value)
-    elif "byte" in type_str:
-        return HexString(value, type_str)
-    elif "string" in type_str:
-        return to_string(value)
-    raise TypeError(f"Unknown type: {type_str}")
+    return _format_value(FormatStep(_get_code(type_str), type_str), value)
 
 
 def _check_array(values: AnyListOrTuple, length: int | None) -> None:
@@ -127,14 +232,6 @@ def _check_array(values: AnyListOrTuple, length: int | None) -> None:
         raise ValueError(f"Sequence has incorrect length, expected {length} but got {len(values)}")
 
 
-def _get_abi_types(abi_params: Sequence[ABIComponent]) -> Sequence[ABIType]:
-    if not abi_params:
-        return []
-    type_str = f"({','.join(get_type_strings(abi_params))})"
-    tuple_type = cast(TupleType, _parse(type_str))
-    return tuple_type.components
-
-
 def _iter_event_topics(event: NonDecodedEvent) -> Iterator[EventData]:
     for name, topic in zip(("topic1", "topic2", "topic3"), event.get("topics", ())):
         yield cast(EventData, {"type": "bytes32", "name": name, "value": topic})
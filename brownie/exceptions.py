@@ -258,6 +258,17 @@ class CompilerError(Exception):
         err = [i.get("formattedMessage") or i["message"] for i in err_json["errors"]]
         super().__init__(f"{compiler} returned the following errors:\n\n" + "\n".join(err))
 
+    def __reduce__(self) -> tuple:
+        # allows the exception to be raised from within a compiler worker process
+        return _rebuild_compiler_error, (self.args[0], self.compiler)
+
+
+def _rebuild_compiler_error(message: str, compiler: str) -> CompilerError:
+    exc = CompilerError.__new__(CompilerError)
+    Exception.__init__(exc, message)
+    exc.compiler = compiler  # type: ignore [misc]
+    return exc
+
 
 @final
 class IncompatibleSolcVersion(Exception):
@@ -3,11 +3,11 @@
 import sys
 import threading
 import time
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
 from getpass import getpass
 from importlib.metadata import version
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Final, Optional, Union, final
 
 import eth_account
 import eth_keys
@@ -53,6 +53,32 @@ rpc = Rpc()
 eth_account.Account.enable_unaudited_hdwallet_features()
 _marker = deque("-/|\\-/|\\")
 
+# keyword arguments accepted for each transaction in `transfer_many`
+TRANSFER_KWARGS: Final = frozenset(
+    {
+        "to",
+        "amount",
+        "gas_limit",
+        "gas_buffer",
+        "gas_price",
+        "max_fee",
+        "priority_fee",
+        "data",
+        "nonce",
+    }
+)
+
+# lowercase fragments of the errors returned by clients when a transaction nonce
+# has already been used: geth, erigon, anvil, hardhat, besu, nethermind,
+# openethereum and ganache
+NONCE_ERRORS: Final = (
+    "nonce too low",
+    "nonce is too low",
+    "nonce_too_low",
+    "oldnonce",
+    "correct nonce",
+)
+
 
 class Accounts(metaclass=_Singleton):
     """
@@ -413,29 +439,90 @@ class PublicKeyAccount:
         return EthAddress(deployment_address)
 
 
+@final
+class _NonceManager:
+    """
+    Reserves nonces for an account locally.
+
+    The next nonce is queried from the node once, and then incremented locally
+    for each transaction. This allows transactions to be broadcast from many
+    threads without waiting on the node between each one. If a reserved nonce is
+    not used, or the chain is reverted, the nonce is queried again when it is
+    next required.
+    """
+
+    __slots__ = ("_address", "_lock", "_next", "__weakref__")
+
+    def __init__(self, address: str) -> None:
+        self._address: Final = address
+        self._lock: Final = threading.Lock()
+        self._next: int | None = None
+        _revert_register(self)
+
+    def peek(self) -> int:
+        """Return the next nonce, without reserving it."""
+        with self._lock:
+            if self._next is None:
+                self._next = self._sync()
+            return self._next
+
+    def reserve(self, nonce: int | None = None) -> int:
+        """
+        Reserve a nonce for a new transaction.
+
+        Arguments
+        ---------
+        nonce : int, optional
+            Nonce given explicitly by the caller, e.g. to replace a pending
+            transaction. If not given, the next available nonce is used.
+
+        Returns
+        -------
+        int
+            The reserved nonce
+        """
+        with self._lock:
+            if self._next is None:
+                self._next = self._sync()
+            if nonce is None:
+                nonce = self._next
+            self._next = max(self._next, nonce + 1)
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        """Return a reserved nonce that was not used by a broadcast transaction."""
+        with self._lock:
+            if self._next == nonce + 1:
+                self._next = nonce
+            elif self._next is not None and nonce < self._next:
+                # a gap was left by the unused nonce, resync with the node
+                self._next = None
+
+    def reset(self) -> None:
+        """Discard the local nonce, so it is queried from the node when next required."""
+        with self._lock:
+            self._next = None
+
+    def _sync(self) -> int:
+        return web3.eth.get_transaction_count(self._address, "pending")
+
+    def _revert(self, height: BlockNumber) -> None:
+        # nonces may have been rolled back, discard the locally tracked value
+        self.reset()
+
+    def _reset(self) -> None:
+        self.reset()
+
+
 class _PrivateKeyAccount(PublicKeyAccount):
     """Base class for Account and LocalAccount"""
 
     def __init__(self, addr: str) -> None:
-        self._lock = threading.Lock()
         super().__init__(addr)
+        self._nonce_manager: Final = _NonceManager(self.address)
 
     def _pending_nonce(self) -> int:
-        tx_from_sender = sorted(history.from_sender(self.address), key=lambda k: k.nonce)
-        if len(tx_from_sender) == 0:
-            return self.nonce
-
-        last_tx = tx_from_sender[-1]
-        if last_tx.status == -1:
-            return last_tx.nonce + 1
-
-        nonce = self.nonce
-        while nonce == last_tx.nonce:
-            # ganache does not always immediately increment the nonce
-            time.sleep(0.5)
-            nonce = self.nonce
-
-        return nonce
+        return self._nonce_manager.peek()
 
     def _gas_limit(
         self,
@@ -684,30 +771,110 @@ class _PrivateKeyAccount(PublicKeyAccount):
         )
 
         if rpc.is_active() and not skip_undo:
-            undo_thread = threading.Thread(
-                target=Chain()._add_to_undo_buffer,
-                args=(
-                    receipt,
-                    self.transfer,
-                    (),
-                    {
-                        "to": to,
-                        "amount": amount,
-                        "gas_limit": gas_limit,
-                        "gas_buffer": gas_buffer,
-                        "gas_price": gas_price,
-                        "max_fee": max_fee,
-                        "priority_fee": priority_fee,
-                        "data": data,
-                    },
-                ),
-                daemon=True,
+            self._add_transfer_to_undo_buffer(
+                receipt,
+                {
+                    "to": to,
+                    "amount": amount,
+                    "gas_limit": gas_limit,
+                    "gas_buffer": gas_buffer,
+                    "gas_price": gas_price,
+                    "max_fee": max_fee,
+                    "priority_fee": priority_fee,
+                    "data": data,
+                },
             )
-            undo_thread.start()
 
         receipt._raise_if_reverted(exc)
         return receipt
 
+    def transfer_many(
+        self,
+        transfers: Sequence[dict[str, Any]],
+        required_confs: int = 1,
+        allow_revert: bool = None,
+        silent: bool = None,
+    ) -> list[TransactionReceipt]:
+        """
+        Broadcast several transactions from this account.
+
+        Every transaction is broadcast before waiting for any confirmations, using
+        consecutive nonces that are reserved locally by the account.
+
+        Arguments
+        ---------
+        transfers : Sequence[dict]
+            Keyword arguments for each transaction, as accepted by `transfer`:
+            `to`, `amount`, `gas_limit`, `gas_buffer`, `gas_price`, `max_fee`,
+            `priority_fee`, `data` and `nonce`.
+        required_confs : int, optional
+            Number of confirmations to wait for on each transaction
+        allow_revert : bool, optional
+            Allow transactions to be broadcast if they are expected to revert
+        silent : bool, optional
+            Toggles console verbosity
+
+        Returns
+        -------
+        list
+            TransactionReceipt for each transaction, in the same order as `transfers`
+
+        If an exception is raised, its `receipts` attribute holds the
+        TransactionReceipt of each transaction that was broadcast.
+        """
+        for kwargs in transfers:
+            invalid = set(kwargs).difference(TRANSFER_KWARGS)
+            if invalid:
+                raise TypeError(f"Invalid transfer argument(s): {', '.join(sorted(invalid))}")
+
+        broadcast: list[tuple[TransactionReceipt, Exception | None]] = []
+        try:
+            for kwargs in transfers:
+                broadcast.append(
+                    self._broadcast(
+                        kwargs.get("to"),
+                        kwargs.get("amount", 0),
+                        kwargs.get("gas_limit"),
+                        kwargs.get("gas_buffer"),
+                        kwargs.get("gas_price"),
+                        kwargs.get("max_fee"),
+                        kwargs.get("priority_fee"),
+                        kwargs.get("data") or "",
+                        kwargs.get("nonce"),
+                        "",
+                        required_confs,
+                        allow_revert,
+                        silent,
+                    )
+                )
+
+            results = []
+            for (receipt, exc), kwargs in zip(broadcast, transfers):
+                receipt = self._await_confirmation(receipt, required_confs)
+                exc = _revert_error(receipt, exc)
+                if rpc.is_active():
+                    kwargs = {k: v for k, v in kwargs.items() if k != "nonce"}
+                    self._add_transfer_to_undo_buffer(receipt, kwargs)
+                results.append((receipt, exc))
+
+            for receipt, exc in results:
+                receipt._raise_if_reverted(exc)
+        except Exception as e:
+            # transactions that were already broadcast are not lost with the exception
+            e.receipts = [receipt for receipt, _ in broadcast]  # type: ignore [attr-defined]
+            raise
+        return [receipt for receipt, _ in results]
+
+    def _add_transfer_to_undo_buffer(
+        self, receipt: TransactionReceipt, kwargs: dict[str, Any]
+    ) -> None:
+        undo_thread = threading.Thread(
+            target=Chain()._add_to_undo_buffer,
+            args=(receipt, self.transfer, (), kwargs),
+            daemon=True,
+        )
+        undo_thread.start()
+
     def _make_transaction(
         self,
         to: Optional["Account"],
@@ -725,6 +892,41 @@ class _PrivateKeyAccount(PublicKeyAccount):
         silent: bool | None,
     ) -> tuple[TransactionReceipt, Exception | None]:
         # shared logic for `transfer` and `deploy`
+        receipt, exc = self._broadcast(
+            to,
+            amount,
+            gas_limit,
+            gas_buffer,
+            gas_price,
+            max_fee,
+            priority_fee,
+            data,
+            nonce,
+            fn_name,
+            required_confs,
+            allow_revert,
+            silent,
+        )
+        receipt = self._await_confirmation(receipt, required_confs)
+        return receipt, _revert_error(receipt, exc)
+
+    def _broadcast(
+        self,
+        to: Optional["Account"],
+        amount: int,
+        gas_limit: int | None,
+        gas_buffer: float | None,
+        gas_price: int | None,
+        max_fee: int | None,
+        priority_fee: int | None,
+        data: str,
+        nonce: int | None,
+        fn_name: str,
+        required_confs: int,
+        allow_revert: bool | None,
+        silent: bool | None,
+    ) -> tuple[TransactionReceipt, Exception | None]:
+        # broadcast a transaction and add it to the history, without awaiting confirmation
         if gas_limit and gas_buffer:
             raise ValueError("Cannot set gas_limit and gas_buffer together")
         if silent is None:
@@ -757,19 +959,23 @@ class _PrivateKeyAccount(PublicKeyAccount):
         except ValueError as e:
             raise VirtualMachineError(e) from None
 
-        with self._lock:
-            # we use a lock here to prevent nonce issues when sending many tx's at once
-            tx = {
-                "from": self.address,
-                "value": Wei(amount),
-                "nonce": nonce if nonce is not None else self._pending_nonce(),
-                "gas": web3.to_hex(gas_limit),
-                "data": HexBytes(data),
-            }
-            if to:
-                tx["to"] = to_address(str(to))
-            tx = _apply_fee_to_tx(tx, gas_price, max_fee, priority_fee)
-            txid = None
+        # only nonces that were allocated by the nonce manager may be released. an explicit
+        # nonce may belong to a pending tx, e.g. when it is being replaced.
+        auto_nonce = nonce is None
+        tx = {
+            "from": self.address,
+            "value": Wei(amount),
+            # the nonce is reserved locally, so that many tx's can be sent at once
+            "nonce": self._nonce_manager.reserve(nonce),
+            "gas": web3.to_hex(gas_limit),
+            "data": HexBytes(data),
+        }
+        if to:
+            tx["to"] = to_address(str(to))
+        tx = _apply_fee_to_tx(tx, gas_price, max_fee, priority_fee)
+        txid = None
+        resynced = False
+        try:
             while True:
                 try:
                     response = self._transact(tx, allow_revert)
@@ -780,6 +986,12 @@ class _PrivateKeyAccount(PublicKeyAccount):
                             print(f"\rTransaction sent: {bright_blue}{txid}{color}")
                 except (ValueError, Web3RPCError) as e:
                     if txid is None:
+                        if auto_nonce and not resynced and _is_nonce_error(e):
+                            # the nonce was used outside of this session, resync and retry
+                            self._nonce_manager.reset()
+                            tx["nonce"] = self._nonce_manager.reserve()
+                            resynced = True
+                            continue
                         exc = VirtualMachineError(e)
                         if not hasattr(exc, "txid"):
                             raise exc from None
@@ -803,34 +1015,12 @@ class _PrivateKeyAccount(PublicKeyAccount):
                         sys.stdout.flush()
                         _marker.rotate(1)
                     time.sleep(1)
+        except BaseException:
+            if txid is None and auto_nonce:
+                # the transaction was not broadcast, so the nonce is still available
+                self._nonce_manager.release(tx["nonce"])
+            raise
 
-        receipt = self._await_confirmation(receipt, required_confs, gas_strategy, gas_iter)
-        if receipt.status != 1 and exc is None:
-            error_data = {
-                "message": (
-                    f"VM Exception while processing transaction: revert {receipt.revert_msg}"
-                ),
-                "code": -32000,
-                "data": {
-                    receipt.txid: {
-                        "error": "revert",
-                        "program_counter": receipt._revert_pc,
-                        "return": receipt.return_value,
-                        "reason": receipt.revert_msg,
-                    },
-                },
-            }
-            exc = VirtualMachineError(ValueError(error_data))
-
-        return receipt, exc
-
-    def _await_confirmation(
-        self,
-        receipt: TransactionReceipt,
-        required_confs: int,
-        gas_strategy: GasABC | None,
-        gas_iter: Iterator | None,
-    ) -> TransactionReceipt:
         # add to TxHistory before waiting for confirmation, this way the tx
         # object is available if the user exits blocking via keyboard interrupt
         history._add_tx(receipt)
@@ -838,6 +1028,11 @@ class _PrivateKeyAccount(PublicKeyAccount):
         if gas_strategy is not None:
             gas_strategy.run(receipt, gas_iter)
 
+        return receipt, exc
+
+    def _await_confirmation(
+        self, receipt: TransactionReceipt, required_confs: int
+    ) -> TransactionReceipt:
         if required_confs == 0:
             # set 0-conf tx's as silent to hide the confirmation output
             receipt._silent = True
@@ -1047,6 +1242,31 @@ class ClefAccount(_PrivateKeyAccount):
         return web3.eth.send_raw_transaction(response["result"]["raw"])
 
 
+def _is_nonce_error(exc: Exception) -> bool:
+    # check if a node rejected a transaction because the nonce was already used
+    message = str(exc).lower()
+    return any(i in message for i in NONCE_ERRORS)
+
+
+def _revert_error(receipt: TransactionReceipt, exc: Exception | None) -> Exception | None:
+    # build the exception raised for a transaction that reverted after broadcasting
+    if receipt.status == 1 or exc is not None:
+        return exc
+    error_data = {
+        "message": f"VM Exception while processing transaction: revert {receipt.revert_msg}",
+        "code": -32000,
+        "data": {
+            receipt.txid: {
+                "error": "revert",
+                "program_counter": receipt._revert_pc,
+                "return": receipt.return_value,
+                "reason": receipt.revert_msg,
+            },
+        },
+    }
+    return VirtualMachineError(ValueError(error_data))
+
+
 def _apply_fee_to_tx(
     tx: dict,
     gas_price: int | None = None,
@@ -6,6 +6,8 @@ import os
 import time
 import warnings
 from collections.abc import Callable, Coroutine, Iterator
+from contextvars import ContextVar
+from functools import partial
 from pathlib import Path
 from re import Match
 from textwrap import TextWrapper
@@ -15,8 +17,6 @@ from typing import TYPE_CHECKING, Any, Final, Optional, TypeAlias, Union, cast
 import requests
 import solcx
 from eth_typing import ABIConstructor, ABIElement, ABIFunction, ChecksumAddress, HexAddress, HexStr
-from faster_eth_abi import decode as decode_abi
-from faster_eth_abi import encode as encode_abi
 from faster_eth_utils import combomethod
 from vvm import get_installable_vyper_versions
 from vvm.utils.convert import to_vyper_version
@@ -34,8 +34,8 @@ from brownie._c_constants import (
     ujson_loads,
 )
 from brownie._config import BROWNIE_FOLDER, CONFIG, REQUEST_HEADERS, _load_project_compiler_config
+from brownie.convert.codec import FunctionCodec
 from brownie.convert.datatypes import Wei
-from brownie.convert.normalize import format_input, format_output
 from brownie.convert.utils import (
     build_function_selector,
     build_function_signature,
@@ -52,6 +52,7 @@ from brownie.exceptions import (
     parse_errors_from_abi,
 )
 from brownie.project import compiler
+from brownie.project.artifacts import materialize
 from brownie.project.flattener import Flattener
 from brownie.typing import (
     AccountsType,
@@ -76,6 +77,7 @@ from .state import (
     _remove_deployment,
     _revert_register,
 )
+from .transaction import evaluate_call_coverage
 from .web3 import ContractEvent, _ContractEvents, _resolve_address, web3
 
 if TYPE_CHECKING:
@@ -86,6 +88,12 @@ LinkReferences: TypeAlias = dict[str, dict[str, list[dict[str, int]]]]
 
 _unverified_addresses: Final[set[ChecksumAddress]] = set()
 
+# Intercepts calls made with `ContractCall.__call__` in the current thread or asyncio
+# task, when set. Used by `brownie.multicall` to queue calls.
+_call_interceptor: Final[ContextVar[Callable[..., Any] | None]] = ContextVar(
+    "_call_interceptor", default=None
+)
+
 
 class _ContractBase:
     _dir_color: Final = "bright magenta"
@@ -111,6 +119,8 @@ class _ContractBase:
         self.signatures: Final[dict[FunctionName, Selector]] = {
             v: k for k, v in self.selectors.items()
         }
+        # {selector: (function signature, codec)}, compiled when first used
+        self._codecs: Final[dict[Selector, tuple[str, FunctionCodec]]] = {}
         parse_errors_from_abi(abi)
 
     @property
@@ -148,27 +158,7 @@ class _ContractBase:
         Any
             Decoded input arguments
         """
-        if not isinstance(calldata, HexBytes):
-            calldata = HexBytes(calldata)
-
-        fn_selector = hexbytes_to_hexstring(calldata[:4])
-
-        abi: ABIFunction | None = None
-        for i in self.abi:
-            if i["type"] == "function" and build_function_selector(i) == fn_selector:
-                abi = i
-                break
-
-        if abi is None:
-            raise ValueError("Four byte selector does not match the ABI for this contract")
-
-        function_sig = build_function_signature(abi)
-
-        types_list = get_type_strings(abi["inputs"])
-        result = decode_abi(types_list, calldata[4:])
-        input_args = format_input(abi, result)
-
-        return function_sig, input_args
+        return _decode_calldata(self.abi, self._codecs, calldata)
 
 
 def _get_linked_libraries_by_source(build: ContractBuildJson) -> dict[str, set[str]]:
@@ -254,6 +244,10 @@ class ContractContainer(_ContractBase):
         self.tx = None
         self.bytecode: Final = build["bytecode"]
         self._contracts: Final[list["ProjectContract"]] = []
+        # block height that each contract is known to exist at, and the highest of
+        # these heights. None means a contract has no known height.
+        self._heights: Final[dict[ChecksumAddress, int]] = {}
+        self._max_height: int | None = 0
         super().__init__(project, build, project._sources)
         self.deploy: Final = ContractConstructor(self, self._name)
         _revert_register(self)
@@ -285,18 +279,46 @@ class ContractContainer(_ContractBase):
             _remove_contract(contract)
             contract._reverted = True
         self._contracts.clear()
+        self._heights.clear()
+        self._max_height = 0
 
     def _revert(self, height: int) -> None:
-        reverted = [
-            i
-            for i in self._contracts
-            if (i.tx and i.tx.block_number is not None and i.tx.block_number > height)
+        if self._max_height is not None and self._max_height <= height:
+            # every contract existed at this height, nothing to do
+            return
+        heights = self._heights
+        reverted = []
+        unknown = []
+        for contract in self._contracts:
+            known = heights.get(contract.address)
+            if known is not None and known <= height:
+                continue
+            if known is not None and contract.tx:
+                # deployed in a transaction that was reverted
+                reverted.append(contract)
+            else:
+                unknown.append(contract)
+        # the code of the remaining contracts is queried in batches
+        codes = web3.batch(partial(web3.eth.get_code, i.address) for i in unknown)
+        for contract, code in zip(unknown, codes):
             # removeprefix is used for compatibility with both hexbytes<1 and >=1
-            or len(web3.eth.get_code(i.address).hex().removeprefix("0x")) <= 2
-        ]
+            if len(code.hex().removeprefix("0x")) <= 2:
+                reverted.append(contract)
+            else:
+                heights[contract.address] = height
         for contract in reverted:
             self.remove(contract)
             contract._reverted = True
+        self._max_height = max((heights[i.address] for i in self._contracts), default=0)
+
+    def _set_height(self, contract: "ProjectContract", height: int | None) -> None:
+        # record the block height that a contract is known to exist at
+        if height is None:
+            self._max_height = None
+            return
+        self._heights[contract.address] = height
+        if self._max_height is not None:
+            self._max_height = max(self._max_height, height)
 
     def remove(self, contract: "ProjectContract") -> None:
         """Removes a contract from the container.
@@ -306,6 +328,7 @@ class ContractContainer(_ContractBase):
         if contract not in self._contracts:
             raise TypeError("Object is not in container.")
         self._contracts.remove(contract)
+        self._heights.pop(contract.address, None)
         contract._delete_deployment()
         _remove_contract(contract)
 
@@ -348,6 +371,7 @@ class ContractContainer(_ContractBase):
         contract._save_deployment()
         _add_contract(contract)
         self._contracts.append(contract)
+        self._set_height(contract, tx.block_number if tx else None)
         if CONFIG.network_type == "live" and persist:
             _add_deployment(contract)
 
@@ -599,6 +623,7 @@ class ContractConstructor:
             abi["name"] = "constructor"
         self.abi: Final = abi
         self._name: Final = name
+        self.__codec: FunctionCodec | None = None
 
     @property
     def payable(self) -> bool:
@@ -659,10 +684,9 @@ class ContractConstructor:
             "linkReferences",
         )
 
-        abi = self.abi
-        data = format_input(abi, args)
-        types_list = get_type_strings(abi["inputs"])
-        return bytecode + encode_abi(types_list, data).hex()
+        if (codec := self.__codec) is None:
+            codec = self.__codec = FunctionCodec("constructor", self.abi["inputs"])
+        return bytecode + codec.encode_input(args).hex()
 
     def estimate_gas(self, *args: Any) -> int:
         """
@@ -725,6 +749,8 @@ class InterfaceConstructor:
             for i in abi
             if i["type"] == "function"
         }
+        # {selector: (function signature, codec)}, compiled when first used
+        self._codecs: Final[dict[Selector, tuple[str, FunctionCodec]]] = {}
 
     def __call__(self, address: str, owner: AccountsType | None = None) -> "Contract":
         return Contract.from_abi(self._name, address, self.abi, owner, persist=False)
@@ -748,27 +774,7 @@ class InterfaceConstructor:
         Any
             Decoded input arguments
         """
-        if not isinstance(calldata, HexBytes):
-            calldata = HexBytes(calldata)
-
-        fn_selector = hexbytes_to_hexstring(calldata[:4])
-
-        abi: ABIFunction | None = None
-        for _abi in self.abi:
-            if _abi["type"] == "function" and build_function_selector(_abi) == fn_selector:
-                abi = _abi
-                break
-
-        if abi is None:
-            raise ValueError("Four byte selector does not match the ABI for this contract")
-
-        function_sig = build_function_signature(abi)
-
-        types_list = get_type_strings(abi["inputs"])
-        result = decode_abi(types_list, calldata[4:])
-        input_args = format_input(abi, result)
-
-        return function_sig, input_args
+        return _decode_calldata(self.abi, self._codecs, calldata)
 
 
 class _DeployedContractBase(_ContractBase):
@@ -912,24 +918,29 @@ class _DeployedContractBase(_ContractBase):
         return Wei(balance)
 
     def _deployment_path(self) -> Path | None:
-        if not self._project._path or (
-            CONFIG.network_type != "live" and not CONFIG.settings["dev_deployment_artifacts"]
-        ):
+        if not self._project._path or CONFIG.network_type != "live":
             return None
 
-        chainid = CONFIG.active_network["chainid"] if CONFIG.network_type == "live" else "dev"
+        chainid = CONFIG.active_network["chainid"]
         path = self._project._build_path.joinpath(f"deployments/{chainid}")
         path.mkdir(exist_ok=True)
         return path.joinpath(f"{self.address}.json")
 
     def _save_deployment(self) -> None:
-        path = self._deployment_path()
-        chainid = CONFIG.active_network["chainid"] if CONFIG.network_type == "live" else "dev"
-        deployment_build = self._build.copy()
+        if CONFIG.network_type != "live":
+            if self._project._path and CONFIG.settings["dev_deployment_artifacts"]:
+                # dev deployments are held in memory and written at the end of the session
+                height = self.tx.block_number if self.tx else None
+                if height is None:
+                    height = web3.eth.block_number
+                self._project._add_dev_deployment(self, height)
+            return
 
+        path = self._deployment_path()
+        deployment_build = materialize(self._build).copy()
         deployment_build["deployment"] = {
             "address": self.address,
-            "chainid": chainid,
+            "chainid": CONFIG.active_network["chainid"],
             "blockHeight": web3.eth.block_number,
         }
         if path:
@@ -939,6 +950,10 @@ class _DeployedContractBase(_ContractBase):
                     ujson_dump(deployment_build, fp)
 
     def _delete_deployment(self) -> None:
+        if CONFIG.network_type != "live":
+            if self._project._path:
+                self._project._remove_dev_deployment(self)
+            return
         if path := self._deployment_path():
             self._project._remove_from_deployment_map(self)
             if path.exists():
@@ -1676,6 +1691,7 @@ class _ContractMethod:
         self.signature: Final = build_function_selector(abi)
         self._input_sig: Final = build_function_signature(abi)
         self.natspec: Final[dict[str, Any]] = natspec or {}
+        self.__codec: FunctionCodec | None = None
 
     def __repr__(self) -> str:
         pay = "payable " if self.payable else ""
@@ -1689,6 +1705,15 @@ class _ContractMethod:
         else:
             return abi["stateMutability"] == "payable"
 
+    @property
+    def _codec(self) -> FunctionCodec:
+        # compiled when first used, most methods of a contract are never called
+        if (codec := self.__codec) is None:
+            abi = self.abi
+            codec = FunctionCodec(abi["name"], abi["inputs"], abi.get("outputs", ()))
+            self.__codec = codec
+        return codec
+
     @staticmethod
     def _autosuggest(obj: "_ContractMethod") -> list[str]:
         # this is a staticmethod to be compatible with `_call_suggest` and `_transact_suggest`
@@ -1798,10 +1823,7 @@ class _ContractMethod:
         -------
         Decoded values
         """
-        abi = self.abi
-        types_list = get_type_strings(abi["inputs"])
-        result = decode_abi(types_list, HexBytes(hexstr)[4:])
-        return format_input(abi, result)
+        return self._codec.decode_input(HexBytes(hexstr)[4:])
 
     def encode_input(self, *args: Any) -> str:
         """
@@ -1817,10 +1839,7 @@ class _ContractMethod:
         str
             Hexstring of encoded ABI data
         """
-        abi = self.abi
-        data = format_input(abi, args)
-        types_list = get_type_strings(abi["inputs"])
-        return self.signature + encode_abi(types_list, data).hex()
+        return self.signature + self._codec.encode_input(args).hex()
 
     def decode_output(self, hexstr: str) -> tuple:
         """
@@ -1835,10 +1854,7 @@ class _ContractMethod:
         -------
         Decoded values
         """
-        abi = self.abi
-        types_list = get_type_strings(abi["outputs"])
-        result = decode_abi(types_list, HexBytes(hexstr))
-        result = format_output(abi, result)
+        result = self._codec.decode_output(HexBytes(hexstr))
         if len(result) == 1:
             result = result[0]
         return result
@@ -1940,23 +1956,27 @@ class ContractCall(_ContractMethod):
             Contract method return value(s).
         """
 
+        if block_identifier is None and override is None:
+            if (interceptor := _call_interceptor.get()) is not None:
+                return interceptor(self, *args)
         if not CONFIG.argv["always_transact"] or block_identifier is not None:
             return self.call(*args, block_identifier=block_identifier, override=override)
 
         args, tx = _get_tx(self._owner, args)
         tx.update({"gas_price": 0, "from": self._owner or accounts[0]})
-        tx["_skip_undo"] = True
         pc, revert_msg = None, None
-        snapshot_id = rpc._snapshot()
+        if not CONFIG.argv["coverage"] or not self._trace_call(args, tx):
+            tx["_skip_undo"] = True
+            snapshot_id = rpc._snapshot()
 
-        try:
-            self.transact(*args, tx)
-        except VirtualMachineError as exc:
-            pc, revert_msg = exc.pc, exc.revert_msg
-        except Exception:
-            pass
-        finally:
-            _revert_transact_call(snapshot_id)
+            try:
+                self.transact(*args, tx)
+            except VirtualMachineError as exc:
+                pc, revert_msg = exc.pc, exc.revert_msg
+            except Exception:
+                pass
+            finally:
+                _revert_transact_call(snapshot_id)
 
         try:
             return self.call(*args)
@@ -1966,6 +1986,15 @@ class ContractCall(_ContractMethod):
                 exc.revert_msg = revert_msg
             raise exc
 
+    def _trace_call(self, args: tuple, tx: dict) -> bool:
+        # evaluate coverage by tracing the call, instead of broadcasting it as a
+        # transaction and reverting. returns False if the node cannot trace calls, or
+        # if the call reverted so that it is transacted to find the revert string.
+        call_tx = {"from": str(tx["from"]), "to": self._address, "data": self.encode_input(*args)}
+        if tx["value"]:
+            call_tx["value"] = hex(Wei(tx["value"]))
+        return evaluate_call_coverage(call_tx)
+
 
 def _get_tx(owner: AccountsType | None, args: tuple) -> tuple:
     # set / remove default sender
@@ -2026,6 +2055,30 @@ def _get_method_object(
 _fixed168x10: Final = {"fixed168x10": "decimal"}
 
 
+def _decode_calldata(
+    abi: list[ABIElement],
+    codecs: dict[Selector, tuple[str, FunctionCodec]],
+    calldata: str | bytes,
+) -> tuple[str, Any]:
+    # decode calldata for one of the functions in an ABI, compiling the codec on first use
+    if not isinstance(calldata, HexBytes):
+        calldata = HexBytes(calldata)
+
+    fn_selector = hexbytes_to_hexstring(calldata[:4])
+
+    if fn_selector not in codecs:
+        for i in abi:
+            if i["type"] == "function" and build_function_selector(i) == fn_selector:
+                codec = FunctionCodec(i["name"], i["inputs"])
+                codecs[fn_selector] = (build_function_signature(i), codec)
+                break
+        else:
+            raise ValueError("Four byte selector does not match the ABI for this contract")
+
+    function_sig, codec = codecs[fn_selector]
+    return function_sig, codec.decode_input(calldata[4:])
+
+
 def _inputs(abi: ABIFunction | ABIConstructor) -> str:
     abi_inputs = abi["inputs"]
     types_list = get_type_strings(abi_inputs, _fixed168x10)
@@ -678,7 +678,7 @@ def _decode_trace(trace: Sequence[_TraceStep], initial_address: AnyAddress) -> E
         return EventDict()
 
     events = eth_event.decode_traceTransaction(
-        trace if type(trace) is list else list(trace),
+        _event_steps(trace),
         _topics,
         allow_undecoded=True,
         initial_address=initial_address,
@@ -686,6 +686,30 @@ def _decode_trace(trace: Sequence[_TraceStep], initial_address: AnyAddress) -> E
     return EventDict(format_event(event) for event in events)
 
 
+def _event_steps(trace: Sequence[_TraceStep]) -> list[_TraceStep]:
+    # `eth_event` requires the stack and memory as lists, but compacted traces hold
+    # them as `StepWords`. they are only read at LOG steps and where the call depth
+    # changes, so the complete list is only built for those steps.
+    steps: list[_TraceStep] = [dict(i) for i in trace]  # type: ignore [misc]
+    last_depth = None
+    for i, step in enumerate(steps):
+        depth = step["depth"]
+        if step["op"].startswith("LOG"):
+            _as_lists(step, "stack", "memory")
+        if last_depth is not None and depth != last_depth:
+            _as_lists(steps[i - 1], "stack")
+            _as_lists(step, "stack")
+        last_depth = depth
+    return steps
+
+
+def _as_lists(step: _TraceStep, *keys: str) -> None:
+    for key in keys:
+        value = step.get(key)
+        if value is not None and type(value) is not list:
+            step[key] = list(value)  # type: ignore [literal-required]
+
+
 def _create_event_filter(
     event: ContractEvent, from_block: int | None = None, to_block: int | None = None
 ) -> filters.LogFilter:
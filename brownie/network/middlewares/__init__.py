@@ -18,6 +18,40 @@ MakeBatchRequestFn: TypeAlias = Callable[[BatchRequest], BatchResponse]
 partial: Final = functools.partial
 
 
+class _DeferredRequest(BaseException):
+    # raised from within `process_request` during the first pass over a batch, to
+    # collect the request that a middleware wishes to make. subclasses BaseException
+    # so that it is not swallowed by middlewares which catch `Exception`.
+
+    def __init__(self, method: RPCEndpoint, params: Any) -> None:
+        super().__init__(method, params)
+        self.method: Final = method
+        self.params: Final = params
+
+
+def _defer_request(method: RPCEndpoint, params: Any) -> Any:
+    raise _DeferredRequest(method, params)
+
+
+class _BatchedRequest:
+    # replays the result of a batched request during the second pass over a batch.
+    # if the middleware makes a different or additional request, it is sent on its own.
+
+    def __init__(
+        self, make_batch_request: MakeBatchRequestFn, request: tuple[Any, Any], response: Any
+    ) -> None:
+        self.make_batch_request: Final = make_batch_request
+        self.request: tuple[Any, Any] | None = request
+        self.response: Final = response
+
+    def __call__(self, method: RPCEndpoint, params: Any) -> Any:
+        if self.request == (method, params):
+            self.request = None
+            return self.response
+        response = self.make_batch_request([(method, params)])
+        return response[0] if isinstance(response, list) else response
+
+
 class BrownieMiddlewareABC(Web3Middleware, ABC):
     """
     Base ABC for all middlewares.
@@ -59,11 +93,60 @@ class BrownieMiddlewareABC(Web3Middleware, ABC):
     @override
     def wrap_make_batch_request(self, make_batch_request: MakeBatchRequestFn) -> MakeBatchRequestFn:
         """
-        Receive the batch middleware request and return `make_batch_request`.
+        Receive the batch middleware request and return `process_batch_request`.
 
         Subclasses should NOT include this method.
         """
-        return make_batch_request
+        return partial(self.process_batch_request, make_batch_request)
+
+    def process_batch_request(
+        self, make_batch_request: MakeBatchRequestFn, requests_info: BatchRequest
+    ) -> BatchResponse:
+        """
+        Process a JSON-RPC batch request, one element at a time.
+
+        Each element is passed through `process_request` twice. The first pass
+        collects the requests that must be made (elements that return without making
+        a request, e.g. a cache hit, are complete). The collected requests are sent
+        onward as a single batch, and the second pass processes each response.
+
+        Subclasses should NOT include this method. Note that any pre-processing
+        within `process_request` may be run twice for each element of a batch.
+
+        Arguments
+        ---------
+        requests_info : List
+            A list of (method, params) tuples.
+
+        Returns
+        -------
+        List
+            A list of responses, in the same order as the requests. If the batch
+            as a whole failed, a single response with an 'error' key.
+        """
+        results: list[Any] = [None] * len(requests_info)
+        deferred: list[int] = []
+        pending: BatchRequest = []
+        for i, (method, params) in enumerate(requests_info):
+            try:
+                results[i] = self.process_request(_defer_request, method, params)
+            except _DeferredRequest as exc:
+                deferred.append(i)
+                pending.append((exc.method, exc.params))
+
+        if not pending:
+            return results
+
+        responses = make_batch_request(pending)
+        if not isinstance(responses, list):
+            # RPC errors return only one response with the error object
+            return responses
+
+        for i, request, response in zip(deferred, pending, responses):
+            make_request = _BatchedRequest(make_batch_request, request, response)
+            method, params = requests_info[i]
+            results[i] = self.process_request(make_request, method, params)
+        return results
 
     @abstractmethod
     def process_request(
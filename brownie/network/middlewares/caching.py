@@ -5,10 +5,11 @@ from collections import OrderedDict
 from typing import Any, Final, final
 
 import faster_hexbytes
+import requests
 from web3 import Web3
 from web3.types import LogReceipt, RPCEndpoint
 
-from brownie._c_constants import HexBytes, ujson_dumps
+from brownie._c_constants import HexBytes, ujson_dumps, ujson_loads
 from brownie._config import CONFIG, _get_data_folder
 from brownie.network.middlewares import BrownieMiddlewareABC, MakeRequestFn, RPCParams
 from brownie.utils.sql import Cursor
@@ -19,6 +20,21 @@ LONGTERM_CACHE: Final = {
     "eth_getCode": lambda w3, data: is_cacheable_bytecode(w3, data),
 }
 CACHE_FILTER_THREAD_JOIN_TIMEOUT: Final = 1.0
+# seconds to wait for the head of the upstream chain when connecting to a fork
+UPSTREAM_HEAD_TIMEOUT: Final = 3.0
+
+# calls to the following RPC endpoints are stored in the block cache when they are
+# made against an immutable block. values are the index of the block identifier in params
+BLOCK_SCOPED_METHODS: Final = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getBlockByHash": 0,
+    "eth_getBlockByNumber": 0,
+    "eth_getCode": 1,
+    "eth_getProof": 2,
+    "eth_getStorageAt": 2,
+    "eth_getTransactionCount": 1,
+}
 
 
 def _strip_push_data(bytecode: bytes) -> bytes:
@@ -88,6 +104,140 @@ def is_cacheable_bytecode(web3: Web3, bytecode: faster_hexbytes.HexBytes) -> boo
     return True
 
 
+def _parse_block_identifier(block_identifier: Any) -> tuple[int | None, str | None]:
+    """
+    Parse a JSON-RPC block identifier.
+
+    Arguments
+    ---------
+    block_identifier : Any
+        Block number, block hash, block tag or EIP-1898 block object.
+
+    Returns
+    -------
+    int | None
+        Block number, if the identifier refers to a block by number.
+    str | None
+        Block hash, if the identifier refers to a block by hash.
+    """
+    if isinstance(block_identifier, dict):
+        # EIP-1898 style block object
+        if "blockHash" in block_identifier:
+            return None, str(block_identifier["blockHash"]).lower()
+        block_identifier = block_identifier.get("blockNumber")
+    if isinstance(block_identifier, bool):
+        return None, None
+    if isinstance(block_identifier, int):
+        return block_identifier, None
+    if isinstance(block_identifier, bytes):
+        if len(block_identifier) == 32:
+            return None, f"0x{block_identifier.hex()}"
+        return None, None
+    if not isinstance(block_identifier, str):
+        return None, None
+    if block_identifier == "earliest":
+        return 0, None
+    if not block_identifier.startswith("0x"):
+        # latest, pending, safe, finalized
+        return None, None
+    if len(block_identifier) == 66:
+        return None, block_identifier.lower()
+    try:
+        return int(block_identifier, 16), None
+    except ValueError:
+        return None, None
+
+
+# (provider, fork info) of the most recent call to `_get_fork_info`
+_fork_info_cache: Final[list[Any]] = [None, None]
+
+
+def _get_fork_info(w3: Web3) -> tuple[int, str, int] | None:
+    """
+    Return details of the upstream chain that a development network was forked from.
+
+    The result is cached for each provider, so the client and the upstream chain
+    are only queried once, when the network is connected.
+
+    Returns
+    -------
+    int
+        Block number that the network was forked at.
+    str
+        Hash of the upstream genesis block, identifying the upstream chain.
+    int
+        Highest block number that is at least `finality_depth` blocks behind the
+        upstream head, or -1 if the upstream head cannot be determined, in which
+        case no reads are persisted.
+
+    `None` is returned if the active network is not a fork, or if the fork
+    block or upstream chain cannot be determined.
+    """
+    if _fork_info_cache[0] is w3.provider:
+        return _fork_info_cache[1]
+    fork_info = _query_fork_info(w3)
+    _fork_info_cache[0] = w3.provider
+    _fork_info_cache[1] = fork_info
+    return fork_info
+
+
+def _query_fork_info(w3: Web3) -> tuple[int, str, int] | None:
+    cmd_settings = CONFIG.active_network.get("cmd_settings") or {}
+    if "fork" not in cmd_settings:
+        return None
+
+    fork_block = None
+    if cmd_settings.get("fork_block") is not None:
+        fork_block = int(cmd_settings["fork_block"])
+    else:
+        # query the client directly, anvil and hardhat both expose the fork block
+        for method, key in (
+            ("anvil_nodeInfo", "forkConfig"),
+            ("hardhat_metadata", "forkedNetwork"),
+        ):
+            try:
+                response = w3.provider.make_request(RPCEndpoint(method), [])
+            except Exception:
+                continue
+            fork_data = (response.get("result") or {}).get(key) or {}
+            if fork_data.get("forkBlockNumber") is not None:
+                fork_block = int(fork_data["forkBlockNumber"])
+                break
+    if fork_block is None:
+        return None
+
+    # blocks at or below the fork block are served from upstream, so the genesis
+    # hash identifies the upstream chain regardless of the local chain id
+    try:
+        response = w3.provider.make_request(RPCEndpoint("eth_getBlockByNumber"), ["0x0", False])
+        genesis_hash = response["result"]["hash"].lower()
+    except Exception:
+        return None
+
+    # only blocks that are final on the upstream chain are persisted. if the upstream
+    # head is unknown, reads are only held in memory.
+    finality_depth = CONFIG.settings["request_cache"]["finality_depth"]
+    head = _get_upstream_head(cmd_settings["fork"])
+    if head is None:
+        return fork_block, genesis_hash, -1
+    return fork_block, genesis_hash, min(fork_block, head - finality_depth)
+
+
+def _get_upstream_head(fork_url: Any) -> int | None:
+    # query the block number of the upstream chain that a network was forked from
+    if not isinstance(fork_url, str) or not fork_url.startswith("http"):
+        return None
+    try:
+        response = requests.post(
+            fork_url,
+            json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []},
+            timeout=UPSTREAM_HEAD_TIMEOUT,
+        )
+        return int(response.json()["result"], 16)
+    except Exception:
+        return None
+
+
 def _new_filter(w3: Web3) -> Any:
     # returns a filter if the client is connected and supports filtering
     try:
@@ -107,14 +257,68 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
     def __init__(self, w3: Web3) -> None:
         super().__init__(w3)
 
-        self.table_key: Final = f"chain{CONFIG.active_network['chainid']}"
+        chainid = CONFIG.active_network.get("chainid") or w3.eth.chain_id
+        self.table_key: Final = f"chain{chainid}"
         self.cur: Final = Cursor(_get_data_folder().joinpath("cache.db"))
         self.cur.execute(f"CREATE TABLE IF NOT EXISTS {self.table_key} (method, params, result)")
 
+        # on a forked development network, reads at blocks that are final on the upstream
+        # chain are cached persistently, other reads are held until the chain is reverted
+        fork_info = _get_fork_info(w3) if CONFIG.network_type == "development" else None
+        fork_block: int | None = None
+        persist_block: int | None = None
+        block_table_key = f"{self.table_key}_blocks"
+        if fork_info is not None:
+            fork_block, genesis_hash, persist_block = fork_info
+            # the local chain id of a fork is not unique, the table is keyed by upstream chain
+            block_table_key = f"{self.table_key}_fork{genesis_hash[2:18]}_blocks"
+        self.fork_block: Final = fork_block
+        self.persist_block: Final = persist_block
+
+        # persistent tier for requests made against an immutable block
+        self.block_table_key: Final = block_table_key
+        self.cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.block_table_key} "
+            "(method, params, result, block, PRIMARY KEY (method, params))"
+        )
+        self.cur.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.block_table_key}_idx "
+            f"ON {self.block_table_key} (block)"
+        )
+
+        # in-memory LRU tier in front of the persistent tier
+        cache_config = CONFIG.settings["request_cache"]
+        self.finality_depth: Final[int] = cache_config["finality_depth"]
+        self.memory_limit: Final[int] = int(cache_config["memory_limit"] * 1024 * 1024)
+        self.memory_cache: Final[OrderedDict[tuple[str, str], tuple[Any, int | None, int]]] = (
+            OrderedDict()
+        )
+        self.memory_size = 0
+        self.stats: Final = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "evictions": 0,
+        }
+        self.memory_lock: Final = threading.Lock()
+
+        # block number -> hash of recently seen heads, used to detect reorgs
+        self.recent_blocks: Final[OrderedDict[int, str]] = OrderedDict()
+        self.last_block_number = 0
+
         self.lock: Final = threading.Lock()
         self.event: Final = threading.Event()
         self._stop_event: Final = threading.Event()
-        self.start_block_filter_loop()
+
+        self.post_fork_cache: Final[dict[int, dict[tuple[str, str], Any]]] = {}
+        if self.fork_block is None:
+            self.start_block_filter_loop()
+        else:
+            from brownie.network.state import _revert_register
+
+            _revert_register(self)
 
     def start_block_filter_loop(self):
         self.event.clear()
@@ -129,8 +333,8 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
             # do not cache when user doesn't want it
             return None
         if network_type != "live":
-            # do not cache on development chains
-            return None
+            # on development chains we only cache when forked from a known block
+            return None if _get_fork_info(w3) is None else 0
         try:
             latest = w3.eth.get_block("latest")
         except Exception:
@@ -163,6 +367,7 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
         # initialize required state variables within the loop to avoid recursion death
         latest = self.w3.eth.get_block("latest")
         self.last_block = latest.hash
+        self.last_block_number = latest.number
         self.last_block_seen = latest.timestamp
         self.last_request = time.time()
         self.block_cache: OrderedDict = OrderedDict()
@@ -209,6 +414,9 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
                             old_key = list(block_cache)[0]
                             del block_cache[old_key]
 
+            if not should_skip and new_blocks:
+                self.process_new_head(new_blocks[-1])
+
             # continue in try: except: block is not supported by mypyc
             # as of jul 23 2025 so we use this workaround instead.
             if should_skip:
@@ -228,6 +436,212 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
                 if self._stop_event.wait(1):
                     break
 
+    def _get_header(self, block_identifier: Any) -> dict[str, Any] | None:
+        # query the provider directly so the lookup bypasses all middlewares
+        if isinstance(block_identifier, int):
+            method, block_identifier = "eth_getBlockByNumber", hex(block_identifier)
+        else:
+            method = "eth_getBlockByHash"
+            if isinstance(block_identifier, bytes):
+                block_identifier = f"0x{block_identifier.hex()}"
+        response = self.w3.provider.make_request(RPCEndpoint(method), [block_identifier, False])
+        return response.get("result")
+
+    def process_new_head(self, block_hash: Any) -> None:
+        """
+        Record a new chain head and evict cached data invalidated by a reorg.
+
+        Arguments
+        ---------
+        block_hash : HexBytes
+            Hash of the new head, as returned by the block filter.
+        """
+        header = self._get_header(block_hash)
+        if not header:
+            return
+        number = int(header["number"], 16)
+        head_hash = header["hash"].lower()
+        recent = self.recent_blocks
+
+        fork_point = None
+        if recent.get(number, head_hash) != head_hash:
+            # a different block has been seen at this height
+            fork_point = number
+        elif recent.get(number - 1, header["parentHash"].lower()) != header["parentHash"].lower():
+            fork_point = number - 1
+        if fork_point is not None:
+            # walk backward until the recorded hash agrees with the canonical chain
+            while fork_point - 1 in recent:
+                ancestor = self._get_header(fork_point - 1)
+                if ancestor and ancestor["hash"].lower() == recent[fork_point - 1]:
+                    break
+                fork_point -= 1
+            self.evict_blocks(fork_point)
+
+        recent[number] = head_hash
+        recent.move_to_end(number)
+        while len(recent) > 2 * self.finality_depth:
+            recent.popitem(last=False)
+        self.last_block_number = max(number, self.last_block_number)
+
+    def evict_blocks(self, from_block: int) -> None:
+        """
+        Remove all block-scoped cache entries at or above the given height.
+
+        Arguments
+        ---------
+        from_block : int
+            Lowest block number that is no longer part of the canonical chain.
+        """
+        for block_number in [i for i in self.recent_blocks if i >= from_block]:
+            del self.recent_blocks[block_number]
+        with self.memory_lock:
+            cache = self.memory_cache
+            for key in [k for k, v in cache.items() if v[1] is not None and v[1] >= from_block]:
+                self.memory_size -= cache.pop(key)[2]
+                self.stats["evictions"] += 1
+        self.cur.execute(f"DELETE FROM {self.block_table_key} WHERE block>=?", (from_block,))
+        with self.lock:
+            self.block_cache.clear()
+
+    def get_immutable_block(self, method: str, params: RPCParams) -> tuple[bool, int | None]:
+        """
+        Check if a request targets a block that can no longer change.
+
+        A block is immutable if it is referenced by hash, or by a number that is
+        at least `finality_depth` blocks behind the most recently seen head.
+
+        Returns
+        -------
+        bool
+            Is the request made against an immutable block?
+        int | None
+            Number of the target block, if it was referenced by number.
+        """
+        idx = BLOCK_SCOPED_METHODS.get(method)
+        if idx is None or len(params) <= idx:
+            return False, None
+        number, block_hash = _parse_block_identifier(params[idx])
+        if block_hash is not None:
+            return True, None
+        if number is not None and number <= self.last_block_number - self.finality_depth:
+            return True, number
+        return False, None
+
+    def _get_block_cached(self, method: str, param_str: str) -> Any:
+        key = (method, param_str)
+        with self.memory_lock:
+            if key in self.memory_cache:
+                self.memory_cache.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self.memory_cache[key][0]
+
+        rows = self.cur.fetchall(
+            f"SELECT result, block FROM {self.block_table_key} WHERE method=? AND params=?",
+            (method, param_str),
+        )
+        if not rows:
+            self.stats["misses"] += 1
+            return None
+        encoded, block_number = rows[0]
+        size = len(param_str) + len(encoded)
+        self.stats["persistent_hits"] += 1
+        self.stats["bytes_read"] += size
+        result = ujson_loads(encoded)
+        self._add_to_memory(key, result, block_number, size)
+        return result
+
+    def _set_block_cached(
+        self, method: str, param_str: str, result: Any, block_number: int | None
+    ) -> None:
+        encoded = ujson_dumps(result)
+        size = len(param_str) + len(encoded)
+        self.cur.insert(self.block_table_key, method, param_str, encoded, block_number)
+        self.stats["bytes_written"] += size
+        self._add_to_memory((method, param_str), result, block_number, size)
+
+    def _add_to_memory(
+        self, key: tuple[str, str], result: Any, block_number: int | None, size: int
+    ) -> None:
+        with self.memory_lock:
+            cache = self.memory_cache
+            if key in cache:
+                self.memory_size -= cache.pop(key)[2]
+            cache[key] = (result, block_number, size)
+            self.memory_size += size
+            while self.memory_size > self.memory_limit and cache:
+                self.memory_size -= cache.popitem(last=False)[1][2]
+                self.stats["evictions"] += 1
+
+    def _revert(self, height: int) -> None:
+        # called by `chain` when the development network is reverted
+        with self.memory_lock:
+            for block_number in [i for i in self.post_fork_cache if i > height]:
+                del self.post_fork_cache[block_number]
+
+    def _reset(self) -> None:
+        with self.memory_lock:
+            self.post_fork_cache.clear()
+
+    def process_fork_request(
+        self,
+        make_request: MakeRequestFn,
+        method: RPCEndpoint,
+        params: RPCParams,
+        param_str: str,
+    ) -> dict[str, Any]:
+        """
+        Process a request on a forked development network.
+
+        Requests made against a block number that is final on the upstream chain are
+        served from the persistent block cache. Requests against a later block number
+        are cached in memory until the chain is reverted below that block. Everything
+        else is passed through.
+        """
+        idx = BLOCK_SCOPED_METHODS.get(method)
+        if idx is None or len(params) <= idx:
+            return make_request(method, params)
+        block_number = _parse_block_identifier(params[idx])[0]
+        if block_number is None:
+            # block tags and local block hashes may change on revert
+            return make_request(method, params)
+
+        if block_number <= self.persist_block:  # type: ignore [operator]
+            result = self._get_block_cached(method, param_str)
+            if result is not None:
+                return {"id": sys.maxsize, "jsonrpc": "2.0", "result": result}
+            response = make_request(method, params)
+            if response.get("result") is not None:
+                self._set_block_cached(method, param_str, response["result"], block_number)
+            return response
+
+        key = (method, param_str)
+        with self.memory_lock:
+            block_cache = self.post_fork_cache.get(block_number, {})
+            if key in block_cache:
+                return block_cache[key]
+        response = make_request(method, params)
+        if response.get("result") is not None:
+            with self.memory_lock:
+                self.post_fork_cache.setdefault(block_number, {})[key] = response
+        return response
+
+    def cache_info(self) -> dict[str, int]:
+        """
+        Return hit, miss and size counters for the block-scoped request cache.
+
+        Returns
+        -------
+        dict
+            Counters for the current session, along with the current number of
+            entries and total size in bytes of the in-memory tier.
+        """
+        with self.memory_lock:
+            info = self.stats.copy()
+            info["memory_entries"] = len(self.memory_cache)
+            info["memory_bytes"] = self.memory_size
+        return info
+
     def process_request(
         self,
         make_request: MakeRequestFn,
@@ -255,6 +669,20 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
         # try to return a cached value
         param_str = ujson_dumps(params, separators=(",", ""), default=str)
 
+        if self.fork_block is not None:
+            return self.process_fork_request(make_request, method, params, param_str)
+
+        # requests against an immutable block are served from the block cache
+        is_immutable, block_number = self.get_immutable_block(method, params)
+        if is_immutable:
+            result = self._get_block_cached(method, param_str)
+            if result is not None:
+                return {"id": sys.maxsize, "jsonrpc": "2.0", "result": result}
+            response = make_request(method, params)
+            if response.get("result") is not None:
+                self._set_block_cached(method, param_str, response["result"], block_number)
+            return response
+
         # check if the value is available within the long-term cache
         if method in LONGTERM_CACHE:
             row = self.cur.fetchone(
@@ -302,6 +730,13 @@ class RequestCachingMiddleware(BrownieMiddlewareABC):
         block_cache = getattr(self, "block_cache", None)
         if block_cache is not None:
             block_cache.clear()
+        memory_cache = getattr(self, "memory_cache", None)
+        if memory_cache is not None:
+            memory_cache.clear()
+            self.memory_size = 0
+        post_fork_cache = getattr(self, "post_fork_cache", None)
+        if post_fork_cache is not None:
+            post_fork_cache.clear()
         block_filter = getattr(self, "block_filter", None)
         if self.w3.isConnected() and block_filter is not None:
             self.w3.eth.uninstall_filter(block_filter.filter_id)
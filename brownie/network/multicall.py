@@ -1,17 +1,23 @@
 from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, Token
 from dataclasses import dataclass
-from threading import Lock, get_ident
+from functools import partial
+from threading import get_ident
 from types import FunctionType, TracebackType
-from typing import Any
+from typing import Any, Final
 
+from hexbytes import HexBytes
 from lazy_object_proxy import Proxy
 from wrapt import ObjectProxy
 
 from brownie._c_constants import ujson_loads
 from brownie._config import BROWNIE_FOLDER, CONFIG
-from brownie.exceptions import ContractNotFound
+from brownie.exceptions import ContractNotFound, RPCRequestError
 from brownie.network import accounts, web3
-from brownie.network.contract import Contract, ContractCall
+from brownie.network.contract import Contract, ContractCall, _call_interceptor, _ContractMethod
+from brownie.network.web3 import BATCH_SIZE
 from brownie.project import compile_source
 from brownie.utils import color
 
@@ -19,6 +25,12 @@ DATA_DIR = BROWNIE_FOLDER.joinpath("data")
 MULTICALL2_ABI = ujson_loads(DATA_DIR.joinpath("interfaces", "Multicall2.json").read_text())
 MULTICALL2_SOURCE = DATA_DIR.joinpath("contracts", "Multicall2.sol").read_text()
 
+# number of calls aggregated within a single `tryAggregate` call by `Multicall.map`.
+# Chunks that fail, e.g. by exceeding the gas limit, are split in half and retried.
+AGGREGATE_SIZE: Final = 500
+# maximum number of requests that `Multicall.map` makes at the same time
+MAX_WORKERS: Final = 8
+
 
 @dataclass
 class Call:
@@ -42,27 +54,118 @@ class LazyResult(Proxy):
         return repr(self.__wrapped__)
 
 
+class _ActiveMulticall:
+    """
+    A multicall within a single thread or asyncio task.
+
+    While active, this object is the call interceptor for `ContractCall.__call__`,
+    so calls made in the same context are queued and later made together.
+    """
+
+    def __init__(self, contract: Contract, block_number: int, verbose: bool) -> None:
+        self.contract = contract
+        self.block_number = block_number
+        self.verbose = verbose
+        self.pending_calls: list[Result] = []
+        self.tokens: tuple[Token, Token] | None = None
+
+    def __call__(self, call: ContractCall, *args: Any) -> LazyResult:
+        """Add a call to the buffer of calls to be made"""
+        calldata = (call._address, call.encode_input(*args))
+        readable = f"{call._name}({', '.join(str(i) for i in args)})"
+        call_obj = Call(calldata, call.decode_output, readable)
+        # future result
+        result = Result(call_obj)
+        self.pending_calls.append(result)
+
+        return LazyResult(lambda: self.flush(result))
+
+    def flush(self, future_result: Result | None = None) -> Any:
+        pending_calls = self.pending_calls
+        self.pending_calls = []
+
+        if not pending_calls:
+            # either all calls have already been made
+            # or this result has already been retrieved
+            return future_result
+
+        if self.verbose:
+            message = (
+                "Multicall:"
+                f"\n  Thread ID: {get_ident()}"
+                f"\n  Block number: {self.block_number}"
+                f"\n  Calls: {len(pending_calls)}"
+            )
+            for c, item in enumerate(pending_calls, start=1):
+                u = "\u2514" if c == len(pending_calls) else "\u251c"
+                message = f"{message}\n    {u}\u2500{item.readable}"
+            print(color.highlight(f"{message}\n"))
+
+        results = self.contract.tryAggregate.call(
+            False,
+            [_call.calldata for _call in pending_calls],
+            block_identifier=self.block_number,
+        )
+
+        for _call, result in zip(pending_calls, results):
+            _call.__wrapped__ = _call.decoder(result[1]) if result[0] else None
+
+        return future_result
+
+
 class Multicall:
-    """Context manager for batching multiple calls to constant contract functions."""
+    """
+    Context manager for batching multiple calls to constant contract functions.
 
-    _lock = Lock()
+    Each thread or asyncio task that enters the context manager has its own queue
+    of pending calls, which is flushed independently of any other. The address and
+    block given with `__call__` also only apply within the same context.
+    """
 
     def __init__(self) -> None:
-        self.address = None
         self.default_verbose = False
-        self._block_number = defaultdict(lambda: None)
-        self._verbose = defaultdict(lambda: None)
-        self._contract = None
-        self._pending_calls: dict[int, list[Call]] = defaultdict(list)
+        # (address, block, verbose) given with `__call__`, used when entering in the
+        # same context
+        self._options: Final[ContextVar[tuple[str | None, Any, bool | None]]] = ContextVar(
+            "multicall_options", default=(None, None, None)
+        )
+        self._active: Final[ContextVar[_ActiveMulticall | None]] = ContextVar(
+            "multicall", default=None
+        )
 
-        setattr(ContractCall, "__original_call_code", ContractCall.__call__.__code__)
-        setattr(ContractCall, "__proxy_call_code", self._proxy_call.__code__)
-        setattr(ContractCall, "__multicall", defaultdict(lambda: None))
-        ContractCall.__call__.__code__ = self._proxy_call.__code__
+    @property
+    def address(self) -> str | None:
+        if active := self._active.get():
+            return active.contract.address
+        return self._options.get()[0] or CONFIG.active_network.get("multicall2")
+
+    @address.setter
+    def address(self, address: str | None) -> None:
+        _, block_identifier, verbose = self._options.get()
+        self._options.set((address, block_identifier, verbose))
 
     @property
     def block_number(self) -> int:
-        return self._block_number[get_ident()]
+        if active := self._active.get():
+            return active.block_number
+        return self._options.get()[1]
+
+    @property
+    def _contract(self) -> Contract | None:
+        # the Multicall2 contract used within the current context
+        if active := self._active.get():
+            return active.contract
+        address = self.address
+        if address is None:
+            return None
+        return Contract.from_abi("Multicall", address, MULTICALL2_ABI)
+
+    @property
+    def _pending_calls(self) -> list[Result]:
+        # calls queued in the current context
+        if active := self._active.get():
+            return active.pending_calls
+        return []
 
     def __call__(
         self,
@@ -70,113 +173,138 @@ class Multicall:
         block_identifier: str | bytes | int | None = None,
         verbose: bool | None = None,
     ) -> "Multicall":
-        self.address = address
-        self._block_number[get_ident()] = block_identifier
-        self._verbose[get_ident()] = verbose if verbose is not None else self.default_verbose
+        self._options.set((address, block_identifier, verbose))
         return self
 
-    def _flush(self, future_result: Result = None) -> Any:
-        pending_calls = self._pending_calls[get_ident()]
-        self._pending_calls[get_ident()] = []
-
-        if not pending_calls:
-            # either all calls have already been made
-            # or this result has already been retrieved
-            return future_result
-        with self._lock:
-            if self._verbose.get(get_ident(), self.default_verbose):
-                message = (
-                    "Multicall:"
-                    f"\n  Thread ID: {get_ident()}"
-                    f"\n  Block number: {self._block_number[get_ident()]}"
-                    f"\n  Calls: {len(pending_calls)}"
-                )
-                for c, item in enumerate(pending_calls, start=1):
-                    u = "\u2514" if c == len(pending_calls) else "\u251c"
-                    message = f"{message}\n    {u}\u2500{item.readable}"
-                print(color.highlight(f"{message}\n"))
-
-            ContractCall.__call__.__code__ = getattr(ContractCall, "__original_call_code")
-            try:
-                results = self._contract.tryAggregate(
-                    False,
-                    [_call.calldata for _call in pending_calls],
-                    block_identifier=self._block_number[get_ident()],
-                )
-            finally:
-                ContractCall.__call__.__code__ = getattr(ContractCall, "__proxy_call_code")
-
-        for _call, result in zip(pending_calls, results):
-            _call.__wrapped__ = _call.decoder(result[1]) if result[0] else None
-
-        return future_result
-
     def flush(self) -> Any:
         """Flush the pending queue of calls, retrieving all the results."""
-        return self._flush()
-
-    def _call_contract(self, call: ContractCall, *args: Any, **kwargs: Any) -> Proxy:
-        """Add a call to the buffer of calls to be made"""
-        calldata = (call._address, call.encode_input(*args, **kwargs))
-        readable = f"{call._name}({', '.join(str(i) for i in args)})"
-        call_obj = Call(calldata, call.decode_output, readable)
-        # future result
-        result = Result(call_obj)
-        self._pending_calls[get_ident()].append(result)
-
-        return LazyResult(lambda: self._flush(result))
-
-    @staticmethod
-    def _proxy_call(*args: Any, **kwargs: Any) -> Any:
-        """Proxy code which substitutes `ContractCall.__call__"""
-        if self := getattr(ContractCall, "__multicall", {}).get(get_ident()):
-            return self._call_contract(*args, **kwargs)
+        if active := self._active.get():
+            return active.flush()
+        return None
 
-        # standard call we let pass through
-        ContractCall.__call__.__code__ = getattr(ContractCall, "__original_call_code")
-        try:
-            result = ContractCall.__call__(*args, **kwargs)
-        finally:
-            ContractCall.__call__.__code__ = getattr(ContractCall, "__proxy_call_code")
-        return result
+    def map(
+        self,
+        fn: _ContractMethod | Sequence[_ContractMethod],
+        args_list: Iterable[Any],
+        block_identifier: int | str | Sequence[int | str] | None = None,
+    ) -> list[Any]:
+        """
+        Call contract methods many times, batching the calls.
+
+        Calls are aggregated with `tryAggregate` when a `Multicall2` contract is
+        available at the block they are made at, and are otherwise sent as
+        JSON-RPC batches of `eth_call` requests. Large numbers of calls are
+        split into chunks, which are requested concurrently, and chunks that
+        fail are split in half and retried. A `Multicall2` contract is never
+        deployed by this method.
+
+        Arguments
+        ---------
+        fn : ContractCall | Sequence[ContractCall]
+            Contract method to call, or a sequence of methods with one for each
+            item in `args_list`
+        args_list : Iterable
+            Arguments of each call. Tuples are unpacked as the arguments, any
+            other value is used as the only argument.
+        block_identifier : int | str | Sequence, optional
+            Block the calls are made at, or a sequence of blocks with one for
+            each call. If not given, every call is made at the current block.
+
+        Returns
+        -------
+        list
+            The result of each call, or None for calls that reverted. Other
+            errors from `eth_call` raise `RPCRequestError`.
+        """
+        args_list = [i if isinstance(i, tuple) else (i,) for i in args_list]
+        fns = [fn] * len(args_list) if isinstance(fn, _ContractMethod) else list(fn)
+        if block_identifier is None:
+            block_identifier = self.block_number or web3.eth.block_number
+        if isinstance(block_identifier, (int, str)):
+            blocks = [block_identifier] * len(args_list)
+        else:
+            blocks = list(block_identifier)
+        if not len(fns) == len(blocks) == len(args_list):
+            raise ValueError("`fn` and `block_identifier` must have one item for each call")
+
+        calls = [(f._address, f.encode_input(*args)) for f, args in zip(fns, args_list)]
+        by_block: dict[int | str, list[int]] = defaultdict(list)
+        for i, block in enumerate(blocks):
+            by_block[block].append(i)
+
+        aggregators = self._get_aggregators(list(by_block))
+        jobs: list[tuple[list[int], Any]] = []
+        for block, indexes in by_block.items():
+            multicall = aggregators[block]
+            size = BATCH_SIZE if multicall is None else AGGREGATE_SIZE
+            for i in range(0, len(indexes), size):
+                chunk = indexes[i : i + size]
+                jobs.append((chunk, (multicall, [calls[x] for x in chunk], block)))
+
+        results: list[Any] = [None] * len(calls)
+        with ThreadPoolExecutor(max(min(MAX_WORKERS, len(jobs)), 1)) as executor:
+            outcomes = executor.map(lambda job: _call_chunk(*job[1]), jobs)
+            for (chunk, _), outcome in zip(jobs, outcomes):
+                for idx, (success, data) in zip(chunk, outcome):
+                    method = fns[idx]
+                    if success and (data or not method.abi["outputs"]):
+                        results[idx] = method.decode_output(data)
+        return results
+
+    def _get_aggregators(self, blocks: list[int | str]) -> dict[int | str, Contract | None]:
+        # returns the Multicall2 contract to aggregate calls at each block, or None
+        # where it does not exist. the code at every block is queried in batches
+        address = self.address
+        if address is None:
+            return dict.fromkeys(blocks)
+        codes = web3.batch(partial(web3.eth.get_code, address, block_identifier=i) for i in blocks)
+        if not any(codes):
+            return dict.fromkeys(blocks)
+        contract = self._contract
+        return {block: contract if code else None for block, code in zip(blocks, codes)}
 
     def __enter__(self) -> "Multicall":
-        """Enter the Context Manager and substitute `ContractCall.__call__`"""
-        # we set the code objects on ContractCall class so we can grab them later
+        """Enter the Context Manager and queue calls made within the current context"""
+        address, block_number, verbose = self._options.get()
+        # the address remains set for later multicalls in the same context
+        self._options.set((address, None, None))
 
         active_network = CONFIG.active_network
 
         if "multicall2" in active_network:
-            self.address = active_network["multicall2"]
+            address = active_network["multicall2"]
         elif "cmd" in active_network:
             deployment = self.deploy({"from": accounts[0]})
-            self.address = deployment.address
-            self._block_number[get_ident()] = deployment.tx.block_number
+            address = deployment.address
+            block_number = deployment.tx.block_number
 
-        self._block_number[get_ident()] = (
-            self._block_number[get_ident()] or web3.eth.get_block_number()
-        )
+        block_number = block_number or web3.eth.get_block_number()
 
-        address = self.address
         if address is None:
             raise ContractNotFound(
                 "Must set Multicall address via `brownie.multicall(address=...)`"
             )
-        elif not web3.eth.get_code(address, block_identifier=self.block_number):
+        elif not web3.eth.get_code(address, block_identifier=block_number):
             raise ContractNotFound(
-                f"Multicall at address {address} does not exist at block {self.block_number}"
+                f"Multicall at address {address} does not exist at block {block_number}"
             )
 
-        self._contract = Contract.from_abi("Multicall", address, MULTICALL2_ABI)
-        getattr(ContractCall, "__multicall")[get_ident()] = self
+        contract = Contract.from_abi("Multicall", address, MULTICALL2_ABI)
+        if verbose is None:
+            verbose = self.default_verbose
+        active = _ActiveMulticall(contract, block_number, verbose)
+        active.tokens = (self._active.set(active), _call_interceptor.set(active))
+        return self
 
     def __exit__(self, exc_type: Exception, exc_val: Any, exc_tb: TracebackType) -> None:
-        """Exit the Context Manager and reattach original `ContractCall.__call__` code"""
-        self.flush()
-        getattr(ContractCall, "__multicall")[get_ident()] = None
-
-        self._block_number.pop(get_ident(), None)
-        self._verbose.pop(get_ident(), None)
+        """Exit the Context Manager, making any pending calls"""
+        active = self._active.get()
+        try:
+            active.flush()
+        finally:
+            active_token, interceptor_token = active.tokens
+            self._active.reset(active_token)
+            _call_interceptor.reset(interceptor_token)
 
     @staticmethod
     def deploy(tx_params: dict) -> Contract:
@@ -194,6 +322,45 @@ class Multicall:
         return deployment
 
 
+def _call_chunk(
+    multicall: Contract | None, calls: list[tuple[str, str]], block: int | str
+) -> list[tuple[bool, Any]]:
+    # make a chunk of calls, returning (success, return data) for each
+    if multicall is not None:
+        try:
+            return multicall.tryAggregate.call(False, calls, block_identifier=block)
+        except Exception:
+            # likely out of gas, or the response was too large
+            if len(calls) > 1:
+                half = len(calls) // 2
+                return _call_chunk(multicall, calls[:half], block) + _call_chunk(
+                    multicall, calls[half:], block
+                )
+    block_id = hex(block) if isinstance(block, int) else block
+    requests = [("eth_call", [{"to": address, "data": data}, block_id]) for address, data in calls]
+    try:
+        responses = web3.make_batch_request(requests, fallback=False)
+        return [_eth_call_result(i) for i in responses]
+    except RPCRequestError:
+        # the batch or its response was likely too large
+        if len(calls) == 1:
+            raise
+        half = len(calls) // 2
+        return _call_chunk(None, calls[:half], block) + _call_chunk(None, calls[half:], block)
+
+
+def _eth_call_result(response: dict[str, Any]) -> tuple[bool, Any]:
+    # a reverted call is unsuccessful, any other error is raised
+    if "error" in response:
+        error = response["error"]
+        message = str(error.get("message", ""))
+        if error.get("code") == 3 or "revert" in message.lower():
+            return False, HexBytes(b"")
+        raise RPCRequestError(f"eth_call failed: {message or error}")
+    result = response.get("result")
+    return result is not None, HexBytes(result or b"")
+
+
 def _active_network_evm_version() -> str | None:
     cmd_settings = CONFIG.active_network.get("cmd_settings") or {}
     if not isinstance(cmd_settings, dict):
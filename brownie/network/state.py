@@ -1,10 +1,10 @@
 #!/usr/bin/python3
 
-import gc
 import threading
 import time
 import weakref
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
 from pathlib import Path
 from sqlite3 import OperationalError
 from typing import TYPE_CHECKING, Any, Final, TypeAlias, Union, cast, final
@@ -17,15 +17,16 @@ import brownie.network.rpc as rpc
 from brownie._c_constants import sha1
 from brownie._config import CONFIG, _get_data_folder
 from brownie._singleton import _Singleton
-from brownie.convert import Wei
+from brownie.convert import Wei, to_address
 from brownie.exceptions import BrownieEnvironmentError, CompilerError
+from brownie.project.artifacts import materialize
 from brownie.project.build import DEPLOYMENT_KEYS
 from brownie.typing import ContractBuildJson, ContractName, Count, PCMap, ProgramCounter
 from brownie.utils import bytes_to_hexstring
 from brownie.utils.sql import Cursor
 
 from .transaction import TransactionReceipt
-from .web3 import _resolve_address, web3
+from .web3 import BATCH_SIZE, _resolve_address, web3
 
 if TYPE_CHECKING:
     from .contract import Contract, ProjectContract
@@ -53,7 +54,15 @@ class TxHistory(metaclass=_Singleton):
 
     def __init__(self) -> None:
         self._list: list[TransactionReceipt] = []
+        # secondary indexes, maintained alongside `_list`
+        self._txids: Final[dict[str, TransactionReceipt]] = {}
+        self._senders: Final[dict[str, list[TransactionReceipt]]] = {}
+        self._receivers: Final[dict[str, list[TransactionReceipt]]] = {}
+        self._nonces: Final[dict[tuple[str, int], list[TransactionReceipt]]] = {}
+        self._lock: Final = threading.Lock()
         self.gas_profile: Final[dict[str, dict[str, int]]] = {}
+        # number of transactions ever added, including any since removed
+        self._count = 0
         _revert_register(self)
 
     def __repr__(self) -> str:
@@ -61,18 +70,11 @@ class TxHistory(metaclass=_Singleton):
             return str(self._list)
         return super().__repr__()
 
-    def __getattribute__(self, name: str) -> Any:
-        # filter dropped transactions prior to attribute access
-        items: list[TransactionReceipt] = super().__getattribute__("_list")
-        items = [i for i in items if i.status != -2]
-        setattr(self, "_list", items)
-        return super().__getattribute__(name)
-
     def __bool__(self) -> bool:
         return bool(self._list)
 
     def __contains__(self, item: Any) -> bool:
-        return item in self._list
+        return isinstance(item, TransactionReceipt) and self._txids.get(item.txid) is item
 
     def __iter__(self) -> Iterator[TransactionReceipt]:
         return iter(self._list)
@@ -84,14 +86,89 @@ class TxHistory(metaclass=_Singleton):
         return len(self._list)
 
     def _reset(self) -> None:
-        self._list.clear()
+        self._set_list([])
 
     def _revert(self, height: BlockNumber) -> None:
-        self._list = [i for i in self._list if cast(BlockNumber, i.block_number) <= height]
+        items = [i for i in self._list if cast(BlockNumber, i.block_number) <= height]
+        if len(items) != len(self._list):
+            self._set_list(items)
 
     def _add_tx(self, tx: TransactionReceipt) -> None:
-        if tx not in self._list:
+        with self._lock:
+            if tx.txid in self._txids:
+                return
             self._list.append(tx)
+            self._index(tx)
+            self._count += 1
+            limit = CONFIG.settings["history_limit"]
+            if limit and len(self._list) > limit:
+                self._evict(len(self._list) - limit)
+
+    def _drop(self, tx: TransactionReceipt) -> None:
+        # called when a transaction is dropped, it is removed from the history
+        with self._lock:
+            if self._txids.get(tx.txid) is tx:
+                self._list = [i for i in self._list if i is not tx]
+                self._unindex([tx])
+
+    def _evict(self, count: int) -> None:
+        # remove the oldest confirmed transactions. They can still be retrieved with
+        # `Chain.get_transaction`, which is served from the persistent transaction
+        # cache on live networks.
+        evicted = set()
+        for tx in self._list:
+            if len(evicted) == count:
+                break
+            if tx.status != -1:
+                evicted.add(tx.txid)
+        if evicted:
+            self._unindex([i for i in self._list if i.txid in evicted])
+            self._list = [i for i in self._list if i.txid not in evicted]
+
+    def _set_list(self, items: list[TransactionReceipt]) -> None:
+        with self._lock:
+            self._list = items
+            self._txids.clear()
+            self._senders.clear()
+            self._receivers.clear()
+            self._nonces.clear()
+            for tx in items:
+                self._index(tx)
+
+    def _index(self, tx: TransactionReceipt) -> None:
+        self._txids[tx.txid] = tx
+        sender = str(tx.sender)
+        self._senders.setdefault(sender, []).append(tx)
+        self._nonces.setdefault((sender, tx.nonce), []).append(tx)
+        if tx.receiver:
+            self._receivers.setdefault(str(tx.receiver), []).append(tx)
+
+    def _unindex(self, txs: list[TransactionReceipt]) -> None:
+        # index lists are only appended to in place. items are removed by replacing
+        # the list, so that a list being iterated by another thread does not skip items
+        for tx in txs:
+            del self._txids[tx.txid]
+            sender = str(tx.sender)
+            _remove_from_index(self._senders, sender, tx)
+            _remove_from_index(self._nonces, (sender, tx.nonce), tx)
+            if tx.receiver:
+                _remove_from_index(self._receivers, str(tx.receiver), tx)
+
+    def get(self, txid: str) -> TransactionReceipt | None:
+        """
+        Return a transaction by hash.
+
+        Arguments
+        ---------
+        txid : str
+            Transaction hash
+
+        Returns
+        -------
+        TransactionReceipt
+            The transaction, or None if it is not within the container.
+        """
+        return self._txids.get(txid)
 
     def clear(self, only_confirmed: bool = False) -> None:
         """
@@ -103,9 +180,9 @@ class TxHistory(metaclass=_Singleton):
             If True, transactions which are still marked as pending will not be removed.
         """
         if only_confirmed:
-            self._list = [i for i in self._list if i.status == -1]
+            self._set_list([i for i in self._list if i.status == -1])
         else:
-            self._list.clear()
+            self._set_list([])
 
     def copy(self) -> list[TransactionReceipt]:
         """Returns a shallow copy of the object as a list"""
@@ -115,6 +192,9 @@ class TxHistory(metaclass=_Singleton):
         """
         Return a filtered list of transactions.
 
+        Filtering by `txid`, `sender` or `sender` and `nonce` uses an index
+        rather than iterating over every transaction.
+
         Arguments
         ---------
         key : Callable, optional
@@ -131,7 +211,19 @@ class TxHistory(metaclass=_Singleton):
         List
             A filtered list of TransactionReceipt objects.
         """
-        result = (i for i in self._list if all(getattr(i, k) == v for k, v in kwargs.items()))
+        items: list[TransactionReceipt]
+        if "txid" in kwargs:
+            tx = self._txids.get(kwargs["txid"])
+            items = [] if tx is None else [tx]
+        elif "sender" in kwargs:
+            sender = _index_key(kwargs["sender"])
+            if "nonce" in kwargs:
+                items = self._nonces.get((sender, kwargs["nonce"]), [])
+            else:
+                items = self._senders.get(sender, [])
+        else:
+            items = self._list
+        result = (i for i in items if all(getattr(i, k) == v for k, v in kwargs.items()))
         return list(result if key is None else filter(key, result))
 
     def wait(self, key: Callable | None = None, **kwargs: Any) -> None:
@@ -154,22 +246,37 @@ class TxHistory(metaclass=_Singleton):
             Names and expected values for TransactionReceipt attributes.
         """
         while True:
-            pending = next(iter(self.filter(key, status=-1, **kwargs)), None)
+            # a tx that is released without confirming, e.g. after a disconnect, remains
+            # pending but is no longer waited on
+            pending = next(
+                (i for i in self.filter(key, status=-1, **kwargs) if not i._confirmed.is_set()),
+                None,
+            )
             if pending is None:
                 return
             pending._confirmed.wait()
 
     def from_sender(self, account: str) -> list[TransactionReceipt]:
         """Returns a list of transactions where the sender is account"""
-        return [i for i in self._list if i.sender == account]
+        return self._senders.get(_index_key(account), []).copy()
 
     def to_receiver(self, account: str) -> list[TransactionReceipt]:
         """Returns a list of transactions where the receiver is account"""
-        return [i for i in self._list if i.receiver == account]
+        return self._receivers.get(_index_key(account), []).copy()
 
     def of_address(self, account: str) -> list[TransactionReceipt]:
         """Returns a list of transactions where account is the sender or receiver"""
-        return [i for i in self._list if i.receiver == account or i.sender == account]
+        key = _index_key(account)
+        sent = self._senders.get(key, [])
+        received = self._receivers.get(key, [])
+        if not received:
+            return sent.copy()
+        if not sent:
+            return received.copy()
+        # merge both lists, preserving the order in which transactions were added
+        found = {i.txid for i in sent}
+        found.update(i.txid for i in received)
+        return [i for i in self._list if i.txid in found]
 
     def _gas(self, fn_name: str, gas_used: int, is_success: bool) -> None:
         gas = self.gas_profile.setdefault(fn_name, {})
@@ -197,6 +304,25 @@ class TxHistory(metaclass=_Singleton):
                 gas["avg_success"] = (avg * count + gas_used) // (count + 1)
 
 
+def _index_key(account: Any) -> str:
+    # normalize an account or address to the checksummed form used as an index key.
+    # ENS names are not resolved, a lookup must not be made to filter the history
+    if hasattr(account, "address"):
+        return str(account.address)
+    try:
+        return to_address(str(account))
+    except ValueError:
+        return str(account)
+
+
+def _remove_from_index(index: dict, key: Any, tx: TransactionReceipt) -> None:
+    items = [i for i in index.get(key, []) if i is not tx]
+    if items:
+        index[key] = items
+    else:
+        index.pop(key, None)
+
+
 @final
 class Chain(metaclass=_Singleton):
     """
@@ -211,6 +337,8 @@ class Chain(metaclass=_Singleton):
         self._current_id: int | str | None = None
         # RPC snapshots rewind backend state, not Brownie's local Python-side clock offset.
         self._snapshot_time_offsets: dict[int | str, int] = {}
+        # block height of each snapshot, so a revert does not need to query it
+        self._snapshot_heights: dict[int | str, BlockNumber] = {}
         self._undo_lock: Final = threading.Lock()
         self._undo_buffer: Final[UndoBuffer] = []
         self._redo_buffer: Final[RedoBuffer] = []
@@ -257,10 +385,33 @@ class Chain(metaclass=_Singleton):
         return block
 
     def __iter__(self) -> Iterator[BlockData | AttributeDict]:
+        height = web3.eth.block_number
+        for start in range(0, height + 1, BATCH_SIZE):
+            yield from self.get_blocks(range(start, min(start + BATCH_SIZE, height + 1)))
+
+    def get_blocks(self, block_numbers: Iterable[int]) -> list[BlockData | AttributeDict]:
+        """
+        Return information about multiple blocks, fetched as JSON-RPC batches.
+
+        Arguments
+        ---------
+        block_numbers : Iterable[int]
+            Block numbers to query, e.g. `range(100, 200)`. Negative values are
+            relative to the most recently mined block, as with `chain[-1]`.
+
+        Returns
+        -------
+        list
+            web3 block data objects, in the same order as `block_numbers`
+        """
+        block_numbers = list(block_numbers)
+        if any(not isinstance(i, int) for i in block_numbers):
+            raise TypeError("Block height must be given as an integer")
+        if any(i < 0 for i in block_numbers):
+            height = web3.eth.block_number
+            block_numbers = [height + 1 + i if i < 0 else i for i in block_numbers]
         get_block = web3.eth.get_block
-        for i in range(web3.eth.block_number + 1):
-            block: BlockData | AttributeDict = get_block(i)
-            yield block
+        return web3.batch(partial(get_block, i) for i in block_numbers)
 
     def new_blocks(
         self, height_buffer: int = 0, poll_interval: int = 5
@@ -346,22 +497,26 @@ class Chain(metaclass=_Singleton):
         else:
             self._time_offset = int(value)
 
-    def _take_snapshot(self) -> int | str:
+    def _take_snapshot(self, height: BlockNumber | None = None) -> int | str:
         """
         Take a Brownie-managed snapshot and store its paired local time offset.
 
         The backend snapshot id alone cannot restore Brownie's Python-side offset.
+        When the current block height is known it is stored as well.
         """
         snapshot_id: int | str = rpc.Rpc().snapshot()
         self._snapshot_time_offsets[snapshot_id] = self._time_offset
+        if height is not None:
+            self._snapshot_heights[snapshot_id] = height
         return snapshot_id
 
     def _revert(self, id_: int | str) -> int | str:
         rpc_client = rpc.Rpc()
         if web3.isConnected() and not web3.eth.block_number and not self._time_offset:
             _notify_registry(BlockNumber(0))
-            return self._take_snapshot()
+            return self._take_snapshot(BlockNumber(0))
         time_offset = self._snapshot_time_offsets.get(id_)
+        height = self._snapshot_heights.get(id_)
         rpc_client.revert(id_)
         if time_offset is None:
             # Older or external snapshot ids have no paired local offset; resync from chain state.
@@ -372,8 +527,10 @@ class Chain(metaclass=_Singleton):
         else:
             # Brownie-created snapshots restore both backend state and local clock offset.
             self._time_offset = time_offset
-        id_ = self._take_snapshot()
-        _notify_registry()
+        if height is None:
+            height = web3.eth.block_number
+        id_ = self._take_snapshot(height)
+        _notify_registry(height)
         return id_
 
     def _add_to_undo_buffer(
@@ -409,6 +566,7 @@ class Chain(metaclass=_Singleton):
         self._current_id = None
         # Snapshot ids are backend-session scoped; offsets tied to them are invalid now.
         self._snapshot_time_offsets.clear()
+        self._snapshot_heights.clear()
         self._time_offset = 0
         self._chainid = None
         _notify_registry(BlockNumber(0))
@@ -419,7 +577,7 @@ class Chain(metaclass=_Singleton):
         """
         if not isinstance(txid, str):
             txid = bytes_to_hexstring(txid)
-        tx = next((i for i in TxHistory() if i.txid == txid), None)
+        tx = TxHistory().get(txid)
         return tx or TransactionReceipt(txid, silent=True, required_confs=0)
 
     def time(self) -> int:
@@ -510,7 +668,8 @@ class Chain(metaclass=_Singleton):
         with self._undo_lock:
             self._undo_buffer.clear()
             self._redo_buffer.clear()
-            self._snapshot_id = self._current_id = self._take_snapshot()
+            height = web3.eth.block_number
+            self._snapshot_id = self._current_id = self._take_snapshot(height)
 
     def revert(self) -> BlockNumber:
         """
@@ -529,7 +688,7 @@ class Chain(metaclass=_Singleton):
             self._undo_buffer.clear()
             self._redo_buffer.clear()
             self._snapshot_id = self._current_id = self._revert(self._snapshot_id)
-            return web3.eth.block_number
+            return self._snapshot_heights[self._snapshot_id]
 
     def reset(self) -> BlockNumber:
         """
@@ -620,18 +779,28 @@ def _revert_register(obj: object) -> None:
     _revert_refs.append(weakref.ref(obj))
 
 
+def _revert_unregister(obj: object) -> None:
+    # stop sending notifications to an object that is no longer in use
+    _revert_refs[:] = [i for i in _revert_refs if i() is not None and i() is not obj]
+
+
 def _notify_registry(height: BlockNumber | None = None) -> None:
-    gc.collect()
+    # objects are only notified while they are referenced. Unreachable objects that
+    # have not been garbage collected may still be notified, so `_revert` must be
+    # inexpensive when nothing the object tracks has changed.
     if height is None:
         height = web3.eth.block_number
+    dead = False
     for ref in _revert_refs.copy():
         obj = ref()
         if obj is None:
-            _revert_refs.remove(ref)
+            dead = True
         elif height:
             obj._revert(height)
         else:
             obj._reset()
+    if dead:
+        _revert_refs[:] = [i for i in _revert_refs if i() is not None]
 
 
 def _find_contract(address: HexAddress | None) -> AnyContract | None:
@@ -725,7 +894,7 @@ def _add_deployment(
         f"(address UNIQUE, alias UNIQUE, paths, {', '.join(DEPLOYMENT_KEYS)})"
     )
 
-    contract_build = contract._build
+    contract_build = materialize(contract._build)
     if "compiler" not in contract_build:
         # do not replace full contract artifacts with ABI-only ones
         row = cur.fetchone(f"SELECT compiler FROM {name} WHERE address=?", (address,))
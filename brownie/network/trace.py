@@ -0,0 +1,612 @@
+#!/usr/bin/python3
+
+from codecs import iterdecode
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, Final, final, overload
+
+import requests
+from web3 import HTTPProvider
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint
+
+from brownie._c_constants import HexBytes, regex_compile, ujson_loads
+from brownie.exceptions import RPCRequestError
+
+# matches the address of a precompiled contract (0x01 - 0x12)
+PRECOMPILE: Final = regex_compile(r"0x0{38}(?:0[1-9]|1[0-8])")
+CALL_OPCODES: Final = frozenset({"CALL", "STATICCALL", "DELEGATECALL"})
+
+# the fields of a structLog step that are used by Brownie, all others are dropped
+STEP_FIELDS: Final = ("pc", "op", "depth", "gas", "gasCost", "stack", "memory", "storage")
+CHUNK_SIZE: Final = 1 << 16
+# maximum number of steps between copies of every word of a stack or memory
+SNAPSHOT_INTERVAL: Final = 64
+
+# tracer options for a structLog trace that is only used to evaluate coverage
+PC_TRACE_OPTIONS: Final = {
+    "disableStack": True,
+    "disableStorage": True,
+    "enableMemory": False,
+    "enableReturnData": False,
+}
+
+_STRUCT_LOGS: Final = regex_compile(r'"structLogs"\s*:\s*\[')
+_SEPARATOR: Final = regex_compile(r"[\s,]*")
+_decoder: Final = JSONDecoder()
+
+
+@final
+class StepWords(Sequence):
+    """
+    The stack or memory of a structLog step, stored as the words that changed
+    since the previous step in the same call frame.
+
+    A word is found by following the chain of earlier steps until the step where
+    it last changed. Every `SNAPSHOT_INTERVAL` steps all words are copied, which
+    limits the length of the chain. The complete list of words is only built when
+    the object is iterated, sliced or compared.
+    """
+
+    __slots__ = ("_base", "_length", "_changes", "_links")
+
+    def __init__(self, base: "StepWords | None", length: int, changes: dict[int, Any]) -> None:
+        if base is None or base._links >= SNAPSHOT_INTERVAL:
+            words = [] if base is None else base._materialize()
+            del words[length:]
+            words.extend([None] * (length - len(words)))
+            for idx, word in changes.items():
+                words[idx] = word
+            self._set(None, length, words)
+        else:
+            self._set(base, length, changes)
+
+    @classmethod
+    def _from_parts(
+        cls, base: "StepWords | None", length: int, changes: dict[int, Any] | list[Any]
+    ) -> "StepWords":
+        # restore an object exactly as it was stored by `pack_struct_logs`
+        obj = cls.__new__(cls)
+        obj._set(base, length, changes)
+        return obj
+
+    def _set(self, base: "StepWords | None", length: int, changes: Any) -> None:
+        self._base = base
+        self._length = length
+        # every word as a list if `base` is None, otherwise {index: word}
+        self._changes = changes
+        self._links = 0 if base is None else base._links + 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return self._materialize()[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("index out of range")
+        node = self
+        while node._base is not None:
+            if index in node._changes:
+                return node._changes[index]
+            node = node._base
+        return node._changes[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._materialize())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, StepWords)):
+            return self._materialize() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore [assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+    def _materialize(self) -> list[Any]:
+        chain = []
+        node = self
+        while node._base is not None:
+            chain.append(node)
+            node = node._base
+        words = list(node._changes)
+        for node in reversed(chain):
+            del words[node._length :]
+            words.extend([None] * (node._length - len(words)))
+            for idx, word in node._changes.items():
+                words[idx] = word
+        return words
+
+
+@final
+class StructLogs:
+    """
+    Columnar representation of a structLog trace from `debug_traceTransaction`.
+
+    The fixed-width fields of each step are held in parallel lists so that the
+    trace may be evaluated in a single pass without per-step dict access. Stack
+    and memory are only read from the original step when required, and joined
+    memory is cached per step.
+
+    When a trace is expanded, the per-step annotations (address, contract name,
+    function, jump depth and source offset) are recorded as columns as well.
+    They are only written into the original step dicts by `annotate`.
+    """
+
+    __slots__ = (
+        "steps",
+        "pc",
+        "op",
+        "depth",
+        "gas",
+        "gas_cost",
+        "frames",
+        "sources",
+        "_memory",
+    )
+
+    def __init__(self, steps: list[dict[str, Any]]) -> None:
+        self.steps: Final = steps
+        self.pc: list[int] = [i["pc"] for i in steps]
+        self.op: list[str] = [i["op"] for i in steps]
+        self.depth: list[int] = [i["depth"] for i in steps]
+        self.gas: list[int] = [i["gas"] for i in steps]
+        self.gas_cost: list[int] = [i["gasCost"] for i in steps]
+
+        # (address, contractName, fn, jumpDepth) for each step, shared between
+        # consecutive steps executing within the same frame
+        self.frames: list[tuple[Any, Any, str, int]] = []
+        # (filename, offset) for each step, or False if the source is unknown
+        self.sources: list[tuple[str, Any] | bool] = []
+        self._memory: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.pc)
+
+    def stack(self, idx: int) -> Sequence[str]:
+        """Return the stack at the given step."""
+        return self.steps[idx]["stack"]
+
+    def memory(self, idx: int) -> bytes:
+        """Return the complete memory at the given step."""
+        try:
+            return self._memory[idx]
+        except KeyError:
+            memory = bytes(HexBytes(_join_memory(self.steps[idx]["memory"])))
+            self._memory[idx] = memory
+            return memory
+
+    def read_memory(self, idx: int, offset: int, length: int) -> HexBytes:
+        """Return a slice of memory at the given step."""
+        return HexBytes(self.memory(idx)[offset : offset + length])
+
+    def get_memory(self, idx: int, stack_idx: int) -> HexBytes:
+        """
+        Return a slice of memory at the given step, using the offset and length
+        from the stack. The data is zero-padded if allocated memory ends early.
+        """
+        stack = self.stack(idx)
+        offset = int(stack[stack_idx], 16)
+        length = int(stack[stack_idx - 1], 16)
+        data = self.memory(idx)[offset : offset + length]
+        return HexBytes(data + b"\x00" * (length - len(data)))
+
+    def annotate(self) -> list[dict[str, Any]]:
+        """
+        Write the expanded columns into the original step dicts.
+
+        Returns
+        -------
+        list
+            The original list of steps, where each step includes the keys
+            `address`, `contractName`, `fn`, `jumpDepth` and `source`.
+        """
+        steps = self.steps
+        frames = self.frames
+        sources = self.sources
+        for i, step in enumerate(steps):
+            address, name, fn, jump_depth = frames[i]
+            source = sources[i]
+            if source:
+                source = {"filename": source[0], "offset": source[1]}  # type: ignore [index]
+            step.update(
+                depth=self.depth[i],
+                gasCost=self.gas_cost[i],
+                address=address,
+                contractName=name,
+                fn=fn,
+                jumpDepth=jump_depth,
+                source=source,
+            )
+        return steps
+
+
+def _join_memory(memory: list) -> str:
+    return "".join(i.removeprefix("0x").zfill(64) for i in memory)
+
+
+def get_struct_logs(provider: BaseProvider, txid: str, options: dict[str, Any]) -> dict[str, Any]:
+    """
+    Request a structLog trace via `debug_traceTransaction`.
+
+    With an HTTP provider the response is streamed and parsed as it is received,
+    one step at a time, so the complete JSON response is never held in memory.
+    With other providers the response is decoded by web3 before being compacted.
+
+    Steps are compacted with `compact_struct_logs`.
+
+    Arguments
+    ---------
+    provider : BaseProvider
+        Provider to send the request with
+    txid : str
+        Transaction hash
+    options : dict
+        Tracer options passed to `debug_traceTransaction`
+
+    Returns
+    -------
+    dict
+        The JSON-RPC response
+    """
+    return _request_struct_logs(
+        provider, "debug_traceTransaction", (txid, options), compact_struct_logs
+    )
+
+
+def get_pc_trace(provider: BaseProvider, method: str, params: tuple) -> dict[str, Any]:
+    """
+    Request a structLog trace that only holds the pc, opcode and call depth of
+    each step, using `PC_TRACE_OPTIONS`.
+
+    The trace is parsed in the same way as `get_struct_logs`, and the steps are
+    converted to columns with `pc_columns`.
+
+    Arguments
+    ---------
+    provider : BaseProvider
+        Provider to send the request with
+    method : str
+        `debug_traceTransaction` or `debug_traceCall`
+    params : tuple
+        Request parameters, where the final item is the tracer options
+
+    Returns
+    -------
+    dict
+        The JSON-RPC response, with `structLogs` given as (pcs, ops, depths)
+    """
+    return _request_struct_logs(provider, method, params, pc_columns)
+
+
+def pc_columns(steps: Iterable[dict[str, Any]]) -> tuple[list[int], list[str], list[int]]:
+    """
+    Convert the steps of a structLog trace to columns of pc, opcode and call depth.
+
+    Arguments
+    ---------
+    steps : Iterable[dict]
+        Steps of the trace
+
+    Returns
+    -------
+    tuple
+        Lists of the pc, opcode and depth of each step
+    """
+    pcs: list[int] = []
+    ops: list[str] = []
+    depths: list[int] = []
+    # share a single string between steps with the same opcode
+    names: dict[str, str] = {}
+    for step in steps:
+        pc = step["pc"]
+        pcs.append(int(pc, 16) if isinstance(pc, str) else pc)
+        op = step["op"]
+        ops.append(names.setdefault(op, op))
+        depths.append(step["depth"])
+    return pcs, ops, depths
+
+
+def _request_struct_logs(
+    provider: BaseProvider,
+    method: str,
+    params: tuple,
+    convert: Callable[[Iterable[dict[str, Any]]], Any],
+) -> dict[str, Any]:
+    rpc_method = RPCEndpoint(method)
+    if not isinstance(provider, HTTPProvider):
+        response = provider.make_request(rpc_method, params)
+        result = response.get("result")
+        if result and result.get("structLogs"):
+            result["structLogs"] = convert(result["structLogs"])
+        return response  # type: ignore [return-value]
+
+    # the request is sent with the same endpoint, headers and timeout as
+    # `HTTPProvider.make_request`, using a session that allows streaming
+    request_kwargs = {**provider.get_request_kwargs(), "stream": True}
+    envelope: list[str] = []
+    with (
+        requests.Session() as session,
+        session.post(
+            provider.endpoint_uri,  # type: ignore [arg-type]
+            data=provider.encode_rpc_request(rpc_method, params),
+            **request_kwargs,
+        ) as http_response,
+    ):
+        http_response.raise_for_status()
+        chunks = iterdecode(http_response.iter_content(CHUNK_SIZE), "utf-8")
+        steps = convert(_iter_struct_logs(chunks, envelope))
+
+    response = ujson_loads("".join(envelope))
+    result = response.get("result")
+    if result and "structLogs" in result:
+        result["structLogs"] = steps
+    return response
+
+
+def compact_struct_logs(steps: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Compact the steps of a structLog trace.
+
+    Only the fields listed in `STEP_FIELDS` are retained. The stack and memory of
+    each step are stored as a `StepWords` object, holding only the words that
+    changed since the previous step in the same call frame. Steps where the stack
+    or memory is unchanged share the same object. While compacting, only the most
+    recent stack and memory of each active call frame are held in full.
+
+    Arguments
+    ---------
+    steps : Iterable[dict]
+        Steps of the trace
+
+    Returns
+    -------
+    list
+        Compacted steps
+    """
+    compact = _StepCompactor()
+    return [compact(i) for i in steps]
+
+
+def pack_struct_logs(steps: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Convert structLog steps to a columnar form for storage.
+
+    Stack and memory words are stored once in a table and referenced by index.
+    Each distinct `StepWords` object is stored once in a second table, as the
+    index of the object it is based on, its length and its changed words. The
+    result may be serialized as JSON and restored with `unpack_struct_logs`.
+
+    Arguments
+    ---------
+    steps : list
+        Steps of the trace, as returned by `compact_struct_logs`. Steps holding
+        the stack and memory as lists are also accepted.
+
+    Returns
+    -------
+    dict
+        Columns of the trace
+    """
+    # word -> index and id(StepWords) -> index, in the order they are first seen
+    words: dict[Any, int] = {}
+    refs: dict[int, int] = {}
+    table: list[list] = []
+    # lists converted to `StepWords`, kept so that their ids are not reused
+    converted: list[StepWords] = []
+
+    def add(value: Any) -> int | None:
+        if value is None:
+            return None
+        if not isinstance(value, StepWords):
+            value = StepWords(None, len(value), dict(enumerate(value)))
+            converted.append(value)
+        chain = []
+        while value is not None and id(value) not in refs:
+            chain.append(value)
+            value = value._base
+        for node in reversed(chain):
+            if node._base is None:
+                changes: list = [words.setdefault(i, len(words)) for i in node._changes]
+                base = None
+            else:
+                changes = [[k, words.setdefault(v, len(words))] for k, v in node._changes.items()]
+                base = refs[id(node._base)]
+            refs[id(node)] = len(table)
+            table.append([base, node._length, changes])
+        return refs[id(chain[0] if chain else value)]
+
+    stacks = [add(i.get("stack")) for i in steps]
+    memories = [add(i.get("memory")) for i in steps]
+    return {
+        "words": list(words),
+        "values": table,
+        "pc": [i["pc"] for i in steps],
+        "op": [i["op"] for i in steps],
+        "depth": [i["depth"] for i in steps],
+        "gas": [i["gas"] for i in steps],
+        "gasCost": [i["gasCost"] for i in steps],
+        "stack": stacks,
+        "memory": memories,
+        "storage": [i.get("storage") for i in steps],
+    }
+
+
+def unpack_struct_logs(packed: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Restore structLog steps from the columnar form given by `pack_struct_logs`.
+
+    The stack and memory of each step are restored as `StepWords` objects, in
+    the same way as the steps returned by `compact_struct_logs`.
+
+    Arguments
+    ---------
+    packed : dict
+        Columns of the trace
+
+    Returns
+    -------
+    list
+        Steps of the trace
+    """
+    words = packed["words"]
+    values: list[StepWords] = []
+    for base, length, changes in packed["values"]:
+        if base is None:
+            values.append(StepWords._from_parts(None, length, [words[i] for i in changes]))
+        else:
+            changes = {k: words[v] for k, v in changes}
+            values.append(StepWords._from_parts(values[base], length, changes))
+    steps = []
+    for pc, op, depth, gas, gas_cost, stack, memory, storage in zip(
+        packed["pc"],
+        packed["op"],
+        packed["depth"],
+        packed["gas"],
+        packed["gasCost"],
+        packed["stack"],
+        packed["memory"],
+        packed["storage"],
+    ):
+        step = {"pc": pc, "op": op, "depth": depth, "gas": gas, "gasCost": gas_cost}
+        if stack is not None:
+            step["stack"] = values[stack]
+        if memory is not None:
+            step["memory"] = values[memory]
+        if storage is not None:
+            step["storage"] = storage
+        steps.append(step)
+    return steps
+
+
+def _iter_struct_logs(chunks: Iterable[str], envelope: list[str]) -> Iterator[dict[str, Any]]:
+    """
+    Incrementally decode the steps of a `debug_traceTransaction` response.
+
+    Arguments
+    ---------
+    chunks : Iterable[str]
+        The response body, in chunks of arbitrary size
+    envelope : list
+        Receives the remainder of the response, with `structLogs` as an empty
+        array, so it may be decoded once the steps have been consumed
+
+    Yields
+    ------
+    dict
+        Each step of the trace, in order
+    """
+    chunks = iter(chunks)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        match = _STRUCT_LOGS.search(buffer)
+        if match is not None:
+            envelope.append(buffer[: match.end()])
+            buffer = buffer[match.end() :]
+            break
+    else:
+        # no trace in the response, most likely an error
+        envelope.append(buffer)
+        return
+
+    pos = 0
+    required = 0
+    exhausted = False
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()  # type: ignore [union-attr]
+        if len(buffer) - pos > required:
+            if buffer[pos] == "]":
+                envelope.append(buffer[pos:])
+                envelope.extend(chunks)
+                return
+            try:
+                step, pos = _decoder.raw_decode(buffer, pos)
+            except JSONDecodeError:
+                # the step is incomplete, wait until at least twice as much data
+                # is available so that large steps are not decoded repeatedly
+                required = 2 * (len(buffer) - pos)
+            else:
+                required = 0
+                yield step
+                continue
+
+        if exhausted:
+            raise RPCRequestError("Incomplete response to `debug_traceTransaction`")
+        chunk = next(chunks, None)
+        if chunk is None:
+            # decode whatever remains, regardless of size
+            exhausted = True
+            required = 0
+        else:
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+@final
+class _StepCompactor:
+    """
+    Strips unused fields from structLog steps and stores the stack and memory of
+    each step as the changes from the previous step in the same call frame.
+    """
+
+    __slots__ = ("_words", "_frames")
+
+    def __init__(self) -> None:
+        self._words: Final[dict[Any, Any]] = {}
+        # call depth -> [stack, StepWords, memory, StepWords], for the most recent
+        # step in each active call frame
+        self._frames: Final[dict[int, list]] = {}
+
+    def __call__(self, step: dict[str, Any]) -> dict[str, Any]:
+        compact = {key: step[key] for key in STEP_FIELDS if key in step}
+        depth = compact["depth"]
+        frames = self._frames
+        if depth + 1 in frames:
+            # returned from a subcall, the deeper frames are discarded
+            for key in [i for i in frames if i > depth]:
+                del frames[key]
+        frame = frames.get(depth)
+        if frame is None:
+            frame = frames[depth] = [None, None, None, None]
+
+        for key, pos in (("stack", 0), ("memory", 2)):
+            value = compact.get(key)
+            if value is not None:
+                compact[key] = self._compact(frame, pos, value)
+        return compact
+
+    def _compact(self, frame: list, pos: int, value: list) -> "StepWords":
+        words = self._words
+        if pos == 0:
+            # stack words are given without a prefix and padded to 32 bytes, which
+            # some clients (e.g. erigon) do not do
+            value = [_stack_word(i) for i in value]
+        value = [words.setdefault(i, i) for i in value]
+        last, node = frame[pos], frame[pos + 1]
+        if last is None:
+            node = StepWords(None, len(value), dict(enumerate(value)))
+        elif last != value:
+            # words are shared, so an unchanged word is the same object
+            changes = {
+                i: word for i, word in enumerate(value) if i >= len(last) or word is not last[i]
+            }
+            node = StepWords(node, len(value), changes)
+        frame[pos], frame[pos + 1] = value, node
+        return node
+
+
+def _stack_word(word: Any) -> Any:
+    if isinstance(word, str) and word.startswith("0x"):
+        return word[2:].lower().zfill(64)
+    return word
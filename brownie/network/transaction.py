@@ -1,13 +1,16 @@
 #!/usr/bin/python3
 
 import functools
+import logging
 import sys
 import threading
 import time
+import traceback
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from pathlib import Path
-from typing import Any, Concatenate, ParamSpec, TypeVar
+from typing import Any, Concatenate, Final, ParamSpec, TypeVar, final
 from warnings import warn
 
 import requests
@@ -16,7 +19,7 @@ from faster_eth_abi import decode
 from web3.exceptions import TransactionNotFound
 from web3.types import TxReceipt
 
-from brownie._c_constants import HexBytes, deque, regex_compile, sha1
+from brownie._c_constants import HexBytes, deque, sha1
 from brownie._config import CONFIG
 from brownie.convert import EthAddress, Wei
 from brownie.exceptions import ContractNotFound, RPCRequestError, decode_typed_error
@@ -39,13 +42,37 @@ from brownie.utils.output import build_tree
 
 from . import state
 from .event import EventDict, _decode_logs, _decode_trace
+from .trace import (
+    CALL_OPCODES,
+    PC_TRACE_OPTIONS,
+    PRECOMPILE,
+    StructLogs,
+    _join_memory,
+    get_pc_trace,
+    get_struct_logs,
+    pack_struct_logs,
+    unpack_struct_logs,
+)
+from .txcache import get_tx_cache
 from .web3 import web3
 
 _T = TypeVar("_T")
 _P = ParamSpec("_P")
 
+_logger: Final = logging.getLogger(__name__)
+
 _marker = deque("-/|\\-/|\\")
 
+# seconds between checks for a new block, and for dropped transactions
+POLL_INTERVAL: Final = 1.0
+NONCE_INTERVAL: Final = 15.0
+# maximum number of seconds the confirmation watcher waits after an error before retrying
+MAX_RETRY_INTERVAL: Final = 30.0
+# maximum number of confirmed transactions that are finalized concurrently
+CONFIRMATION_WORKERS: Final = 4
+# opcodes that create a new call frame
+FRAME_OPCODES: Final = CALL_OPCODES | {"CALLCODE", "CREATE", "CREATE2"}
+
 
 def trace_property(fn: Callable[["TransactionReceipt"], _T]) -> "property[_T]":
     # attributes that are only available after querying the transaction trace
@@ -180,6 +207,8 @@ class TransactionReceipt:
         self._trace_exc: Exception | None = None
         self._trace_origin: str | None = None
         self._raw_trace: list | None = None
+        self._trace_expanded = False
+        self._trace_logs: StructLogs | None = None
         self._trace: list | None = None
         self._events: EventDict | None = None
         self._return_value: Any = None
@@ -189,6 +218,9 @@ class TransactionReceipt:
         self._new_contracts: list[EthAddress] | None = None
         self._internal_transfers: list[dict[str, Any]] | None = None
         self._subcalls: list[dict[str, Any]] | None = None
+        # transaction data awaiting storage in the persistent cache
+        self._uncached_tx: dict | None = None
+        self._cached_receipt: Any = None
 
         # attributes that can be set immediately
         self.sender = sender
@@ -207,7 +239,14 @@ class TransactionReceipt:
         if self._revert_pc is not None:
             self._dev_revert_msg = build._get_dev_revert(self._revert_pc) or None
 
-        tx: dict = web3.eth.get_transaction(HexBytes(self.txid))
+        tx_cache = get_tx_cache()
+        cached = tx_cache.get_receipt(web3.chain_id, self.txid) if tx_cache else None
+        if cached is not None:
+            tx, self._cached_receipt = cached
+        else:
+            tx = web3.eth.get_transaction(HexBytes(self.txid))
+            if tx_cache is not None:
+                self._uncached_tx = tx
         self._set_from_tx(tx)
 
         if not self._silent:
@@ -227,16 +266,11 @@ class TransactionReceipt:
                 f"   Nonce: {bright_blue}{self.nonce}{color}"
             )
 
-        # await confirmation of tx in a separate thread which is blocking if
+        # await confirmation of tx via the shared watcher, which is blocking if
         # required_confs > 0 or tx has already confirmed (`blockNumber` != None)
-        confirm_thread = threading.Thread(
-            target=self._await_confirmation,
-            args=(tx.get("blockNumber"), required_confs),
-            daemon=True,
-        )
-        confirm_thread.start()
+        done = _watcher.watch(self, tx.get("blockNumber"), required_confs)
         if is_blocking and (required_confs > 0 or tx.get("blockNumber")):
-            confirm_thread.join()
+            done.wait()
 
     def __repr__(self) -> str:
         color_str = {-2: "dark white", -1: "bright yellow", 0: "bright red", 1: ""}[self.status]
@@ -265,7 +299,7 @@ class TransactionReceipt:
     def internal_transfers(self) -> list[dict[str, Any]]:
         if not self.status:
             return []
-        if self._internal_transfers is None:
+        if self._internal_transfers is None and not self._get_call_trace():
             self._expand_trace()
         return self._internal_transfers
 
@@ -273,7 +307,7 @@ class TransactionReceipt:
     def modified_state(self) -> bool | None:
         if not self.status:
             self._modified_state = False
-        elif self._modified_state is None:
+        elif self._modified_state is None and not self._get_state_diff():
             self._get_trace()
         return self._modified_state
 
@@ -281,7 +315,7 @@ class TransactionReceipt:
     def new_contracts(self) -> list[EthAddress]:
         if not self.status:
             return []
-        if self._new_contracts is None:
+        if self._new_contracts is None and not self._get_call_trace():
             self._expand_trace()
         return self._new_contracts
 
@@ -289,7 +323,7 @@ class TransactionReceipt:
     def return_value(self) -> str | None:
         if not self.status:
             return None
-        if self._return_value is None:
+        if self._return_value is None and not self._get_call_trace():
             self._get_trace()
         return self._return_value
 
@@ -314,7 +348,7 @@ class TransactionReceipt:
 
     @trace_property
     def subcalls(self) -> list | None:
-        if self._subcalls is None:
+        if self._subcalls is None and not self._get_call_trace():
             self._expand_trace()
         subcalls = filter(lambda s: not _is_call_to_precompile(s), self._subcalls)
         return list(subcalls)
@@ -323,6 +357,7 @@ class TransactionReceipt:
     def trace(self) -> list | None:
         if self._trace is None:
             self._expand_trace()
+            self._annotate_trace()
         return self._trace
 
     @property
@@ -432,8 +467,7 @@ class TransactionReceipt:
                 break
             except TransactionNotFound:
                 if self.nonce is not None:
-                    self.status = Status(-2)
-                    self._confirmed.set()
+                    _mark_dropped(self)
                     return
                 time.sleep(1)
 
@@ -467,94 +501,17 @@ class TransactionReceipt:
         )
 
     def _await_confirmation(self, block_number: int = None, required_confs: int = 1) -> None:
-        # await first confirmation
-        block_number = block_number or self.block_number
-        nonce_time = 0.0
-        sender_nonce = 0
-        eth = web3.eth
-        stdout_write = sys.stdout.write
-        stdout_flush = sys.stdout.flush
-        while True:
-            # every 15 seconds, check if the nonce increased without a confirmation of
-            # this specific transaction. if this happens, the tx has likely dropped
-            # and we should stop waiting.
-            if time.time() - nonce_time > 15:
-                sender_nonce = eth.get_transaction_count(str(self.sender))
-                nonce_time = time.time()
-
-            try:
-                receipt = eth.get_transaction_receipt(HexBytes(self.txid))
-            except TransactionNotFound:
-                receipt = None
-            # the null blockHash check is required for older versions of Parity
-            # taken from `web3._utils.transactions.wait_for_transaction_receipt`
-            if receipt is not None and receipt["blockHash"] is not None:
-                break
-
-            # continuation of the nonce logic 2 sections prior. we must check the receipt
-            # after querying the nonce, because in the other order there is a chance that
-            # the tx would confirm after checking the receipt but before checking the nonce
-            if sender_nonce > self.nonce:
-                self.status = Status(-2)
-                self._confirmed.set()
-                return
-
-            if not block_number and not self._silent and required_confs > 0:
-                if required_confs == 1:
-                    stdout_write(f"  Waiting for confirmation... {_marker[0]}\r")
-                else:
-                    stdout_write(
-                        f"  Required confirmations: {bright_yellow}0/"
-                        f"{required_confs}{color}   {_marker[0]}\r"
-                    )
-                _marker.rotate(1)
-                stdout_flush()
-
-            time.sleep(1)
-
-        # silence other dropped tx's immediately after confirmation to avoid output weirdness
-        for dropped_tx in state.TxHistory().filter(
-            sender=self.sender, nonce=self.nonce, key=lambda k: k != self
-        ):
-            dropped_tx._silent = True
-
-        self.block_number = receipt["blockNumber"]
-        # wait for more confirmations if required and handle uncle blocks
-        remaining_confs = required_confs
-        while remaining_confs > 0 and required_confs > 1:
-            try:
-                receipt = eth.get_transaction_receipt(self.txid)
-                self.block_number = receipt["blockNumber"]
-            except TransactionNotFound:
-                if not self._silent:
-                    stdout_write(f"\r{red}Transaction was lost...{color}{' ' * 8}")
-                    stdout_flush()
-                # check if tx is still in mempool, this will raise otherwise
-                tx = eth.get_transaction(self.txid)
-                self.block_number = None
-                return self._await_confirmation(tx.get("blockNumber"), required_confs)
-            if required_confs - self.confirmations != remaining_confs:
-                remaining_confs = required_confs - self.confirmations
-                if not self._silent:
-                    stdout_write(
-                        f"\rRequired confirmations: {bright_yellow}{self.confirmations}/"
-                        f"{required_confs}{color}  "
-                    )
-                    if remaining_confs == 0:
-                        stdout_write("\n")
-                    stdout_flush()
-            if remaining_confs > 0:
-                time.sleep(1)
+        # block until the confirmation watcher has processed this transaction
+        _watcher.watch(self, block_number or self.block_number, required_confs).wait()
 
+    def _confirm(self, receipt: TxReceipt, required_confs: int) -> None:
+        # called by the confirmation watcher once the required confirmations are reached
         self._set_from_receipt(receipt)
+        self._cache_receipt(receipt)
         try:
             # if coverage evaluation is active, evaluate the trace
-            if (
-                CONFIG.argv["coverage"]
-                and not coverage._check_cached(self.coverage_hash)
-                and self.trace
-            ):
-                self._expand_trace()
+            if CONFIG.argv["coverage"] and not coverage._check_cached(self.coverage_hash):
+                self._evaluate_coverage()
             if not self._silent and required_confs > 0:
                 print(self._confirm_output())
         finally:
@@ -563,8 +520,29 @@ class TransactionReceipt:
             for dropped_tx in state.TxHistory().filter(
                 sender=self.sender, nonce=self.nonce, key=lambda k: k != self
             ):
-                dropped_tx.status = Status(-2)
-                dropped_tx._confirmed.set()
+                _mark_dropped(dropped_tx)
+
+    def _evaluate_coverage(self) -> None:
+        # coverage is evaluated from the pcs executed by each contract when the node
+        # allows it, otherwise it is found while expanding the full structLog trace
+        if self._raw_trace is None and not self.contract_address and self.gas_used > 21000:
+            call_frame = self._get_native_trace("callTracer", {})
+            if call_frame is not None:
+                coverage_eval = _get_pc_coverage_eval(
+                    "debug_traceTransaction",
+                    (self.txid, PC_TRACE_OPTIONS),
+                    call_frame,
+                    self.receiver,
+                    self.input,
+                )
+                if coverage_eval is not None:
+                    coverage._add_transaction(self.coverage_hash, coverage_eval)
+                    return
+
+        # coverage only needs the expansion, not the annotated trace
+        self._get_trace()
+        if self._raw_trace:
+            self._expand_trace()
 
     def _set_from_tx(self, tx: dict) -> None:
         if not self.sender:
@@ -651,20 +629,24 @@ class TransactionReceipt:
             self._trace = []
             return
 
-        if not web3.supports_traces:
-            raise RPCRequestError("Node client does not support `debug_traceTransaction`")
-        try:
-            trace = web3.provider.make_request(
-                # Set enableMemory to all RPC as anvil return the memory key
-                "debug_traceTransaction",
-                (self.txid, {"disableStorage": CONFIG.mode != "console", "enableMemory": True}),
-            )
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            msg = f"Encountered a {type(e).__name__} while requesting "
-            msg += "`debug_traceTransaction`. The local RPC client has likely crashed."
-            if CONFIG.argv["coverage"]:
-                msg += " If the error persists, add the `skip_coverage` marker to this test."
-            raise RPCRequestError(msg) from None
+        # Set enableMemory to all RPC as anvil return the memory key
+        options = {"disableStorage": CONFIG.mode != "console", "enableMemory": True}
+        trace = self._load_struct_logs(options)
+        if trace is None:
+            if not web3.supports_traces:
+                raise RPCRequestError("Node client does not support `debug_traceTransaction`")
+            try:
+                trace = get_struct_logs(web3.provider, self.txid, options)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                msg = f"Encountered a {type(e).__name__} while requesting "
+                msg += "`debug_traceTransaction`. The local RPC client has likely crashed."
+                if CONFIG.argv["coverage"]:
+                    msg += " If the error persists, add the `skip_coverage` marker to this test."
+                raise RPCRequestError(msg) from None
+            if "error" not in trace:
+                result = trace["result"]
+                packed = {**result, "structLogs": pack_struct_logs(result["structLogs"])}
+                self._save_trace(_struct_logs_key(options), {**trace, "result": packed})
 
         if "error" in trace:
             self._modified_state = None
@@ -727,6 +709,180 @@ class TransactionReceipt:
         else:
             self._reverted_trace(trace)
 
+    def _get_native_trace(self, tracer: str, tracer_config: dict) -> Any:
+        """Queries `debug_traceTransaction` using one of the node's built-in tracers.
+
+        Returns None if the node does not support the tracer, in which case
+        the caller should fall back to the structLog trace.
+        """
+        result = self._load_trace(tracer)
+        if result is not None and _is_tracer_result(tracer, result):
+            return result
+        if tracer in web3._unsupported_tracers:
+            return None
+        if not web3.supports_traces:
+            raise RPCRequestError("Node client does not support `debug_traceTransaction`")
+        try:
+            response = web3.provider.make_request(
+                "debug_traceTransaction",
+                (self.txid, {"tracer": tracer, "tracerConfig": tracer_config}),
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            return None
+
+        result = response.get("result")
+        if "error" in response or not _is_tracer_result(tracer, result):
+            # nodes that ignore the `tracer` option return a structLog trace instead
+            web3._unsupported_tracers.add(tracer)
+            return None
+        self._save_trace(tracer, result)
+        return result
+
+    def _is_final(self) -> bool:
+        # final transactions are stored in the persistent cache
+        depth = CONFIG.settings["request_cache"]["finality_depth"]
+        return bool(self.block_number) and self.confirmations > depth
+
+    def _cache_receipt(self, receipt: TxReceipt) -> None:
+        tx, self._uncached_tx = self._uncached_tx, None
+        tx_cache = get_tx_cache()
+        if tx is not None and tx_cache is not None and self._is_final():
+            tx_cache.set_receipt(web3.chain_id, self.txid, tx, receipt)  # type: ignore [arg-type]
+
+    def _load_trace(self, tracer: str) -> Any:
+        tx_cache = get_tx_cache()
+        if tx_cache is None:
+            return None
+        return tx_cache.get_trace(web3.chain_id, self.txid, tracer)
+
+    def _load_struct_logs(self, options: dict) -> Any:
+        # a trace that includes storage may also be used when it is not required
+        keys = [_struct_logs_key(options)]
+        if options["disableStorage"]:
+            keys.append(_struct_logs_key({**options, "disableStorage": False}))
+        for key in keys:
+            trace = self._load_trace(key)
+            if trace is not None:
+                result = trace["result"]
+                result["structLogs"] = unpack_struct_logs(result["structLogs"])
+                return trace
+        return None
+
+    def _save_trace(self, tracer: str, result: Any) -> None:
+        tx_cache = get_tx_cache()
+        if tx_cache is not None and self._is_final():
+            tx_cache.set_trace(web3.chain_id, self.txid, tracer, result)
+
+    def _get_call_trace(self) -> bool:
+        """Finds the subcalls, internal transfers, new contracts and return value
+        using `callTracer`, which is far cheaper than evaluating the structLog trace.
+
+        Returns False if the structLog trace should be used instead, either because
+        it has already been retrieved, the node does not support `callTracer`, or a
+        subcall reverted without a reason string in a contract with dev revert strings.
+        """
+        if self._subcalls is not None:
+            return True
+        if self._raw_trace is not None or self.contract_address:
+            return False
+        if self.input == "0x" and self.gas_used == 21000:
+            return False
+        call_frame = self._get_native_trace("callTracer", {})
+        if call_frame is None:
+            return False
+
+        self._new_contracts = []
+        self._internal_transfers = []
+        subcalls: list[dict[str, Any]] = []
+        # subcall dicts by id of their call frame, to mark self-destructs
+        frame_subcalls: dict[int, dict[str, Any]] = {}
+
+        frames = [(call_frame, i) for i in reversed(call_frame.get("calls") or [])]
+        while frames:
+            parent, frame = frames.pop()
+            frames.extend((frame, i) for i in reversed(frame.get("calls") or []))
+            step_op = frame["type"]
+            value = frame.get("value") or "0x0"
+
+            if step_op == "SELFDESTRUCT":
+                if id(parent) in frame_subcalls:
+                    frame_subcalls[id(parent)]["selfdestruct"] = True
+                continue
+
+            from_ = EthAddress(frame["from"])
+            address = EthAddress(frame["to"])
+            subcall: dict[str, Any] = {"from": from_, "to": address, "op": step_op}
+            subcalls.append(subcall)
+            frame_subcalls[id(frame)] = subcall
+            if step_op in ("CALL", "CALLCODE"):
+                subcall["value"] = int(value, 16)
+            if step_op in ("CALL", "CREATE", "CREATE2") and int(value, 16):
+                self._add_internal_xfer(from_, address, value)
+            if step_op in ("CREATE", "CREATE2"):
+                self._new_contracts.append(address)
+                continue
+
+            calldata = HexBytes(frame.get("input") or "0x")
+            contract = state._find_contract(address)
+            fn = contract and contract.get_method_object(hexbytes_to_hexstring(calldata[:4]))
+            if calldata and fn:
+                subcall["function"] = fn._input_sig
+                try:
+                    zip_ = zip(fn.abi["inputs"], fn.decode_input(calldata))
+                    subcall["inputs"] = {i[0]["name"]: i[1] for i in zip_}
+                except Exception:
+                    subcall["calldata"] = hexbytes_to_hexstring(calldata)
+            else:
+                subcall["calldata"] = hexbytes_to_hexstring(calldata)
+
+            output = HexBytes(frame.get("output") or "0x")
+            if "error" in frame:
+                if len(output) > 4:
+                    try:
+                        subcall["revert_msg"] = decode(["string"], output[4:])[0]
+                    except Exception:
+                        subcall["revert_msg"] = hexbytes_to_hexstring(output)
+                elif contract and build._has_dev_revert_strings(contract._build):
+                    # the dev revert string depends on the pc of the revert, which
+                    # `callTracer` does not give, so the structLog trace is required
+                    self._new_contracts = self._internal_transfers = None
+                    return False
+                continue
+            if output:
+                subcall["returndata"] = hexbytes_to_hexstring(output)
+            if fn:
+                try:
+                    return_values = fn.decode_output(output) if output else None
+                    if output and len(fn.abi["outputs"]) == 1:
+                        return_values = (return_values,)
+                    subcall["return_value"] = return_values
+                except Exception:
+                    pass
+
+        if self.status and self._return_value is None and call_frame.get("output"):
+            self._confirmed_return_value(call_frame["output"])
+        self._subcalls = subcalls
+        return True
+
+    def _get_state_diff(self) -> bool:
+        """Determines if the transaction modified storage using `prestateTracer`.
+
+        Returns False if the structLog trace should be used instead.
+        """
+        if self._raw_trace is not None or (self.input == "0x" and self.gas_used == 21000):
+            return False
+        state_diff = self._get_native_trace("prestateTracer", {"diffMode": True})
+        if state_diff is None:
+            return False
+
+        # slots that are cleared only appear in `pre`, so both sides are checked
+        self._modified_state = any(
+            account.get("storage")
+            for key in ("pre", "post")
+            for account in (state_diff.get(key) or {}).values()
+        )
+        return True
+
     def _confirmed_trace(self, trace: Sequence) -> None:
         self._modified_state = next((True for i in trace if i["op"] == "SSTORE"), False)
 
@@ -797,6 +953,7 @@ class TransactionReceipt:
             else:
                 # if none is found, expand the trace and get it from the pcMap
                 self._expand_trace()
+                self._annotate_trace()
                 try:
                     contract = state._find_contract(step["address"])
                     pc_map = contract._build["pcMap"]
@@ -912,7 +1069,9 @@ class TransactionReceipt:
         return None
 
     def _expand_trace(self) -> None:
-        """Adds the following attributes to each step of the stack trace:
+        """Evaluates the stack trace to find subcalls, internal transfers, new
+        contracts and coverage data, and records the following attributes for
+        each step of the stack trace:
 
         address: The address executing this contract.
         contractName: The name of the contract.
@@ -923,78 +1082,91 @@ class TransactionReceipt:
             filename: path to the source file for this step
             offset: Start and end offset associated source code
         }
+
+        The attributes are held in columns and only added to the steps when
+        `trace` is accessed, see `_annotate_trace`.
         """
         if self._raw_trace is None:
             self._get_trace()
-        if self._trace is not None:
+        if self._trace_expanded:
             # in case `_get_trace` also expanded the trace, do not repeat
             return
+        self._trace_expanded = True
 
-        self._trace = trace = self._raw_trace
-        self._new_contracts = []
+        trace = self._raw_trace
+        new_contracts: list[EthAddress] = []
+        self._new_contracts = new_contracts
         self._internal_transfers = []
-        subcalls = self._subcalls = []
+        subcalls: list[dict[str, Any]] = []
+        self._subcalls = subcalls
         if self.contract_address or not trace:
             coverage._add_transaction(self.coverage_hash, {})
             return
 
-        if trace[0]["depth"] == 1:
+        self._trace_logs = logs = StructLogs(trace)
+        pcs = logs.pc
+        ops = logs.op
+        depths = logs.depth
+        if depths[0] == 1:
             self._trace_origin = "geth"
-            self._call_cost = self.gas_used - trace[0]["gas"] + trace[-1]["gas"]
-            for t in trace:
-                t["depth"] = t["depth"] - 1
+            self._call_cost = self.gas_used - logs.gas[0] + logs.gas[-1]
+            depths = logs.depth = [i - 1 for i in depths]
         else:
             self._trace_origin = "ganache"
-            if trace[0]["gasCost"] >= 21000:
+            if logs.gas_cost[0] >= 21000:
                 # in ganache <6.10.0, gas costs are shifted by one step - we can
                 # identify this when the first step has a gas cost >= 21000
-                self._call_cost = trace[0]["gasCost"]
-                for i in range(len(trace) - 1):
-                    trace[i]["gasCost"] = trace[i + 1]["gasCost"]
-                trace[-1]["gasCost"] = 0
+                self._call_cost = logs.gas_cost[0]
+                logs.gas_cost = logs.gas_cost[1:] + [0]
             else:
-                self._call_cost = self.gas_used - trace[0]["gas"] + trace[-1]["gas"]
+                self._call_cost = self.gas_used - logs.gas[0] + logs.gas[-1]
+
+        frames = logs.frames
+        sources = logs.sources
+        add_frame = frames.append
+        add_source = sources.append
 
         # last_map gives a quick reference of previous values at each depth
         last_map = {0: _get_last_map(self.receiver, self.input[:10])}
         coverage_eval: dict = {last_map[0]["name"]: {}}
-        precompile_contract = regex_compile(r"0x0{38}(?:0[1-9]|1[0-8])")
-        call_opcodes = ("CALL", "STATICCALL", "DELEGATECALL")
-        for i in range(len(trace)):
+        for i in range(len(pcs)):
+            depth = depths[i]
+            opcode = ops[i]
+
             # if depth has increased, tx has called into a different contract
-            is_depth_increase = trace[i]["depth"] > trace[i - 1]["depth"]
-            is_subcall = trace[i - 1]["op"] in call_opcodes
+            is_depth_increase = depth > depths[i - 1]
+            is_subcall = ops[i - 1] in CALL_OPCODES
             if is_depth_increase or is_subcall:
-                step = trace[i - 1]
-                if step["op"] in ("CREATE", "CREATE2"):
+                step_op = ops[i - 1]
+                step_address = frames[i - 1][0]
+                step_stack = logs.stack(i - 1)
+                if step_op in ("CREATE", "CREATE2"):
                     # creating a new contract
-                    out = next(x for x in trace[i:] if x["depth"] == step["depth"])
-                    address = out["stack"][-1][-40:]
-                    sig = f"<{step['op']}>"
+                    out = next(x for x in range(i, len(pcs)) if depths[x] == depths[i - 1])
+                    address = logs.stack(out)[-1][-40:]
+                    sig = f"<{step_op}>"
                     calldata = None
-                    self._new_contracts.append(EthAddress(address))
-                    if int(step["stack"][-1], 16):
-                        self._add_internal_xfer(step["address"], address, step["stack"][-1])
+                    new_contracts.append(EthAddress(address))
+                    if int(step_stack[-1], 16):
+                        self._add_internal_xfer(step_address, address, step_stack[-1])
                 else:
                     # calling an existing contract
-                    stack_idx = -4 if step["op"] in ("CALL", "CALLCODE") else -3
-                    offset = int(step["stack"][stack_idx], 16)
-                    length = int(step["stack"][stack_idx - 1], 16)
-                    calldata = HexBytes(_join_memory(step["memory"]))[offset : offset + length]
+                    stack_idx = -4 if step_op in ("CALL", "CALLCODE") else -3
+                    offset = int(step_stack[stack_idx], 16)
+                    length = int(step_stack[stack_idx - 1], 16)
+                    calldata = logs.read_memory(i - 1, offset, length)
                     sig = hexbytes_to_hexstring(calldata[:4])
-                    address = step["stack"][-2][-40:]
+                    address = step_stack[-2][-40:]
 
                 if is_depth_increase:
-                    last_map[trace[i]["depth"]] = _get_last_map(address, sig)
-                    coverage_eval.setdefault(last_map[trace[i]["depth"]]["name"], {})
-
-                subcalls.append(
-                    {"from": step["address"], "to": EthAddress(address), "op": step["op"]}
-                )
-                if step["op"] in ("CALL", "CALLCODE"):
-                    subcalls[-1]["value"] = int(step["stack"][-3], 16)
-                if is_depth_increase and calldata and last_map[trace[i]["depth"]].get("function"):
-                    fn = last_map[trace[i]["depth"]]["function"]
+                    last_map[depth] = _get_last_map(address, sig)
+                    coverage_eval.setdefault(last_map[depth]["name"], {})
+
+                subcalls.append({"from": step_address, "to": EthAddress(address), "op": step_op})
+                if step_op in ("CALL", "CALLCODE"):
+                    subcalls[-1]["value"] = int(step_stack[-3], 16)
+                if is_depth_increase and calldata and last_map[depth].get("function"):
+                    fn = last_map[depth]["function"]
                     subcalls[-1]["function"] = fn._input_sig
                     try:
                         zip_ = zip(fn.abi["inputs"], fn.decode_input(calldata))
@@ -1005,49 +1177,49 @@ class TransactionReceipt:
                 elif calldata or is_subcall:
                     subcalls[-1]["calldata"] = hexbytes_to_hexstring(calldata)
 
-                if precompile_contract.search(str(subcalls[-1]["from"])) is not None:
+                if PRECOMPILE.search(str(subcalls[-1]["from"])) is not None:
                     caller = subcalls.pop(-2)["from"]
                     subcalls[-1]["from"] = caller
 
-            # update trace from last_map
-            last = last_map[trace[i]["depth"]]
-            trace[i].update(
-                address=last["address"],
-                contractName=last["name"],
-                fn=last["internal_calls"][-1],
-                jumpDepth=last["jumpDepth"],
-                source=False,
-            )
-
-            opcode = trace[i]["op"]
-            if opcode == "CALL" and int(trace[i]["stack"][-3], 16):
-                self._add_internal_xfer(
-                    last["address"], trace[i]["stack"][-2][-40:], trace[i]["stack"][-3]
+            # record the frame for this step, the tuple is shared until the frame changes
+            last = last_map[depth]
+            frame = last.get("frame")
+            if frame is None:
+                frame = last["frame"] = (
+                    last["address"],
+                    last["name"],
+                    last["internal_calls"][-1],
+                    last["jumpDepth"],
                 )
+            add_frame(frame)
+            add_source(False)
+
+            if opcode == "CALL":
+                stack = logs.stack(i)
+                if int(stack[-3], 16):
+                    self._add_internal_xfer(last["address"], stack[-2][-40:], stack[-3])
 
             # If the function signature is not available for decoding return data attach
             # the encoded data.
             # If the function signature is available this will be overridden by setting
             # `return_value` a few lines below.
-            if trace[i]["depth"] and opcode == "RETURN":
+            if depth and opcode == "RETURN":
                 subcall: dict = next(i for i in subcalls[::-1] if i["to"] == last["address"])
-
-                if opcode == "RETURN":
-                    returndata = _get_memory(trace[i], -1)
-                    if returndata.hex().removeprefix("0x"):
-                        subcall["returndata"] = hexbytes_to_hexstring(returndata)
+                returndata = logs.get_memory(i, -1)
+                if returndata.hex().removeprefix("0x"):
+                    subcall["returndata"] = hexbytes_to_hexstring(returndata)
 
             try:
-                pc = last["pc_map"][trace[i]["pc"]]
+                pc = last["pc_map"][pcs[i]]
             except (KeyError, TypeError):
                 # we don't have enough information about this contract
                 continue
 
-            if trace[i]["depth"] and opcode in ("RETURN", "REVERT", "INVALID", "SELFDESTRUCT"):
-                subcall: dict = next(i for i in subcalls[::-1] if i["to"] == last["address"])
+            if depth and opcode in ("RETURN", "REVERT", "INVALID", "SELFDESTRUCT"):
+                subcall = next(i for i in subcalls[::-1] if i["to"] == last["address"])
 
                 if opcode == "RETURN":
-                    returndata = _get_memory(trace[i], -1)
+                    returndata = logs.get_memory(i, -1)
                     if returndata:
                         fn = last["function"]
                         try:
@@ -1063,7 +1235,7 @@ class TransactionReceipt:
                     subcall["selfdestruct"] = True
                 else:
                     if opcode == "REVERT":
-                        data = _get_memory(trace[i], -1)
+                        data = logs.get_memory(i, -1)
                         if len(data) > 4:
                             try:
                                 subcall["revert_msg"] = decode(["string"], data[4:])[0]
@@ -1074,43 +1246,42 @@ class TransactionReceipt:
 
             if "path" not in pc:
                 continue
-            trace[i]["source"] = {"filename": last["path_map"][pc["path"]], "offset": pc["offset"]}
+            sources[i] = (last["path_map"][pc["path"]], pc["offset"])
 
             if "fn" not in pc:
                 continue
 
             # calculate coverage
             if last["coverage"]:
-                if pc["path"] not in coverage_eval[last["name"]]:
-                    coverage_eval[last["name"]][pc["path"]] = [set(), set(), set()]
-                if "statement" in pc:
-                    coverage_eval[last["name"]][pc["path"]][0].add(pc["statement"])
-                if "branch" in pc:
-                    if pc["op"] != "JUMPI":
-                        last["active_branches"].add(pc["branch"])
-                    elif "active_branches" not in last or pc["branch"] in last["active_branches"]:
-                        # false, true
-                        key = 1 if trace[i + 1]["pc"] == trace[i]["pc"] + 1 else 2
-                        coverage_eval[last["name"]][pc["path"]][key].add(pc["branch"])
-                        if "active_branches" in last:
-                            last["active_branches"].remove(pc["branch"])
+                _record_coverage(coverage_eval[last["name"]], last, pc, pcs, i)
 
             # ignore jumps with no function - they are compiler optimizations
             if "jump" in pc:
                 # jump 'i' is calling into an internal function
                 if pc["jump"] == "i":
                     try:
-                        fn = last["pc_map"][trace[i + 1]["pc"]]["fn"]
+                        fn = last["pc_map"][pcs[i + 1]]["fn"]
                     except (KeyError, IndexError):
                         continue
                     if fn != last["internal_calls"][-1]:
                         last["internal_calls"].append(fn)
                         last["jumpDepth"] += 1
+                        last["frame"] = None
                 # jump 'o' is returning from an internal function
                 elif last["jumpDepth"] > 0:
                     del last["internal_calls"][-1]
                     last["jumpDepth"] -= 1
-        coverage._add_transaction(self.coverage_hash, {k: v for k, v in coverage_eval.items() if v})
+                    last["frame"] = None
+        coverage._add_transaction(self.coverage_hash, _finalize_coverage(coverage_eval))
+
+    def _annotate_trace(self) -> None:
+        # add the attributes evaluated in `_expand_trace` to each step of the trace
+        if self._trace is not None:
+            return
+        if self._trace_logs is None:
+            self._trace = self._raw_trace
+        else:
+            self._trace = self._trace_logs.annotate()
 
     def _add_internal_xfer(self, from_: str, to: str, value: str) -> None:
         if not value.startswith("0x"):
@@ -1527,10 +1698,6 @@ def _get_memory(step: dict, idx: int) -> HexBytes:
     return data
 
 
-def _join_memory(memory: list) -> str:
-    return "".join(i.removeprefix("0x").zfill(64) for i in memory)
-
-
 def _get_last_map(address: EthAddress, sig: str) -> dict:
     contract = state._find_contract(address)
     last_map = {"address": EthAddress(address), "jumpDepth": 0, "name": None, "coverage": False}
@@ -1540,6 +1707,8 @@ def _get_last_map(address: EthAddress, sig: str) -> dict:
             full_fn_name = f"{contract._name}.{contract.get_method(sig)}"
         else:
             full_fn_name = contract._name
+        if "pcMap" in contract._build:
+            build._add_dev_revert_strings(contract._build)
         last_map.update(
             contract=contract,
             function=contract.get_method_object(sig),
@@ -1559,6 +1728,483 @@ def _get_last_map(address: EthAddress, sig: str) -> dict:
     return last_map
 
 
+def _record_coverage(
+    contract_eval: dict, last: dict, pc: dict, pcs: Sequence[int], idx: int
+) -> None:
+    # record the statement and branch hit by a single step
+    path_eval = contract_eval.get(pc["path"])
+    if path_eval is None:
+        path_eval = contract_eval[pc["path"]] = [0, 0, 0]
+    if "statement" in pc:
+        path_eval[0] |= 1 << pc["statement"]
+    if "branch" in pc:
+        if pc["op"] != "JUMPI":
+            last["active_branches"].add(pc["branch"])
+        elif "active_branches" not in last or pc["branch"] in last["active_branches"]:
+            # false, true
+            key = 1 if pcs[idx + 1] == pcs[idx] + 1 else 2
+            path_eval[key] |= 1 << pc["branch"]
+            if "active_branches" in last:
+                last["active_branches"].remove(pc["branch"])
+
+
+def _finalize_coverage(coverage_eval: dict) -> dict:
+    # convert the bitmaps for each path to tuples and drop contracts without coverage
+    return {k: {p: tuple(b) for p, b in v.items()} for k, v in coverage_eval.items() if v}
+
+
+def _mark_dropped(tx: TransactionReceipt) -> None:
+    tx.status = Status(-2)
+    state.TxHistory()._drop(tx)
+    nonce_manager = getattr(tx.sender, "_nonce_manager", None)
+    if nonce_manager is not None:
+        # the nonce may have been left unused, leaving a gap before the locally
+        # reserved nonces. resync with the node before the next tx is broadcast.
+        nonce_manager.reset()
+    tx._confirmed.set()
+
+
+def _release_disconnected(tx: TransactionReceipt) -> None:
+    # the outcome of a tx cannot be known once disconnected. it is left pending and in
+    # the history, and anything waiting on the tx is released
+    if not tx._silent:
+        warn(f"Disconnected while awaiting confirmation of {tx.txid}, its status is unknown")
+    tx._confirmed.set()
+
+
+def _struct_logs_key(options: dict) -> str:
+    # structLog traces requested with different options are cached separately
+    return "structLogs:" + ",".join(f"{k}={v}" for k, v in sorted(options.items()))
+
+
+def _is_tracer_result(tracer: str, result: Any) -> bool:
+    # check that a result has the shape produced by one of the node's built-in tracers
+    if not isinstance(result, dict) or "structLogs" in result:
+        return False
+    if tracer == "callTracer":
+        return "type" in result and "gas" in result
+    if tracer == "prestateTracer":
+        # only used with `diffMode`
+        return "pre" in result and "post" in result
+    return True
+
+
+def _get_pc_coverage_eval(
+    method: str, params: tuple, call_frame: dict, receiver: str | None, calldata: str
+) -> dict | None:
+    """
+    Evaluates coverage using a trace that only holds the pc, opcode and call depth
+    of each step, without expanding subcalls, memory or source annotations.
+
+    The call frames from `callTracer` are in the order that the calls were made,
+    so each call opcode in the trace is matched with the next frame in order to
+    find the contract that was entered.
+
+    Arguments
+    ---------
+    method : str
+        `debug_traceTransaction` or `debug_traceCall`
+    params : tuple
+        Request parameters for `method`
+    call_frame : dict
+        Result of the same request using `callTracer`
+    receiver : str
+        Address that is called
+    calldata : str
+        Calldata of the transaction or call
+
+    Returns
+    -------
+    dict
+        Coverage evaluation, or None if the node did not return a trace or the
+        trace cannot be matched to the call frames
+    """
+    try:
+        response = get_pc_trace(web3.provider, method, params)
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+        return None
+    result = response.get("result")
+    if "error" in response or not isinstance(result, dict):
+        return None
+    pcs, ops, depths = result.get("structLogs") or ([], [], [])
+    if not pcs:
+        return {}
+
+    frames = []
+    pending = list(reversed(call_frame.get("calls") or []))
+    while pending:
+        frame = pending.pop()
+        pending.extend(reversed(frame.get("calls") or []))
+        if frame["type"] != "SELFDESTRUCT":
+            frames.append(frame)
+
+    # geth starts at a depth of 1, ganache at 0
+    offset = depths[0]
+    last_map = {0: _get_last_map(receiver, calldata[:10])}  # type: ignore [arg-type]
+    coverage_eval: dict = {last_map[0]["name"]: {}}
+    frame_idx = 0
+    entered = None
+    last_depth = 0
+    for i in range(len(pcs)):
+        depth = depths[i] - offset
+        if depth > last_depth:
+            if entered is None:
+                return None
+            step_op = entered["type"]
+            if not entered.get("to"):
+                return None
+            if step_op in ("CREATE", "CREATE2"):
+                sig = f"<{step_op}>"
+            else:
+                sig = (entered.get("input") or "0x")[:10]
+            last_map[depth] = _get_last_map(entered["to"], sig)
+            coverage_eval.setdefault(last_map[depth]["name"], {})
+        last_depth = depth
+        last = last_map[depth]
+
+        opcode = ops[i]
+        if opcode in FRAME_OPCODES:
+            if frame_idx == len(frames) or frames[frame_idx]["type"] != opcode:
+                return None
+            entered = frames[frame_idx]
+            frame_idx += 1
+        else:
+            entered = None
+
+        if not last["coverage"]:
+            continue
+        try:
+            pc = last["pc_map"][pcs[i]]
+        except (KeyError, TypeError):
+            continue
+        if "path" in pc and "fn" in pc:
+            _record_coverage(coverage_eval[last["name"]], last, pc, pcs, i)
+
+    if frame_idx != len(frames):
+        return None
+    return _finalize_coverage(coverage_eval)
+
+
+def evaluate_call_coverage(tx: dict) -> bool:
+    """
+    Evaluates coverage for a contract call using `debug_traceCall`, so that the
+    call does not need to be broadcast as a transaction and reverted.
+
+    Gas used by the call is also added to the gas profile.
+
+    Arguments
+    ---------
+    tx : dict
+        Call parameters, as passed to `eth_call`
+
+    Returns
+    -------
+    bool
+        False if the node does not support `debug_traceCall` or the call reverted,
+        in which case the call should be broadcast as a transaction instead. A
+        reverted call is not evaluated here, so that the revert string can be
+        determined from the transaction.
+    """
+    if web3._supports_trace_call is False or not web3.supports_traces:
+        return False
+    try:
+        response = web3.provider.make_request(
+            "debug_traceCall", (tx, "latest", {"tracer": "callTracer"})
+        )
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+        return False
+    call_frame = response.get("result")
+    if "error" in response or not isinstance(call_frame, dict):
+        web3._supports_trace_call = False
+        return False
+    web3._supports_trace_call = True
+    if "error" in call_frame:
+        # the call reverted. the trace does not include dev revert strings, which are
+        # found from the pc of the revert when the call is broadcast as a transaction
+        return False
+
+    gas_used = int(call_frame.get("gasUsed") or "0x0", 16)
+    contract = state._find_contract(tx["to"])
+    if contract is not None:
+        fn_name = contract.get_method(tx["data"])
+        if fn_name:
+            state.TxHistory()._gas(f"{contract._name}.{fn_name}", gas_used, True)
+
+    base = (
+        f"{web3.eth.block_number}{tx.get('from')}{tx['to']}{tx.get('value')}{tx['data']}"
+        f"{call_frame.get('output')}{gas_used}"
+    )
+    coverage_hash = sha1(base.encode()).hexdigest()
+    if coverage._check_cached(coverage_hash):  # type: ignore [arg-type]
+        return True
+    coverage_eval = _get_pc_coverage_eval(
+        "debug_traceCall", (tx, "latest", PC_TRACE_OPTIONS), call_frame, tx["to"], tx["data"]
+    )
+    if coverage_eval is None:
+        return False
+    coverage._add_transaction(coverage_hash, coverage_eval)  # type: ignore [arg-type]
+    return True
+
+
 def _is_call_to_precompile(subcall: dict) -> bool:
-    precompile_contract = regex_compile(r"0x0{38}(?:0[1-9]|1[0-8])")
-    return True if precompile_contract.search(str(subcall["to"])) is not None else False
+    return PRECOMPILE.search(str(subcall["to"])) is not None
+
+
+@final
+class _PendingConfirmation:
+    """A transaction that is being watched by the confirmation watcher."""
+
+    __slots__ = ("tx", "required_confs", "remaining_confs", "show_waiting", "done")
+
+    def __init__(self, tx: TransactionReceipt, block_number: int | None, required_confs: int):
+        self.tx: Final = tx
+        self.required_confs: Final = required_confs
+        self.remaining_confs = required_confs
+        # the waiting spinner is only shown if the tx was pending when it was broadcast
+        self.show_waiting = not block_number
+        # set once the watcher has finished processing the transaction
+        self.done: Final = threading.Event()
+
+
+@final
+class _ConfirmationWatcher:
+    """
+    Awaits the confirmation of all pending transactions from a single thread.
+
+    Newly added transactions are checked immediately. After that, receipts for
+    every pending transaction are requested in one JSON-RPC batch each time a new
+    block is found. Every `NONCE_INTERVAL` seconds the batch also includes the
+    nonce of each sender, to detect transactions that were dropped or replaced.
+    Confirmed transactions are finalized in a small thread pool, so that printing
+    output or evaluating coverage does not delay the other transactions.
+    """
+
+    __slots__ = (
+        "_condition",
+        "_new",
+        "_pending",
+        "_thread",
+        "_executor",
+        "_nonces",
+        "_nonce_time",
+        "__weakref__",
+    )
+
+    def __init__(self) -> None:
+        self._condition: Final = threading.Condition()
+        self._new: list[_PendingConfirmation] = []
+        self._pending: list[_PendingConfirmation] = []
+        self._thread: threading.Thread | None = None
+        # created when the first transaction is finalized
+        self._executor: ThreadPoolExecutor | None = None
+        self._nonces: dict[str, int] = {}
+        self._nonce_time = 0.0
+
+    def watch(
+        self, tx: TransactionReceipt, block_number: int | None, required_confs: int
+    ) -> threading.Event:
+        """
+        Begin watching a transaction.
+
+        Arguments
+        ---------
+        tx : TransactionReceipt
+            Transaction to watch
+        block_number : int | None
+            Block number of the transaction when it was broadcast
+        required_confs : int
+            Number of confirmations to wait for
+
+        Returns
+        -------
+        threading.Event
+            Event that is set once the transaction has confirmed or dropped
+        """
+        pending = _PendingConfirmation(tx, block_number, required_confs)
+        if tx._cached_receipt is not None:
+            self._finalize(pending, tx._cached_receipt)
+            return pending.done
+        with self._condition:
+            self._new.append(pending)
+            if self._thread is None:
+                # cached nonces are cleared when the chain is reverted or reset
+                state._revert_register(self)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="brownie-confirmation-watcher", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return pending.done
+
+    def _revert(self, height: int) -> None:
+        # a tx may be resent with a nonce below the cached value after a revert
+        self._nonces.clear()
+        self._nonce_time = 0.0
+
+    def _reset(self) -> None:
+        self._revert(0)
+
+    def _run(self) -> None:
+        last_height = None
+        poll_time = 0.0
+        errors = 0
+        while True:
+            with self._condition:
+                if not self._new:
+                    self._condition.wait(POLL_INTERVAL if self._pending else None)
+                new, self._new = self._new, []
+            # new transactions are watched before any request is made, so that they
+            # are retried if the request fails
+            watching = bool(self._pending)
+            self._pending.extend(new)
+
+            if web3.provider is None:
+                # disconnected, the pending transactions can no longer be confirmed
+                for pending in self._pending:
+                    _release_disconnected(pending.tx)
+                    pending.done.set()
+                self._pending.clear()
+                continue
+
+            try:
+                check = new
+                if watching and time.time() - poll_time >= POLL_INTERVAL:
+                    poll_time = time.time()
+                    self._show_waiting()
+                    height = web3.eth.block_number
+                    if height != last_height:
+                        last_height = height
+                        check = list(self._pending)
+                if check:
+                    self._check(check)
+                errors = 0
+            except Exception:
+                # the node may be temporarily unavailable, retry with an increasing delay
+                # and check every pending transaction on the next poll
+                errors += 1
+                last_height = None
+                delay = min(POLL_INTERVAL * 2 ** (errors - 1), MAX_RETRY_INTERVAL)
+                _logger.warning(
+                    "Unable to check pending transactions, retrying in %.0fs",
+                    delay,
+                    exc_info=errors == 1,
+                )
+                time.sleep(delay)
+
+    def _show_waiting(self) -> None:
+        stdout_write = sys.stdout.write
+        for pending in self._pending:
+            tx = pending.tx
+            if tx.block_number or not pending.show_waiting or tx._silent:
+                continue
+            if pending.required_confs == 1:
+                stdout_write(f"  Waiting for confirmation... {_marker[0]}\r")
+            elif pending.required_confs > 1:
+                stdout_write(
+                    f"  Required confirmations: {bright_yellow}0/"
+                    f"{pending.required_confs}{color}   {_marker[0]}\r"
+                )
+            else:
+                continue
+            _marker.rotate(1)
+            sys.stdout.flush()
+
+    def _check(self, entries: list[_PendingConfirmation]) -> None:
+        batch = [("eth_getTransactionReceipt", [i.tx.txid]) for i in entries]
+        senders: list[str] = []
+        if time.time() - self._nonce_time > NONCE_INTERVAL:
+            # query the nonces before the receipts, if a tx confirms between the two
+            # requests it must not be mistaken for a dropped tx
+            self._nonce_time = time.time()
+            senders = sorted({str(i.tx.sender) for i in entries if not i.tx.block_number})
+            batch = [("eth_getTransactionCount", [i, "latest"]) for i in senders] + batch
+
+        responses = web3.make_batch_request(batch)
+        for sender, response in zip(senders, responses):
+            if "result" in response:
+                self._nonces[sender] = int(response["result"], 16)
+
+        for pending, response in zip(entries, responses[len(senders) :]):
+            result = response.get("result")
+            # the null blockHash check is required for older versions of Parity
+            if result and result.get("blockHash") is not None:
+                self._on_mined(pending, int(result["blockNumber"], 16))
+            else:
+                self._on_pending(pending)
+
+    def _on_mined(self, pending: _PendingConfirmation, block_number: int) -> None:
+        tx = pending.tx
+        if not tx.block_number:
+            # silence other dropped tx's immediately after confirmation to avoid output weirdness
+            for dropped_tx in state.TxHistory().filter(
+                sender=tx.sender, nonce=tx.nonce, key=lambda k: k != tx
+            ):
+                dropped_tx._silent = True
+        tx.block_number = block_number
+
+        # wait for more confirmations if required
+        required_confs = pending.required_confs
+        if required_confs > 1:
+            confirmations = tx.confirmations
+            if required_confs - confirmations != pending.remaining_confs:
+                pending.remaining_confs = max(required_confs - confirmations, 0)
+                if not tx._silent:
+                    sys.stdout.write(
+                        f"\rRequired confirmations: {bright_yellow}{confirmations}/"
+                        f"{required_confs}{color}  "
+                    )
+                    if pending.remaining_confs == 0:
+                        sys.stdout.write("\n")
+                    sys.stdout.flush()
+            if pending.remaining_confs > 0:
+                return
+
+        self._pending.remove(pending)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                CONFIRMATION_WORKERS, thread_name_prefix="brownie-confirmation"
+            )
+        self._executor.submit(self._finalize, pending)
+
+    def _on_pending(self, pending: _PendingConfirmation) -> None:
+        tx = pending.tx
+        if tx.block_number:
+            # the tx was mined, but has been lost due to a reorg
+            if not tx._silent:
+                sys.stdout.write(f"\r{red}Transaction was lost...{color}{' ' * 8}")
+                sys.stdout.flush()
+            tx.block_number = None
+            pending.show_waiting = True
+            return
+
+        if self._nonces.get(str(tx.sender), 0) > tx.nonce:
+            # the nonce has increased without a confirmation of this specific tx,
+            # it has likely dropped. check the receipt once more to avoid a race
+            response = web3.make_batch_request([("eth_getTransactionReceipt", [tx.txid])])[0]
+            if response.get("result"):
+                return
+            self._pending.remove(pending)
+            _mark_dropped(tx)
+            pending.done.set()
+
+    def _finalize(self, pending: _PendingConfirmation, receipt: Any = None) -> None:
+        tx = pending.tx
+        try:
+            if receipt is None:
+                try:
+                    receipt = web3.eth.get_transaction_receipt(HexBytes(tx.txid))
+                except TransactionNotFound:
+                    # lost to a reorg after the receipt was found, keep watching
+                    tx.block_number = None
+                    with self._condition:
+                        self._new.append(pending)
+                        self._condition.notify()
+                    return
+            tx._confirm(receipt, pending.required_confs)
+        except Exception:
+            traceback.print_exc()
+        pending.done.set()
+
+
+_watcher: Final = _ConfirmationWatcher()
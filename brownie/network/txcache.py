@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+
+import zlib
+from typing import Any, Final, final
+
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from brownie._c_constants import HexBytes, ujson_dumps, ujson_loads
+from brownie._config import CONFIG, _get_data_folder
+from brownie.utils.sql import Cursor
+
+# fields of a transaction and receipt that are required by `TransactionReceipt`
+TX_FIELDS: Final = (
+    "blockNumber",
+    "from",
+    "gas",
+    "gasPrice",
+    "input",
+    "maxFeePerGas",
+    "maxPriorityFeePerGas",
+    "nonce",
+    "to",
+    "type",
+    "value",
+)
+RECEIPT_FIELDS: Final = (
+    "blockHash",
+    "blockNumber",
+    "contractAddress",
+    "effectiveGasPrice",
+    "gasUsed",
+    "logs",
+    "status",
+    "transactionIndex",
+)
+LOG_BYTES_FIELDS: Final = ("blockHash", "data", "transactionHash")
+
+
+@final
+class TxCache:
+    """
+    Persistent cache of transactions, receipts and traces.
+
+    Only transactions that are confirmed on a live network, at least
+    `request_cache.finality_depth` blocks deep, are stored. Traces are held as
+    zlib-compressed JSON so that repeated inspection of a historical transaction
+    does not query `debug_traceTransaction` again.
+    """
+
+    __slots__ = ("cur",)
+
+    def __init__(self) -> None:
+        self.cur: Final = Cursor(_get_data_folder().joinpath("txcache.db"))
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS receipts "
+            "(chainid, txid, tx, receipt, PRIMARY KEY(chainid, txid))"
+        )
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS traces "
+            "(chainid, txid, tracer, data, PRIMARY KEY(chainid, txid, tracer))"
+        )
+
+    def get_receipt(self, chain_id: int, txid: str) -> tuple[dict, AttributeDict] | None:
+        """
+        Return a cached transaction and receipt.
+
+        Arguments
+        ---------
+        chain_id : int
+            Chain ID of the network the transaction was broadcast on
+        txid : str
+            Transaction hash
+
+        Returns
+        -------
+        tuple
+            (transaction, receipt), or None if the transaction is not cached
+        """
+        row = self.cur.fetchone(
+            "SELECT tx, receipt FROM receipts WHERE chainid=? AND txid=?", (chain_id, txid)
+        )
+        if row is None:
+            return None
+        tx, receipt = row
+        tx["input"] = HexBytes(tx["input"])
+        receipt["blockHash"] = HexBytes(receipt["blockHash"])
+        receipt["logs"] = [
+            AttributeDict(
+                {
+                    **log,
+                    **{k: HexBytes(log[k]) for k in LOG_BYTES_FIELDS if k in log},
+                    "topics": [HexBytes(i) for i in log["topics"]],
+                }
+            )
+            for log in receipt["logs"]
+        ]
+        return tx, AttributeDict(receipt)
+
+    def set_receipt(self, chain_id: int, txid: str, tx: dict, receipt: dict) -> None:
+        """Store a transaction and receipt."""
+        tx = {k: tx[k] for k in TX_FIELDS if k in tx}
+        receipt = {k: receipt[k] for k in RECEIPT_FIELDS if k in receipt}
+        self.cur.insert(
+            "receipts",
+            chain_id,
+            txid,
+            ujson_loads(Web3.to_json(tx)),
+            ujson_loads(Web3.to_json(receipt)),
+        )
+
+    def get_trace(self, chain_id: int, txid: str, tracer: str) -> Any:
+        """
+        Return a cached `debug_traceTransaction` result.
+
+        Arguments
+        ---------
+        chain_id : int
+            Chain ID of the network the transaction was broadcast on
+        txid : str
+            Transaction hash
+        tracer : str
+            Name of the tracer. The default opcode trace is stored under
+            "structLogs:" followed by the tracer options, with the steps in
+            the columnar form given by `trace.pack_struct_logs`.
+
+        Returns
+        -------
+        Any
+            The decoded result, or None if the trace is not cached
+        """
+        rows = self.cur.fetchall(
+            "SELECT data FROM traces WHERE chainid=? AND txid=? AND tracer=?",
+            (chain_id, txid, tracer),
+        )
+        if not rows:
+            return None
+        return ujson_loads(zlib.decompress(rows[0][0]))
+
+    def set_trace(self, chain_id: int, txid: str, tracer: str, result: Any) -> None:
+        """Store a `debug_traceTransaction` result."""
+        data = zlib.compress(ujson_dumps(result).encode())
+        self.cur.insert("traces", chain_id, txid, tracer, data)
+
+    def clear(self) -> None:
+        """Remove all cached transactions and traces."""
+        self.cur.execute("DELETE FROM receipts")
+        self.cur.execute("DELETE FROM traces")
+
+
+_tx_cache: TxCache | None = None
+
+
+def get_tx_cache() -> TxCache | None:
+    """
+    Return the persistent transaction cache, or None if the active network is
+    not a live network or the cache has been disabled.
+    """
+    global _tx_cache
+    if CONFIG.network_type != "live" or not CONFIG.settings["request_cache"]["transactions"]:
+        return None
+    if _tx_cache is None:
+        _tx_cache = TxCache()
+    return _tx_cache
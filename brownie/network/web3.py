@@ -2,8 +2,9 @@
 
 import os
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
+from typing import Any, Final
 
 from ens import ENS
 from eth_typing import ChecksumAddress, HexStr
@@ -18,11 +19,14 @@ from web3.gas_strategies.rpc import rpc_gas_price_strategy
 from brownie._c_constants import ujson_dump, ujson_load
 from brownie._config import CONFIG, _get_data_folder
 from brownie.convert import to_address
-from brownie.exceptions import MainnetUndefined, UnsetENSName
+from brownie.exceptions import MainnetUndefined, RPCRequestError, UnsetENSName
 from brownie.network.middlewares import get_middlewares
 
 _chain_uri_cache: dict = {}
 
+# maximum number of requests sent within a single JSON-RPC batch
+BATCH_SIZE: Final = 100
+
 
 class Web3(_Web3):
     """Brownie Web3 subclass"""
@@ -35,6 +39,9 @@ class Web3(_Web3):
         self._chain_uri: str | None = None
         self._custom_middleware: list[tuple[Callable[["_Web3"], object], object]] = []
         self._supports_traces = None
+        # built-in `debug_traceTransaction` tracers that the node has rejected
+        self._unsupported_tracers: set[str] = set()
+        self._supports_trace_call: bool | None = None
         self._chain_id: int | None = None
 
     def _remove_middlewares(self) -> None:
@@ -118,6 +125,8 @@ class Web3(_Web3):
             self._genesis_hash = None
             self._chain_uri = None
             self._supports_traces = None
+            self._unsupported_tracers.clear()
+            self._supports_trace_call = None
             self._chain_id = None
             self._remove_middlewares()
 
@@ -128,6 +137,93 @@ class Web3(_Web3):
         # retained to avoid breaking an interface explicitly defined in brownie
         return self.is_connected()
 
+    def batch(self, calls: Iterable[Callable[[], Any]]) -> list[Any]:
+        """
+        Make several requests as JSON-RPC batches.
+
+        Requests pass through all middlewares, and are sent in batches of up to
+        `BATCH_SIZE` requests using web3's `batch_requests`. If a batch fails, or
+        the provider cannot batch requests, each request in it is made on its own,
+        so that any exception is raised for the request that caused it.
+
+        Arguments
+        ---------
+        calls : Iterable[Callable]
+            Callables that each make a single web3 request when called with no
+            arguments, e.g. `functools.partial(web3.eth.get_block, 42)`.
+
+        Returns
+        -------
+        list
+            The result of each call, in the same order as `calls`.
+        """
+        calls = list(calls)
+        results: list[Any] = []
+        for i in range(0, len(calls), BATCH_SIZE):
+            chunk = calls[i : i + BATCH_SIZE]
+            if len(chunk) == 1:
+                results.append(chunk[0]())
+                continue
+            try:
+                with self.batch_requests() as batch:
+                    for call in chunk:
+                        batch.add(call())
+                    results.extend(batch.execute())
+            except Exception:
+                # the provider may not support batching, or a request failed. web3
+                # raises for the batch as a whole, so every request is made again
+                results.extend(call() for call in chunk)
+        return results
+
+    def _send_batch(self, requests: list[tuple[Any, Any]]) -> list[dict[str, Any]] | None:
+        # send a batch through all middlewares, returning None if it failed as a whole
+        if len(requests) < 2:
+            return None
+        try:
+            request_func = self.provider.batch_request_func(self, self.middleware_onion)
+            response = request_func(requests)
+        except Exception:
+            return None
+        if not isinstance(response, list) or len(response) != len(requests):
+            return None
+        return response
+
+    def make_batch_request(
+        self, requests: Sequence[tuple[str, Any]], fallback: bool = True
+    ) -> list[dict[str, Any]]:
+        """
+        Make raw JSON-RPC requests as batches.
+
+        Unlike `batch`, the responses are not formatted by web3, so a null or error
+        result for one request does not affect the others. Requests pass through all
+        middlewares, and are sent individually if the provider cannot batch them.
+
+        Arguments
+        ---------
+        requests : Sequence[tuple]
+            (method, params) for each request
+        fallback : bool, optional
+            If False, `RPCRequestError` is raised when a batch fails as a whole,
+            instead of sending each request in it individually.
+
+        Returns
+        -------
+        list
+            The JSON-RPC response for each request, in the same order as `requests`.
+        """
+        responses: list[dict[str, Any]] = []
+        for i in range(0, len(requests), BATCH_SIZE):
+            chunk = list(requests[i : i + BATCH_SIZE])
+            response = self._send_batch(chunk)
+            if response is None:
+                # a single request, or the batch failed as a whole
+                if not fallback and len(chunk) > 1:
+                    raise RPCRequestError(f"Batch of {len(chunk)} requests failed")
+                request_func = self.provider.request_func(self, self.middleware_onion)
+                response = [request_func(*request) for request in chunk]
+            responses.extend(response)
+        return responses
+
     @property
     def supports_traces(self) -> bool:
         if not self.provider:
@@ -0,0 +1,279 @@
+#!/usr/bin/python3
+
+import marshal
+import os
+import pathlib
+import threading
+import zlib
+from typing import Any, Final, final
+
+from mypy_extensions import mypyc_attr
+
+from brownie.typing import ContractBuildJson
+
+# fields of a contract artifact that are only decoded when they are first accessed
+LAZY_KEYS: Final = ("ast", "coverageMap", "deployedSourceMap", "opcodes", "pcMap", "sourceMap")
+
+MAGIC: Final = b"BRWNBIN1"
+REVERT_MAGIC: Final = b"BRWNREV1"
+
+_decode_lock: Final = threading.Lock()
+
+
+# TODO: remove this decorator once mypyc supports subclassing dict
+@final
+@mypyc_attr(native_class=False)
+class LazyBuildJson(dict):
+    """
+    Contract build data loaded from a compact artifact.
+
+    The fields in `LAZY_KEYS` are held as compressed, serialized data and are
+    only decoded when accessed by key. Each field is decoded once and the result
+    is shared by all copies. Methods that expose every value, such as `items` or
+    `values`, decode all remaining fields first.
+
+    Code that passes build data to a JSON encoder should call `materialize`
+    beforehand, as encoders read the underlying dict directly.
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        lazy: dict[str, bytes],
+        decoded: dict[str, Any] | None = None,
+        pending: set[str] | None = None,
+    ) -> None:
+        super().__init__(data)
+        # the encoded and decoded fields are shared with every copy of this object
+        self._lazy: Final = lazy
+        self._decoded: Final = {} if decoded is None else decoded
+        self._pending: Final = set(lazy) if pending is None else pending
+
+    def __missing__(self, key: str) -> Any:
+        if key not in self._pending:
+            raise KeyError(key)
+        with _decode_lock:
+            try:
+                value = self._decoded[key]
+            except KeyError:
+                value = self._decoded[key] = marshal.loads(zlib.decompress(self._lazy[key]))
+        dict.__setitem__(self, key, value)
+        self._pending.discard(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._pending
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._pending:
+            self._pending.discard(key)
+        else:
+            dict.__delitem__(self, key)
+
+    def __iter__(self) -> Any:
+        self.materialize()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._pending)
+
+    def __reduce__(self) -> tuple:
+        return LazyBuildJson, (dict(self.items()), {})
+
+    def contains(self, key: str) -> bool:
+        """Check if a key is present, without decoding it. Safe for compiled callers."""
+        return self.__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Any:
+        self.materialize()
+        return dict.keys(self)
+
+    def items(self) -> Any:
+        self.materialize()
+        return dict.items(self)
+
+    def values(self) -> Any:
+        self.materialize()
+        return dict.values(self)
+
+    def copy(self) -> "LazyBuildJson":
+        # dict.copy would call the overridden `keys` and decode everything
+        return LazyBuildJson(
+            dict(dict.items(self)), self._lazy, self._decoded, self._pending.copy()
+        )
+
+    def materialize(self) -> "LazyBuildJson":
+        """Decode every remaining field."""
+        for key in list(self._pending):
+            self.__missing__(key)
+        return self
+
+
+def materialize(build_json: ContractBuildJson) -> ContractBuildJson:
+    """
+    Return build data with every field decoded, as a plain dict.
+
+    Arguments
+    ---------
+    build_json : dict
+        Contract build data, which may have been loaded from a compact artifact
+
+    Returns
+    -------
+    dict
+        Build data that can be safely passed to a JSON encoder
+    """
+    if isinstance(build_json, LazyBuildJson):
+        return dict(build_json.materialize().items())  # type: ignore [return-value]
+    return build_json
+
+
+def get_compact_path(json_path: pathlib.Path) -> pathlib.Path:
+    """Return the path of the compact artifact for a JSON build artifact."""
+    return json_path.with_suffix(".bin")
+
+
+def load_compact_artifact(json_path: pathlib.Path) -> ContractBuildJson | None:
+    """
+    Load a contract artifact from the compact artifact next to a JSON artifact.
+
+    Arguments
+    ---------
+    json_path : Path
+        Path to the JSON build artifact
+
+    Returns
+    -------
+    LazyBuildJson
+        Build data, or None if there is no compact artifact or it does not
+        match the current JSON artifact
+    """
+    try:
+        with get_compact_path(json_path).open("rb") as fp:
+            data = fp.read()
+        stat = json_path.stat()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+    try:
+        json_stat, eager, lazy = marshal.loads(data[len(MAGIC) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if json_stat != (stat.st_mtime_ns, stat.st_size):
+        return None
+    return LazyBuildJson(eager, lazy)  # type: ignore [return-value]
+
+
+def save_compact_artifact(json_path: pathlib.Path, build_json: ContractBuildJson) -> None:
+    """
+    Save a compact artifact next to a JSON build artifact.
+
+    The compact artifact is only valid for the JSON artifact as it exists when
+    this function is called, so it must be saved after the JSON artifact is written.
+
+    Arguments
+    ---------
+    json_path : Path
+        Path to the JSON build artifact
+    build_json : dict
+        Build data contained in the JSON artifact
+    """
+    data: dict[str, Any] = dict(materialize(build_json))
+    if "pcMap" in data:
+        # store the pcMap with integer keys, as used by `Build`
+        data["pcMap"] = {int(k): v for k, v in data["pcMap"].items()}
+    eager = {k: v for k, v in data.items() if k not in LAZY_KEYS}
+    try:
+        lazy = {k: zlib.compress(marshal.dumps(data[k]), 1) for k in LAZY_KEYS if k in data}
+        stat = json_path.stat()
+        payload = marshal.dumps(((stat.st_mtime_ns, stat.st_size), eager, lazy))
+    except (OSError, ValueError):
+        # the build data contains a type that cannot be serialized, use JSON only
+        return
+    _write_atomic(get_compact_path(json_path), MAGIC + payload)
+
+
+def get_revert_path(json_path: pathlib.Path) -> pathlib.Path:
+    """Return the path of the revert data cache for a JSON build artifact."""
+    return json_path.with_suffix(".reverts")
+
+
+def load_revert_data(json_path: pathlib.Path, key: str) -> tuple[dict, dict] | None:
+    """
+    Load cached revert data for a contract.
+
+    Arguments
+    ---------
+    json_path : Path
+        Path to the JSON build artifact
+    key : str
+        Key of the revert data, derived from the bytecode hash
+
+    Returns
+    -------
+    tuple
+        Revert data as generated by `Build`, or None if there is no cached data
+        or it does not match the current JSON artifact
+    """
+    try:
+        with get_revert_path(json_path).open("rb") as fp:
+            data = fp.read()
+        stat = json_path.stat()
+    except OSError:
+        return None
+    if not data.startswith(REVERT_MAGIC):
+        return None
+    try:
+        json_stat, cached_key, revert_data = marshal.loads(data[len(REVERT_MAGIC) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if json_stat != (stat.st_mtime_ns, stat.st_size) or cached_key != key:
+        return None
+    return revert_data
+
+
+def save_revert_data(json_path: pathlib.Path, key: str, revert_data: tuple[dict, dict]) -> None:
+    """
+    Cache the revert data for a contract next to its JSON build artifact.
+
+    Arguments
+    ---------
+    json_path : Path
+        Path to the JSON build artifact
+    key : str
+        Key of the revert data, derived from the bytecode hash
+    revert_data : tuple
+        Revert data as generated by `Build`
+    """
+    try:
+        stat = json_path.stat()
+        payload = marshal.dumps(((stat.st_mtime_ns, stat.st_size), key, revert_data))
+        _write_atomic(get_revert_path(json_path), REVERT_MAGIC + payload)
+    except (OSError, ValueError):
+        # the cache is optional, the revert data is generated again next time
+        return
+
+
+def unlink_artifact(json_path: pathlib.Path) -> None:
+    """Delete a JSON build artifact and the related compact artifact and caches."""
+    json_path.unlink(missing_ok=True)
+    get_compact_path(json_path).unlink(missing_ok=True)
+    get_revert_path(json_path).unlink(missing_ok=True)
+
+
+def _write_atomic(path: pathlib.Path, data: bytes) -> None:
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("wb") as fp:
+        fp.write(data)
+    temp_path.replace(path)
@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 # mypy: disable-error-code="index"
 
-from typing import Final, Literal, cast, final
+import pathlib
+from typing import Final, Literal, TypeAlias, cast, final
 
 from brownie.typing import (
     BuildJson,
@@ -15,6 +16,7 @@ from brownie.typing import (
     ProgramCounter,
 )
 
+from .artifacts import LazyBuildJson, load_revert_data, save_revert_data
 from .sources import Sources, highlight_source
 
 INTERFACE_KEYS: Final = "abi", "contractName", "sha1", "type"
@@ -46,7 +48,14 @@ BUILD_KEYS: Final = (
     "sourcePath",
 ) + DEPLOYMENT_KEYS
 
+# ({pc: (path, offset, fn, dev) or False}, {pc: dev string from a source comment})
+RevertData: TypeAlias = tuple[dict, dict]
+
 _revert_map: Final[dict[int | str, tuple | Literal[False]]] = {}
+# revert data for each contract, keyed by bytecode hash
+_revert_data: Final[dict[str, RevertData]] = {}
+# contracts that are not yet added to the revert map, keyed by bytecode hash
+_pending_reverts: Final[dict[str, tuple["Build", ContractBuildJson, pathlib.Path | None]]] = {}
 
 
 @final
@@ -62,6 +71,7 @@ class Build:
         self,
         build_json: ContractBuildJson,
         alias: ContractName | None = None,
+        path: pathlib.Path | None = None,
     ) -> None:
         contract_name = alias or build_json["contractName"]
         if contract_name in self._contracts and build_json["type"] == "interface":
@@ -70,27 +80,36 @@ class Build:
             # interfaces should generate artifact in /build/interfaces/ not /build/contracts/
             return
         self._contracts[contract_name] = build_json
-        if "pcMap" not in build_json:
-            # no pcMap means build artifact is for an interface
+        if not isinstance(build_json, LazyBuildJson):
+            if "pcMap" not in build_json:
+                # no pcMap means build artifact is for an interface
+                return
+            pc_map: dict[int | str, ProgramCounter] = build_json["pcMap"]  # type: ignore
+            if "0" in pc_map:
+                build_json["pcMap"] = PCMap({Count(int(k)): pc_map[k] for k in pc_map})
+        elif not build_json.contains("pcMap"):
             return
 
-        pc_map: dict[int | str, ProgramCounter] = build_json["pcMap"]  # type: ignore [assignment]
-        if "0" in pc_map:
-            build_json["pcMap"] = PCMap({Count(int(k)): pc_map[k] for k in pc_map})
-        self._generate_revert_map(pc_map, build_json["allSourcePaths"], build_json["language"])
+        # revert data is generated when it is first needed
+        key = _get_revert_key(build_json)
+        _revert_data.pop(key, None)
+        _pending_reverts.pop(key, None)
+        _pending_reverts[key] = (self, build_json, path)
 
     def _add_interface(self, build_json: InterfaceBuildJson) -> None:
         contract_name = build_json["contractName"]
         self._interfaces[contract_name] = build_json
 
-    def _generate_revert_map(
+    def _generate_revert_data(
         self,
         pcMap: dict[int | str, ProgramCounter],
         source_map: dict[str, str],
         language: Language,
-    ) -> None:
-        # Adds a contract's dev revert strings to the revert map and it's pcMap
+    ) -> RevertData:
+        # Finds a contract's revert data, and adds dev revert strings to it's pcMap
         marker = "//" if language == "Solidity" else "#"
+        reverts: dict[int | str, tuple[str, Offset, str, str] | Literal[False]] = {}
+        dev_strings: dict[int | str, str] = {}
         for pc, data in pcMap.items():
             op = data["op"]
             if op in ("REVERT", "INVALID") or "jump_revert" in data:
@@ -102,33 +121,25 @@ class Build:
 
                 if "dev" not in data:
                     if "fn" not in data or "first_revert" in data:
-                        _revert_map[pc] = False
+                        reverts[pc] = False
                         continue
                     try:
                         revert_str = self._sources.get(path_str)[data["offset"][1] :]
                         revert_str = revert_str[: revert_str.index("\n")]
                         revert_str = revert_str[revert_str.index(marker) + len(marker) :].strip()
                         if revert_str.startswith("dev:"):
-                            data["dev"] = revert_str
+                            data["dev"] = dev_strings[pc] = revert_str
                     except (KeyError, ValueError):
                         pass
 
                 msg = "" if op == "REVERT" else "invalid opcode"
-                revert = (
+                reverts[pc] = (
                     path_str,
-                    data["offset"],
+                    tuple(data["offset"]),  # type: ignore [arg-type]
                     data.get("fn", "<None>"),
                     data.get("dev", msg),
-                    self._sources,
                 )
-
-                # do not compare the final tuple item in case the same project was loaded twice
-                if pc not in _revert_map or (
-                    _revert_map[pc] and revert[:-1] == _revert_map[pc][:-1]
-                ):
-                    _revert_map[pc] = revert
-                    continue
-                _revert_map[pc] = False
+        return reverts, dev_strings
 
     def _remove_contract(self, contract_name: ContractName) -> None:
         key = self._stem(contract_name)
@@ -169,13 +180,96 @@ class Build:
         based on a changed source file."""
         return [k for k, v in self._contracts.items() if contract_name in v.get("dependencies", [])]
 
+    def get_import_graph(self) -> dict[str, list[str]]:
+        """Returns a dict of {path: [paths]} giving every other source file that is
+        included when compiling each source path. Used by the compiler to find the
+        source paths affected when a source file is modified."""
+        graph: dict[str, set[str]] = {}
+        for build_json in self._contracts.values():
+            if "allSourcePaths" not in build_json:
+                continue
+            path = build_json["sourcePath"]
+            imports = graph.setdefault(path, set())
+            imports.update(build_json["allSourcePaths"].values())
+            imports.discard(path)
+        return {k: sorted(v) for k, v in graph.items()}
+
     def _stem(self, contract_name: ContractName) -> ContractName:
         return contract_name.replace(".json", "")  # type: ignore [return-value]
 
 
+def _get_revert_key(build_json: ContractBuildJson) -> str:
+    # the bytecode hash excludes solc metadata, so the source hash is included as
+    # well to distinguish between versions of a contract that differ only by comments
+    return f"{build_json['bytecodeSha1']}-{build_json['sha1']}"
+
+
+def _load_revert_data(key: str) -> RevertData:
+    build, build_json, path = _pending_reverts.pop(key)
+    data = None if path is None else load_revert_data(path, key)
+    if data is None:
+        data = build._generate_revert_data(
+            build_json["pcMap"], build_json["allSourcePaths"], build_json["language"]
+        )
+        if path is not None:
+            save_revert_data(path, key, data)
+
+    _revert_data[key] = data
+    sources = build._sources
+    for pc, revert in data[0].items():
+        if revert is False:
+            _revert_map[pc] = False
+            continue
+        # do not compare the final tuple item in case the same project was loaded twice
+        if pc not in _revert_map or (_revert_map[pc] and revert == _revert_map[pc][:-1]):
+            _revert_map[pc] = revert + (sources,)
+            continue
+        _revert_map[pc] = False
+    return data
+
+
+def _load_pending_revert_data() -> None:
+    # add every pending contract to the revert map, in the order they were added
+    for key in list(_pending_reverts):
+        _load_revert_data(key)
+
+
+def _get_contract_revert_data(build_json: ContractBuildJson) -> RevertData | None:
+    if "bytecodeSha1" not in build_json or "sha1" not in build_json:
+        return None
+    key = _get_revert_key(build_json)
+    if key in _pending_reverts:
+        return _load_revert_data(key)
+    return _revert_data.get(key)
+
+
+def _has_dev_revert_strings(build_json: ContractBuildJson) -> bool:
+    # Returns True if any revert in the contract has a dev revert string, either from
+    # a source comment or added to the pcMap by the compiler
+    data = _get_contract_revert_data(build_json)
+    if data is None:
+        return False
+    return any(i and i[3] not in ("", "invalid opcode") for i in data[0].values())
+
+
+def _add_dev_revert_strings(build_json: ContractBuildJson) -> None:
+    # Adds the dev revert strings from source comments to a contract's pcMap. Revert
+    # data is generated when it is first needed, so this must be called before
+    # reading dev revert strings from a pcMap.
+    data = _get_contract_revert_data(build_json)
+    if data is None:
+        return
+    if data[1]:
+        pc_map: dict = build_json["pcMap"]
+        for pc, dev in data[1].items():
+            if pc in pc_map:
+                pc_map[pc].setdefault("dev", dev)
+
+
 def _get_dev_revert(pc: int) -> str | None:
     # Given the program counter from a stack trace that caused a transaction
     # to revert, returns the commented dev string (if any)
+    _load_pending_revert_data()
     if pc not in _revert_map:
         return None
     revert = _revert_map[pc]
@@ -189,6 +283,7 @@ def _get_error_source_from_pc(
 ) -> tuple[str | None, tuple[int, int] | None, str | None, str | None]:
     # Given the program counter from a stack trace that caused a transaction
     # to revert, returns the highlighted relevant source code and the method name.
+    _load_pending_revert_data()
     if pc not in _revert_map or _revert_map[pc] is False:
         return (None,) * 4
     revert = cast(tuple[str, Offset, str, str, Sources], _revert_map[pc])
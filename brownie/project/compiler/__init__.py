@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 # mypy: disable-error-code="index,typeddict-unknown-key"
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
 from typing import Any, Final, TypeAlias, Union, cast
 
 import solcast
@@ -10,6 +14,7 @@ from brownie._c_constants import Path, Version, deepcopy, sha1, ujson_loads
 from brownie._config import _get_data_folder
 from brownie.exceptions import UnsupportedLanguage
 from brownie.project import sources
+from brownie.project.compiler.cache import evict_outputs
 from brownie.project.compiler.solidity import (  # NOQA: F401
     find_best_solc_version,
     find_solc_versions,
@@ -72,6 +77,7 @@ def compile_and_format(
     remappings: list[str] | str | None = None,
     optimizer: OptimizerSettings | None = None,
     viaIR: bool | None = None,
+    jobs: int | None = 1,
 ) -> dict[ContractName, ContractBuildJson]:
     """Compiles contracts and returns build data.
 
@@ -87,6 +93,7 @@ def compile_and_format(
         remappings: list of solidity path remappings
         optimizer: dictionary of solidity optimizer settings
         viaIR: enable compilation pipeline to go through the Yul intermediate representation
+        jobs: number of compiler versions to run in parallel (use None for one per CPU)
 
     Returns:
         build data dict
@@ -133,46 +140,93 @@ def compile_and_format(
             else:
                 optimizer = {"enabled": False, "runs": 0}
 
-    language: Language
-    compiler_data: CompilerConfig
-    for version, path_list in compiler_targets.items():
-        compiler_data = {}  # type: ignore [typeddict-item]
-        if path_list[0].endswith(".vy"):
-            set_vyper_version(version)
-            language = "Vyper"
-            compiler_data["version"] = str(vyper.get_version())
-            interfaces = {
-                key: interface_sources[key]
-                for key in interface_sources
-                if Path(key).suffix != ".sol"
-            }
-        else:
-            set_solc_version(version)
-            language = "Solidity"
-            compiler_data["version"] = str(solidity.get_version())
-            interfaces = {
-                k: v
-                for k in interface_sources
-                if Path(k).suffix == ".sol"
-                and Version(version) in sources.get_pragma_spec(v := interface_sources[k], k)
-            }
-
-        to_compile = {key: contract_sources[key] for key in contract_sources if key in path_list}
-
-        input_json = generate_input_json(
-            to_compile,
-            evm_version=evm_version[language] if isinstance(evm_version, dict) else evm_version,
-            language=language,
-            interface_sources=interfaces,
-            remappings=remappings,
-            optimizer=optimizer,
-            viaIR=viaIR,
+    targets = [
+        (
+            str(version),
+            {key: contract_sources[key] for key in contract_sources if key in path_list},
+            interface_sources,
+            evm_version,
+            remappings,
+            optimizer,
+            viaIR,
+            silent,
+            allow_paths,
         )
+        for version, path_list in compiler_targets.items()
+    ]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 2 or len(targets) < 2:
+        for target in targets:
+            build_json.update(_compile_target(*target))
+    else:
+        # each compiler version is handled in a separate process. results and console
+        # output are collected in the original order, so the result is deterministic
+        with ProcessPoolExecutor(max_workers=min(jobs, len(targets))) as executor:
+            futures = [executor.submit(_compile_target_captured, *target) for target in targets]
+            for future in futures:
+                target_json, output = future.result()
+                if output:
+                    print(output, end="")
+                build_json.update(target_json)
+
+    evict_outputs()
+    return build_json
 
-        output_json = compile_from_input_json(input_json, silent, allow_paths)
-        build_json.update(generate_build_json(input_json, output_json, compiler_data, silent))
 
-    return build_json
+def _compile_target(
+    version: str,
+    contract_sources: dict[str, str],
+    interface_sources: dict[str, str],
+    evm_version: EvmVersionSpec | None,
+    remappings: list[str] | str | None,
+    optimizer: OptimizerSettings | None,
+    viaIR: bool | None,
+    silent: bool,
+    allow_paths: str | None,
+) -> dict[ContractName, ContractBuildJson]:
+    # compile and format all sources that are handled by a single compiler version
+    language: Language
+    compiler_data: CompilerConfig = {}  # type: ignore [typeddict-item]
+    if next(iter(contract_sources)).endswith(".vy"):
+        set_vyper_version(version)
+        language = "Vyper"
+        compiler_data["version"] = str(vyper.get_version())
+        interfaces = {
+            key: interface_sources[key] for key in interface_sources if Path(key).suffix != ".sol"
+        }
+    else:
+        set_solc_version(version)
+        language = "Solidity"
+        compiler_data["version"] = str(solidity.get_version())
+        interfaces = {
+            k: v
+            for k in interface_sources
+            if Path(k).suffix == ".sol"
+            and Version(version) in sources.get_pragma_spec(v := interface_sources[k], k)
+        }
+
+    input_json = generate_input_json(
+        contract_sources,
+        evm_version=evm_version[language] if isinstance(evm_version, dict) else evm_version,
+        language=language,
+        interface_sources=interfaces,
+        remappings=remappings,
+        optimizer=optimizer,
+        viaIR=viaIR,
+    )
+
+    output_json = compile_from_input_json(input_json, silent, allow_paths)
+    return generate_build_json(input_json, output_json, compiler_data, silent)
+
+
+def _compile_target_captured(*args: Any) -> tuple[dict[ContractName, ContractBuildJson], str]:
+    # run `_compile_target` within a worker process, returning the console output
+    # so that it can be printed in order by the parent process
+    with redirect_stdout(StringIO()) as output:
+        build_json = _compile_target(*args)
+    return build_json, output.getvalue()
 
 
 def generate_input_json(
@@ -0,0 +1,484 @@
+#!/usr/bin/python3
+
+import os
+import sqlite3
+import time
+import zlib
+from collections.abc import Callable, Iterable
+from hashlib import sha256
+from typing import Any, Final, final
+
+from requests.exceptions import RequestException
+from semantic_version import NpmSpec
+
+from brownie._c_constants import sha1, ujson_dumps, ujson_loads
+from brownie._config import CONFIG, _get_data_folder
+from brownie.project import sources
+from brownie.utils.sql import Cursor
+
+# number of seconds that a list of installable compiler versions is considered current
+VERSION_LIST_TTL: Final = 86400
+
+# maximum number of parameters in a single sqlite query
+_QUERY_CHUNK: Final = 500
+
+_PRAGMA_PARSERS: Final[dict[str, Callable[[str, str | None], NpmSpec]]] = {
+    "Solidity": sources.get_pragma_spec,
+    "Vyper": sources.get_vyper_pragma_spec,
+}
+
+# {(language, source hash): pragma string} for every source seen in this process
+_pragmas: Final[dict[tuple[str, str], str]] = {}
+_specs: Final[dict[str, NpmSpec]] = {}
+
+
+@final
+class CompilerCache:
+    """
+    Persistent cache of compiler metadata, stored in `compilers.db` within the
+    data folder.
+
+    Holds the lists of installable solc and vyper versions, so that they are
+    not queried on every run, and the version pragma of each source file by
+    content hash, so that unchanged sources are not parsed again.
+
+    Compiler output is stored as zlib-compressed JSON, keyed by a hash of the
+    compiler input and version, and shared between every project. Entries are
+    evicted by age and by the total size of the cache.
+    """
+
+    __slots__ = ("cur",)
+
+    def __init__(self) -> None:
+        self.cur: Final = Cursor(_get_data_folder().joinpath("compilers.db"))
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS versions (compiler PRIMARY KEY, updated, versions)"
+        )
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS pragmas "
+            "(language, hash, pragma, PRIMARY KEY(language, hash))"
+        )
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS outputs "
+            "(key PRIMARY KEY, language, version, size, created, accessed, hits, data)"
+        )
+        self.cur.execute("CREATE TABLE IF NOT EXISTS stats (name PRIMARY KEY, value)")
+
+    def get_versions(self, compiler: str) -> tuple[list[str], float] | None:
+        """
+        Return the cached list of installable versions for a compiler.
+
+        Arguments
+        ---------
+        compiler : str
+            Name of the compiler, "solc" or "vyper"
+
+        Returns
+        -------
+        tuple
+            (versions, timestamp of when the list was fetched), or None if the
+            list is not cached
+        """
+        row = self.cur.fetchone(
+            "SELECT versions, updated FROM versions WHERE compiler=?", (compiler,)
+        )
+        if row is None:
+            return None
+        return row[0], row[1]
+
+    def set_versions(self, compiler: str, versions: list[str]) -> None:
+        """Store the list of installable versions for a compiler."""
+        self.cur.insert("versions", compiler, time.time(), versions)
+
+    def get_pragmas(self, language: str, hashes: list[str]) -> dict[str, str]:
+        """
+        Return cached version pragmas.
+
+        Arguments
+        ---------
+        language : str
+            Source language, "Solidity" or "Vyper"
+        hashes : list
+            sha1 hashes of the source files
+
+        Returns
+        -------
+        dict
+            {source hash: pragma string} for each hash that is cached
+        """
+        pragmas: dict[str, str] = {}
+        for i in range(0, len(hashes), _QUERY_CHUNK):
+            chunk = hashes[i : i + _QUERY_CHUNK]
+            rows = self.cur.fetchall(
+                "SELECT hash, pragma FROM pragmas WHERE language=? "
+                f"AND hash IN ({','.join('?' * len(chunk))})",
+                (language, *chunk),
+            )
+            pragmas.update(rows)
+        return pragmas
+
+    def set_pragmas(self, language: str, pragmas: dict[str, str]) -> None:
+        """Store version pragmas as {source hash: pragma string}."""
+        # insert within a single transaction, rather than committing each row
+        self.cur.insert_many("pragmas", ((language, k, v) for k, v in pragmas.items()))
+
+    def get_output(self, key: str) -> dict | None:
+        """
+        Return cached compiler output.
+
+        Arguments
+        ---------
+        key : str
+            Key of the output, as given by `get_output_key`
+
+        Returns
+        -------
+        dict
+            Standard JSON compiler output, or None if the output is not cached
+        """
+        rows = self.cur.fetchall("SELECT data FROM outputs WHERE key=?", (key,))
+        if not rows:
+            self._increment("misses")
+            return None
+        self.cur.execute(
+            "UPDATE outputs SET accessed=?, hits=hits+1 WHERE key=?", (time.time(), key)
+        )
+        self._increment("hits")
+        return ujson_loads(zlib.decompress(rows[0][0]))
+
+    def set_output(self, key: str, language: str, version: str, output_json: dict) -> None:
+        """
+        Store compiler output.
+
+        Arguments
+        ---------
+        key : str
+            Key of the output, as given by `get_output_key`
+        language : str
+            Source language, "Solidity" or "Vyper"
+        version : str
+            Compiler version
+        output_json : dict
+            Standard JSON compiler output
+        """
+        data = zlib.compress(ujson_dumps(output_json).encode())
+        now = time.time()
+        self.cur.insert("outputs", key, language, version, len(data), now, now, 0, data)
+
+    def evict(self, max_size: int, max_age: float) -> int:
+        """
+        Remove compiler output that has not been used recently.
+
+        Arguments
+        ---------
+        max_size : int
+            Maximum total size of the stored output, in bytes. The least recently
+            used entries are removed until the cache is within this size.
+        max_age : float
+            Entries that have not been used for this many seconds are removed.
+
+        Returns
+        -------
+        int
+            Number of entries removed
+        """
+        rows = self.cur.fetchall("SELECT key, size, accessed FROM outputs ORDER BY accessed DESC")
+        total = 0
+        expired_before = time.time() - max_age
+        evicted = []
+        for key, size, accessed in rows:
+            total += size
+            if total > max_size or accessed < expired_before:
+                evicted.append(key)
+        for i in range(0, len(evicted), _QUERY_CHUNK):
+            chunk = evicted[i : i + _QUERY_CHUNK]
+            self.cur.execute(
+                f"DELETE FROM outputs WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+        if evicted:
+            self._increment("evictions", len(evicted))
+        return len(evicted)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Return statistics about the cached compiler output.
+
+        Returns
+        -------
+        dict
+            * `entries`: number of cached outputs
+            * `size`: total size of the cached outputs, in bytes
+            * `hits`, `misses`, `evictions`: totals since the cache was created
+            * `versions`: {(language, version): (entries, size)}
+        """
+        stats: dict[str, Any] = {"hits": 0, "misses": 0, "evictions": 0}
+        stats.update(self.cur.fetchall("SELECT name, value FROM stats"))
+        rows = self.cur.fetchall(
+            "SELECT language, version, COUNT(*), SUM(size) FROM outputs "
+            "GROUP BY language, version ORDER BY language, version"
+        )
+        stats["versions"] = {(i[0], i[1]): (i[2], i[3]) for i in rows}
+        stats["entries"] = sum(i[2] for i in rows)
+        stats["size"] = sum(i[3] for i in rows)
+        return stats
+
+    def clear(self) -> None:
+        """Remove all cached compiler metadata and output."""
+        self.cur.execute("DELETE FROM versions")
+        self.cur.execute("DELETE FROM pragmas")
+        self.cur.execute("DELETE FROM outputs")
+        self.cur.execute("DELETE FROM stats")
+
+    def _increment(self, name: str, value: int = 1) -> None:
+        self.cur.execute(
+            "INSERT INTO stats VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value=value+?",
+            (name, value, value),
+        )
+
+
+_compiler_cache: CompilerCache | None = None
+
+# caches inherited from a parent process. a sqlite connection must not be used, or
+# closed, after a fork, so these are retained without being used
+_inherited_caches: Final[list[CompilerCache]] = []
+
+
+def get_compiler_cache() -> CompilerCache:
+    """Return the persistent compiler cache."""
+    global _compiler_cache
+    if _compiler_cache is None:
+        _compiler_cache = CompilerCache()
+    return _compiler_cache
+
+
+def _reset_after_fork() -> None:
+    # a forked process, e.g. a parallel compile worker, opens its own connection
+    global _compiler_cache
+    if _compiler_cache is not None:
+        _inherited_caches.append(_compiler_cache)
+        _compiler_cache = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def evict_outputs() -> int:
+    """
+    Remove compiler output according to the `compiler_cache` settings.
+
+    This is called once at the end of each compile, rather than as each output
+    is stored, as every entry is checked.
+
+    Returns
+    -------
+    int
+        Number of entries removed
+    """
+    config = CONFIG.settings["compiler_cache"]
+    if not config["enabled"]:
+        return 0
+    try:
+        return get_compiler_cache().evict(config["max_size"] * 1024**2, config["max_age"] * 86400)
+    except sqlite3.OperationalError:
+        # the database is locked by another process, evict on the next compile
+        return 0
+
+
+def get_output_key(input_json: dict, version: str) -> str:
+    """
+    Return the cache key for compiling a standard JSON input.
+
+    The input is normalized before hashing: keys are sorted, and remappings
+    whose prefix does not appear in any source are dropped, as they cannot
+    affect the output. This allows the same sources to share an entry after
+    unrelated packages are installed.
+
+    Arguments
+    ---------
+    input_json : dict
+        Standard JSON compiler input
+    version : str
+        Compiler version, including the commit hash where available
+
+    Returns
+    -------
+    str
+        Hex-encoded sha256 hash
+    """
+    settings = input_json.get("settings", {})
+    if settings.get("remappings"):
+        contents = [i.get("content", "") for i in input_json["sources"].values()]
+        remappings = [
+            i for i in settings["remappings"] if any(_remap_prefix(i) in c for c in contents)
+        ]
+        input_json = dict(input_json, settings=dict(settings, remappings=remappings))
+    data = ujson_dumps([version, input_json], sort_keys=True)
+    return sha256(data.encode()).hexdigest()
+
+
+def compile_with_cache(
+    input_json: Any, language: str, version: str, compile_fn: Callable[[], dict]
+) -> dict:
+    """
+    Return the output of compiling a standard JSON input, from the cache if possible.
+
+    If the output is not cached, it is generated by `compile_fn` and stored. Output
+    is only stored if every source it references is included in the input, so that
+    it does not depend on files read by the compiler from disk.
+
+    Arguments
+    ---------
+    input_json : dict
+        Standard JSON compiler input
+    language : str
+        Source language, "Solidity" or "Vyper"
+    version : str
+        Compiler version, including the commit hash where available
+    compile_fn : Callable
+        Compiles `input_json` and returns the standard JSON output
+
+    Returns
+    -------
+    dict
+        Standard JSON compiler output
+    """
+    if not CONFIG.settings["compiler_cache"]["enabled"]:
+        return compile_fn()
+
+    cache = get_compiler_cache()
+    key = get_output_key(input_json, version)
+    try:
+        output_json = cache.get_output(key)
+    except sqlite3.OperationalError:
+        # the database is locked by another process, e.g. a parallel compile
+        output_json = None
+    if output_json is not None:
+        return output_json
+
+    output_json = compile_fn()
+    input_paths = set(input_json["sources"]).union(input_json.get("interfaces", ()))
+    if input_paths.issuperset(output_json.get("sources", ())):
+        try:
+            cache.set_output(key, language, version, output_json)
+        except sqlite3.OperationalError:
+            pass
+    return output_json
+
+
+def _remap_prefix(remapping: str) -> str:
+    # "context:prefix=target" -> "prefix"
+    return remapping.split("=", 1)[0].split(":", 1)[-1]
+
+
+def get_installable_versions(compiler: str, fetch: Callable[[], Iterable[Any]]) -> list[str]:
+    """
+    Return the installable versions of a compiler.
+
+    The list saved in the data folder is used if it was fetched within the last
+    `VERSION_LIST_TTL` seconds. Otherwise a new list is fetched and saved. If a
+    new list cannot be fetched, an outdated list is used when one is available.
+
+    Arguments
+    ---------
+    compiler : str
+        Name of the compiler, "solc" or "vyper"
+    fetch : Callable
+        Returns the installable versions, querying the network
+
+    Returns
+    -------
+    list
+        Installable versions, as strings
+    """
+    cache = get_compiler_cache()
+    cached = cache.get_versions(compiler)
+    if cached is not None and time.time() - cached[1] < VERSION_LIST_TTL:
+        return cached[0]
+    try:
+        versions = [str(i) for i in fetch()]
+    except RequestException:
+        if cached is None:
+            raise
+        return cached[0]
+    cache.set_versions(compiler, versions)
+    return versions
+
+
+def get_pragma_specs(
+    contract_sources: dict[str, str],
+    language: str,
+    source_hashes: dict[str, str] | None = None,
+) -> dict[str, NpmSpec]:
+    """
+    Return the version pragma of each source file.
+
+    Pragmas are memoized by source hash, both in memory and in the data folder,
+    so a source is only parsed the first time its content is seen.
+
+    Arguments
+    ---------
+    contract_sources : dict
+        {path: source code}
+    language : str
+        Source language, "Solidity" or "Vyper"
+    source_hashes : dict, optional
+        {path: sha1 hash of the source}, if already known
+
+    Returns
+    -------
+    dict
+        {path: NpmSpec}
+    """
+    if source_hashes is None:
+        source_hashes = {}
+    hashes = {
+        path: source_hashes.get(path) or sha1(source.encode()).hexdigest()
+        for path, source in contract_sources.items()
+    }
+
+    unknown = [i for i in set(hashes.values()) if (language, i) not in _pragmas]
+    if unknown:
+        cache = get_compiler_cache()
+        for source_hash, pragma in cache.get_pragmas(language, unknown).items():
+            _pragmas[(language, source_hash)] = pragma
+
+        parse = _PRAGMA_PARSERS[language]
+        new_pragmas: dict[str, str] = {}
+        for path, source_hash in hashes.items():
+            if (language, source_hash) not in _pragmas:
+                spec = parse(contract_sources[path], path)
+                _specs.setdefault(str(spec), spec)
+                _pragmas[(language, source_hash)] = new_pragmas[source_hash] = str(spec)
+        if new_pragmas:
+            cache.set_pragmas(language, new_pragmas)
+
+    return {path: _get_spec(_pragmas[(language, i)]) for path, i in hashes.items()}
+
+
+def get_unique_specs(pragma_specs: dict[str, NpmSpec]) -> dict[str, NpmSpec]:
+    """
+    Filter pragmas so that each distinct pragma is only evaluated once.
+
+    Arguments
+    ---------
+    pragma_specs : dict
+        {path: NpmSpec}
+
+    Returns
+    -------
+    dict
+        {path: NpmSpec} for the first path with each distinct pragma
+    """
+    unique: dict[str, tuple[str, NpmSpec]] = {}
+    for path, spec in pragma_specs.items():
+        unique.setdefault(str(spec), (path, spec))
+    return dict(unique.values())
+
+
+def _get_spec(pragma: str) -> NpmSpec:
+    try:
+        return _specs[pragma]
+    except KeyError:
+        spec = _specs[pragma] = NpmSpec(pragma)
+        return spec
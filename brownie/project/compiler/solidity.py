@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 
 import logging
-from typing import Any, Deque, Final, TypeAlias, cast
+from bisect import bisect_right
+from typing import Any, Final, TypeAlias, cast, final
 
 import semantic_version
 import solcast
@@ -11,10 +12,21 @@ from packaging.version import Version as PVersion
 from requests.exceptions import ConnectionError
 from solcast.nodes import NodeBase, is_inside_offset
 
-from brownie._c_constants import Version, deque, sha1
+from brownie._c_constants import Version, sha1
 from brownie._config import EVM_EQUIVALENTS
 from brownie.exceptions import CompilerError, IncompatibleSolcVersion  # noqa
-from brownie.project.compiler.utils import VersionList, VersionSpec, _get_alias, expand_source_map
+from brownie.project.compiler.cache import (
+    compile_with_cache,
+    get_installable_versions,
+    get_pragma_specs,
+    get_unique_specs,
+)
+from brownie.project.compiler.utils import (
+    VersionList,
+    VersionSpec,
+    _get_alias,
+    expand_source_map_columns,
+)
 from brownie.typing import (
     BranchMap,
     BytecodeJson,
@@ -31,8 +43,6 @@ from brownie.typing import (
     StatementMap,
 )
 
-from . import sources
-
 solcx_logger: Final = logging.getLogger("solcx")
 solcx_logger.setLevel(10)
 sh: Final = logging.StreamHandler()
@@ -103,10 +113,13 @@ def compile_from_input_json(
         if settings["evmVersion"]:
             print(f"  EVM Version: {settings['evmVersion'].capitalize()}")
 
-    try:
-        return solcx.compile_standard(cast(dict[Any, Any], input_json), allow_paths=allow_paths)
-    except solcx.exceptions.SolcError as e:
-        raise CompilerError(e, "solc")
+    def compile_fn() -> dict[str, Any]:
+        try:
+            return solcx.compile_standard(cast(dict[Any, Any], input_json), allow_paths=allow_paths)
+        except solcx.exceptions.SolcError as e:
+            raise CompilerError(e, "solc")
+
+    return compile_with_cache(input_json, "Solidity", str(get_version()), compile_fn)
 
 
 def set_solc_version(version: VersionSpec) -> str:
@@ -170,13 +183,11 @@ def find_solc_versions(
 
     available_versions, installed_versions = _get_solc_version_list()
 
-    pragma_specs: dict = {}
+    pragma_specs = get_pragma_specs(contract_sources, "Solidity")
     to_install = set()
     new_versions = set()
 
-    for path, source in contract_sources.items():
-        pragma_spec = sources.get_pragma_spec(source, path)
-        pragma_specs[path] = pragma_spec
+    for path, pragma_spec in get_unique_specs(pragma_specs).items():
         version = pragma_spec.select(installed_versions)
 
         if not version and not install_needed and not install_latest:
@@ -208,10 +219,13 @@ def find_solc_versions(
         )
 
     # organize source paths by latest available solc version
+    selected: dict[str, str] = {}
     compiler_versions: dict[str, list[str]] = {}
     for path, spec in pragma_specs.items():
-        version = spec.select(installed_versions)
-        compiler_versions.setdefault(str(version), []).append(path)
+        pragma = str(spec)
+        if pragma not in selected:
+            selected[pragma] = str(spec.select(installed_versions))
+        compiler_versions.setdefault(selected[pragma], []).append(path)
 
     return compiler_versions
 
@@ -240,8 +254,7 @@ def find_best_solc_version(
 
     available_versions, installed_versions = _get_solc_version_list()
 
-    for path, source in contract_sources.items():
-        pragma_spec = sources.get_pragma_spec(source, path)
+    for pragma_spec in get_unique_specs(get_pragma_specs(contract_sources, "Solidity")).values():
         installed_versions = [i for i in installed_versions if i in pragma_spec]
         available_versions = [i for i in available_versions if i in pragma_spec]
 
@@ -266,7 +279,12 @@ def _get_solc_version_list() -> tuple[VersionList, VersionList]:
     installed_versions: VersionList = list(map(_as_version, solcx.get_installed_solc_versions()))
     if AVAILABLE_SOLC_VERSIONS is None:
         try:
-            AVAILABLE_SOLC_VERSIONS = list(map(_as_version, solcx.get_installable_solc_versions()))
+            AVAILABLE_SOLC_VERSIONS = list(
+                map(
+                    _as_version,
+                    get_installable_versions("solc", solcx.get_installable_solc_versions),
+                )
+            )
         except ConnectionError:
             if not installed_versions:
                 raise ConnectionError("Solc not installed and cannot connect to GitHub")
@@ -363,19 +381,25 @@ def _generate_coverage_data(
     if not opcodes_str:
         return PCMap({}), {}, {}
 
-    source_map = deque(expand_source_map(source_map_str))
-    opcodes = deque(opcodes_str.split(" "))
+    # format of the source map is [start], [length], [contract_id], [jump code]
+    starts, lengths, contract_ids, jump_codes = expand_source_map_columns(source_map_str)
+    opcodes = opcodes_str.split(" ")
 
     contract_nodes = [contract_node] + contract_node.dependencies
     source_nodes: dict[IntegerString, NodeBase] = {
         str(i.contract_id): i.parent() for i in contract_nodes
     }
+    contract_id_strings = {i.contract_id: str(i.contract_id) for i in contract_nodes}
 
-    stmt_nodes = {i: stmt_nodes[i].copy() for i in source_nodes}
+    # statements that are not yet added to the statement map
+    stmt_index = {i: _OffsetIndex([(x, x) for x in stmt_nodes[i]]) for i in source_nodes}
+    stmt_order = {i: {x: idx for idx, x in enumerate(stmt_nodes[i])} for i in source_nodes}
     statement_map: StatementMap = {i: {} for i in source_nodes}
+    fn_index = {i: _get_function_index(source_nodes[i]) for i in source_nodes}
+    revert_index: dict[str, _OffsetIndex] = {}
 
     # possible branch offsets
-    branch_original = {i: branch_nodes[i].copy() for i in source_nodes}
+    branch_original = {i: branch_nodes[i] for i in source_nodes}
     branch_nodes = {i: {i.offset for i in branch_nodes[i]} for i in source_nodes}
     # currently active branches, awaiting a jumpi
     branch_active: dict[str, dict[Offset, int]] = {i: {} for i in source_nodes}
@@ -392,20 +416,23 @@ def _generate_coverage_data(
     active_source_node: NodeBase | None = None
     active_fn_node: NodeBase | None = None
     active_fn_name: str | None = None
-    first_source = source_map[0]
-
-    while source_map and source_map[-1][2] == -1:
-        # trim the end of the source map where there are no contracts associated
-        # this is required because sometimes the source map is too long
-        # likely a side effect of the YUL optimizer ¯\_(ツ)_/¯
-        source_map.pop()
-
-    while source_map:
-        # format of source_map is [start, stop, contract_id, jump code]
-        source = source_map.popleft()
-        start, stop, contract_id_int, jump_code = source
-
-        op = opcodes.popleft()
+    first_source = (starts[0], lengths[0], contract_ids[0], jump_codes[0])
+
+    # trim the end of the source map where there are no contracts associated
+    # this is required because sometimes the source map is too long
+    # likely a side effect of the YUL optimizer ¯\_(ツ)_/¯
+    source_count = len(contract_ids)
+    while source_count and contract_ids[source_count - 1] == -1:
+        source_count -= 1
+
+    op_idx = 0
+    for idx in range(source_count):
+        start = starts[idx]
+        contract_id_int = contract_ids[idx]
+        jump_code = jump_codes[idx]
+
+        op = opcodes[op_idx]
+        op_idx += 1
         this: ProgramCounter = {"op": op, "pc": pc}  # type: ignore [typeddict-item]
         pc_list.append(this)
 
@@ -424,20 +451,32 @@ def _generate_coverage_data(
             this["jump"] = jump_code
 
         pc += 1
-        if op.startswith("PUSH") and opcodes[0][:2] == "0x":
-            this["value"] = opcodes.popleft()
+        if op.startswith("PUSH") and opcodes[op_idx][:2] == "0x":
+            this["value"] = opcodes[op_idx]
+            op_idx += 1
             pc += int(op[4:])
 
         # for REVERT opcodes without a source offset, try to infer one
-        if (contract_id_int == -1 or source == first_source) and op == "REVERT":
+        if op == "REVERT" and (
+            contract_id_int == -1
+            or (start, lengths[idx], contract_id_int, jump_code) == first_source
+        ):
+            next_source: Source | None = None
+            if idx + 1 < source_count:
+                next_source = (
+                    starts[idx + 1],
+                    lengths[idx + 1],
+                    contract_ids[idx + 1],  # type: ignore [typeddict-item]
+                    jump_codes[idx + 1],
+                )
             _find_revert_offset(
-                pc_list, source_map, active_source_node, active_fn_node, active_fn_name
+                pc_list, next_source, active_source_node, active_fn_node, active_fn_name
             )
         if contract_id_int == -1:
             continue
 
         # set contract path (-1 means none)
-        contract_id = str(source[2])
+        contract_id = contract_id_strings.get(contract_id_int) or str(contract_id_int)
         if contract_id not in source_nodes:
             # In Solidity >=0.7.2 contract ID can reference an AST within the YUL-optimization
             # "generatedSources". Brownie does not support coverage evaluation within these
@@ -450,7 +489,7 @@ def _generate_coverage_data(
         # set source offset (-1 means none)
         if start == -1:
             continue
-        offset: Offset = (start, start + stop)
+        offset: Offset = (start, start + lengths[idx])
         this["offset"] = offset
 
         if op == "REVERT" and not optimizer_revert:
@@ -458,15 +497,11 @@ def _generate_coverage_data(
             # such that all reverts appear to happen at the same point in the source code.
             # We mark this REVERT as the "optimizer revert" so that when it's encountered in
             # a trace we know to look back to find the actual revert location.
-            if fn_node := active_source_node.children(
-                include_parents=False,
-                include_children=True,
-                required_offset=offset,
-                filters=(
-                    {"nodeType": "FunctionCall", "expression.name": "revert"},
-                    {"nodeType": "FunctionCall", "expression.name": "require"},
-                ),
-            ):
+            if contract_id not in revert_index:
+                revert_index[contract_id] = _get_revert_index(active_source_node)
+            # the innermost revert or require call containing the offset, the same node
+            # that `children(include_parents=False, required_offset=offset)` returned
+            if fn_node := revert_index[contract_id].find(offset):
                 args = len(fn_node[0].arguments)
                 if args == 2 or (fn_node[0].expression.name == "revert" and args):
                     optimizer_revert = True
@@ -492,39 +527,48 @@ def _generate_coverage_data(
                 del branch_set[contract_id][offset]
             branch_active[contract_id][offset] = len(pc_list) - 1
 
-        try:
-            # set fn name and statement coverage marker
-            if "offset" in pc_list[-2] and offset == pc_list[-2]["offset"]:
+        # set fn name and statement coverage marker
+        if len(pc_list) > 1:
+            last = pc_list[-2]
+            if "offset" in last and offset == last["offset"]:
                 this["fn"] = active_fn_name
-            else:
-                active_fn_node, active_fn_name = _get_active_fn(active_source_node, offset)
+            elif fn_nodes := fn_index[contract_id].find(offset):
+                active_fn_node = fn_nodes[0]
+                active_fn_name = _get_fn_name(active_fn_node)
                 this["fn"] = active_fn_name
-                stmt_offset: Offset = next(
-                    i for i in stmt_nodes[contract_id] if sources.is_inside_offset(offset, i)
+                # when statements are nested, use the first in the order they were found
+                order = stmt_order[contract_id]
+                stmt_offset = min(
+                    (i for i in stmt_index[contract_id].find(offset) if i in order),
+                    key=order.__getitem__,
+                    default=None,
                 )
-                stmt_nodes[contract_id].discard(stmt_offset)
-                statement_map[contract_id].setdefault(active_fn_name, {})[count] = stmt_offset
-                this["statement"] = count
-                count += 1
-        except (KeyError, IndexError, StopIteration):
-            pass
+                if stmt_offset is not None:
+                    del order[stmt_offset]
+                    statement_map[contract_id].setdefault(active_fn_name, {})[count] = stmt_offset
+                    this["statement"] = count
+                    count += 1
 
-        if this.get("value", None) == fallback_hexstr and opcodes[0] in ("JUMP", "JUMPI"):
+        if this.get("value", None) == fallback_hexstr and opcodes[op_idx] in ("JUMP", "JUMPI"):
             # track all jumps to the initial revert
             key = (this["path"], this["offset"])
             revert_map.setdefault(key, []).append(len(pc_list))
 
-    while opcodes[0] not in ("INVALID", "STOP") and pc < instruction_count:
+    while opcodes[op_idx] not in ("INVALID", "STOP") and pc < instruction_count:
         # necessary because sometimes solidity returns an incomplete source map
-        op = opcodes.popleft()
+        op = opcodes[op_idx]
+        op_idx += 1
         this = {"op": op, "pc": pc}  # type: ignore [typeddict-item]
         pc_list.append(this)
         pc += 1
-        if op.startswith("PUSH") and opcodes[0][:2] == "0x":
-            this["value"] = opcodes.popleft()
+        if op.startswith("PUSH") and opcodes[op_idx][:2] == "0x":
+            this["value"] = opcodes[op_idx]
+            op_idx += 1
             pc += int(op[4:])
 
     # compare revert and require statements against the map of revert jumps
+    if revert_map:
+        mapped_offsets = {x["offset"] for x in pc_list if "offset" in x}
     for (contract_id, fn_offset), values in revert_map.items():
         fn_node = source_nodes[contract_id].children(
             depth=2,
@@ -545,15 +589,19 @@ def _generate_coverage_data(
         for node in revert_nodes:
             offset = node.offset
             # if the node offset is not in the source map, apply it's offset to the JUMPI op
-            if not any("offset" in x and x["offset"] == offset for x in pc_list):
+            if offset not in mapped_offsets:
                 pc_list[values[0]].update(
                     offset=offset, jump_revert=True
                 )  # type: ignore [call-arg]
+                mapped_offsets.add(offset)
                 del values[0]
 
     # set branch index markers and build final branch map
     branch_map: BranchMap = {i: {} for i in source_nodes}
     for path, markers in branch_set.items():
+        branch_offsets: dict[Offset, NodeBase] = {}
+        for node in branch_original[path]:
+            branch_offsets.setdefault(node.offset, node)
         for offset, idx in markers.items():
             # for branch to be hit, need an op relating to the source and the next JUMPI
             # this is because of how the compiler optimizes nested BinaryOperations
@@ -561,7 +609,7 @@ def _generate_coverage_data(
                 fn = cast(str, pc_list[idx[0]]["fn"])
                 pc_list[idx[0]]["branch"] = count
                 pc_list[idx[1]]["branch"] = count
-                node = next(i for i in branch_original[path] if i.offset == offset)
+                node = branch_offsets[offset]
                 branch_map[path].setdefault(fn, {})[count] = offset + (node.jump,)
                 count += 1
 
@@ -569,16 +617,81 @@ def _generate_coverage_data(
     return pc_map, statement_map, branch_map
 
 
+@final
+class _OffsetIndex:
+    """
+    Finds the AST nodes with a source offset that contains a given offset.
+
+    Offsets are sorted by start position and linked to the closest offset that
+    contains them. As AST nodes are either nested or disjoint, every match is
+    linked from the last offset that starts before the given one, so only a
+    few offsets are compared for each lookup rather than every node.
+    """
+
+    def __init__(self, items: list[tuple[Offset, Any]]) -> None:
+        items = sorted(items, key=lambda i: (i[0][0], -i[0][1]))
+        self._offsets: Final = [i[0] for i in items]
+        self._values: Final = [i[1] for i in items]
+        self._starts: Final = [i[0][0] for i in items]
+
+        parents: list[int] = []
+        stack: list[int] = []
+        nested = True
+        for idx, (start, stop) in enumerate(self._offsets):
+            while stack and self._offsets[stack[-1]][1] <= start:
+                stack.pop()
+            if stack and stop > self._offsets[stack[-1]][1]:
+                nested = False
+            parents.append(stack[-1] if stack else -1)
+            stack.append(idx)
+        self._parents: Final = parents
+        self._nested: Final = nested
+
+    def find(self, offset: Offset) -> list[Any]:
+        """Returns the values for every node containing the offset, innermost first."""
+        start, stop = offset
+        offsets = self._offsets
+        if not self._nested or start == stop:
+            # an empty offset may sit on the boundary of two nodes, compare every node
+            found = sorted(
+                (x[1] - x[0], i) for i, x in enumerate(offsets) if x[0] <= start and stop <= x[1]
+            )
+            return [self._values[i[1]] for i in found]
+
+        values = []
+        idx = bisect_right(self._starts, start) - 1
+        while idx != -1:
+            if stop <= offsets[idx][1]:
+                values.append(self._values[idx])
+            idx = self._parents[idx]
+        return values
+
+
+def _get_function_index(source_node: NodeBase) -> _OffsetIndex:
+    fn_nodes = source_node.children(depth=2, filters={"nodeType": "FunctionDefinition"})
+    return _OffsetIndex([(i.offset, i) for i in fn_nodes])
+
+
+def _get_revert_index(source_node: NodeBase) -> _OffsetIndex:
+    nodes = source_node.children(
+        filters=(
+            {"nodeType": "FunctionCall", "expression.name": "revert"},
+            {"nodeType": "FunctionCall", "expression.name": "require"},
+        )
+    )
+    return _OffsetIndex([(i.offset, i) for i in nodes])
+
+
 def _find_revert_offset(
     pc_list: PcList,
-    source_map: Deque[Source],
+    next_source: Source | None,
     source_node: NodeBase,
     fn_node: NodeBase,
     fn_name: str | None,
 ) -> None:
     # attempt to infer a source offset for reverts that do not have one
 
-    if source_map:
+    if next_source is not None:
         # is not the last instruction
         if len(pc_list) >= 8 and pc_list[-8]["op"] == "CALLVALUE":
             # reference to CALLVALUE 8 instructions previous is a nonpayable function check
@@ -596,13 +709,10 @@ def _find_revert_offset(
 
     # get the offset of the next instruction
     next_offset = None
-    if source_map:
-        next_instruction = source_map[0]
-        if next_instruction[2] != -1:
-            next_start = next_instruction[0]
-            next_stop = next_start + next_instruction[1]
-            next_offset = (next_start, next_stop)
-
+    if next_source is not None and next_source[2] != -1:
+        next_start = next_source[0]
+        next_stop = next_start + next_source[1]
+        next_offset = (next_start, next_stop)
     # if the next instruction offset is not equal to the offset of the active function,
     # but IS contained within the active function, apply this offset to the current
     # instruction
@@ -646,10 +756,7 @@ def _set_invalid_error_string(source_node: NodeBase, pc_map: ProgramCounter) ->
             pc_map["dev"] = "Modulus by zero"
 
 
-def _get_active_fn(source_node: NodeBase, offset: tuple[int, int]) -> tuple[NodeBase, str]:
-    fn_node = source_node.children(
-        depth=2, required_offset=offset, filters={"nodeType": "FunctionDefinition"}
-    )[0]
+def _get_fn_name(fn_node: NodeBase) -> str:
     name = getattr(fn_node, "name", None)
     if not name:
         if getattr(fn_node, "kind", "function") != "function":
@@ -662,9 +769,9 @@ def _get_active_fn(source_node: NodeBase, offset: tuple[int, int]) -> tuple[Node
     parent = fn_node.parent()
     if parent.nodeType == "SourceUnit":
         # the function exists outside a contract
-        return fn_node, name
+        return name
 
-    return fn_node, f"{fn_node.parent().name}.{name}"
+    return f"{parent.name}.{name}"
 
 
 def _get_nodes(output_json: dict) -> tuple[list[NodeBase], StatementNodes, BranchNodes]:
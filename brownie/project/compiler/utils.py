@@ -12,6 +12,7 @@ from brownie.typing import ContractName, Source, SourceId, SourceIndex
 VersionSpec: TypeAlias = Union[str, Version]
 VersionList: TypeAlias = list[Version]
 SourceMapRow: TypeAlias = list[str | int | None]
+SourceMapColumns: TypeAlias = tuple[list[int], list[int], list[int], list[str]]
 
 
 def expand_source_map(source_map_str: str | dict) -> list[Source]:
@@ -37,6 +38,37 @@ def expand_source_map(source_map_str: str | dict) -> list[Source]:
     return [_to_source(row) for row in source_map]
 
 
+def expand_source_map_columns(source_map_str: str) -> SourceMapColumns:
+    """
+    Expand the compressed sourceMap supplied by solc into columns of start offsets,
+    lengths, source ids (-1 if none) and jump codes, with one entry per instruction.
+    """
+    starts: list[int] = []
+    lengths: list[int] = []
+    source_ids: list[int] = []
+    jump_codes: list[str] = []
+    start = length = source_id = -1
+    jump_code = "-"
+    for row in source_map_str.split(";"):
+        if row:
+            # ignore the "modifier depth" value added in solidity 0.6.0
+            fields = row.split(":", 4)
+            count = len(fields)
+            if fields[0]:
+                start = int(fields[0])
+            if count > 1 and fields[1]:
+                length = int(fields[1])
+            if count > 2 and fields[2]:
+                source_id = int(fields[2])
+            if count > 3 and fields[3]:
+                jump_code = fields[3]
+        starts.append(start)
+        lengths.append(length)
+        source_ids.append(source_id)
+        jump_codes.append(jump_code)
+    return starts, lengths, source_ids, jump_codes
+
+
 def _expand_row(row: str) -> SourceMapRow:
     """Expand a packed string into a row of params."""
     result: SourceMapRow = [None] * 4
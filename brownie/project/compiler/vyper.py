@@ -14,7 +14,12 @@ from vyper.exceptions import VyperException
 
 from brownie._c_constants import Version, deque, sha1
 from brownie.exceptions import CompilerError, IncompatibleVyperVersion
-from brownie.project import sources
+from brownie.project.compiler.cache import (
+    compile_with_cache,
+    get_installable_versions,
+    get_pragma_specs,
+    get_unique_specs,
+)
 from brownie.project.compiler.utils import VersionList, VersionSpec, expand_source_map
 from brownie.project.sources import is_inside_offset
 from brownie.typing import (
@@ -116,7 +121,12 @@ def _get_vyper_version_list() -> tuple[VersionList, VersionList]:
         installed_versions.append(lib_version)
     if AVAILABLE_VYPER_VERSIONS is None:
         try:
-            AVAILABLE_VYPER_VERSIONS = _convert_to_semver(_get_installable_vyper_versions())
+            AVAILABLE_VYPER_VERSIONS = _convert_to_semver(
+                [
+                    PVersion(i)
+                    for i in get_installable_versions("vyper", _get_installable_vyper_versions)
+                ]
+            )
         except ConnectionError:
             if not installed_versions:
                 raise ConnectionError("Vyper not installed and cannot connect to GitHub")
@@ -152,13 +162,12 @@ def find_vyper_versions(
 
     available_versions, installed_versions = _get_vyper_version_list()
 
-    pragma_specs: dict[str, semantic_version.NpmSpec] = {}
+    pragma_specs = get_pragma_specs(contract_sources, "Vyper")
     to_install: set[str] = set()
     new_versions: set[str] = set()
 
-    for path, source in contract_sources.items():
-        pragma_specs[path] = sources.get_vyper_pragma_spec(source, path)
-        version = pragma_specs[path].select(installed_versions)
+    for path, pragma_spec in get_unique_specs(pragma_specs).items():
+        version = pragma_spec.select(installed_versions)
 
         if not version and not install_needed and not install_latest:
             raise IncompatibleVyperVersion(
@@ -189,10 +198,13 @@ def find_vyper_versions(
         )
 
     # organize source paths by latest available vyper version
+    selected: dict[str, str] = {}
     compiler_versions: dict[str, list[str]] = {}
     for path, spec in pragma_specs.items():
-        version = spec.select(installed_versions)
-        compiler_versions.setdefault(str(version), []).append(path)
+        pragma = str(spec)
+        if pragma not in selected:
+            selected[pragma] = str(spec.select(installed_versions))
+        compiler_versions.setdefault(selected[pragma], []).append(path)
 
     return compiler_versions
 
@@ -219,9 +231,7 @@ def find_best_vyper_version(
 
     available_versions, installed_versions = _get_vyper_version_list()
 
-    for path, source in contract_sources.items():
-
-        pragma_spec = sources.get_vyper_pragma_spec(source, path)
+    for pragma_spec in get_unique_specs(get_pragma_specs(contract_sources, "Vyper")).values():
         installed_versions = [i for i in installed_versions if i in pragma_spec]
         available_versions = [i for i in available_versions if i in pragma_spec]
 
@@ -264,20 +274,24 @@ def compile_from_input_json(
         for unsupported_output in ("userdoc", "devdoc"):
             if unsupported_output in outputs:
                 outputs.remove(unsupported_output)
-    if version == Version(vyper.__version__):
-        try:
-            return vyper_json.compile_json(input_json)
-        except VyperException as exc:
-            raise exc.with_traceback(None)
-    else:
+
+    def compile_fn() -> dict:
+        if version == Version(vyper.__version__):
+            try:
+                return vyper_json.compile_json(input_json)
+            except VyperException as exc:
+                raise exc.with_traceback(None)
         try:
             # NOTE: vvm uses `packaging.version.Version` which is not compatible with
             #       `semantic_version.Version` so we first must cast it as a string
-            version = str(version)
-            return _vvm_compile_standard(input_json, base_path=allow_paths, vyper_version=version)
+            return _vvm_compile_standard(
+                input_json, base_path=allow_paths, vyper_version=str(version)
+            )
         except vvm.exceptions.VyperError as exc:
             raise CompilerError(exc, "vyper")
 
+    return compile_with_cache(input_json, "Vyper", str(version), compile_fn)
+
 
 def _get_unique_build_json(
     output_evm: dict,
@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Final, final
+
+from brownie._c_constants import sha1, ujson_dumps, ujson_loads
+from brownie.project.artifacts import materialize
+from brownie.typing import ContractBuildJson
+from brownie.utils.sql import Cursor
+
+
+@final
+class DevDeployments:
+    """
+    Registry of the contracts deployed on a development network, used when
+    `dev_deployment_artifacts` is enabled.
+
+    Each deployment is held in memory as (contract name, block height, build
+    hash). Build data is only referenced, and is stored once for each contract
+    name and bytecode regardless of how many times the contract is deployed.
+    Nothing is written to disk until `flush` is called at the end of a session,
+    so deployments that are reverted within a session are never written.
+
+    Arguments
+    ---------
+    path : Path
+        Path of the SQLite database that deployments are flushed to
+    """
+
+    __slots__ = ("path", "_deployments", "_builds", "_saved", "_dirty", "max_height")
+
+    def __init__(self, path: Path) -> None:
+        self.path: Final = path
+        # {address: (contract name, block height, build hash)} in order of deployment
+        self._deployments: Final[dict[str, tuple[str, int, str]]] = {}
+        self._builds: Final[dict[str, ContractBuildJson]] = {}
+        # hashes of the build data that is already stored in the database
+        self._saved: Final[set[str]] = set()
+        self._dirty = False
+        self.max_height = 0
+
+    def __len__(self) -> int:
+        return len(self._deployments)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._deployments
+
+    def add(self, address: str, name: str, height: int, build: ContractBuildJson) -> None:
+        """
+        Record a deployment.
+
+        Arguments
+        ---------
+        address : str
+            Address of the deployed contract
+        name : str
+            Name of the contract
+        height : int
+            Block height that the contract is known to exist at
+        build : dict
+            Build data of the contract
+        """
+        build_hash = sha1(f"{name}:{build.get('bytecode', '')}".encode()).hexdigest()
+        self._builds.setdefault(build_hash, build)
+        # the most recent deployment is always last
+        self._deployments.pop(address, None)
+        self._deployments[address] = (name, height, build_hash)
+        self.max_height = max(self.max_height, height)
+        self._dirty = True
+
+    def remove(self, address: str) -> None:
+        """Remove a deployment, if it is recorded."""
+        if self._deployments.pop(address, None) is not None:
+            self._dirty = True
+
+    def revert(self, height: int) -> None:
+        """Remove the deployments made after a block height."""
+        if self.max_height <= height:
+            return
+        for address, (_, block_height, _) in list(self._deployments.items()):
+            if block_height > height:
+                del self._deployments[address]
+        self.max_height = max((i[1] for i in self._deployments.values()), default=0)
+        self._dirty = True
+
+    def clear(self) -> None:
+        """Remove every deployment, and delete the database."""
+        self._deployments.clear()
+        self._builds.clear()
+        self._saved.clear()
+        self._dirty = False
+        self.max_height = 0
+        self.path.unlink(missing_ok=True)
+
+    def get_map(self) -> dict[str, list[str]]:
+        """Return the deployed addresses as {contract name: [address, ...]}, newest first."""
+        deployment_map: dict[str, list[str]] = {}
+        for address, (name, _, _) in reversed(self._deployments.items()):
+            deployment_map.setdefault(name, []).append(address)
+        return deployment_map
+
+    def load(self) -> list[tuple[str, str, int, ContractBuildJson]]:
+        """
+        Load the deployments stored in the database, replacing those in memory.
+
+        Returns
+        -------
+        list
+            (address, contract name, block height, build data) of each deployment,
+            oldest first
+        """
+        self._deployments.clear()
+        self._builds.clear()
+        self._saved.clear()
+        self._dirty = False
+        self.max_height = 0
+        if not self.path.exists():
+            return []
+        cur = Cursor(self.path)
+        try:
+            rows = cur.fetchall(
+                "SELECT address, name, height, hash FROM deployments ORDER BY rowid"
+            )
+            builds = dict(cur.fetchall("SELECT hash, build FROM builds"))
+        except sqlite3.DatabaseError:
+            # the database is not valid, discard it
+            rows = []
+        finally:
+            cur.close()
+
+        deployments: list[tuple[str, str, int, ContractBuildJson]] = []
+        for address, name, height, build_hash in rows:
+            if build_hash not in builds:
+                continue
+            if build_hash not in self._builds:
+                self._builds[build_hash] = ujson_loads(zlib.decompress(builds[build_hash]))
+                self._saved.add(build_hash)
+            self._deployments[address] = (name, height, build_hash)
+            self.max_height = max(self.max_height, height)
+            deployments.append((address, name, height, self._builds[build_hash]))
+        return deployments
+
+    def flush(self) -> bool:
+        """
+        Write the deployments to the database.
+
+        Returns
+        -------
+        bool
+            True if the deployments changed since they were last written
+        """
+        if not self._dirty:
+            return False
+        used = {i[2] for i in self._deployments.values()}
+        for build_hash in [i for i in self._builds if i not in used]:
+            del self._builds[build_hash]
+            self._saved.discard(build_hash)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        cur = Cursor(self.path)
+        try:
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS deployments (address PRIMARY KEY, name, height, hash)"
+            )
+            cur.execute("CREATE TABLE IF NOT EXISTS builds (hash PRIMARY KEY, build)")
+            # write everything within a single transaction, rather than committing each row
+            cur.execute("BEGIN")
+            try:
+                cur.execute("DELETE FROM deployments")
+                for address, (name, height, build_hash) in self._deployments.items():
+                    cur.insert("deployments", address, name, height, build_hash)
+                for build_hash in used - self._saved:
+                    data = ujson_dumps(materialize(self._builds[build_hash]))
+                    cur.insert("builds", build_hash, zlib.compress(data.encode(), 1))
+                cur.execute("DELETE FROM builds WHERE hash NOT IN (SELECT hash FROM deployments)")
+            except BaseException:
+                # leave the previously written deployments in place
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+        finally:
+            cur.close()
+        self._saved.update(used)
+        self._dirty = False
+        return True
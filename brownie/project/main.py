@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 # mypy: disable-error-code="union-attr"
 
+import atexit
 import os
 import pathlib
 import shutil
@@ -58,10 +59,23 @@ from brownie.network.contract import (
     InterfaceContainer,
     ProjectContract,
 )
-from brownie.network.state import _add_contract, _remove_contract, _revert_register
+from brownie.network.state import (
+    _add_contract,
+    _remove_contract,
+    _revert_register,
+    _revert_unregister,
+)
 from brownie.project import compiler
+from brownie.project.artifacts import (
+    LazyBuildJson,
+    load_compact_artifact,
+    save_compact_artifact,
+    unlink_artifact,
+)
 from brownie.project.build import BUILD_KEYS, INTERFACE_KEYS, Build
-from brownie.project.sources import Sources, get_pragma_spec
+from brownie.project.compiler.cache import get_pragma_specs
+from brownie.project.deployments import DevDeployments
+from brownie.project.sources import Sources
 from brownie.typing import (
     BuildJson,
     CompilerConfig,
@@ -143,6 +157,7 @@ class _ProjectBase:
                 remappings=solc_config.get("remappings", []),
                 optimizer=solc_config.get("optimizer", None),
                 viaIR=solc_config.get("viaIR", None),
+                jobs=CONFIG.argv["jobs"] or compiler_config.get("jobs", 1),
             )
         finally:
             os.chdir(cwd)
@@ -150,6 +165,7 @@ class _ProjectBase:
         build = self._build
         build_path = self._build_path
         for alias, data in build_json.items():
+            path: pathlib.Path | None = None
             if build_path is not None and not data["sourcePath"].startswith("interface"):
                 # interfaces should generate artifact in /build/interfaces/ not /build/contracts/
                 if alias == data["contractName"]:
@@ -162,10 +178,12 @@ class _ProjectBase:
                         parent.mkdir(exist_ok=True)
                 with path.open("w") as fp:
                     ujson_dump(data, fp, sort_keys=True, indent=2, default=sorted)
+                if alias == data["contractName"] and CONFIG.settings["compact_artifacts"]:
+                    save_compact_artifact(path, data)
 
             if alias == data["contractName"]:
                 # only add artifacts from the core project for now
-                build._add_contract(data)
+                build._add_contract(data, path=path)
 
     def _create_containers(self) -> None:
         # create container objects
@@ -226,6 +244,9 @@ class Project(_ProjectBase):
 
         self._name: Final = name
         self._active: bool = False
+        self._dev_deployments: Final = DevDeployments(
+            self._build_path.joinpath("deployments/dev.db")
+        )
         self.load(compile=compile)
 
     def load(self, raise_if_loaded: bool = True, compile: bool = True) -> None:
@@ -252,31 +273,31 @@ class Project(_ProjectBase):
 
         for path in build_path.glob("contracts/*.json"):
             contract_build_json = _load_contract_build_json_from_disk(path)
-            if not set(BUILD_KEYS).issubset(contract_build_json):
-                path.unlink()
+            if not _is_valid_build_json(contract_build_json):
+                unlink_artifact(path)
                 continue
             if path.stem not in contract_list:
                 potential_dependencies.append((path, contract_build_json))
                 continue
             if isinstance(contract_build_json["allSourcePaths"], list):
                 # this handles the format change in v1.7.0, it can be removed in a future release
-                path.unlink()
+                unlink_artifact(path)
                 test_path = build_path.joinpath("tests.json")
                 if test_path.exists():
                     test_path.unlink()
                 continue
             if not project_path.joinpath(contract_build_json["sourcePath"]).exists():
-                path.unlink()
+                unlink_artifact(path)
                 continue
-            build._add_contract(contract_build_json)
+            build._add_contract(contract_build_json, path=path)
 
         for path, contract_build_json in potential_dependencies:
             dependents = build.get_dependents(path.stem)  # type: ignore [arg-type]
             is_dependency = len(set(dependents) & set(contract_list)) > 0
             if is_dependency:
-                build._add_contract(contract_build_json)
+                build._add_contract(contract_build_json, path=path)
             else:
-                path.unlink()
+                unlink_artifact(path)
 
         interface_hashes: dict[str, HexStr] = {}
         interface_list = sources.get_interface_list()
@@ -287,7 +308,7 @@ class Project(_ProjectBase):
                 not set(INTERFACE_KEYS).issubset(interface_build_json)
                 or path.stem not in interface_list
             ):
-                path.unlink()
+                unlink_artifact(path)
                 continue
             build._add_interface(interface_build_json)
             interface_hashes[path.stem] = interface_build_json["sha1"]
@@ -301,6 +322,7 @@ class Project(_ProjectBase):
             changed = self._get_changed_contracts(interface_hashes)
             self._compile(changed, config, False)
             self._compile_interfaces(interface_hashes)
+            self._save_import_graph()
         self._load_dependency_artifacts()
 
         self._create_containers()
@@ -335,31 +357,81 @@ class Project(_ProjectBase):
             if compiled_hashes.get(name) != new_hashes[name]:
                 build._remove_interface(name)
 
-        contracts = {c for c in sources.get_contract_list() if self._compare_build_json(c)}
-        for contract in list(contracts):
-            dependents = build.get_dependents(contract)
-            contracts.update(dependents)
+        # source files that were modified, added or removed since the last compile
+        file_hashes, graph = sources.get_source_hashes(), self._load_import_graph()
+        compiled_files = graph["hashes"]
+        changed = {k for k, v in file_hashes.items() if compiled_files.get(k) != v}
+        changed.update(k for k in compiled_files if k not in file_hashes)
+
+        # contracts with a missing artifact or changed compiler settings
+        contract_list = sources.get_contract_list()
+        changed.update(
+            sources.get_source_path(c)
+            for c in contract_list
+            if self._compare_build_json(c, file_hashes)
+        )
+
+        # every source path that includes a changed file must also be recompiled
+        dependents: dict[str, set[str]] = {}
+        for path, imports in graph["imports"].items():
+            for imported in imports:
+                dependents.setdefault(imported, set()).add(path)
+        for path in list(changed):
+            changed.update(dependents.get(path, ()))
 
         # remove outdated build artifacts
-        for name in contracts:
-            build._remove_contract(name)
+        for name in contract_list:
+            if sources.get_source_path(name) in changed:
+                build._remove_contract(name)
 
         # get final list of changed source paths
-        changed_set = list({sources.get_source_path(contract) for contract in contracts})
-        return dict(zip(changed_set, (sources.get(changed) for changed in changed_set)))
+        changed_set = [i for i in sources.get_path_list() if i in changed]
+        return {path: sources.get(path) for path in changed_set}
+
+    def _load_import_graph(self) -> dict[str, dict]:
+        # load the source file hashes and import graph from the last compile. If it
+        # is not available, it is generated from the existing build artifacts.
+        path = self._build_path.joinpath("imports.json")
+        try:
+            with path.open() as fp:
+                return ujson_load(fp)
+        except (FileNotFoundError, JSONDecodeError):
+            pass
 
-    def _compare_build_json(self, contract_name: ContractName) -> bool:
+        sources = self._sources
+        hashes: dict[str, str] = {}
+        for name, data in self._build.items():
+            try:
+                source_path = data.get("sourcePath") or sources.get_source_path(name, True)
+            except KeyError:
+                continue
+            hashes[source_path] = data["sha1"]
+        return {"hashes": hashes, "imports": self._build.get_import_graph()}
+
+    def _save_import_graph(self) -> None:
+        graph = {
+            "hashes": self._sources.get_source_hashes(),
+            "imports": self._build.get_import_graph(),
+        }
+        with self._build_path.joinpath("imports.json").open("w") as fp:
+            ujson_dump(graph, fp, sort_keys=True, indent=2)
+
+    def _compare_build_json(
+        self, contract_name: ContractName, source_hashes: dict[str, HexStr]
+    ) -> bool:
         config = self._compiler_config
         # confirm that this contract was previously compiled
         try:
-            source = self._sources.get(contract_name)
+            source_path = self._sources.get_source_path(contract_name)
+            source = self._sources.get(source_path)
             build_json: ContractBuildJson = self._build.get(  # type: ignore [assignment]
                 contract_name
             )
         except KeyError:
             return True
         # compare source hashes
-        if build_json["sha1"] != sha1(source.encode()).hexdigest():
+        source_hash = source_hashes.get(source_path) or sha1(source.encode()).hexdigest()
+        if build_json["sha1"] != source_hash:
             return True
         # compare compiler settings
         compiler = build_json["compiler"]
@@ -370,7 +442,8 @@ class Project(_ProjectBase):
             if not _solidity_compiler_equal(solc_config, compiler):
                 return True
             # compare solc pragma against compiled version
-            if Version(compiler["version"]) not in get_pragma_spec(source):
+            pragma_specs = get_pragma_specs({source_path: source}, "Solidity", source_hashes)
+            if Version(compiler["version"]) not in pragma_specs[source_path]:
                 return True
         else:
             if not _vyper_compiler_equal(config["vyper"], compiler):
@@ -419,14 +492,16 @@ class Project(_ProjectBase):
                 for counter in pc_map.values():
                     if "offset" in counter:
                         counter["offset"] = tuple(counter["offset"])
-                build._add_contract(build_json, contract_alias)
+                build._add_contract(build_json, contract_alias, path)
             else:
-                path.unlink()
+                unlink_artifact(path)
 
     def _load_deployments(self) -> None:
-        if CONFIG.network_type != "live" and not CONFIG.settings["dev_deployment_artifacts"]:
+        if CONFIG.network_type != "live":
+            if CONFIG.settings["dev_deployment_artifacts"]:
+                self._load_dev_deployments()
             return
-        chainid = CONFIG.active_network["chainid"] if CONFIG.network_type == "live" else "dev"
+        chainid = CONFIG.active_network["chainid"]
         path = self._build_path.joinpath(f"deployments/{chainid}")
         path.mkdir(exist_ok=True)
         deployments = list(path.glob("*.json"))
@@ -442,16 +517,8 @@ class Project(_ProjectBase):
             if contract_name not in self._containers:
                 build_json.unlink()
                 continue
-            if "pcMap" in build:
-                contract = ProjectContract(self, build, build_json.stem)
-            else:
-                contract = Contract.from_abi(  # type: ignore [assignment]
-                    contract_name, build_json.stem, build["abi"]
-                )
-                contract._project = self
-            container = self._containers[contract_name]
-            _add_contract(contract)
-            container._contracts.append(contract)
+            deployment: dict = build.get("deployment", {})  # type: ignore [misc]
+            self._add_deployed_contract(build, build_json.stem, deployment.get("blockHeight"))
 
             # update deployment map for the current chain
             instances = deployment_map.setdefault(chainid, {}).setdefault(contract_name, [])
@@ -461,6 +528,29 @@ class Project(_ProjectBase):
 
         self._save_deployment_map(deployment_map)
 
+    def _load_dev_deployments(self) -> None:
+        registry = self._dev_deployments
+        for address, contract_name, height, build in registry.load():
+            if contract_name not in self._containers:
+                registry.remove(address)
+                continue
+            self._add_deployed_contract(build, address, height)
+        self._flush_dev_deployments()
+
+    def _add_deployed_contract(self, build: BuildJson, address: str, height: int | None) -> None:
+        contract_name = build["contractName"]
+        if "pcMap" in build:
+            contract = ProjectContract(self, build, address)
+        else:
+            contract = Contract.from_abi(  # type: ignore [assignment]
+                contract_name, address, build["abi"]
+            )
+            contract._project = self
+        container = self._containers[contract_name]
+        _add_contract(contract)
+        container._contracts.append(contract)
+        container._set_height(contract, height)
+
     def _load_deployment_map(self) -> DeploymentMap:
         deployment_map = {}
         map_path = self._build_path.joinpath("deployments/map.json")
@@ -474,9 +564,9 @@ class Project(_ProjectBase):
             ujson_dump(deployment_map, fp, sort_keys=True, indent=2, default=sorted)
 
     def _remove_from_deployment_map(self, contract: ProjectContract) -> None:
-        if CONFIG.network_type != "live" and not CONFIG.settings["dev_deployment_artifacts"]:
+        if CONFIG.network_type != "live":
             return
-        chainid = CONFIG.active_network["chainid"] if CONFIG.network_type == "live" else "dev"
+        chainid = CONFIG.active_network["chainid"]
         deployment_map = self._load_deployment_map()
         try:
             deployment_map[chainid][contract._name].remove(contract.address)
@@ -490,10 +580,10 @@ class Project(_ProjectBase):
         self._save_deployment_map(deployment_map)
 
     def _add_to_deployment_map(self, contract: ProjectContract) -> None:
-        if CONFIG.network_type != "live" and not CONFIG.settings["dev_deployment_artifacts"]:
+        if CONFIG.network_type != "live":
             return
 
-        chainid = CONFIG.active_network["chainid"] if CONFIG.network_type == "live" else "dev"
+        chainid = CONFIG.active_network["chainid"]
         deployment_map = self._load_deployment_map()
         try:
             deployment_map[chainid][contract._name].remove(contract.address)
@@ -553,6 +643,8 @@ class Project(_ProjectBase):
                 if v == self or (k in self and v == self[k]):  # type: ignore [operator, index]
                     del dict_[k]
 
+        self._flush_dev_deployments()
+
         # remove contracts
         for container in self._containers.values():
             for contract in container._contracts:
@@ -568,6 +660,7 @@ class Project(_ProjectBase):
         sys.modules["brownie.project"].__console_dir__.remove(name)
         self._active = False
         _loaded_projects.remove(self)
+        _revert_unregister(self)
 
         # clear paths
         try:
@@ -575,29 +668,32 @@ class Project(_ProjectBase):
         except ValueError:
             pass
 
-    def _clear_dev_deployments(self, height: int) -> None:
-        path = self._build_path.joinpath("deployments/dev")
-        if path.exists():
-            deployment_map = self._load_deployment_map()
-            for deployment in path.glob("*.json"):
-                if height == 0:
-                    deployment.unlink()
-                else:
-                    with deployment.open("r") as fp:
-                        deployment_artifact: dict = ujson_load(fp)
-                    block_height = deployment_artifact["deployment"]["blockHeight"]
-                    if block_height > height:
-                        deployment.unlink()
-                        address = deployment_artifact["deployment"]["address"]
-                        contract_name = deployment_artifact["contractName"]
-                        try:
-                            deployment_map["dev"][contract_name].remove(address)
-                        except (KeyError, ValueError):
-                            pass
-            if "dev" in deployment_map and (height == 0 or not deployment_map["dev"]):
-                del deployment_map["dev"]
-                shutil.rmtree(path)
+    def _add_dev_deployment(self, contract: ProjectContract, height: int) -> None:
+        self._dev_deployments.add(contract.address, contract._name, height, contract._build)
+
+    def _remove_dev_deployment(self, contract: ProjectContract) -> None:
+        self._dev_deployments.remove(contract.address)
+
+    def _flush_dev_deployments(self) -> None:
+        # write dev deployments to disk, and update the deployment map to match
+        if not self._dev_deployments.flush():
+            return
+        deployment_map = self._load_deployment_map()
+        deployment_map.pop("dev", None)
+        if dev_map := self._dev_deployments.get_map():
+            deployment_map["dev"] = dev_map  # type: ignore [assignment]
+        self._save_deployment_map(deployment_map)
 
+    def _clear_dev_deployments(self, height: int) -> None:
+        if height:
+            self._dev_deployments.revert(height)
+            return
+        self._dev_deployments.clear()
+        # remove the per-deployment artifacts saved by earlier versions
+        shutil.rmtree(self._build_path.joinpath("deployments/dev"), ignore_errors=True)
+        deployment_map = self._load_deployment_map()
+        if "dev" in deployment_map:
+            del deployment_map["dev"]
             self._save_deployment_map(deployment_map)
 
     def _revert(self, height: int) -> None:
@@ -608,6 +704,18 @@ class Project(_ProjectBase):
 
 
 def _load_contract_build_json_from_disk(path: pathlib.Path) -> ContractBuildJson:
+    if CONFIG.settings["compact_artifacts"]:
+        build_json = load_compact_artifact(path)
+        if build_json is not None:
+            return build_json
+        build_json = _load_json_build_json(path)
+        if set(BUILD_KEYS).issubset(build_json):
+            save_compact_artifact(path, build_json)
+        return build_json
+    return _load_json_build_json(path)
+
+
+def _load_json_build_json(path: pathlib.Path) -> ContractBuildJson:
     try:
         with path.open() as fp:
             contract_build_json: dict = ujson_load(fp)
@@ -623,6 +731,13 @@ def _load_contract_build_json_from_disk(path: pathlib.Path) -> ContractBuildJson
         return {}  # type: ignore [return-value]
 
 
+def _is_valid_build_json(build_json: ContractBuildJson) -> bool:
+    if isinstance(build_json, LazyBuildJson):
+        # compact artifacts are only saved for valid build data
+        return True
+    return set(BUILD_KEYS).issubset(build_json)
+
+
 def _load_interface_build_json_from_disk(path: pathlib.Path) -> InterfaceBuildJson:
     try:
         with path.open() as fp:
@@ -682,6 +797,15 @@ def get_loaded_projects() -> list["Project"]:
     return _loaded_projects.copy()
 
 
+def _flush_dev_deployments() -> None:
+    # dev deployments are held in memory until the end of the session
+    for project in _loaded_projects:
+        project._flush_dev_deployments()
+
+
+atexit.register(_flush_dev_deployments)
+
+
 def new(
     project_path_str: str = ".", ignore_subfolder: bool = False, ignore_existing: bool = False
 ) -> str:
@@ -23,6 +23,9 @@ class Sources:
         self._contracts: Final[dict[ContractName, str]] = {}
         self._interface_sources: Final[dict[str, str]] = {}
         self._interfaces: Final[dict[ContractName, str]] = {}
+        # paths of the project's own source files, excluding any sources from
+        # outside the project that are later loaded by `get`
+        self._project_paths: Final = (*contract_sources, *interface_sources)
 
         contracts: dict[ContractName, tuple[str, str]] = {}
         collisions: dict[ContractName, set[str]] = {}
@@ -106,6 +109,13 @@ class Sources:
             for k, v in self._interfaces.items()
         }
 
+    def get_source_hashes(self) -> dict[str, HexStr]:
+        """Returns a dict of hashes for every project source file in the form of {path: hash}"""
+        return {
+            path: sha1(self.get(path).encode()).hexdigest()  # type: ignore [misc]
+            for path in self._project_paths
+        }
+
     def get_interface_sources(self) -> dict[str, str]:
         """Returns a dict of interfaces sources in the form {path: source}"""
         return {v: self._interface_sources[v] for v in self._interfaces.values()}
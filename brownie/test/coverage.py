@@ -1,13 +1,22 @@
 #!/usr/bin/python3
 
-from typing import Final, NewType
+import marshal
+import pathlib
+import zlib
+from collections.abc import Iterable
+from typing import Any, Final, NewType, TypeAlias
 
 from eth_typing import HexStr
 
-from brownie._c_constants import deepcopy
 from brownie.typing import ContractName, IntegerString
 
-CoverageEval = NewType("CoverageEval", dict[ContractName, dict[IntegerString, dict[int, set]]])
+# Coverage for a single source path of a contract is held as three bitmaps, one
+# for each of: statements, branches that evaluated false, branches that evaluated
+# true. Bit `n` of a bitmap is set when the item with coverage map id `n` was hit.
+Bitmaps: TypeAlias = tuple[int, int, int]
+CoverageEval = NewType("CoverageEval", dict[ContractName, dict[IntegerString, Bitmaps]])
+
+MAGIC: Final = b"BRWNCOV1"
 
 # Coverage evaluation is stored on a per-tx basis. We use a special "coverage hash"
 # with additional inforarmation included to ensure no two transactions will produce
@@ -28,7 +37,7 @@ _cached_coverage_eval: Final[dict[str, CoverageEval]] = {}
 _active_module_coverage_hashes: Final[set[HexStr]] = set()
 
 
-def get_coverage_eval() -> dict[str, dict]:
+def get_coverage_eval() -> dict[str, CoverageEval]:
     """Returns all coverage data, active and cached."""
     return {**_cached_coverage_eval, **_coverage_eval}
 
@@ -40,24 +49,106 @@ def get_merged_coverage_eval(cov_eval: dict[str, CoverageEval] | None = None) ->
     """
     if cov_eval is None:
         cov_eval = _coverage_eval
-    if not cov_eval:
-        return {}  # type: ignore [return-value]
-    coverage_eval_list = list(cov_eval.values())
-    merged_eval = deepcopy(coverage_eval_list.pop())
-    for coverage_eval in coverage_eval_list:
-        for name in coverage_eval:
+    merged_eval: dict[ContractName, dict[IntegerString, Bitmaps]] = {}
+    for coverage_eval in cov_eval.values():
+        for name, paths in coverage_eval.items():
             if name not in merged_eval:
-                merged_eval[name] = coverage_eval[name]
+                merged_eval[name] = dict(paths)
                 continue
             eval_for_name = merged_eval[name]
-            for path, map_ in coverage_eval[name].items():
+            for path, bitmaps in paths.items():
                 if path not in eval_for_name:
-                    eval_for_name[path] = map_
+                    eval_for_name[path] = bitmaps
                     continue
-                eval_for_path = eval_for_name[path]
-                for i in range(3):
-                    eval_for_path[i] = set(eval_for_path[i]).union(map_[i])
-    return merged_eval
+                stmts, false, true = eval_for_name[path]
+                eval_for_name[path] = (stmts | bitmaps[0], false | bitmaps[1], true | bitmaps[2])
+    return CoverageEval(merged_eval)
+
+
+def to_bitmap(ids: Iterable[int]) -> int:
+    """Returns a bitmap with the bit for each of the given coverage map ids set."""
+    bitmap = 0
+    for i in ids:
+        bitmap |= 1 << i
+    return bitmap
+
+
+def from_bitmap(bitmap: int) -> list[int]:
+    """Returns a sorted list of the coverage map ids that are set in a bitmap."""
+    return [i for i, bit in enumerate(bin(bitmap)[:1:-1]) if bit == "1"]
+
+
+def is_set(bitmap: int, idx: int | str) -> bool:
+    """Checks if the bit for a coverage map id is set in a bitmap."""
+    return bool(bitmap >> int(idx) & 1)
+
+
+def save_coverage_eval(path: pathlib.Path, cov_eval: dict[str, CoverageEval]) -> None:
+    """
+    Saves per-transaction coverage data to a compact binary file.
+
+    Identical evaluations are only stored once, and the result is compressed.
+
+    Arguments
+    ---------
+    path : Path
+        Path to save the data at
+    cov_eval : dict
+        Coverage data as {coverage hash: coverage eval}
+    """
+    evals: list[Any] = []
+    indexes: dict[bytes, int] = {}
+    tx: dict[str, int] = {}
+    for coverage_hash, coverage_eval in cov_eval.items():
+        data = marshal.dumps(coverage_eval)
+        if data not in indexes:
+            indexes[data] = len(evals)
+            evals.append(coverage_eval)
+        tx[coverage_hash] = indexes[data]
+    with path.open("wb") as fp:
+        fp.write(MAGIC + zlib.compress(marshal.dumps((evals, tx)), 1))
+
+
+def load_coverage_eval(path: pathlib.Path) -> dict[str, CoverageEval]:
+    """
+    Loads per-transaction coverage data saved with `save_coverage_eval`.
+
+    Arguments
+    ---------
+    path : Path
+        Path of the saved data
+
+    Returns
+    -------
+    dict
+        Coverage data as {coverage hash: coverage eval}, or an empty dict if the
+        file does not exist or is not valid
+    """
+    try:
+        with path.open("rb") as fp:
+            data = fp.read()
+    except OSError:
+        return {}
+    if not data.startswith(MAGIC):
+        return {}
+    try:
+        evals, tx = marshal.loads(zlib.decompress(data[len(MAGIC) :]))
+    except (EOFError, ValueError, TypeError, zlib.error):
+        return {}
+    return {k: evals[v] for k, v in tx.items()}
+
+
+def _from_lists(coverage_eval: dict[str, dict[str, list[list[int]]]]) -> CoverageEval:
+    # Convert coverage data from the set-based format used by earlier versions
+    return CoverageEval(
+        {
+            ContractName(name): {
+                IntegerString(path): (to_bitmap(v[0]), to_bitmap(v[1]), to_bitmap(v[2]))
+                for path, v in paths.items()
+            }
+            for name, paths in coverage_eval.items()
+        }
+    )
 
 
 def clear() -> None:
@@ -46,12 +46,21 @@ class PytestBrownieBase:
         )
         key_func = compose(self._path, attrgetter("parent"))
         self.conf_hashes = dict(zip(map(key_func, glob), map(_get_ast_hash, glob)))
+        build_path = self.project._build_path
         try:
-            with self.project._build_path.joinpath("tests.json").open() as fp:
+            with build_path.joinpath("tests.json").open() as fp:
                 hashes = ujson_load(fp)
         except (FileNotFoundError, JSONDecodeError):
-            hashes = {"tests": {}, "contracts": {}, "tx": {}}
-
+            hashes = {"tests": {}, "contracts": {}}
+        tx = coverage.load_coverage_eval(build_path.joinpath("coverage.bin"))
+        if "tx" in hashes:
+            # coverage data saved as JSON by an earlier version
+            tx.update((k, coverage._from_lists(v)) for k, v in hashes["tx"].items())
+
+        # durations and transaction counts from previous runs, including changed modules
+        self.timings = {
+            k: (v.get("duration") or {}, v.get("txcount")) for k, v in hashes["tests"].items()
+        }
         self.tests = {
             k: v
             for k, v in hashes["tests"].items()
@@ -63,7 +72,7 @@ class PytestBrownieBase:
             for k, v in hashes["contracts"].items()
             if k not in self.contracts or v != self.contracts[k]
         }:
-            for txhash, coverage_eval in hashes["tx"].items():
+            for txhash, coverage_eval in tx.items():
                 if not changed_contracts.intersection(coverage_eval.keys()):
                     coverage._add_cached_transaction(txhash, coverage_eval)
             self.tests = {
@@ -72,7 +81,7 @@ class PytestBrownieBase:
                 if v["isolated"] is not False and not changed_contracts.intersection(v["isolated"])
             }
         else:
-            for txhash, coverage_eval in hashes["tx"].items():
+            for txhash, coverage_eval in tx.items():
                 coverage._add_cached_transaction(txhash, coverage_eval)
 
     def _reduce_path_strings(self, text):
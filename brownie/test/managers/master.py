@@ -1,13 +1,13 @@
 #!/usr/bin/python3
 
 import pytest
-from xdist.scheduler import LoadFileScheduling
 
 from brownie._c_constants import ujson_dump, ujson_load
 from brownie._config import CONFIG
 from brownie.test import coverage
 
 from .base import PytestBrownieBase
+from .scheduler import PytestBrownieScheduling
 
 
 class PytestBrownieMaster(PytestBrownieBase):
@@ -30,10 +30,30 @@ class PytestBrownieMaster(PytestBrownieBase):
         """
         Return a node scheduler implementation.
 
-        Uses file scheduling to ensure consistent test execution with module-level
-        isolation.
+        Schedules whole test modules to ensure consistent test execution with
+        module-level isolation, balanced using the cost of each module in
+        previous runs.
         """
-        return LoadFileScheduling(config, log)
+        return PytestBrownieScheduling(config, log, self._get_module_costs())
+
+    def _get_module_costs(self):
+        # estimate the cost of each module in the current mode. when a module has only
+        # run in the other mode, use the cost per transaction of modules that have
+        # run in the current mode.
+        mode = "coverage" if CONFIG.argv["coverage"] else "default"
+        measured = [(v[0][mode], v[1]) for v in self.timings.values() if mode in v[0] and v[1]]
+        num_tx = sum(i[1] for i in measured)
+        tx_cost = sum(i[0] for i in measured) / num_tx if num_tx else None
+
+        costs = {}
+        for path, (duration, txcount) in self.timings.items():
+            if mode in duration:
+                costs[path] = duration[mode]
+            elif tx_cost is not None and txcount:
+                costs[path] = tx_cost * txcount
+            elif duration:
+                costs[path] = max(duration.values())
+        return costs
 
     def pytest_xdist_node_collection_finished(self, ids):
         """
@@ -58,6 +78,8 @@ class PytestBrownieMaster(PytestBrownieBase):
 
         * Aggregates results from `build/tests-{workerid}.json` files and stores
           them as `build/test.json`.
+        * Aggregates coverage data from `build/coverage-{workerid}.bin` files and
+          stores it as `build/coverage.bin`.
         """
         if session.testscollected == 0:
             raise pytest.UsageError(
@@ -68,19 +90,25 @@ class PytestBrownieMaster(PytestBrownieBase):
         build_path = self.project._build_path
 
         # aggregate worker test results
-        report = {"tests": {}, "contracts": self.contracts, "tx": {}}
+        report = {"tests": {}, "contracts": self.contracts}
         for path in list(build_path.glob("tests-*.json")):
             with path.open() as fp:
                 data = ujson_load(fp)
             assert data["contracts"] == report["contracts"]
             report["tests"].update(data["tests"])
-            report["tx"].update(data["tx"])
+            path.unlink()
+
+        # aggregate worker coverage results
+        tx = {}
+        for path in list(build_path.glob("coverage-*.bin")):
+            tx.update(coverage.load_coverage_eval(path))
             path.unlink()
 
         # store worker coverage results - these are used in `pytest_terminal_summary`
-        for hash_, coverage_eval in report["tx"].items():
+        for hash_, coverage_eval in tx.items():
             coverage._add_transaction(hash_, coverage_eval)
 
         # save aggregate test results
         with build_path.joinpath("tests.json").open("w") as fp:
             ujson_dump(report, fp, indent=2, sort_keys=True, default=sorted)
+        coverage.save_coverage_eval(build_path.joinpath("coverage.bin"), tx)
@@ -14,7 +14,7 @@ from brownie._c_constants import regex_compile, regex_fullmatch, ujson_dump
 from brownie._cli.console import Console
 from brownie._config import CONFIG
 from brownie.exceptions import VirtualMachineError
-from brownie.network.state import _get_current_dependencies
+from brownie.network.state import TxHistory, _get_current_dependencies
 from brownie.test import coverage, output
 from brownie.utils import color
 from brownie.utils._color import yellow
@@ -163,6 +163,10 @@ class PytestBrownieRunner(PytestBrownieBase):
         self.printer = None
         if config.getoption("capture") == "no":
             self.printer = PytestPrinter()
+        # time spent and transactions made in each module during this run
+        self.durations = {}
+        self.tx_counts = {}
+        self.ran = set()
 
     def pytest_generate_tests(self, metafunc):
         """
@@ -322,6 +326,7 @@ class PytestBrownieRunner(PytestBrownieBase):
         of executing a test.
 
         * Updates isolation data for the given test module
+        * Records the time spent and transactions made in the test module
         * Stores the outcome of the test in `self.results`
         * During teardown of the final test in a given module, resets coverage
           data and records results for that module in `self.tests`
@@ -334,6 +339,13 @@ class PytestBrownieRunner(PytestBrownieBase):
         path, test_id = self._test_id(report.nodeid)
         idx = self.node_map[path].index(test_id)
 
+        # record time spent, and the transaction count when the module starts
+        if report.when == "setup" and idx == 0:
+            self.tx_counts[path] = TxHistory()._count
+        self.durations[path] = self.durations.get(path, 0.0) + report.duration
+        if report.when == "call":
+            self.ran.add(path)
+
         # update module isolation data
         if path in self.isolated:
             self.isolated[path].update(
@@ -360,6 +372,14 @@ class PytestBrownieRunner(PytestBrownieBase):
             # a previous run, retain the previous data
             txhash = self.tests[path]["txhash"]
 
+        # record timings for the current mode, retaining those of a previous run if
+        # every test was skipped
+        duration, txcount = self.timings.get(path, ({}, None))
+        duration = dict(duration)
+        if path in self.ran:
+            duration["coverage" if CONFIG.argv["coverage"] else "default"] = self.durations[path]
+            txcount = TxHistory()._count - self.tx_counts.get(path, 0)
+
         # save module test results
         isolated = sorted(self.isolated[path]) if path in self.isolated else False
         is_cov = CONFIG.argv["coverage"] or (path in self.tests and self.tests[path]["coverage"])
@@ -369,6 +389,8 @@ class PytestBrownieRunner(PytestBrownieBase):
             "coverage": is_cov,
             "txhash": txhash,
             "results": "".join(self.results[path]),
+            "duration": duration,
+            "txcount": txcount,
         }
 
     @pytest.hookimpl(hookwrapper=True)
@@ -497,18 +519,21 @@ class PytestBrownieRunner(PytestBrownieBase):
         Called after whole test run finished, right before returning the exit
         status to the system.
 
-        Stores test results in `build/tests.json`.
+        Stores test results in `build/tests.json` and coverage data in
+        `build/coverage.bin`.
         """
-        self._sessionfinish("tests.json")
+        self._sessionfinish("tests.json", "coverage.bin")
 
-    def _sessionfinish(self, path):
-        # store test results at the given path
+    def _sessionfinish(self, path, coverage_path):
+        # store test results and coverage data at the given paths
         txhash = {x for v in self.tests.values() for x in v["txhash"]}
         coverage_eval = keyfilter(txhash.__contains__, coverage.get_coverage_eval())
-        report = {"tests": self.tests, "contracts": self.contracts, "tx": coverage_eval}
+        report = {"tests": self.tests, "contracts": self.contracts}
 
-        with self.project._build_path.joinpath(path).open("w") as fp:
+        build_path = self.project._build_path
+        with build_path.joinpath(path).open("w") as fp:
             ujson_dump(report, fp, indent=2, sort_keys=True, default=sorted)
+        coverage.save_coverage_eval(build_path.joinpath(coverage_path), coverage_eval)
 
     def pytest_terminal_summary(self, terminalreporter):
         """
@@ -565,8 +590,9 @@ class PytestBrownieXdistRunner(PytestBrownieRunner):
         Called after whole test run finished, right before returning the exit
         status to the system.
 
-        Stores test results in `build/tests-{workerid}.json`. Each of these files
-        is then aggregated in `PytestBrownieMaster.pytest_sessionfinish`.
+        Stores test results in `build/tests-{workerid}.json` and coverage data in
+        `build/coverage-{workerid}.bin`. Each of these files is then aggregated in
+        `PytestBrownieMaster.pytest_sessionfinish`.
         """
         self.tests = keyfilter(self.results.__contains__, self.tests)
-        self._sessionfinish(f"tests-{self.workerid}.json")
+        self._sessionfinish(f"tests-{self.workerid}.json", f"coverage-{self.workerid}.bin")
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+
+from xdist.scheduler import LoadScopeScheduling
+
+
+class PytestBrownieScheduling(LoadScopeScheduling):
+    """
+    Distributes test modules across xdist workers, using the cost of each module
+    as measured in previous runs.
+
+    Each test module is a single work unit, so all tests within an isolated
+    module run on the same worker. Units are assigned longest first. Once every
+    unit has been assigned, a worker that runs out of work steals the most
+    recently assigned unit that has not started from the worker with the most
+    remaining work.
+
+    Arguments
+    ---------
+    config : pytest.Config
+        Pytest config object
+    log : Producer
+        xdist log producer
+    costs : dict
+        Estimated cost of each test module as {path: seconds}. Modules without
+        an estimate are given the average cost per test of the other modules.
+    """
+
+    def __init__(self, config, log=None, costs=None):
+        super().__init__(config, log)
+        self.costs = costs or {}
+        self.unit_costs = {}
+        # outstanding steal requests as {victim node: (thief node, scope)}
+        self.steals = {}
+        self.thieves = set()
+        # (victim node, scope) of steal requests that were refused
+        self.refused = set()
+
+    def _split_scope(self, nodeid):
+        # one work unit per test module
+        return nodeid.split("::", 1)[0]
+
+    def _assign_work_unit(self, node):
+        if not self.unit_costs:
+            self._order_workqueue()
+        super()._assign_work_unit(node)
+
+    def _order_workqueue(self):
+        # estimate the cost of each unit and sort the queue so the longest unit is first
+        known = [(self.costs[k], len(v)) for k, v in self.workqueue.items() if k in self.costs]
+        num_tests = sum(i[1] for i in known)
+        test_cost = sum(i[0] for i in known) / num_tests if num_tests else 1.0
+        for scope, work_unit in self.workqueue.items():
+            cost = self.costs.get(scope)
+            self.unit_costs[scope] = len(work_unit) * test_cost if cost is None else cost
+
+        items = sorted(self.workqueue.items(), key=lambda i: -self.unit_costs[i[0]])
+        self.workqueue.clear()
+        self.workqueue.update(items)
+
+    def _remaining_cost(self, node):
+        # estimated cost of the work that is yet to run on a node
+        return sum(
+            self.unit_costs.get(scope, 0) * list(unit.values()).count(False) / len(unit)
+            for scope, unit in self.assigned_work[node].items()
+        )
+
+    def _unstarted_units(self, node):
+        # units that are queued on a node behind the one it is running
+        units = [k for k, v in self.assigned_work[node].items() if not all(v.values())]
+        return [k for k in units[1:] if not any(self.assigned_work[node][k].values())]
+
+    def _reschedule(self, node):
+        if node.shutting_down or node in self.thieves:
+            return
+        if self.workqueue:
+            super()._reschedule(node)
+            return
+        if self._pending_of(self.assigned_work[node]) > 2:
+            return
+        if not self._steal(node):
+            node.shutdown()
+
+    def _steal(self, node):
+        # request an unstarted unit from the node with the most remaining work
+        victims = sorted(
+            (i for i in self.nodes if i is not node and i not in self.steals),
+            key=self._remaining_cost,
+            reverse=True,
+        )
+        for victim in victims:
+            units = [i for i in self._unstarted_units(victim) if (victim, i) not in self.refused]
+            if not units:
+                continue
+            scope = units[-1]
+            collection = self.registered_collections[victim]
+            indices = [collection.index(i) for i in self.assigned_work[victim][scope]]
+            self.steals[victim] = (node, scope)
+            self.thieves.add(node)
+            victim.send_steal(indices)
+            return True
+        return False
+
+    def remove_pending_tests_from_node(self, node, indices):
+        """
+        Called when a node responds to a steal request.
+
+        Steals are all or nothing, so either the entire unit was removed from
+        the node and is assigned to the thief, or nothing was removed.
+        """
+        if node not in self.steals:
+            return
+        thief, scope = self.steals.pop(node)
+        self.thieves.discard(thief)
+        if indices:
+            self.workqueue[scope] = self.assigned_work[node].pop(scope)
+        else:
+            # the node has already started the unit
+            self.refused.add((node, scope))
+        if thief in self.assigned_work:
+            if self.workqueue and not thief.shutting_down:
+                self._assign_work_unit(thief)
+            else:
+                self._reschedule(thief)
+        for other in self.nodes:
+            # if the thief is gone, another node picks up the unit
+            if self.workqueue:
+                self._reschedule(other)
+
+    def remove_node(self, node):
+        steal = self.steals.pop(node, None)
+        self.thieves.discard(node)
+        crashitem = super().remove_node(node)
+        if steal is not None:
+            thief = steal[0]
+            self.thieves.discard(thief)
+            if thief in self.assigned_work:
+                self._reschedule(thief)
+        return crashitem
@@ -14,7 +14,7 @@ from brownie.typing import ContractName, CoverageMap
 from brownie.utils import color
 from brownie.utils._color import bright_green, bright_magenta, bright_red, bright_yellow
 
-from .coverage import CoverageEval
+from .coverage import Bitmaps, CoverageEval, is_set
 
 COVERAGE_COLORS: Final[list[tuple[float, str]]] = [
     (0.8, bright_red),
@@ -227,7 +227,7 @@ def _get_totals(
 
 def _split_by_fn(
     build: Build,
-    coverage_eval: dict[ContractName, dict[str, dict[int, set[int]]]],
+    coverage_eval: CoverageEval,
 ) -> dict[ContractName, dict[str, dict[str, tuple[list[int], list[int], list[int]]]]]:
     # Splits a coverage eval dict so that coverage indexes are stored by function.
     results: dict[ContractName, dict[str, dict[str, Any]]] = {
@@ -243,21 +243,18 @@ def _split_by_fn(
 
 
 def _split(
-    coverage_eval: dict[int, set[int]],
+    coverage_eval: Bitmaps,
     coverage_map: CoverageMap,
     key: str,
 ) -> dict[str, tuple[list[int], list[int], list[int]]]:
     branches = coverage_map["branches"][key]
     statements = coverage_map["statements"][key]
-    # not too sure what to call these but we don't want to getitem repeatedly
-    first_eval = coverage_eval[0]
-    second_eval = coverage_eval[1]
-    third_eval = coverage_eval[2]
+    statement_bits, false_bits, true_bits = coverage_eval
     return {
         fn: (
-            [i for i in statements[fn] if int(i) in first_eval],
-            [i for i in branches[fn] if int(i) in second_eval],
-            [i for i in branches[fn] if int(i) in third_eval],
+            [i for i in statements[fn] if is_set(statement_bits, i)],
+            [i for i in branches[fn] if is_set(false_bits, i)],
+            [i for i in branches[fn] if is_set(true_bits, i)],
         )
         for fn in branches.keys() & statements.keys()
     }
@@ -331,7 +328,7 @@ def _get_highlights(build, coverage_eval) -> dict[str, dict[str, dict[str, list]
 
 
 def _statement_highlights(
-    coverage_eval: dict[str, dict[int, set]],
+    coverage_eval: dict[str, Bitmaps],
     coverage_map: dict[str, dict[str, dict[int, Any]]],
 ) -> dict[str, list]:
     results: dict[str, list] = {i: [] for i in coverage_map}
@@ -346,16 +343,16 @@ def _statement_highlights(
 
 def _statement_color(
     i: int,
-    coverage_eval: dict[str, dict[int, set]],
+    coverage_eval: dict[str, Bitmaps],
     path: str,
 ) -> str:
-    if path in coverage_eval and int(i) in coverage_eval[path][0]:
+    if path in coverage_eval and is_set(coverage_eval[path][0], i):
         return "green"
     return "red"
 
 
 def _branch_highlights(
-    coverage_eval: dict[str, dict[int, set]],
+    coverage_eval: dict[str, Bitmaps],
     coverage_map: dict[str, dict[str, dict[int, Any]]],
 ) -> dict[str, list]:
     results: dict[str, list] = {i: [] for i in coverage_map}
@@ -370,17 +367,17 @@ def _branch_highlights(
 
 def _branch_color(
     i: int,
-    coverage_eval: dict[str, dict[int, set]],
+    coverage_eval: dict[str, Bitmaps],
     path: str,
     jump: None,
 ) -> str:
     if path not in coverage_eval:
         return "red"
     coverage_eval_for_path = coverage_eval[path]
-    if i in coverage_eval_for_path[2]:
-        if i in coverage_eval_for_path[1]:
+    if is_set(coverage_eval_for_path[2], i):
+        if is_set(coverage_eval_for_path[1], i):
             return "green"
         return "yellow" if jump else "orange"
-    if i in coverage_eval_for_path[1]:
+    if is_set(coverage_eval_for_path[1], i):
         return "orange" if jump else "yellow"
     return "red"
@@ -162,6 +162,7 @@ class VyperConfig(TypedDict):
 @final
 class CompilerConfig(TypedDict):
     evm_version: EvmVersion | None
+    jobs: NotRequired[int | None]
     solc: NotRequired[SolcConfig]
     vyper: VyperConfig
     version: NotRequired[str]
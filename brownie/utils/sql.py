@@ -2,6 +2,7 @@
 
 import sqlite3
 import threading
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import Any, Final, final
 
@@ -30,6 +31,23 @@ class Cursor:
                 f"INSERT OR REPLACE INTO {table} VALUES ({','.join('?'*len(encoded))})", encoded
             )
 
+    def insert_many(self, table: str, rows: Iterable[Sequence[Any]]) -> None:
+        # insert within a single transaction, holding the lock so that statements
+        # from other threads are not made part of it
+        with self._lock:
+            self._execute("BEGIN")
+            try:
+                for values in rows:
+                    encoded = [ujson_dumps(i) if isinstance(i, (dict, list)) else i for i in values]
+                    self._execute(
+                        f"INSERT OR REPLACE INTO {table} VALUES ({','.join('?'*len(encoded))})",
+                        encoded,
+                    )
+            except BaseException:
+                self._execute("ROLLBACK")
+                raise
+            self._execute("COMMIT")
+
     def execute(self, cmd: str, *args: Any) -> None:
         with self._lock:
             self._execute(cmd, *args)
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+
+import pytest
+from faster_eth_abi import encode
+
+from brownie.convert.codec import FunctionCodec
+from brownie.convert.datatypes import EthAddress, HexString, ReturnValue
+from brownie.convert.normalize import compile_plan, format_input
+
+inputs = [
+    {"name": "num", "type": "uint256"},
+    {
+        "name": "structs",
+        "type": "tuple[]",
+        "components": [
+            {"name": "addr", "type": "address"},
+            {"name": "hashes", "type": "bytes32[2]"},
+        ],
+    },
+    {"name": "flag", "type": "bool"},
+]
+outputs = [
+    {
+        "name": "result",
+        "type": "tuple",
+        "components": [{"name": "x", "type": "int8"}, {"name": "y", "type": "bytes"}],
+    },
+    {"name": "values", "type": "uint16[]"},
+]
+args = (5, [("0x" + "22" * 20, ["0x01", "0x02"])], True)
+
+
+@pytest.fixture
+def codec():
+    yield FunctionCodec("foo", inputs, outputs)
+
+
+def test_encode_input(codec):
+    types = ["uint256", "(address,bytes32[2])[]", "bool"]
+    abi = {"name": "foo", "inputs": inputs}
+    assert codec.encode_input(args) == encode(types, format_input(abi, args))
+
+
+def test_decode_input(codec):
+    decoded = codec.decode_input(codec.encode_input(args))
+    assert decoded == [5, [["0x" + "22" * 20, ["0x01", "0x02"]]], True]
+    assert isinstance(decoded[1][0][0], EthAddress)
+    assert isinstance(decoded[1][0][1][0], HexString)
+
+
+def test_decode_output(codec):
+    result = codec.decode_output(encode(["(int8,bytes)", "uint16[]"], [(-3, b"\x01"), [1, 2]]))
+    assert isinstance(result, ReturnValue)
+    assert result.dict() == {"result": {"x": -3, "y": "0x01"}, "values": (1, 2)}
+
+
+def test_no_outputs():
+    codec = FunctionCodec("foo", inputs)
+    assert codec.decode_output(b"") == ()
+
+
+def test_input_errors(codec):
+    with pytest.raises(ValueError, match="foo Sequence has incorrect length"):
+        codec.encode_input((1, []))
+    with pytest.raises(OverflowError, match="foo '-1'"):
+        codec.encode_input((-1, [], True))
+    with pytest.raises(TypeError, match="bar requires no arguments"):
+        FunctionCodec("bar", []).encode_input((1,))
+
+
+def test_plans_cached(codec):
+    other = FunctionCodec("bar", inputs, outputs)
+    assert other.input_plan is codec.input_plan
+    assert other.output_plan is codec.output_plan
+    type_strs = ["uint256", "(address,bytes32[2])[]", "bool"]
+    assert compile_plan(type_strs) is codec.input_plan
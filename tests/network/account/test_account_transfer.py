@@ -230,3 +230,27 @@ def test_deploy_via_transfer(accounts, web3):
 def test_gas_limit_and_buffer(accounts):
     with pytest.raises(ValueError):
         accounts[0].transfer(accounts[1], 1000, gas_limit=21000, gas_buffer=1.3)
+
+
+def test_transfer_many(accounts):
+    txs = accounts[0].transfer_many(
+        [{"to": accounts[1], "amount": 1000}, {"to": accounts[2], "amount": 2000, "data": "0x1234"}]
+    )
+    assert [tx.nonce for tx in txs] == [0, 1]
+    assert [tx.status for tx in txs] == [1, 1]
+    assert txs[1].input == "0x1234"
+    assert accounts[0].nonce == 2
+
+
+def test_transfer_many_invalid_kwargs(accounts):
+    with pytest.raises(TypeError):
+        accounts[0].transfer_many([{"to": accounts[1], "value": 1000}])
+    assert accounts[0].nonce == 0
+
+
+def test_nonce_out_of_band(accounts, web3):
+    """local nonce recovers when a transaction is sent outside of brownie"""
+    accounts[0].transfer(accounts[1], 1000)
+    web3.eth.send_transaction({"from": accounts[0].address, "to": accounts[1].address})
+    tx = accounts[0].transfer(accounts[1], 1000)
+    assert tx.nonce == 2
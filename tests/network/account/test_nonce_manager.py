@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+
+import pytest
+
+from brownie.network import account
+from brownie.network.account import Account, _is_nonce_error, _NonceManager
+
+ADDRESS = "0x66aB6D9362d4F35596279692F0251Db635165871"
+
+
+class _FakeEth:
+    def __init__(self):
+        self.nonce = 5
+
+    def get_transaction_count(self, address, block_identifier):
+        return self.nonce
+
+
+@pytest.fixture
+def eth(monkeypatch):
+    eth = _FakeEth()
+    monkeypatch.setattr(account.web3, "eth", eth, raising=False)
+    yield eth
+
+
+@pytest.fixture
+def acct(eth):
+    acct = object.__new__(Account)
+    acct.address = ADDRESS
+    acct._nonce_manager = _NonceManager(ADDRESS)
+    yield acct
+
+
+def _broadcast(acct, nonce=None):
+    return acct._broadcast(None, 0, 21000, None, 1, None, None, "", nonce, "", 1, True, True)
+
+
+def test_reserve_release(eth):
+    nonce_manager = _NonceManager(ADDRESS)
+    assert [nonce_manager.reserve() for i in range(3)] == [5, 6, 7]
+    nonce_manager.release(7)
+    assert nonce_manager.peek() == 7
+
+    # releasing an earlier nonce leaves a gap, the next nonce is queried again
+    nonce_manager.release(5)
+    eth.nonce = 6
+    assert nonce_manager.reserve() == 6
+
+
+def test_explicit_nonce_not_released(acct):
+    # replacing the pending tx with nonce 5 fails before it is broadcast
+    acct._nonce_manager.reserve()
+
+    def transact(tx, allow_revert):
+        raise ConnectionError
+
+    acct._transact = transact
+    with pytest.raises(ConnectionError):
+        _broadcast(acct, nonce=5)
+    assert acct._nonce_manager.peek() == 6
+
+    # a failed tx with a reserved nonce returns the nonce
+    with pytest.raises(ConnectionError):
+        _broadcast(acct)
+    assert acct._nonce_manager.peek() == 6
+
+
+def test_nonce_resync(acct, eth):
+    acct._nonce_manager.reserve()
+    nonces = []
+
+    def transact(tx, allow_revert):
+        nonces.append(tx["nonce"])
+        raise ValueError({"code": -32000, "message": "Nonce too low. Expected 9, got 6"})
+
+    acct._transact = transact
+    eth.nonce = 9
+    with pytest.raises(Exception):
+        _broadcast(acct)
+    # the nonce is resynced once, and not retried again
+    assert nonces == [6, 9]
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "nonce too low",
+        "Nonce too low. Expected nonce to be 2 but got 1.",
+        "Transaction nonce is too low. Try incrementing the nonce.",
+        "NONCE_TOO_LOW",
+        "OldNonce, Current nonce: 3, nonce of rejected tx: 1",
+        "the tx doesn't have the correct nonce. account has nonce of: 3 tx has nonce of: 1",
+    ],
+)
+def test_is_nonce_error(message):
+    assert _is_nonce_error(ValueError({"code": -32000, "message": message}))
+
+
+def test_not_nonce_error():
+    assert not _is_nonce_error(ValueError("insufficient funds for gas * price + value"))
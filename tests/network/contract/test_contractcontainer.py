@@ -44,6 +44,31 @@ def test_container_revert(BrownieTester, accounts, chain):
     assert BrownieTester[0] == c
 
 
+def test_container_revert_without_get_code(BrownieTester, accounts, chain, web3, monkeypatch):
+    BrownieTester.deploy(True, {"from": accounts[0]})
+    chain.snapshot()
+    BrownieTester.deploy(True, {"from": accounts[0]})
+    calls = []
+    get_code = web3.eth.get_code
+    monkeypatch.setattr(web3.eth, "get_code", lambda *args: calls.append(args) or get_code(*args))
+    chain.revert()
+    chain.revert()
+    assert len(BrownieTester) == 1
+    assert not calls
+
+
+def test_container_revert_at(BrownieTester, accounts, chain):
+    t = BrownieTester.deploy(True, {"from": accounts[0]})
+    del BrownieTester[0]
+    chain.snapshot()
+    t2 = BrownieTester.deploy(True, {"from": accounts[0]})
+    del BrownieTester[0]
+    BrownieTester.at(t.address)
+    BrownieTester.at(t2.address)
+    chain.revert()
+    assert list(BrownieTester) == [t]
+
+
 def test_remove_at(BrownieTester, accounts):
     t = BrownieTester.deploy(True, {"from": accounts[0]})
     BrownieTester.remove(t)
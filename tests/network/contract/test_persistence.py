@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 
-import json
+import sqlite3
 
 
 def test_persist_load_unload(testproject, BrownieTester, devnetwork, accounts, config):
@@ -32,17 +32,17 @@ def test_changed_name(testproject, BrownieTester, devnetwork, accounts, config):
 
     contract = BrownieTester.deploy(True, {"from": accounts[0]})
     second = BrownieTester.deploy(True, {"from": accounts[0]})
+    testproject._flush_dev_deployments()
 
-    path = testproject._path.joinpath(f"build/deployments/dev/{contract.address}.json")
-    with path.open() as fp:
-        build_json = json.load(fp)
-    build_json["contractName"] = "PotatoTester"
-    with path.open("w") as fp:
-        json.dump(build_json, fp)
+    path = testproject._build_path.joinpath("deployments/dev.db")
+    db = sqlite3.connect(path)
+    db.execute("UPDATE deployments SET name='PotatoTester' WHERE address=?", (contract.address,))
+    db.commit()
+    db.close()
 
     _reload(testproject)
 
-    assert not path.exists()
+    assert contract.address not in testproject._dev_deployments
     assert len(testproject.BrownieTester) == 1, testproject.BrownieTester
     assert testproject.BrownieTester[0].address == second.address
 
@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+
+from functools import partial
+
+import pytest
+from web3.exceptions import Web3RPCError
+from web3.providers import JSONBaseProvider
+
+from brownie.network.middlewares import BrownieMiddlewareABC
+from brownie.network.web3 import Web3
+
+
+class _CachingMiddleware(BrownieMiddlewareABC):
+    @classmethod
+    def get_layer(cls, w3, network_type):
+        return 0
+
+    def process_request(self, make_request, method, params):
+        if (method, params) in self.cache:
+            return self.cache[(method, params)]
+        response = make_request(method, params)
+        response["processed"] = True
+        self.cache[(method, params)] = response
+        return response
+
+
+def _middleware(cache=None):
+    middleware = object.__new__(_CachingMiddleware)
+    middleware.cache = cache or {}
+    return middleware
+
+
+def test_batch_elements_are_processed():
+    batches = []
+
+    def make_batch_request(requests):
+        batches.append(requests)
+        return [{"result": params} for method, params in requests]
+
+    middleware = _middleware()
+    make_request = middleware.wrap_make_batch_request(make_batch_request)
+    responses = make_request([("eth_getBalance", "a"), ("eth_getBalance", "b")])
+
+    assert responses == [
+        {"result": "a", "processed": True},
+        {"result": "b", "processed": True},
+    ]
+    assert batches == [[("eth_getBalance", "a"), ("eth_getBalance", "b")]]
+
+
+def test_cached_elements_are_not_sent():
+    batches = []
+
+    def make_batch_request(requests):
+        batches.append(requests)
+        return [{"result": params} for method, params in requests]
+
+    middleware = _middleware({("eth_getBalance", "a"): {"result": "cached"}})
+    make_request = middleware.wrap_make_batch_request(make_batch_request)
+    responses = make_request([("eth_getBalance", "a"), ("eth_getBalance", "b")])
+
+    assert responses == [{"result": "cached"}, {"result": "b", "processed": True}]
+    assert batches == [[("eth_getBalance", "b")]]
+
+
+def test_fully_cached_batch_makes_no_request():
+    def make_batch_request(requests):
+        raise AssertionError("should not be called")
+
+    middleware = _middleware({("eth_getBalance", "a"): {"result": "cached"}})
+    make_request = middleware.wrap_make_batch_request(make_batch_request)
+    assert make_request([("eth_getBalance", "a")]) == [{"result": "cached"}]
+
+
+def test_batch_level_error_is_returned():
+    error = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "no batches"}}
+
+    middleware = _middleware()
+    make_request = middleware.wrap_make_batch_request(lambda requests: error)
+    assert make_request([("eth_getBalance", "a"), ("eth_getBalance", "b")]) == error
+
+
+class _BatchProvider(JSONBaseProvider):
+    # returns the address as the balance, and an error for the zero address
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def _response(self, method, params):
+        self.requests.append((method, params[0]))
+        if int(params[0], 16) == 0:
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "failed"}}
+        return {"jsonrpc": "2.0", "id": 1, "result": params[0]}
+
+    def make_request(self, method, params):
+        return self._response(method, params)
+
+    def make_batch_request(self, requests):
+        return [self._response(method, params) for method, params in requests]
+
+
+def test_web3_batch_retries_failed_batch():
+    w3 = Web3()
+    w3.provider = _BatchProvider()
+    addresses = [f"0x{i:040x}" for i in range(1, 4)]
+    results = w3.batch(partial(w3.eth.get_balance, i) for i in addresses)
+    assert results == [1, 2, 3]
+    assert len(w3.provider.requests) == 3
+
+    w3.provider.requests.clear()
+    with pytest.raises(Web3RPCError):
+        w3.batch(partial(w3.eth.get_balance, i) for i in [addresses[0], f"0x{0:040x}"])
+    # each request is made again, so the error is raised for the request that failed
+    zero = f"0x{0:040x}"
+    assert [i[1] for i in w3.provider.requests] == [addresses[0], zero, addresses[0], zero]
@@ -1,8 +1,14 @@
 #!/usr/bin/python3
 
 import threading
+from collections import OrderedDict
 
-from brownie.network.middlewares.caching import RequestCachingMiddleware
+import pytest
+import requests
+
+from brownie.network.middlewares import caching
+from brownie.network.middlewares.caching import RequestCachingMiddleware, _parse_block_identifier
+from brownie.utils.sql import Cursor
 
 
 class _DisconnectedWeb3:
@@ -70,3 +76,211 @@ def test_loop_exception_handler_releases_startup_waiters():
 
     assert middleware.is_killed is True
     assert middleware.event.is_set()
+
+
+def _block_cache_middleware(tmp_path, finality_depth=10, memory_limit=10**6):
+    middleware = object.__new__(RequestCachingMiddleware)
+    middleware.w3 = _DisconnectedWeb3()
+    middleware.table_key = "chain1"
+    middleware.block_table_key = "chain1_blocks"
+    middleware.cur = Cursor(tmp_path.joinpath("cache.db"))
+    middleware.cur.execute(
+        "CREATE TABLE chain1_blocks (method, params, result, block, PRIMARY KEY (method, params))"
+    )
+    middleware.finality_depth = finality_depth
+    middleware.memory_limit = memory_limit
+    middleware.memory_cache = OrderedDict()
+    middleware.memory_size = 0
+    middleware.stats = dict.fromkeys(
+        ("memory_hits", "persistent_hits", "misses", "bytes_read", "bytes_written", "evictions"),
+        0,
+    )
+    middleware.memory_lock = threading.Lock()
+    middleware.lock = threading.Lock()
+    middleware.block_cache = OrderedDict()
+    middleware.recent_blocks = OrderedDict()
+    middleware.last_block_number = 100
+    middleware.fork_block = None
+    middleware.persist_block = None
+    middleware.post_fork_cache = {}
+    return middleware
+
+
+@pytest.mark.parametrize(
+    "block_identifier,expected",
+    [
+        ("latest", (None, None)),
+        ("pending", (None, None)),
+        ("earliest", (0, None)),
+        ("0x2a", (42, None)),
+        (42, (42, None)),
+        ("0x" + "AB" * 32, (None, "0x" + "ab" * 32)),
+        (b"\x01" * 32, (None, "0x" + "01" * 32)),
+        ({"blockHash": "0x" + "ab" * 32}, (None, "0x" + "ab" * 32)),
+        ({"blockNumber": "0x2a"}, (42, None)),
+        (True, (None, None)),
+    ],
+)
+def test_parse_block_identifier(block_identifier, expected):
+    assert _parse_block_identifier(block_identifier) == expected
+
+
+def test_get_immutable_block(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    assert middleware.get_immutable_block("eth_call", [{}, "0x5a"]) == (True, 90)
+    assert middleware.get_immutable_block("eth_call", [{}, "0x5b"]) == (False, None)
+    assert middleware.get_immutable_block("eth_call", [{}, "latest"]) == (False, None)
+    assert middleware.get_immutable_block("eth_call", [{}, "0x" + "ab" * 32]) == (True, None)
+    assert middleware.get_immutable_block("eth_getStorageAt", ["0x00", "0x0", "0x1"]) == (True, 1)
+    assert middleware.get_immutable_block("eth_blockNumber", []) == (False, None)
+
+
+def test_block_cache_tiers(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    calls = []
+
+    def make_request(method, params):
+        calls.append(method)
+        return {"id": 1, "jsonrpc": "2.0", "result": "0x1234"}
+
+    params = ["0x0000000000000000000000000000000000000001", "0x1"]
+    assert middleware.process_request(make_request, "eth_getBalance", params)["result"] == "0x1234"
+    assert middleware.process_request(make_request, "eth_getBalance", params)["result"] == "0x1234"
+    assert calls == ["eth_getBalance"]
+
+    # clearing the memory tier falls back to the persistent tier
+    middleware.memory_cache.clear()
+    assert middleware.process_request(make_request, "eth_getBalance", params)["result"] == "0x1234"
+    assert calls == ["eth_getBalance"]
+
+    info = middleware.cache_info()
+    assert info["misses"] == 1
+    assert info["memory_hits"] == 1
+    assert info["persistent_hits"] == 1
+    assert info["bytes_written"] == info["bytes_read"] > 0
+    assert info["memory_entries"] == 1
+
+
+def test_memory_tier_is_size_bounded(tmp_path):
+    middleware = _block_cache_middleware(tmp_path, memory_limit=100)
+    for i in range(10):
+        middleware._add_to_memory(("eth_call", str(i)), "0x00", 1, 30)
+    assert middleware.memory_size <= 100
+    assert list(middleware.memory_cache) == [
+        ("eth_call", "7"),
+        ("eth_call", "8"),
+        ("eth_call", "9"),
+    ]
+
+
+def test_evict_blocks_after_reorg(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    middleware._set_block_cached("eth_call", "a", "0x01", 10)
+    middleware._set_block_cached("eth_call", "b", "0x02", 20)
+    middleware._set_block_cached("eth_call", "c", "0x03", None)
+
+    middleware.evict_blocks(15)
+
+    assert list(middleware.memory_cache) == [("eth_call", "a"), ("eth_call", "c")]
+    middleware.memory_cache.clear()
+    assert middleware._get_block_cached("eth_call", "a") == "0x01"
+    assert middleware._get_block_cached("eth_call", "b") is None
+    assert middleware._get_block_cached("eth_call", "c") == "0x03"
+
+
+def test_process_new_head_detects_reorg(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    canonical = {10: "0x0a", 11: "0x0b", 12: "0x0c"}
+    middleware.recent_blocks.update({10: "0x0a", 11: "0xdead", 12: "0xbeef"})
+    middleware._set_block_cached("eth_call", "a", "0x01", 10)
+    middleware._set_block_cached("eth_call", "b", "0x02", 11)
+
+    def get_header(block_identifier):
+        if block_identifier == "0x0d":
+            return {"number": "0xd", "hash": "0x0d", "parentHash": "0x0c"}
+        return {"number": hex(block_identifier), "hash": canonical[block_identifier]}
+
+    middleware._get_header = get_header
+    middleware.process_new_head("0x0d")
+
+    assert list(middleware.recent_blocks) == [10, 13]
+    assert list(middleware.memory_cache) == [("eth_call", "a")]
+
+
+def test_fork_caching(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    middleware.fork_block = 50
+    middleware.persist_block = 40
+    calls = []
+
+    def make_request(method, params):
+        calls.append(params[1])
+        return {"id": 1, "jsonrpc": "2.0", "result": "0x1234"}
+
+    address = "0x0000000000000000000000000000000000000001"
+    for block_identifier in ("0x28", "0x32", "0x33", "latest") * 2:
+        middleware.process_request(make_request, "eth_getCode", [address, block_identifier])
+    assert calls == ["0x28", "0x32", "0x33", "latest", "latest"]
+
+    # only data that is final upstream is persisted, later data is only held in memory
+    assert middleware.cur.fetchall("SELECT block FROM chain1_blocks") == [(40,)]
+    assert list(middleware.post_fork_cache) == [50, 51]
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+def test_fork_info(monkeypatch):
+    calls = []
+
+    class Provider:
+        def make_request(self, method, params):
+            calls.append(method)
+            if method == "anvil_nodeInfo":
+                return {"result": {"forkConfig": {"forkBlockNumber": 1000}}}
+            return {"result": {"hash": "0x" + "AB" * 32}}
+
+    w3 = type("Web3", (), {"provider": Provider()})()
+    monkeypatch.setattr(
+        caching.CONFIG, "_active_network", {"cmd_settings": {"fork": "http://localhost:1"}}
+    )
+    monkeypatch.setitem(caching.CONFIG.settings["request_cache"], "finality_depth", 64)
+    upstream = []
+
+    def post(url, **kwargs):
+        upstream.append(kwargs["timeout"])
+        return _Response({"result": "0x3f2"})
+
+    monkeypatch.setattr(requests, "post", post)
+
+    assert caching._get_fork_info(w3) == (1000, "0x" + "ab" * 32, 946)
+    assert caching._get_fork_info(w3) == (1000, "0x" + "ab" * 32, 946)
+    assert calls == ["anvil_nodeInfo", "eth_getBlockByNumber"]
+    # the upstream head is only requested once per connection, with a short timeout
+    assert upstream == [caching.UPSTREAM_HEAD_TIMEOUT]
+
+    # if the upstream head is unknown, no blocks are persisted
+    w3.provider = Provider()
+
+    def timeout(url, **kwargs):
+        raise requests.exceptions.Timeout
+
+    monkeypatch.setattr(requests, "post", timeout)
+    assert caching._get_fork_info(w3) == (1000, "0x" + "ab" * 32, -1)
+
+
+def test_fork_cache_revert_and_reset(tmp_path):
+    middleware = _block_cache_middleware(tmp_path)
+    middleware.fork_block = 50
+    middleware.post_fork_cache.update({51: {}, 52: {}, 53: {}})
+
+    middleware._revert(52)
+    assert list(middleware.post_fork_cache) == [51, 52]
+
+    middleware._reset()
+    assert middleware.post_fork_cache == {}
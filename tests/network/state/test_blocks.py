@@ -125,3 +125,20 @@ def _assert_blocks_equal(a, b, *ignore_keys_missing) -> None:
                 assert key in a, (key, a)
             if key in a:
                 assert a[key] == b[key], (a[key], b[key])
+
+
+def test_get_blocks(devnetwork, chain, web3):
+    chain.mine(5)
+    blocks = chain.get_blocks(range(6))
+    assert [i.number for i in blocks] == list(range(6))
+    assert blocks[-1] == web3.eth.get_block(5)
+
+
+def test_get_blocks_negative_index(devnetwork, chain):
+    chain.mine(5)
+    assert [i.number for i in chain.get_blocks([-1, -2, 0])] == [5, 4, 0]
+
+
+def test_iter(devnetwork, chain):
+    chain.mine(5)
+    assert [i.number for i in chain] == list(range(6))
@@ -1,5 +1,10 @@
 #!/usr/bin/python3
 
+import pytest
+from ens import ENS
+
+from brownie.network import state, web3
+
 
 def test_adds_tx(accounts, history):
     assert len(history) == 0
@@ -77,3 +82,35 @@ def test_filter(accounts, history):
     assert history.filter(sender=accounts[0]) == [tx1, tx3]
     assert history.filter(sender=accounts[1], receiver=accounts[2]) == [tx2]
     assert history.filter(sender=accounts[0], key=lambda k: k.value > "1 ether") == [tx3]
+
+
+def test_filter_nonce(accounts, history):
+    tx1 = accounts[0].transfer(accounts[1], "1 ether")
+    tx2 = accounts[0].transfer(accounts[1], "1 ether")
+    accounts[1].transfer(accounts[2], "1 ether")
+
+    assert history.filter(sender=accounts[0], nonce=1) == [tx2]
+    assert history.filter(sender=accounts[0].address.lower(), nonce=0) == [tx1]
+    assert history.filter(txid=tx1.txid) == [tx1]
+
+
+def test_get(accounts, history):
+    tx = accounts[0].transfer(accounts[1], "1 ether")
+    assert history.get(tx.txid) is tx
+    assert history.get("0x" + "00" * 32) is None
+
+
+def test_history_limit(accounts, history, config):
+    config.settings["history_limit"] = 2
+    txs = [accounts[0].transfer(accounts[1], "1 ether") for i in range(3)]
+    assert history.copy() == txs[1:]
+    assert history.get(txs[0].txid) is None
+    assert history.from_sender(accounts[0]) == txs[1:]
+
+
+def test_index_key_does_not_resolve_ens(monkeypatch):
+    monkeypatch.setattr(web3, "_mainnet_w3", object())
+    monkeypatch.setattr(ENS, "from_web3", pytest.fail)
+    address = "0x66aB6D9362d4F35596279692F0251Db635165871"
+    assert state._index_key(address.lower()) == address
+    assert state._index_key("brownie.eth") == "brownie.eth"
@@ -15,10 +15,12 @@ from brownie.network.event import (
     EventDict,
     EventWatcher,
     _create_event_filter,
+    _decode_trace,
     _EventItem,
     _is_provider_teardown_error,
     event_watcher,
 )
+from brownie.network.trace import compact_struct_logs
 from brownie.network.transaction import TransactionReceipt
 
 
@@ -136,6 +138,31 @@ def test_provider_teardown_error_detection_is_narrow(monkeypatch):
     assert _is_provider_teardown_error(teardown_error) is False
 
 
+def test_decode_compacted_trace():
+    def step(op, depth, stack, memory=()):
+        stack = [f"{i:064x}" for i in stack]
+        return {
+            "pc": 0,
+            "op": op,
+            "depth": depth,
+            "gas": 0,
+            "gasCost": 0,
+            "stack": stack,
+            "memory": [f"{i:064x}" for i in memory],
+        }
+
+    steps = compact_struct_logs(
+        [
+            step("CALL", 1, [0, 0x22, 0]),
+            step("LOG0", 2, [32, 0], [5]),
+            step("STOP", 2, [], [5]),
+            step("STOP", 1, [1]),
+        ]
+    )
+    events = _decode_trace(steps, "0x" + "11" * 20)
+    assert events[0]["data"] == "0x" + f"{5:064x}"
+
+
 def test_tuple_values(accounts, tester):
     value = ["blahblah", accounts[1], ("yesyesyes", "0x1234")]
     tx = tester.setTuple(value)
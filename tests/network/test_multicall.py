@@ -1,10 +1,13 @@
 import inspect
+import threading
 
 import pytest
 from lazy_object_proxy import Proxy
 
 import brownie
 import brownie.network.multicall as multicall_module
+from brownie.exceptions import RPCRequestError
+from brownie.network.contract import ContractCall, _call_interceptor
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -43,9 +46,9 @@ def test_flush_mid_execution(accounts, tester):
 
     with brownie.multicall:
         tester.getTuple(addr)
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 1
+        assert len(brownie.multicall._pending_calls) == 1
         brownie.multicall.flush()
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 0
+        assert len(brownie.multicall._pending_calls) == 0
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -56,10 +59,10 @@ def test_proxy_object_fetches_on_next_use(accounts, tester):
 
     with brownie.multicall:
         ret_val = tester.getTuple(addr)
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 1
+        assert len(brownie.multicall._pending_calls) == 1
         # ret_val is now fetched
         assert ret_val == value
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 0
+        assert len(brownie.multicall._pending_calls) == 0
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -179,3 +182,225 @@ def test_all_values_come_from_the_same_block(chain, devnetwork):
         assert first_call == second_call == third_call == fourth_call
 
     assert brownie.multicall._contract.getBlockNumber() == first_call + 20
+
+
+UINT_ABI = {
+    "name": "double",
+    "type": "function",
+    "stateMutability": "view",
+    "inputs": [{"name": "value", "type": "uint256"}],
+    "outputs": [{"name": "", "type": "uint256"}],
+}
+
+
+def _double(data):
+    # fake contract method, reverts for odd values
+    value = int(data[10:], 16)
+    return None if value % 2 else f"0x{value * 2:064x}"
+
+
+class _FakeWeb3:
+    block_number = 42
+
+    def __init__(self, code=b""):
+        self.code = code
+        self.batches = []
+        self.code_batches = []
+        self.batch_limit = None
+        self.error = None
+        self.eth = self
+
+    def get_code(self, address, block_identifier=None):
+        return self.code
+
+    def batch(self, calls):
+        calls = list(calls)
+        self.code_batches.append(len(calls))
+        return [i() for i in calls]
+
+    def make_batch_request(self, requests, fallback=True):
+        if self.batch_limit and len(requests) > self.batch_limit and not fallback:
+            raise RPCRequestError("too large")
+        self.batches.append(requests)
+        responses = []
+        for _, (tx, block) in requests:
+            result = _double(tx["data"])
+            if result:
+                responses.append({"result": result})
+            else:
+                responses.append({"error": self.error or {"code": 3}})
+        return responses
+
+
+class _FakeAggregate:
+    def __init__(self, limit):
+        self.limit = limit
+        self.calls = []
+
+    def call(self, require_success, calls, block_identifier=None):
+        self.calls.append((len(calls), block_identifier))
+        if len(calls) > self.limit:
+            raise ValueError("out of gas")
+        return [(bool(_double(data)), _double(data) or "0x") for _, data in calls]
+
+
+class _FakeAggregator:
+    address = "0x0000000000000000000000000000000000000002"
+
+    def __init__(self, limit):
+        self.tryAggregate = _FakeAggregate(limit)
+
+
+@pytest.fixture
+def multicall_map(monkeypatch):
+    fake_web3 = _FakeWeb3()
+    fake_config = type("FakeConfig", (), {"active_network": {}})()
+    monkeypatch.setattr(multicall_module, "web3", fake_web3)
+    monkeypatch.setattr(multicall_module, "CONFIG", fake_config)
+    yield fake_web3
+
+
+def _method(address="0x0000000000000000000000000000000000000001"):
+    return ContractCall(address, UINT_ABI, "double", None)
+
+
+def test_map_eth_call_batches(multicall_map):
+    results = brownie.multicall.map(_method(), range(250))
+    assert results == [None if i % 2 else i * 2 for i in range(250)]
+    assert [len(i) for i in multicall_map.batches] == [100, 100, 50]
+    assert {i[1][1] for batch in multicall_map.batches for i in batch} == {hex(42)}
+
+
+def test_map_multiple_contracts_and_blocks(multicall_map):
+    methods = [_method(), _method("0x0000000000000000000000000000000000000003")]
+    results = brownie.multicall.map(methods, [(2,), (4,)], block_identifier=[7, "latest"])
+    assert results == [4, 8]
+    assert len(multicall_map.batches) == 2
+    assert [batch[0][1][0]["to"] for batch in multicall_map.batches] == [
+        methods[0]._address,
+        methods[1]._address,
+    ]
+    assert [batch[0][1][1] for batch in multicall_map.batches] == ["0x7", "latest"]
+
+
+def test_map_code_queried_in_batch(multicall_map, monkeypatch):
+    aggregator = _FakeAggregator(500)
+    multicall_map.code = b"\x01"
+    monkeypatch.setitem(multicall_module.CONFIG.active_network, "multicall2", aggregator.address)
+    monkeypatch.setattr(multicall_module.Contract, "from_abi", lambda *args: aggregator)
+
+    results = brownie.multicall.map(_method(), [2, 4, 6], block_identifier=[7, 8, 9])
+    assert results == [4, 8, 12]
+    assert multicall_map.code_batches == [3]
+    assert sorted(i[1] for i in aggregator.tryAggregate.calls) == [7, 8, 9]
+
+
+def test_map_eth_call_errors(multicall_map):
+    multicall_map.error = {"code": -32000, "message": "execution reverted"}
+    assert brownie.multicall.map(_method(), [1, 2]) == [None, 4]
+
+    multicall_map.error = {"code": -32000, "message": "header not found"}
+    with pytest.raises(RPCRequestError):
+        brownie.multicall.map(_method(), [1, 2])
+
+
+def test_map_eth_call_split(multicall_map):
+    multicall_map.batch_limit = 30
+    results = brownie.multicall.map(_method(), range(100))
+    assert results == [None if i % 2 else i * 2 for i in range(100)]
+    assert [len(i) for i in multicall_map.batches] == [25, 25, 25, 25]
+
+
+def test_map_length_mismatch(multicall_map):
+    with pytest.raises(ValueError):
+        brownie.multicall.map([_method()], [1, 2])
+    with pytest.raises(ValueError):
+        brownie.multicall.map(_method(), [1, 2], block_identifier=[1])
+
+
+def test_map_try_aggregate_split(multicall_map, monkeypatch):
+    aggregator = _FakeAggregator(300)
+    multicall_map.code = b"\x01"
+    monkeypatch.setitem(multicall_module.CONFIG.active_network, "multicall2", aggregator.address)
+    monkeypatch.setattr(multicall_module.Contract, "from_abi", lambda *args: aggregator)
+
+    results = brownie.multicall.map(_method(), range(1200), block_identifier=10)
+    assert results == [None if i % 2 else i * 2 for i in range(1200)]
+    assert not multicall_map.batches
+    # chunks of 500 exceed the limit and are split in half
+    assert sorted(i[0] for i in aggregator.tryAggregate.calls) == [
+        200,
+        250,
+        250,
+        250,
+        250,
+        500,
+        500,
+    ]
+
+
+@pytest.fixture
+def offline_multicall(multicall_map, monkeypatch):
+    aggregator = _FakeAggregator(500)
+    multicall_map.code = b"\x01"
+    multicall_map.get_block_number = lambda: 5
+    monkeypatch.setitem(multicall_module.CONFIG.active_network, "multicall2", aggregator.address)
+    monkeypatch.setattr(multicall_module.Contract, "from_abi", lambda *args: aggregator)
+    yield aggregator
+
+
+def test_call_not_patched():
+    assert ContractCall.__call__.__code__.co_name == "__call__"
+    assert _call_interceptor.get() is None
+
+
+def test_calls_queued_in_context(offline_multicall):
+    method = _method()
+    with brownie.multicall:
+        assert _call_interceptor.get() is not None
+        results = [method(i) for i in range(4)]
+        assert len(brownie.multicall._pending_calls) == 4
+    assert _call_interceptor.get() is None
+    assert results == [0, None, 4, None]
+    assert offline_multicall.tryAggregate.calls == [(4, 5)]
+
+
+def test_threads_flush_independently(offline_multicall):
+    method = _method()
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def run(value):
+        with brownie.multicall:
+            result = method(value)
+            barrier.wait()
+            assert len(brownie.multicall._pending_calls) == 1
+            brownie.multicall.flush()
+            results[value] = result
+            barrier.wait()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in (2, 4)]
+    for thread in threads:
+        thread.start()
+    with brownie.multicall:
+        assert not brownie.multicall._pending_calls
+    for thread in threads:
+        thread.join()
+
+    assert results == {2: 4, 4: 8}
+    assert offline_multicall.tryAggregate.calls == [(1, 5), (1, 5)]
+
+
+def test_address_set_per_context(multicall_map):
+    address = "0x0000000000000000000000000000000000000005"
+    results = []
+
+    def run():
+        brownie.multicall(address=address)
+        results.append(brownie.multicall.address)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    assert results == [address]
+    assert brownie.multicall.address is None
@@ -0,0 +1,265 @@
+#!/usr/bin/python3
+
+import json
+
+import pytest
+import requests
+from web3 import HTTPProvider
+
+from brownie.exceptions import RPCRequestError
+from brownie.network.trace import (
+    PC_TRACE_OPTIONS,
+    SNAPSHOT_INTERVAL,
+    STEP_FIELDS,
+    StepWords,
+    StructLogs,
+    _iter_struct_logs,
+    _StepCompactor,
+    compact_struct_logs,
+    get_pc_trace,
+    get_struct_logs,
+    pack_struct_logs,
+    pc_columns,
+    unpack_struct_logs,
+)
+
+
+def _step(pc, op, depth=1, stack=None, memory=None):
+    return {
+        "pc": pc,
+        "op": op,
+        "depth": depth,
+        "gas": 1000 - pc,
+        "gasCost": 3,
+        "stack": stack or [],
+        "memory": memory or [],
+    }
+
+
+def test_columns():
+    logs = StructLogs([_step(0, "PUSH1"), _step(2, "PUSH1"), _step(4, "STOP")])
+    assert len(logs) == 3
+    assert logs.pc == [0, 2, 4]
+    assert logs.op == ["PUSH1", "PUSH1", "STOP"]
+    assert logs.depth == [1, 1, 1]
+    assert logs.gas == [1000, 998, 996]
+    assert logs.gas_cost == [3, 3, 3]
+
+
+def test_memory():
+    memory = ["00" * 31 + "01", "0x" + "ff" * 32]
+    stack = ["0" * 63 + "8", "0" * 62 + "1e"]  # length 8, offset 30
+    logs = StructLogs([_step(0, "RETURN", stack=stack, memory=memory)])
+
+    assert logs.memory(0) == b"\x00" * 31 + b"\x01" + b"\xff" * 32
+    assert logs.read_memory(0, 30, 4) == b"\x00\x01\xff\xff"
+    assert logs.get_memory(0, -1) == b"\x00\x01" + b"\xff" * 6
+    # memory is zero-padded when the slice extends beyond allocated memory
+    assert logs.read_memory(0, 60, 8) == b"\xff" * 4
+    stack[-1] = "0" * 62 + "3c"
+    assert logs.get_memory(0, -1) == b"\xff" * 4 + b"\x00" * 4
+
+
+def test_annotate():
+    steps = [_step(0, "PUSH1"), _step(2, "STOP")]
+    logs = StructLogs(steps)
+    logs.depth = [0, 0]
+    frame = ("0x" + "aa" * 20, "Token", "Token.transfer", 0)
+    logs.frames.extend([frame, frame])
+    logs.sources.extend([("contracts/Token.sol", (10, 20)), False])
+
+    assert logs.annotate() is steps
+    assert steps[0]["depth"] == 0
+    assert steps[0]["fn"] == "Token.transfer"
+    assert steps[0]["source"] == {"filename": "contracts/Token.sol", "offset": (10, 20)}
+    assert steps[1]["source"] is False
+    assert steps[1]["contractName"] == "Token"
+
+
+def _response(steps):
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {"gas": 21000, "failed": False, "returnValue": "", "structLogs": steps},
+    }
+
+
+def _chunks(data, size):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_iter_struct_logs(size):
+    steps = [
+        _step(i, "MSTORE", memory=["00" * 32] * i, stack=["0" * 64] * (i % 3)) for i in range(20)
+    ]
+    envelope = []
+    data = json.dumps(_response(steps), indent=1)
+
+    assert list(_iter_struct_logs(_chunks(data, size), envelope)) == steps
+    assert json.loads("".join(envelope)) == _response([])
+
+
+def test_iter_struct_logs_error():
+    data = json.dumps({"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "nope"}})
+    envelope = []
+
+    assert list(_iter_struct_logs(_chunks(data, 5), envelope)) == []
+    assert json.loads("".join(envelope))["error"]["message"] == "nope"
+
+
+def test_iter_struct_logs_incomplete():
+    data = json.dumps(_response([_step(0, "STOP"), _step(1, "STOP")]))
+    truncated = data[: data.index("STOP") + 10]
+
+    with pytest.raises(RPCRequestError):
+        list(_iter_struct_logs(_chunks(truncated, 4), []))
+
+
+def test_compact_steps():
+    memory = ["00" * 32, "11" * 32]
+    steps = [
+        {**_step(0, "PUSH1", memory=list(memory)), "refund": 0, "memSize": 64},
+        _step(2, "CALL", memory=list(memory)),
+        _step(0, "PUSH1", depth=2, memory=[]),
+        _step(4, "POP", memory=list(memory), stack=["0" * 64, "0" * 64]),
+    ]
+    compact = _StepCompactor()
+    result = [compact(i) for i in steps]
+
+    assert result == [{k: v for k, v in i.items() if k in STEP_FIELDS} for i in steps]
+    # unchanged memory at the same depth is shared, across subcalls
+    assert result[0]["memory"] is result[1]["memory"] is result[3]["memory"]
+    assert result[3]["stack"][0] is result[3]["stack"][1]
+
+
+def test_compact_stack_changes():
+    words = [f"{i:064x}" for i in range(SNAPSHOT_INTERVAL * 3)]
+    steps = [_step(i, "PUSH1", stack=words[: i + 1]) for i in range(len(words))]
+    steps.append(_step(0, "STOP", depth=2, stack=["0x1"]))
+    steps.append(_step(len(words), "POP", stack=words[:-1]))
+
+    result = compact_struct_logs(steps)
+    assert result == steps[:-2] + [_step(0, "STOP", depth=2, stack=["0" * 63 + "1"]), steps[-1]]
+    # each step only holds the words pushed since the previous step
+    assert result[5]["stack"]._changes == {5: words[5]}
+    assert result[5]["stack"][2] is words[2]
+    assert result[-1]["stack"]._changes == {}
+    assert len(result[-1]["stack"]) == len(words) - 1
+    # all words are copied periodically, to limit the number of steps in each lookup
+    assert max(i["stack"]._links for i in result) == SNAPSHOT_INTERVAL
+
+
+def test_step_words():
+    base = StepWords(None, 3, {0: "a", 1: "b", 2: "c"})
+    words = StepWords(StepWords(base, 2, {}), 4, {1: "x", 3: "y"})
+    assert words == ["a", "x", None, "y"]
+    assert words[-1] == "y" and words[0] == "a"
+    assert words[1:3] == ["x", None]
+    assert list(words) == ["a", "x", None, "y"]
+    with pytest.raises(IndexError):
+        words[4]
+
+
+def test_pack_struct_logs():
+    memory = ["00" * 32, "11" * 32]
+    steps = [
+        _step(0, "PUSH1", memory=list(memory), stack=["0" * 64]),
+        _step(2, "SSTORE", memory=list(memory), stack=["0" * 64, "0" * 64]),
+        {k: v for k, v in _step(0, "STOP", depth=2).items() if k != "memory"},
+    ]
+    steps[1]["storage"] = {"00" * 32: "11" * 32}
+    compact = _StepCompactor()
+    steps = [compact(i) for i in steps]
+
+    packed = json.loads(json.dumps(pack_struct_logs(steps)))
+    assert packed["words"] == ["0" * 64, "11" * 32]
+    assert packed["values"] == [[None, 1, [0]], [0, 2, [[1, 0]]], [None, 0, []], [None, 2, [0, 1]]]
+    assert packed["stack"] == [0, 1, 2]
+    assert packed["memory"] == [3, 3, None]
+
+    result = unpack_struct_logs(packed)
+    assert result == steps
+    assert result[0]["memory"] is result[1]["memory"]
+    assert result[1]["stack"]._base is result[0]["stack"]
+    assert "memory" not in result[2]
+
+
+def test_pack_struct_logs_lists():
+    steps = [_step(0, "PUSH1", stack=["0" * 64]), _step(2, "STOP", stack=["0" * 64])]
+    result = unpack_struct_logs(json.loads(json.dumps(pack_struct_logs(steps))))
+    assert result == steps
+
+
+def test_get_struct_logs_non_http():
+    steps = [_step(0, "PUSH1", memory=["00" * 32]), _step(2, "STOP", memory=["00" * 32])]
+
+    class Provider:
+        def make_request(self, method, params):
+            assert method == "debug_traceTransaction"
+            assert params == ("0x1234", {"enableMemory": True})
+            return _response(steps)
+
+    response = get_struct_logs(Provider(), "0x1234", {"enableMemory": True})
+    struct_logs = response["result"]["structLogs"]
+    assert struct_logs == steps
+    assert struct_logs[0]["memory"] is struct_logs[1]["memory"]
+
+
+def test_get_struct_logs_http(monkeypatch):
+    steps = [_step(0, "PUSH1", memory=["00" * 32]), _step(2, "STOP", memory=["00" * 32])]
+    provider = HTTPProvider("http://localhost:8545", request_kwargs={"timeout": 42})
+    requests_made = []
+
+    class Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, size):
+            return _chunks(json.dumps(_response(steps)).encode(), 10)
+
+    def post(session, endpoint_uri, data, **kwargs):
+        requests_made.append((endpoint_uri, json.loads(data), kwargs))
+        return Response()
+
+    monkeypatch.setattr(requests.Session, "post", post)
+    response = get_struct_logs(provider, "0x1234", {"enableMemory": True})
+
+    assert response["result"]["structLogs"] == steps
+    ((endpoint_uri, request, kwargs),) = requests_made
+    assert endpoint_uri == "http://localhost:8545"
+    assert request["method"] == "debug_traceTransaction"
+    assert request["params"] == ["0x1234", {"enableMemory": True}]
+    assert kwargs["stream"] is True
+    assert kwargs["timeout"] == 42
+    assert kwargs["headers"] == provider.get_request_kwargs()["headers"]
+
+
+def test_pc_columns():
+    steps = [_step(0, "PUSH1"), {**_step(2, "CALL"), "pc": "0x2"}, _step(0, "PUSH1", depth=2)]
+    pcs, ops, depths = pc_columns(steps)
+    assert pcs == [0, 2, 0]
+    assert ops == ["PUSH1", "CALL", "PUSH1"]
+    assert depths == [1, 1, 2]
+    assert ops[0] is ops[2]
+
+
+def test_get_pc_trace_non_http():
+    steps = [_step(0, "PUSH1"), _step(2, "STOP")]
+
+    class Provider:
+        def make_request(self, method, params):
+            assert method == "debug_traceCall"
+            assert params == ({"to": "0x1234"}, "latest", PC_TRACE_OPTIONS)
+            return _response(steps)
+
+    response = get_pc_trace(
+        Provider(), "debug_traceCall", ({"to": "0x1234"}, "latest", PC_TRACE_OPTIONS)
+    )
+    assert response["result"]["structLogs"] == ([0, 2], ["PUSH1", "STOP"], [1, 1])
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import pytest
+from web3.datastructures import AttributeDict
+
+from brownie._c_constants import HexBytes
+from brownie.network.txcache import TxCache
+
+TXID = "0x" + "ab" * 32
+
+
+@pytest.fixture
+def tx_cache():
+    cache = TxCache()
+    yield cache
+    cache.clear()
+
+
+def _receipt():
+    log = AttributeDict(
+        {
+            "address": "0x" + "11" * 20,
+            "blockHash": HexBytes("0x" + "cd" * 32),
+            "blockNumber": 100,
+            "data": HexBytes("0x" + "00" * 31 + "01"),
+            "logIndex": 0,
+            "topics": [HexBytes("0x" + "ef" * 32)],
+            "transactionHash": HexBytes(TXID),
+            "transactionIndex": 2,
+        }
+    )
+    return AttributeDict(
+        {
+            "blockHash": HexBytes("0x" + "cd" * 32),
+            "blockNumber": 100,
+            "contractAddress": None,
+            "cumulativeGasUsed": 100000,
+            "gasUsed": 50000,
+            "logs": [log],
+            "status": 1,
+            "transactionIndex": 2,
+        }
+    )
+
+
+def test_receipt(tx_cache):
+    tx = AttributeDict(
+        {
+            "blockNumber": 100,
+            "from": "0x" + "22" * 20,
+            "gas": 60000,
+            "gasPrice": 10**9,
+            "input": HexBytes("0x12345678"),
+            "nonce": 3,
+            "r": HexBytes("0x01"),
+            "to": "0x" + "11" * 20,
+            "type": 0,
+            "value": 0,
+        }
+    )
+    assert tx_cache.get_receipt(1, TXID) is None
+    tx_cache.set_receipt(1, TXID, tx, _receipt())
+
+    cached_tx, receipt = tx_cache.get_receipt(1, TXID)
+    assert cached_tx == {k: v for k, v in tx.items() if k != "r"}
+    assert "cumulativeGasUsed" not in receipt
+    assert receipt.logs[0].topics == _receipt().logs[0].topics
+    assert receipt.logs[0].data == _receipt().logs[0].data
+    assert receipt.blockHash == _receipt().blockHash
+    assert tx_cache.get_receipt(5, TXID) is None
+
+
+def test_trace(tx_cache):
+    result = {"returnValue": "0x", "structLogs": [{"pc": 0, "op": "STOP", "depth": 1}]}
+    assert tx_cache.get_trace(1, TXID, "structLogs") is None
+
+    tx_cache.set_trace(1, TXID, "structLogs", result)
+    tx_cache.set_trace(1, TXID, "callTracer", {"type": "CALL"})
+    assert tx_cache.get_trace(1, TXID, "structLogs") == result
+    assert tx_cache.get_trace(1, TXID, "callTracer") == {"type": "CALL"}
+
+    tx_cache.clear()
+    assert tx_cache.get_trace(1, TXID, "structLogs") is None
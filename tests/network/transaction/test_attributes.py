@@ -75,13 +75,12 @@ def test_return_value(accounts, tester):
 def test_return_value_from_rpc_result(accounts, tester, monkeypatch):
     tx = tester.setNum(42, {"from": accounts[0], "_skip_undo": True})
 
-    def make_request(method, params):
-        assert method == "debug_traceTransaction"
-        assert params[0] == tx.txid
+    def get_struct_logs(provider, txid, options):
+        assert txid == tx.txid
         return {"result": {"returnValue": "0x" + "0" * 63 + "1", "structLogs": []}}
 
     monkeypatch.setattr("brownie.network.transaction.web3._supports_traces", True)
-    monkeypatch.setattr("brownie.network.transaction.web3.provider.make_request", make_request)
+    monkeypatch.setattr("brownie.network.transaction.get_struct_logs", get_struct_logs)
 
     assert tx.return_value is True
 
@@ -97,13 +96,12 @@ def test_revert_msg_from_rpc_result(accounts, tester, monkeypatch, console_mode)
         "7a65726f00000000000000000000000000000000000000000000000000000000"
     )
 
-    def make_request(method, params):
-        assert method == "debug_traceTransaction"
-        assert params[0] == tx.txid
+    def get_struct_logs(provider, txid, options):
+        assert txid == tx.txid
         return {"result": {"returnValue": encoded_error, "structLogs": []}}
 
     monkeypatch.setattr("brownie.network.transaction.web3._supports_traces", True)
-    monkeypatch.setattr("brownie.network.transaction.web3.provider.make_request", make_request)
+    monkeypatch.setattr("brownie.network.transaction.get_struct_logs", get_struct_logs)
 
     assert tx.revert_msg == "zero"
 
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from brownie.network import transaction
+from brownie.network.transaction import Status, _ConfirmationWatcher
+
+
+class _FakeEth:
+    def __init__(self):
+        self.height = 0
+
+    @property
+    def block_number(self):
+        # a new block on every poll
+        self.height += 1
+        return self.height
+
+
+class _FakeWeb3:
+    def __init__(self, provider=True):
+        self.provider = provider
+        self.eth = _FakeEth()
+
+    def make_batch_request(self, requests):
+        raise RuntimeError("node unavailable")
+
+
+def _tx(txid="0x01"):
+    return SimpleNamespace(
+        txid=txid,
+        sender="0xaa",
+        nonce=0,
+        block_number=None,
+        status=Status(-1),
+        _silent=True,
+        _cached_receipt=None,
+        _confirmed=threading.Event(),
+    )
+
+
+def test_executor_created_lazily():
+    assert _ConfirmationWatcher()._executor is None
+
+
+def test_disconnected_left_pending(monkeypatch):
+    monkeypatch.setattr(transaction, "web3", _FakeWeb3(provider=None))
+    tx = _tx()
+    assert _ConfirmationWatcher().watch(tx, None, 1).wait(5)
+    assert tx.status == Status.Pending
+    assert tx._confirmed.is_set()
+
+
+def test_new_tx_watched_when_poll_fails(monkeypatch):
+    watcher = _ConfirmationWatcher()
+    tx = _tx("0x02")
+    watched = []
+
+    class _Eth:
+        @property
+        def block_number(self):
+            raise RuntimeError("node unavailable")
+
+    class _Web3:
+        provider = True
+        eth = _Eth()
+
+        def make_batch_request(self, requests):
+            if not watched:
+                # a second tx is added while the first is checked
+                watcher.watch(tx, None, 1)
+            return [
+                {"result": "0x0" if i[0] == "eth_getTransactionCount" else None} for i in requests
+            ]
+
+    def sleep(delay):
+        watched.append([i.tx.txid for i in watcher._pending])
+        fake_web3.provider = None
+
+    fake_web3 = _Web3()
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    monkeypatch.setattr(transaction, "time", SimpleNamespace(time=time.time, sleep=sleep))
+    monkeypatch.setattr(transaction, "POLL_INTERVAL", 0.01)
+
+    watcher.watch(_tx(), None, 1)
+    assert tx._confirmed.wait(5)
+    assert watched == [["0x01", "0x02"]]
+
+
+def test_nonces_cleared_on_revert():
+    watcher = _ConfirmationWatcher()
+    watcher._nonces["0xaa"] = 5
+    watcher._nonce_time = time.time()
+    watcher._revert(3)
+    assert not watcher._nonces
+    assert watcher._nonce_time == 0
+
+
+def test_retry_backoff(monkeypatch, caplog):
+    delays = []
+    fake_web3 = _FakeWeb3()
+
+    def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 4:
+            # disconnect, so that the watcher stops retrying
+            fake_web3.provider = None
+
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    monkeypatch.setattr(transaction, "time", SimpleNamespace(time=time.time, sleep=sleep))
+    monkeypatch.setattr(transaction, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(transaction, "MAX_RETRY_INTERVAL", 0.03)
+
+    watcher = _ConfirmationWatcher()
+    with caplog.at_level(logging.WARNING, logger=transaction.__name__):
+        assert watcher.watch(_tx(), None, 1).wait(5)
+
+    assert delays == [0.01, 0.02, 0.03, 0.03]
+    records = [i for i in caplog.records if i.name == transaction.__name__]
+    assert len(records) == 4
+    assert records[0].exc_info and not any(i.exc_info for i in records[1:])
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+import pytest
+
+from brownie.network import transaction
+from brownie.network.trace import pack_struct_logs
+from brownie.network.transaction import TransactionReceipt
+
+STRUCT_LOG_TRACE = {"gas": 21000, "failed": False, "returnValue": "", "structLogs": []}
+CALL_FRAME = {"type": "CALL", "from": "0xaa", "to": "0xbb", "gas": "0x5208", "gasUsed": "0x0"}
+STATE_DIFF = {"pre": {"0xbb": {"storage": {"0x00": "0x01"}}}, "post": {"0xbb": {}}}
+
+
+class _FakeWeb3:
+    supports_traces = True
+
+    def __init__(self, results):
+        self.provider = self
+        self.results = results
+        self.requests = []
+        self._unsupported_tracers = set()
+
+    def make_request(self, method, params):
+        tracer = params[1]["tracer"]
+        self.requests.append(tracer)
+        return {"jsonrpc": "2.0", "id": 1, "result": self.results[tracer]}
+
+
+class _FakeTxCache:
+    def __init__(self):
+        self.traces = {}
+
+    def get_trace(self, chain_id, txid, tracer):
+        return self.traces.get(tracer)
+
+    def set_trace(self, chain_id, txid, tracer, result):
+        self.traces[tracer] = result
+
+
+@pytest.fixture
+def tx_cache(monkeypatch):
+    tx_cache = _FakeTxCache()
+    monkeypatch.setattr(transaction, "get_tx_cache", lambda: tx_cache)
+    monkeypatch.setattr(TransactionReceipt, "_is_final", lambda self: True)
+    yield tx_cache
+
+
+def _receipt():
+    tx = object.__new__(TransactionReceipt)
+    tx.txid = "0x" + "11" * 32
+    return tx
+
+
+@pytest.mark.parametrize(
+    "tracer,config,result",
+    [("callTracer", {}, CALL_FRAME), ("prestateTracer", {"diffMode": True}, STATE_DIFF)],
+)
+def test_native_trace(monkeypatch, tx_cache, tracer, config, result):
+    fake_web3 = _FakeWeb3({tracer: result})
+    fake_web3.chain_id = 1
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+
+    assert _receipt()._get_native_trace(tracer, config) == result
+    assert tx_cache.traces == {tracer: result}
+    assert not fake_web3._unsupported_tracers
+
+
+@pytest.mark.parametrize(
+    "tracer,config", [("callTracer", {}), ("prestateTracer", {"diffMode": True})]
+)
+def test_tracer_ignored(monkeypatch, tx_cache, tracer, config):
+    # the node ignores the `tracer` option and returns a structLog trace
+    fake_web3 = _FakeWeb3({tracer: STRUCT_LOG_TRACE})
+    fake_web3.chain_id = 1
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+
+    tx = _receipt()
+    assert tx._get_native_trace(tracer, config) is None
+    assert tx._get_native_trace(tracer, config) is None
+    assert fake_web3.requests == [tracer]
+    assert fake_web3._unsupported_tracers == {tracer}
+    assert tx_cache.traces == {}
+
+
+def test_invalid_cached_trace_ignored(monkeypatch, tx_cache):
+    fake_web3 = _FakeWeb3({"callTracer": CALL_FRAME})
+    fake_web3.chain_id = 1
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    tx_cache.traces["callTracer"] = STRUCT_LOG_TRACE
+
+    assert _receipt()._get_native_trace("callTracer", {}) == CALL_FRAME
+    assert tx_cache.traces == {"callTracer": CALL_FRAME}
+
+
+def test_struct_logs_cached_by_options(monkeypatch, tx_cache):
+    fake_web3 = _FakeWeb3({})
+    fake_web3.chain_id = 1
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    steps = [{"pc": 0, "op": "STOP", "depth": 1, "gas": 0, "gasCost": 0, "stack": []}]
+    with_storage = {"disableStorage": False, "enableMemory": True}
+    without_storage = {"disableStorage": True, "enableMemory": True}
+    key = transaction._struct_logs_key(without_storage)
+    tx_cache.traces[key] = {"result": {**STRUCT_LOG_TRACE, "structLogs": pack_struct_logs(steps)}}
+
+    tx = _receipt()
+    assert tx._load_struct_logs(with_storage) is None
+    assert tx._load_struct_logs(without_storage)["result"]["structLogs"] == steps
+
+    # a trace that includes storage is used when storage is not required
+    del tx_cache.traces[key]
+    key = transaction._struct_logs_key(with_storage)
+    tx_cache.traces[key] = {"result": {**STRUCT_LOG_TRACE, "structLogs": pack_struct_logs(steps)}}
+    assert tx._load_struct_logs(without_storage)["result"]["structLogs"] == steps
+
+
+class _FakeContract:
+    def __init__(self, dev_reverts):
+        self._build = {"dev_reverts": dev_reverts}
+
+    def get_method_object(self, selector):
+        return None
+
+
+@pytest.mark.parametrize(
+    "dev_reverts,output", [(True, "0x"), (False, "0x"), (True, "0xdeadbeef00")]
+)
+def test_call_trace_dev_revert(monkeypatch, tx_cache, dev_reverts, output):
+    subcall = {**CALL_FRAME, "from": "0x" + "bb" * 20, "to": "0x" + "cc" * 20, "input": "0x1234"}
+    frame = {
+        **CALL_FRAME,
+        "to": "0x" + "bb" * 20,
+        "calls": [{**subcall, "error": "execution reverted", "output": output}],
+    }
+    fake_web3 = _FakeWeb3({"callTracer": frame})
+    fake_web3.chain_id = 1
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    monkeypatch.setattr(
+        transaction.state, "_find_contract", lambda address: _FakeContract(dev_reverts)
+    )
+    monkeypatch.setattr(
+        transaction.build, "_has_dev_revert_strings", lambda build: build["dev_reverts"]
+    )
+
+    tx = _receipt()
+    tx.__dict__.update(
+        _subcalls=None,
+        _raw_trace=None,
+        contract_address=None,
+        input="0x1234",
+        status=1,
+        _return_value=None,
+    )
+    if dev_reverts and output == "0x":
+        # the revert pc is required to find the dev revert string
+        assert tx._get_call_trace() is False
+        assert tx._new_contracts is None and tx._internal_transfers is None
+    else:
+        assert tx._get_call_trace() is True
+        assert len(tx._subcalls) == 1
@@ -3,6 +3,7 @@
 import pytest
 
 from brownie.network.contract import ProjectContract
+from brownie.network.transaction import TransactionReceipt
 
 solidity_source = """
 pragma solidity 0.6.2;
@@ -63,6 +64,26 @@ def test_solidity_create2(solcproject):
     assert foo.foo() == 42
 
 
+def test_call_tracer(solcproject, web3):
+    deployer = solcproject.Deployer[0]
+    tx = deployer.create(False)
+    native = TransactionReceipt(tx.txid)
+
+    assert len(native.new_contracts) == 1
+    if "callTracer" in web3._unsupported_tracers:
+        pytest.skip("Node does not support callTracer")
+    assert native._raw_trace is None
+
+    # results from `callTracer` match those found by evaluating the structLog trace
+    tx.trace
+    assert native.new_contracts == tx.new_contracts
+    assert native.internal_transfers == tx.internal_transfers
+    assert [(i["from"], i["to"], i["op"]) for i in native.subcalls] == [
+        (i["from"], i["to"], i["op"]) for i in tx.subcalls
+    ]
+    assert native.return_value == tx.return_value
+
+
 def test_solidity_reverts(solcproject, console_mode):
     deployer = solcproject.Deployer[0]
     tx = deployer.create(True)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+
+import pytest
+
+from brownie.network import transaction
+
+PC_MAP = {
+    0: {"path": "0", "fn": "A.foo", "statement": 0, "op": "PUSH1"},
+    2: {"path": "0", "fn": "A.foo", "branch": 1, "op": "JUMPI"},
+    3: {"path": "0", "fn": "A.foo", "statement": 2, "op": "CALL"},
+    4: {"path": "0", "fn": "A.foo", "op": "STOP"},
+    5: {"path": "0", "fn": "A.foo", "statement": 3, "op": "CALL"},
+}
+
+# A jumps at pc 2 and calls B, which does not jump and calls a precompile
+STEPS = (
+    [0, 2, 5, 0, 2, 3, 4, 4],
+    ["PUSH1", "JUMPI", "CALL", "PUSH1", "JUMPI", "CALL", "STOP", "STOP"],
+    [1, 1, 1, 2, 2, 2, 2, 1],
+)
+
+
+def _last_map(address, sig):
+    name = {"0xaa": "A", "0xbb": "B"}.get(address)
+    return {"name": name, "coverage": bool(name), "pc_map": PC_MAP if name else None}
+
+
+@pytest.fixture(autouse=True)
+def pc_trace(monkeypatch):
+    monkeypatch.setattr(transaction, "_get_last_map", _last_map)
+    trace = {"structLogs": STEPS}
+    monkeypatch.setattr(transaction, "get_pc_trace", lambda *args: {"result": trace})
+    yield trace
+
+
+def _calls(precompile_type="CALL"):
+    return [
+        {
+            "type": "CALL",
+            "to": "0xbb",
+            "input": "0x12345678",
+            "calls": [{"type": precompile_type, "to": "0x01", "input": "0x"}],
+        }
+    ]
+
+
+def _evaluate(calls):
+    return transaction._get_pc_coverage_eval(
+        "debug_traceTransaction", (), {"calls": calls}, "0xaa", "0x12345678"
+    )
+
+
+def test_pc_coverage():
+    assert _evaluate(_calls()) == {
+        "A": {"0": (0b1001, 0, 0b10)},
+        "B": {"0": (0b101, 0b10, 0)},
+    }
+
+
+def test_selfdestruct_frames_ignored():
+    calls = _calls()
+    calls[0]["calls"].append({"type": "SELFDESTRUCT", "to": "0xcc"})
+    assert _evaluate(calls) == _evaluate(_calls())
+
+
+def test_empty_trace(pc_trace):
+    pc_trace["structLogs"] = []
+    assert _evaluate([]) == {}
+
+
+@pytest.mark.parametrize(
+    "calls", [[], _calls()[:1] * 2, _calls("STATICCALL"), [{**_calls()[0], "calls": []}]]
+)
+def test_frames_do_not_match(calls):
+    assert _evaluate(calls) is None
+
+
+def test_reverted_call_not_evaluated(monkeypatch):
+    class _FakeWeb3:
+        _supports_trace_call = None
+        supports_traces = True
+
+        def __init__(self):
+            self.provider = self
+
+        def make_request(self, method, params):
+            return {"result": {"type": "CALL", "error": "execution reverted", "gasUsed": "0x10"}}
+
+    fake_web3 = _FakeWeb3()
+    monkeypatch.setattr(transaction, "web3", fake_web3)
+    monkeypatch.setattr(transaction, "get_pc_trace", pytest.fail)
+    assert transaction.evaluate_call_coverage({"to": "0xaa", "data": "0x12345678"}) is False
+    assert fake_web3._supports_trace_call is True
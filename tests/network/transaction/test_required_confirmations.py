@@ -4,6 +4,7 @@ import time
 import pytest
 
 import brownie
+from brownie.network.transaction import CONFIRMATION_WORKERS
 
 
 def send_and_wait_for_tx():
@@ -90,3 +91,16 @@ def test_multithreading(accounts, history, block_time_network):
     for tx in history:
         assert tx.status == 1
         assert tx.confirmations >= 2
+
+
+def test_shared_confirmation_watcher(accounts, block_time_network):
+    threads = threading.active_count()
+    txs = [
+        accounts[0].transfer(accounts[1], "0.1 ether", required_confs=0, silent=True)
+        for _ in range(10)
+    ]
+    # pending transactions are watched by a single thread, not one thread per tx
+    assert threading.active_count() - threads <= 1 + CONFIRMATION_WORKERS
+    for tx in txs:
+        assert tx._confirmed.wait(10)
+        assert tx.status == 1
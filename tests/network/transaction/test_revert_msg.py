@@ -3,7 +3,7 @@
 import pytest
 
 from brownie.exceptions import VirtualMachineError
-from brownie.network.transaction import web3
+from brownie.network import transaction
 from brownie.project import compile_source
 
 
@@ -136,15 +136,15 @@ def test_dev_revert_msg_from_trace_when_rpc_return_value_empty(
     tx._dev_revert_msg = None
     tx._raw_trace = None
     tx._trace = None
-    make_request = web3.provider.make_request
+    get_struct_logs = transaction.get_struct_logs
 
-    def make_request_without_return_value(method, params):
-        response = make_request(method, params)
-        if method == "debug_traceTransaction" and params[0] == tx.txid:
+    def get_struct_logs_without_return_value(provider, txid, options):
+        response = get_struct_logs(provider, txid, options)
+        if txid == tx.txid:
             response = {**response, "result": {**response["result"], "returnValue": ""}}
         return response
 
-    monkeypatch.setattr(web3.provider, "make_request", make_request_without_return_value)
+    monkeypatch.setattr(transaction, "get_struct_logs", get_struct_logs_without_return_value)
 
     assert tx.revert_msg == "two"
     assert tx.dev_revert_msg == "dev: error"
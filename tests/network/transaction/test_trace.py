@@ -23,6 +23,8 @@ def norevertmap():
 def mocker_spy(mocker):
     mocker.spy(TransactionReceipt, "_get_trace")
     mocker.spy(TransactionReceipt, "_expand_trace")
+    mocker.spy(TransactionReceipt, "_get_call_trace")
+    mocker.spy(TransactionReceipt, "_get_state_diff")
 
 
 def test_revert_msg_get_trace_no_revert_map(console_mode, tester, norevertmap):
@@ -76,10 +78,11 @@ def test_revert_events(console_mode, tester):
 
 
 def test_modified_state(console_mode, tester):
-    """modified_state queries the trace but does not evaluate"""
+    """modified_state queries the state diff, or the trace without evaluating it"""
     tx = tester.doNothing()
     tx.modified_state
-    assert tx._get_trace.call_count
+    assert tx._get_state_diff.call_count
+    assert tx._get_trace.call_count == (tx._raw_trace is not None)
     assert not tx._expand_trace.call_count
 
 
@@ -92,7 +95,8 @@ def test_modified_state_revert(console_mode, tester):
 def test_new_contracts(console_mode, tester):
     tx = tester.doNothing()
     assert tx.new_contracts == []
-    assert tx._expand_trace.call_count
+    assert tx._get_call_trace.call_count
+    assert tx._expand_trace.call_count == (tx._raw_trace is not None)
 
 
 def test_new_contracts_reverts(console_mode, tester):
@@ -104,7 +108,8 @@ def test_new_contracts_reverts(console_mode, tester):
 def test_internal_xfers(tester):
     tx = tester.doNothing()
     assert tx.internal_transfers == []
-    assert tx._expand_trace.call_count
+    assert tx._get_call_trace.call_count
+    assert tx._expand_trace.call_count == (tx._raw_trace is not None)
 
 
 def test_internal_xfers_reverts(console_mode, tester):
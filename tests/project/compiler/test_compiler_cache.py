@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+
+import os
+import sqlite3
+import time
+
+import pytest
+from requests.exceptions import ConnectionError, ReadTimeout
+from semantic_version import NpmSpec
+
+from brownie.exceptions import PragmaNotFound
+from brownie.project import sources
+from brownie.project.compiler import cache
+
+
+@pytest.fixture
+def compiler_cache(monkeypatch):
+    compiler_cache = cache.CompilerCache()
+    monkeypatch.setattr(cache, "_compiler_cache", compiler_cache)
+    monkeypatch.setattr(cache, "_pragmas", {})
+    yield compiler_cache
+    compiler_cache.clear()
+
+
+@pytest.fixture
+def fetch():
+    calls = []
+
+    def fetch():
+        calls.append(True)
+        if isinstance(fetch.versions, Exception):
+            raise fetch.versions
+        return fetch.versions
+
+    fetch.versions = ["0.8.1", "0.8.0"]
+    fetch.calls = calls
+    yield fetch
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    calls = []
+
+    def get_pragma_spec(source, path=None):
+        calls.append(path)
+        return sources.get_pragma_spec(source, path)
+
+    monkeypatch.setitem(cache._PRAGMA_PARSERS, "Solidity", get_pragma_spec)
+    yield calls
+
+
+def test_versions_cached(compiler_cache, fetch):
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.1", "0.8.0"]
+    fetch.versions = ["0.8.2"]
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.1", "0.8.0"]
+    assert len(fetch.calls) == 1
+    assert compiler_cache.get_versions("vyper") is None
+
+
+def test_versions_expired(compiler_cache, fetch):
+    cache.get_installable_versions("solc", fetch)
+    compiler_cache.cur.execute(
+        "UPDATE versions SET updated=?", (time.time() - cache.VERSION_LIST_TTL,)
+    )
+    fetch.versions = ["0.8.2"]
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.2"]
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.2"]
+    assert len(fetch.calls) == 2
+
+
+def test_versions_offline(compiler_cache, fetch):
+    cache.get_installable_versions("solc", fetch)
+    compiler_cache.cur.execute("UPDATE versions SET updated=0")
+    fetch.versions = ConnectionError()
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.1", "0.8.0"]
+    with pytest.raises(ConnectionError):
+        cache.get_installable_versions("vyper", fetch)
+
+
+def test_versions_timeout(compiler_cache, fetch):
+    cache.get_installable_versions("solc", fetch)
+    compiler_cache.cur.execute("UPDATE versions SET updated=0")
+    fetch.versions = ReadTimeout()
+    assert cache.get_installable_versions("solc", fetch) == ["0.8.1", "0.8.0"]
+
+
+def test_pragma_specs(compiler_cache, parse_count):
+    contract_sources = {
+        "A.sol": "pragma solidity ^0.8.0; contract A {}",
+        "B.sol": "pragma solidity >=0.6.0 <0.9.0; contract B {}",
+        "C.sol": "pragma solidity ^0.8.0; contract A {}",
+    }
+    pragma_specs = cache.get_pragma_specs(contract_sources, "Solidity")
+    assert pragma_specs == {
+        "A.sol": NpmSpec("^0.8.0"),
+        "B.sol": NpmSpec(">=0.6.0 <0.9.0"),
+        "C.sol": NpmSpec("^0.8.0"),
+    }
+    assert parse_count == ["A.sol", "B.sol"]
+
+    assert cache.get_pragma_specs(contract_sources, "Solidity") == pragma_specs
+    assert len(parse_count) == 2
+
+
+def test_pragma_specs_persisted(compiler_cache, parse_count, monkeypatch):
+    contract_sources = {"A.sol": "pragma solidity ^0.8.0; contract A {}"}
+    cache.get_pragma_specs(contract_sources, "Solidity")
+    monkeypatch.setattr(cache, "_pragmas", {})
+    assert cache.get_pragma_specs(contract_sources, "Solidity") == {"A.sol": NpmSpec("^0.8.0")}
+    assert len(parse_count) == 1
+
+
+def test_pragma_specs_source_hashes(compiler_cache, parse_count):
+    source = "pragma solidity ^0.8.0; contract A {}"
+    cache.get_pragma_specs({"A.sol": source}, "Solidity", {"A.sol": "00" * 20})
+    cache.get_pragma_specs({"A.sol": source}, "Solidity", {"A.sol": "00" * 20})
+    cache.get_pragma_specs({"A.sol": source}, "Solidity")
+    assert len(parse_count) == 2
+
+
+def test_set_pragmas_rolled_back(compiler_cache):
+    with pytest.raises(sqlite3.Error):
+        compiler_cache.set_pragmas("Solidity", {"aa": "^0.8.0", "bb": object()})
+    assert compiler_cache.get_pragmas("Solidity", ["aa", "bb"]) == {}
+    compiler_cache.set_pragmas("Solidity", {"aa": "^0.8.0"})
+    assert compiler_cache.get_pragmas("Solidity", ["aa", "bb"]) == {"aa": "^0.8.0"}
+
+
+def test_pragma_not_found(compiler_cache):
+    with pytest.raises(PragmaNotFound):
+        cache.get_pragma_specs({"A.sol": "contract A {}"}, "Solidity")
+
+
+def test_unique_specs():
+    pragma_specs = {
+        "A.sol": NpmSpec("^0.8.0"),
+        "B.sol": NpmSpec("^0.7.0"),
+        "C.sol": NpmSpec("^0.8.0"),
+    }
+    assert cache.get_unique_specs(pragma_specs) == {
+        "A.sol": NpmSpec("^0.8.0"),
+        "B.sol": NpmSpec("^0.7.0"),
+    }
+
+
+def _input_json(content="pragma solidity ^0.8.0; contract A {}", remappings=()):
+    return {
+        "language": "Solidity",
+        "sources": {"A.sol": {"content": content}},
+        "settings": {"optimizer": {"enabled": True, "runs": 200}, "remappings": list(remappings)},
+    }
+
+
+@pytest.fixture
+def compile_count():
+    calls = []
+
+    def compile_fn(sources=("A.sol",)):
+        def fn():
+            calls.append(True)
+            return {"contracts": {}, "sources": {k: {"id": i} for i, k in enumerate(sources)}}
+
+        return fn
+
+    compile_fn.calls = calls
+    yield compile_fn
+
+
+def test_output_key():
+    key = cache.get_output_key(_input_json(), "0.8.0")
+    assert key != cache.get_output_key(_input_json(), "0.8.1")
+    assert key != cache.get_output_key(_input_json("contract B {}"), "0.8.0")
+
+    reordered = _input_json()
+    reordered["settings"] = dict(reversed(reordered["settings"].items()))
+    assert cache.get_output_key(reordered, "0.8.0") == key
+
+
+def test_output_key_remappings():
+    content = 'import "foo/Foo.sol"; contract A {}'
+    key = cache.get_output_key(_input_json(content, ["foo=/packages/foo"]), "0.8.0")
+    unused = ["foo=/packages/foo", "ctx:bar=/packages/bar"]
+    assert cache.get_output_key(_input_json(content, unused), "0.8.0") == key
+    assert cache.get_output_key(_input_json(content, ["foo=/packages/foo2"]), "0.8.0") != key
+    assert cache.get_output_key(_input_json(content), "0.8.0") != key
+
+
+def test_compile_with_cache(compiler_cache, compile_count):
+    output = cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count())
+    assert cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count()) == output
+    assert len(compile_count.calls) == 1
+
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.1", compile_count())
+    assert len(compile_count.calls) == 2
+
+    stats = compiler_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+    assert stats["versions"].keys() == {("Solidity", "0.8.0"), ("Solidity", "0.8.1")}
+
+
+def test_compile_with_cache_disabled(compiler_cache, compile_count, config):
+    config.settings["compiler_cache"]["enabled"] = False
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count())
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count())
+    assert len(compile_count.calls) == 2
+    assert compiler_cache.get_stats()["entries"] == 0
+
+
+def test_output_from_disk_not_cached(compiler_cache, compile_count):
+    fn = compile_count(("A.sol", "/home/user/B.sol"))
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", fn)
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", fn)
+    assert len(compile_count.calls) == 2
+    assert compiler_cache.get_stats()["entries"] == 0
+
+
+def test_evict_by_age(compiler_cache, compile_count):
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count())
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.1", compile_count())
+    compiler_cache.cur.execute("UPDATE outputs SET accessed=0 WHERE version='0.8.0'")
+    assert compiler_cache.evict(2**30, 86400) == 1
+    assert list(compiler_cache.get_stats()["versions"]) == [("Solidity", "0.8.1")]
+
+
+def test_evict_by_size(compiler_cache, compile_count):
+    for version in ("0.8.0", "0.8.1", "0.8.2"):
+        cache.compile_with_cache(_input_json(), "Solidity", version, compile_count())
+    compiler_cache.cur.execute("UPDATE outputs SET accessed=0 WHERE version='0.8.1'")
+    size = compiler_cache.get_stats()["size"]
+    assert compiler_cache.evict(size - 1, 86400) == 1
+    assert list(compiler_cache.get_stats()["versions"]) == [
+        ("Solidity", "0.8.0"),
+        ("Solidity", "0.8.2"),
+    ]
+    assert compiler_cache.get_stats()["evictions"] == 1
+
+
+def test_outputs_not_evicted_on_store(compiler_cache, compile_count, config):
+    config.settings["compiler_cache"]["max_age"] = 0
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.0", compile_count())
+    cache.compile_with_cache(_input_json(), "Solidity", "0.8.1", compile_count())
+    assert compiler_cache.get_stats()["entries"] == 2
+    compiler_cache.cur.execute("UPDATE outputs SET accessed=0")
+    assert cache.evict_outputs() == 2
+    assert compiler_cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_cache_not_shared_after_fork(compiler_cache):
+    pid = os.fork()
+    if pid == 0:
+        # the child opens its own connection rather than using the inherited one
+        child_cache = cache.get_compiler_cache()
+        os._exit(0 if child_cache is not compiler_cache else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert cache.get_compiler_cache() is compiler_cache
@@ -0,0 +1,399 @@
+#!/usr/bin/python3
+
+import json
+
+import pytest
+import solcx
+from semantic_version import Version
+
+from brownie.project.compiler import solidity
+
+SOURCE = """pragma solidity ^0.8.0;
+
+contract Foo {
+    function bar(uint256 a) public returns (uint256) {
+        require(a > 1, "dev: too small");
+        if (a > 10 && a < 20) {
+            revert("bad");
+        }
+        return a * 2;
+    }
+
+    function baz(uint256 b) public returns (uint256) {
+        return b / 3;
+    }
+}
+"""
+
+
+def _src(text, end=None, after=None):
+    # source offset of `text`, or from the start of `text` to the end of `end`
+    start = SOURCE.index(text, SOURCE.index(after) if after else 0)
+    stop = SOURCE.index(end, start) + len(end) if end else start + len(text)
+    return f"{start}:{stop - start}:0"
+
+
+def _node(node_type, src, **fields):
+    return {"nodeType": node_type, "src": src, **fields}
+
+
+def _identifier(src, name):
+    return _node("Identifier", src, name=name, referencedDeclaration=-1)
+
+
+def _operation(text, operator, type_string):
+    left, right = text.split(f" {operator} ")
+    return _node(
+        "BinaryOperation",
+        _src(text),
+        operator=operator,
+        typeDescriptions={"typeString": type_string},
+        leftExpression=_identifier(_src(left, after=text), left),
+        rightExpression=_node("Literal", _src(right, after=text), value=right),
+    )
+
+
+def _call(text, name, *arguments):
+    return _node(
+        "FunctionCall",
+        _src(text),
+        expression=_identifier(_src(name), name),
+        arguments=list(arguments),
+        typeDescriptions={"typeString": "tuple()"},
+    )
+
+
+def _function(name, end, statements):
+    return _node(
+        "FunctionDefinition",
+        _src(f"function {name}", end),
+        name=name,
+        kind="function",
+        implemented=True,
+        visibility="public",
+        parameters=_node("ParameterList", _src("(", ")", after=f"function {name}"), parameters=[]),
+        returnParameters=_node(
+            "ParameterList", _src("(uint256)", after=f"function {name}"), parameters=[]
+        ),
+        body=_node("Block", _src("{", end, after=f"function {name}"), statements=statements),
+    )
+
+
+def _ast():
+    require = _call(
+        'require(a > 1, "dev: too small")',
+        "require",
+        _operation("a > 1", ">", "bool"),
+        _node("Literal", _src('"dev: too small"'), value="dev: too small"),
+    )
+    condition = _node(
+        "BinaryOperation",
+        _src("a > 10 && a < 20"),
+        operator="&&",
+        typeDescriptions={"typeString": "bool"},
+        leftExpression=_operation("a > 10", ">", "bool"),
+        rightExpression=_operation("a < 20", "<", "bool"),
+    )
+    revert = _call('revert("bad")', "revert", _node("Literal", _src('"bad"'), value="bad"))
+    if_body = _node(
+        "Block",
+        _src("{", "}", after="a < 20"),
+        statements=[_node("ExpressionStatement", _src('revert("bad");'), expression=revert)],
+    )
+    bar = _function(
+        "bar",
+        "return a * 2;\n    }",
+        [
+            _node("ExpressionStatement", _src("require(", ");"), expression=require),
+            _node("IfStatement", _src("if (", "}"), condition=condition, trueBody=if_body),
+            _node("Return", _src("return a * 2;"), expression=_operation("a * 2", "*", "uint256")),
+        ],
+    )
+    baz = _function(
+        "baz",
+        "return b / 3;\n    }",
+        [_node("Return", _src("return b / 3;"), expression=_operation("b / 3", "/", "uint256"))],
+    )
+    contract = _node(
+        "ContractDefinition",
+        _src("contract Foo", "}\n}"),
+        id=1,
+        name="Foo",
+        contractKind="contract",
+        contractDependencies=[],
+        linearizedBaseContracts=[1],
+        baseContracts=[],
+        nodes=[bar, baz],
+    )
+    return _node(
+        "SourceUnit",
+        _src(SOURCE),
+        absolutePath="contracts/Foo.sol",
+        exportedSymbols={"Foo": [1]},
+        nodes=[contract],
+    )
+
+
+# (opcode, source offset, jump) for each instruction of the deployed bytecode
+CONTRACT = _src("contract Foo", "}\n}")
+BAR = _src("function bar", "return a * 2;\n    }")
+BAZ = _src("function baz", "return b / 3;\n    }")
+REQUIRE = _src('require(a > 1, "dev: too small")')
+IF = _src("if (", "}")
+CONDITION = _src("a > 10 && a < 20")
+REVERT = _src('revert("bad")')
+UNMAPPED = "-1:-1:-1"
+INSTRUCTIONS = [
+    ("PUSH1 0x80", CONTRACT, "-"),
+    ("PUSH1 0x40", CONTRACT, "-"),
+    ("MSTORE", CONTRACT, "-"),
+    ("CALLVALUE", CONTRACT, "-"),
+    ("DUP1", CONTRACT, "-"),
+    ("ISZERO", CONTRACT, "-"),
+    ("PUSH2 0x10", CONTRACT, "-"),
+    ("JUMPI", CONTRACT, "-"),
+    ("PUSH1 0x0", CONTRACT, "-"),
+    ("DUP1", CONTRACT, "-"),
+    ("REVERT", CONTRACT, "-"),
+    ("JUMPDEST", CONTRACT, "-"),
+    ("POP", CONTRACT, "-"),
+    ("PUSH1 0x4", CONTRACT, "-"),
+    ("CALLDATASIZE", CONTRACT, "-"),
+    ("LT", CONTRACT, "-"),
+    ("PUSH2 0x2B", CONTRACT, "-"),
+    ("JUMPI", CONTRACT, "-"),
+    ("PUSH1 0x0", CONTRACT, "-"),
+    ("CALLDATALOAD", CONTRACT, "-"),
+    ("PUSH1 0xE0", CONTRACT, "-"),
+    ("SHR", CONTRACT, "-"),
+    ("DUP1", CONTRACT, "-"),
+    ("PUSH4 0x354B2735", CONTRACT, "-"),
+    ("EQ", CONTRACT, "-"),
+    ("PUSH2 0x30", CONTRACT, "-"),
+    ("JUMPI", CONTRACT, "-"),
+    ("JUMPDEST", CONTRACT, "-"),
+    ("PUSH1 0x0", CONTRACT, "-"),
+    ("DUP1", CONTRACT, "-"),
+    ("REVERT", CONTRACT, "-"),
+    # Foo.bar
+    ("JUMPDEST", BAR, "-"),
+    ("PUSH2 0x35", BAR, "-"),
+    ("JUMP", BAR, "i"),
+    ("JUMPDEST", _src("a > 1"), "-"),
+    ("PUSH1 0x1", _src("a > 1"), "-"),
+    ("DUP3", _src("a > 1"), "-"),
+    ("GT", _src("a > 1"), "-"),
+    ("PUSH2 0x2B", REQUIRE, "-"),
+    ("JUMPI", REQUIRE, "-"),
+    ("PUSH1 0xA", _src("a > 10"), "-"),
+    ("DUP3", _src("a > 10"), "-"),
+    ("GT", _src("a > 10"), "-"),
+    ("DUP1", CONDITION, "-"),
+    ("ISZERO", CONDITION, "-"),
+    ("PUSH2 0x4D", CONDITION, "-"),
+    ("JUMPI", CONDITION, "-"),
+    ("POP", CONDITION, "-"),
+    ("PUSH1 0x14", _src("a < 20"), "-"),
+    ("DUP3", _src("a < 20"), "-"),
+    ("LT", _src("a < 20"), "-"),
+    ("JUMPDEST", CONDITION, "-"),
+    ("ISZERO", IF, "-"),
+    ("PUSH2 0x58", IF, "-"),
+    ("JUMPI", IF, "-"),
+    ("PUSH1 0x40", REVERT, "-"),
+    ("MLOAD", REVERT, "-"),
+    ("DUP1", REVERT, "-"),
+    ("REVERT", REVERT, "-"),
+    ("JUMPDEST", IF, "-"),
+    ("REVERT", UNMAPPED, "-"),
+    ("PUSH1 0x2", _src("a * 2"), "-"),
+    ("DUP3", _src("a * 2"), "-"),
+    ("MUL", _src("a * 2"), "-"),
+    ("SWAP1", _src("return a * 2;"), "-"),
+    ("JUMP", BAR, "o"),
+    # Foo.baz
+    ("JUMPDEST", BAZ, "-"),
+    ("PUSH1 0x3", _src("b / 3"), "-"),
+    ("DUP2", _src("b / 3"), "-"),
+    ("DUP2", _src("b / 3"), "-"),
+    ("ISZERO", _src("b / 3"), "-"),
+    ("PUSH2 0x6B", _src("b / 3"), "-"),
+    ("JUMPI", _src("b / 3"), "-"),
+    ("INVALID", _src("b / 3"), "-"),
+    ("JUMPDEST", _src("b / 3"), "-"),
+    ("DIV", _src("b / 3"), "-"),
+    ("SWAP1", _src("return b / 3;"), "-"),
+    ("JUMP", BAZ, "o"),
+]
+
+
+@pytest.fixture
+def coverage_args(monkeypatch):
+    monkeypatch.setattr(solcx, "get_solc_version", lambda **kwargs: Version("0.8.19"))
+    output_json = {"sources": {"contracts/Foo.sol": {"id": 0, "ast": _ast()}}}
+    source_nodes, stmt_nodes, branch_nodes = solidity._get_nodes(output_json)
+    source_map = ";".join(f"{src}:{jump}" for _, src, jump in INSTRUCTIONS)
+    opcodes = " ".join(i[0] for i in INSTRUCTIONS) + " INVALID"
+    yield (source_map, opcodes, source_nodes[0]["Foo"], stmt_nodes, branch_nodes, False, 112)
+
+
+EXPECTED_PC_MAP = {
+    0: {"op": "PUSH1", "value": "0x80", "path": "0", "offset": [25, 319]},
+    2: {"op": "PUSH1", "value": "0x40", "path": "0", "offset": [25, 319], "fn": None},
+    4: {"op": "MSTORE", "path": "0", "offset": [25, 319], "fn": None},
+    5: {"op": "CALLVALUE", "path": "0", "offset": [25, 319], "fn": None},
+    6: {"op": "DUP1", "path": "0", "offset": [25, 319], "fn": None},
+    7: {"op": "ISZERO", "path": "0", "offset": [25, 319], "fn": None},
+    8: {"op": "PUSH2", "value": "0x10", "path": "0", "offset": [25, 319], "fn": None},
+    11: {"op": "JUMPI", "path": "0", "offset": [25, 319], "fn": None},
+    12: {"op": "PUSH1", "value": "0x0", "path": "0", "offset": [25, 319], "fn": None},
+    14: {"op": "DUP1", "path": "0", "offset": [25, 319], "fn": None},
+    15: {
+        "op": "REVERT",
+        "dev": "Cannot send ether to nonpayable function",
+        "fn": None,
+        "offset": [25, 319],
+        "path": "0",
+    },
+    16: {"op": "JUMPDEST", "path": "0", "offset": [25, 319], "fn": None},
+    17: {"op": "POP", "path": "0", "offset": [25, 319], "fn": None},
+    18: {"op": "PUSH1", "value": "0x4", "path": "0", "offset": [25, 319], "fn": None},
+    20: {"op": "CALLDATASIZE", "path": "0", "offset": [25, 319], "fn": None},
+    21: {"op": "LT", "path": "0", "offset": [25, 319], "fn": None},
+    22: {"op": "PUSH2", "value": "0x2B", "path": "0", "offset": [25, 319], "fn": None},
+    25: {"op": "JUMPI", "path": "0", "offset": [25, 319], "fn": None},
+    26: {"op": "PUSH1", "value": "0x0", "path": "0", "offset": [25, 319], "fn": None},
+    28: {"op": "CALLDATALOAD", "path": "0", "offset": [25, 319], "fn": None},
+    29: {"op": "PUSH1", "value": "0xE0", "path": "0", "offset": [25, 319], "fn": None},
+    31: {"op": "SHR", "path": "0", "offset": [25, 319], "fn": None},
+    32: {"op": "DUP1", "path": "0", "offset": [25, 319], "fn": None},
+    33: {"op": "PUSH4", "value": "0x354B2735", "path": "0", "offset": [25, 319], "fn": None},
+    38: {"op": "EQ", "path": "0", "offset": [25, 319], "fn": None},
+    39: {"op": "PUSH2", "value": "0x30", "path": "0", "offset": [25, 319], "fn": None},
+    42: {"op": "JUMPI", "path": "0", "offset": [25, 319], "fn": None},
+    43: {"op": "JUMPDEST", "path": "0", "offset": [25, 319], "fn": None},
+    44: {"op": "PUSH1", "value": "0x0", "path": "0", "offset": [25, 319], "fn": None},
+    46: {"op": "DUP1", "path": "0", "offset": [25, 319], "fn": None},
+    47: {"op": "REVERT", "first_revert": True, "path": "0", "offset": [25, 319], "fn": None},
+    48: {"op": "JUMPDEST", "path": "0", "offset": [44, 233], "fn": "Foo.bar"},
+    49: {"op": "PUSH2", "value": "0x35", "path": "0", "offset": [44, 233], "fn": "Foo.bar"},
+    52: {"op": "JUMP", "jump": "i", "path": "0", "offset": [44, 233], "fn": "Foo.bar"},
+    53: {"op": "JUMPDEST", "path": "0", "offset": [111, 116], "fn": "Foo.bar", "statement": 0},
+    54: {"op": "PUSH1", "value": "0x1", "path": "0", "offset": [111, 116], "fn": "Foo.bar"},
+    56: {"op": "DUP3", "path": "0", "offset": [111, 116], "fn": "Foo.bar"},
+    57: {"op": "GT", "path": "0", "offset": [111, 116], "fn": "Foo.bar", "branch": 4},
+    58: {"op": "PUSH2", "value": "0x2B", "path": "0", "offset": [103, 135], "fn": "Foo.bar"},
+    61: {"op": "JUMPI", "path": "0", "offset": [103, 135], "fn": "Foo.bar", "branch": 4},
+    62: {"op": "PUSH1", "value": "0xA", "path": "0", "offset": [149, 155], "fn": "Foo.bar"},
+    64: {"op": "DUP3", "path": "0", "offset": [149, 155], "fn": "Foo.bar"},
+    65: {"op": "GT", "path": "0", "offset": [149, 155], "fn": "Foo.bar", "branch": 5},
+    66: {"op": "DUP1", "path": "0", "offset": [149, 165], "fn": "Foo.bar"},
+    67: {"op": "ISZERO", "path": "0", "offset": [149, 165], "fn": "Foo.bar"},
+    68: {"op": "PUSH2", "value": "0x4D", "path": "0", "offset": [149, 165], "fn": "Foo.bar"},
+    71: {"op": "JUMPI", "path": "0", "offset": [149, 165], "fn": "Foo.bar", "branch": 5},
+    72: {"op": "POP", "path": "0", "offset": [149, 165], "fn": "Foo.bar"},
+    73: {"op": "PUSH1", "value": "0x14", "path": "0", "offset": [159, 165], "fn": "Foo.bar"},
+    75: {"op": "DUP3", "path": "0", "offset": [159, 165], "fn": "Foo.bar"},
+    76: {"op": "LT", "path": "0", "offset": [159, 165], "fn": "Foo.bar", "branch": 6},
+    77: {"op": "JUMPDEST", "path": "0", "offset": [149, 165], "fn": "Foo.bar"},
+    78: {"op": "ISZERO", "path": "0", "offset": [145, 205], "fn": "Foo.bar"},
+    79: {"op": "PUSH2", "value": "0x58", "path": "0", "offset": [145, 205], "fn": "Foo.bar"},
+    82: {"op": "JUMPI", "path": "0", "offset": [145, 205], "fn": "Foo.bar", "branch": 6},
+    83: {
+        "op": "PUSH1",
+        "value": "0x40",
+        "path": "0",
+        "offset": [181, 194],
+        "fn": "Foo.bar",
+        "statement": 1,
+    },
+    85: {"op": "MLOAD", "path": "0", "offset": [181, 194], "fn": "Foo.bar"},
+    86: {"op": "DUP1", "path": "0", "offset": [181, 194], "fn": "Foo.bar"},
+    87: {
+        "op": "REVERT",
+        "path": "0",
+        "offset": [181, 194],
+        "optimizer_revert": True,
+        "fn": "Foo.bar",
+    },
+    88: {"op": "JUMPDEST", "path": "0", "offset": [145, 205], "fn": "Foo.bar"},
+    89: {"op": "REVERT", "path": "0", "fn": "Foo.bar", "offset": [221, 226]},
+    90: {"op": "PUSH1", "value": "0x2", "path": "0", "offset": [221, 226], "fn": "Foo.bar"},
+    92: {"op": "DUP3", "path": "0", "offset": [221, 226], "fn": "Foo.bar"},
+    93: {"op": "MUL", "path": "0", "offset": [221, 226], "fn": "Foo.bar"},
+    94: {"op": "SWAP1", "path": "0", "offset": [214, 227], "fn": "Foo.bar", "statement": 2},
+    95: {"op": "JUMP", "jump": "o", "path": "0", "offset": [44, 233], "fn": "Foo.bar"},
+    96: {"op": "JUMPDEST", "path": "0", "offset": [239, 317], "fn": "Foo.baz"},
+    97: {
+        "op": "PUSH1",
+        "value": "0x3",
+        "path": "0",
+        "offset": [305, 310],
+        "fn": "Foo.baz",
+        "statement": 3,
+    },
+    99: {"op": "DUP2", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    100: {"op": "DUP2", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    101: {"op": "ISZERO", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    102: {"op": "PUSH2", "value": "0x6B", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    105: {"op": "JUMPI", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    106: {
+        "op": "INVALID",
+        "path": "0",
+        "offset": [305, 310],
+        "dev": "Division by zero",
+        "fn": "Foo.baz",
+    },
+    107: {"op": "JUMPDEST", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    108: {"op": "DIV", "path": "0", "offset": [305, 310], "fn": "Foo.baz"},
+    109: {"op": "SWAP1", "path": "0", "offset": [298, 311], "fn": "Foo.baz"},
+    110: {"op": "JUMP", "jump": "o", "path": "0", "offset": [239, 317], "fn": "Foo.baz"},
+}
+EXPECTED_STATEMENTS = {
+    "0": {
+        "Foo.bar": {"0": [103, 136], "1": [181, 195], "2": [214, 227]},
+        "Foo.baz": {"3": [298, 311]},
+    }
+}
+EXPECTED_BRANCHES = {
+    "0": {"Foo.bar": {"4": [111, 116, True], "5": [149, 155, False], "6": [159, 165, False]}}
+}
+
+
+def _json(value):
+    return json.loads(json.dumps(value))
+
+
+def test_coverage_data(coverage_args):
+    pc_map, statement_map, branch_map = solidity._generate_coverage_data(*coverage_args)
+    assert _json(pc_map) == {str(k): v for k, v in EXPECTED_PC_MAP.items()}
+    assert _json(statement_map) == EXPECTED_STATEMENTS
+    assert _json(branch_map) == EXPECTED_BRANCHES
+
+
+def test_offset_index_order():
+    index = solidity._OffsetIndex([((0, 10), "outer"), ((2, 5), "inner"), ((6, 8), "other")])
+    assert index.find((3, 4)) == ["inner", "outer"]
+    assert index.find((5, 5)) == ["inner", "outer"]
+    assert index.find((1, 9)) == ["outer"]
+    assert index.find((11, 12)) == []
+
+
+def test_revert_index_matches_children(coverage_args):
+    # the revert node is the innermost `revert` or `require` call containing the offset,
+    # the same node as returned by `children(include_parents=False)`
+    source_node = coverage_args[2].parent()
+    index = solidity._get_revert_index(source_node)
+    filters = (
+        {"nodeType": "FunctionCall", "expression.name": "revert"},
+        {"nodeType": "FunctionCall", "expression.name": "require"},
+    )
+    for _, src, _ in INSTRUCTIONS:
+        start, length, contract_id = (int(i) for i in src.split(":"))
+        if contract_id == -1:
+            continue
+        offset = (start, start + length)
+        expected = source_node.children(
+            include_parents=False, required_offset=offset, filters=filters
+        )
+        assert index.find(offset)[:1] == expected[:1]
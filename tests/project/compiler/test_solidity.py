@@ -252,3 +252,12 @@ contract Foo {{ function foo() external returns (bool) {{
 }}"""
     compiler.compile_and_format({"foo.sol": code})
     assert "exceeds EIP-170 limit of 24577" in capfd.readouterr()[0]
+
+
+@pytest.mark.parametrize(
+    "source_map",
+    ["0:10:0:-", "0:10:0:-;;2:5::i;:3;::1:o;;4:1:-1:-:1", "1:2:0:-;3;;:4::-:2;5:6:1"],
+)
+def test_expand_source_map_columns(source_map):
+    columns = compiler.utils.expand_source_map_columns(source_map)
+    assert list(zip(*columns)) == compiler.utils.expand_source_map(source_map)
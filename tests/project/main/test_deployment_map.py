@@ -2,15 +2,12 @@ import json
 
 
 def get_map(project) -> dict:
+    project._flush_dev_deployments()
     with project._build_path.joinpath("deployments/map.json").open("r") as fp:
         content = json.load(fp)
     return content
 
 
-def get_dev_artifacts(project) -> list:
-    return list(project._build_path.joinpath("deployments/dev/").glob("*.json"))
-
-
 def test_dev_deployment_map_content(testproject, BrownieTester, config, accounts):
     config.settings["dev_deployment_artifacts"] = True
 
@@ -20,7 +17,7 @@ def test_dev_deployment_map_content(testproject, BrownieTester, config, accounts
     assert isinstance(content, dict)
 
     assert len(content["dev"]["BrownieTester"]) == 1
-    assert len(get_dev_artifacts(testproject)) == 1
+    assert len(testproject._dev_deployments) == 1
 
     # deploy and verify deployment of second contract
     BrownieTester.deploy(True, {"from": accounts[0]})
@@ -30,7 +27,18 @@ def test_dev_deployment_map_content(testproject, BrownieTester, config, accounts
     assert len(content["dev"]["BrownieTester"]) == 2
     assert content["dev"]["BrownieTester"][0] == address
 
-    assert len(get_dev_artifacts(testproject)) == 2
+    assert len(testproject._dev_deployments) == 2
+
+
+def test_dev_deployments_written_on_flush(testproject, BrownieTester, config, accounts):
+    config.settings["dev_deployment_artifacts"] = True
+
+    BrownieTester.deploy(True, {"from": accounts[0]})
+    path = testproject._build_path.joinpath("deployments/dev.db")
+    assert not path.exists()
+    testproject._flush_dev_deployments()
+    assert path.exists()
+    assert not testproject._build_path.joinpath("deployments/dev").exists()
 
 
 def test_dev_deployment_map_clear_on_disconnect(
@@ -39,18 +47,21 @@ def test_dev_deployment_map_clear_on_disconnect(
     config.settings["dev_deployment_artifacts"] = True
 
     BrownieTester.deploy(True, {"from": accounts[0]})
+    testproject._flush_dev_deployments()
     devnetwork.disconnect()
     content = get_map(testproject)
     assert not content
+    assert not testproject._build_path.joinpath("deployments/dev.db").exists()
 
 
 def test_dev_deployment_map_clear_on_remove(testproject, BrownieTester, config, accounts):
     config.settings["dev_deployment_artifacts"] = True
 
     BrownieTester.deploy(True, {"from": accounts[0]})
+    testproject._flush_dev_deployments()
     BrownieTester.remove(BrownieTester[-1])
 
-    assert len(get_dev_artifacts(testproject)) == 0
+    assert len(testproject._dev_deployments) == 0
     content = get_map(testproject)
     assert not content
 
@@ -61,8 +72,8 @@ def test_dev_deployment_map_revert(testproject, BrownieTester, config, accounts,
     BrownieTester.deploy(True, {"from": accounts[0]})
     chain.snapshot()
     BrownieTester.deploy(True, {"from": accounts[0]})
-    assert len(get_dev_artifacts(testproject)) == 2
+    assert len(testproject._dev_deployments) == 2
     chain.revert()
-    assert len(get_dev_artifacts(testproject)) == 1
+    assert len(testproject._dev_deployments) == 1
     content = get_map(testproject)
     assert len(content["dev"]["BrownieTester"]) == 1
@@ -2,6 +2,9 @@
 
 import pytest
 
+from brownie._c_constants import ujson_dump, ujson_load
+from brownie.project.artifacts import LazyBuildJson
+
 LIBRARY = """
 pragma solidity ^0.5.0;
 library FooLib {
@@ -122,3 +125,58 @@ def test_modify_base(mockproject):
         "contracts/BaseFoo.sol",
         "contracts/Foo.sol",
     ]
+
+
+# modifying an imported interface should recompile the contracts that import it
+def test_modify_interface(mockproject):
+    with mockproject._path.joinpath("interfaces/IFoo.sol").open("w") as fp:
+        fp.write(INTERFACE + "// comment")
+
+    mockproject.load()
+    assert sorted(mockproject._compile.call_args[0][0]) == ["contracts/Foo.sol"]
+
+
+# without a saved import graph, it is generated from the existing build artifacts
+def test_missing_import_graph(mockproject):
+    mockproject._path.joinpath("build/imports.json").unlink()
+    with mockproject._path.joinpath("contracts/FooLib.sol").open("w") as fp:
+        fp.write(LIBRARY.replace("true", "false"))
+
+    mockproject.load()
+    assert sorted(mockproject._compile.call_args[0][0]) == [
+        "contracts/BaseFoo.sol",
+        "contracts/Foo.sol",
+        "contracts/FooLib.sol",
+    ]
+    assert mockproject._path.joinpath("build/imports.json").exists()
+
+
+# compact artifacts are used in place of unmodified JSON artifacts
+def test_compact_artifacts(mockproject):
+    json_path = mockproject._path.joinpath("build/contracts/Foo.json")
+    assert json_path.with_suffix(".bin").exists()
+
+    with json_path.open() as fp:
+        pc_map = ujson_load(fp)["pcMap"]
+
+    mockproject.load()
+    build_json = mockproject._build.get("Foo")
+    assert isinstance(build_json, LazyBuildJson)
+    assert sorted(build_json["pcMap"]) == sorted(int(i) for i in pc_map)
+
+
+# a modified JSON artifact takes precedence over the compact artifact
+def test_compact_artifact_outdated(mockproject):
+    json_path = mockproject._path.joinpath("build/contracts/Foo.json")
+    with json_path.open() as fp:
+        build_json = ujson_load(fp)
+    build_json["natspec"] = {"notice": "modified"}
+    with json_path.open("w") as fp:
+        ujson_dump(build_json, fp)
+
+    mockproject.load()
+    assert mockproject._build.get("Foo")["natspec"] == {"notice": "modified"}
+    mockproject.close()
+    mockproject.load()
+    assert isinstance(mockproject._build.get("Foo"), LazyBuildJson)
+    assert mockproject._build.get("Foo")["natspec"] == {"notice": "modified"}
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+
+import pickle
+
+import pytest
+
+from brownie._c_constants import ujson_dump
+from brownie.project import artifacts
+
+BUILD_JSON = {
+    "contractName": "Foo",
+    "abi": [],
+    "offset": (0, 42),
+    "opcodes": "PUSH1 0x80 PUSH1 0x40 MSTORE",
+    "pcMap": {"0": {"op": "PUSH1", "offset": (0, 42), "path": "0", "value": "0x80"}},
+    "coverageMap": {"branches": {}, "statements": {}},
+}
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path.joinpath("Foo.json")
+    with path.open("w") as fp:
+        ujson_dump(BUILD_JSON, fp)
+    artifacts.save_compact_artifact(path, BUILD_JSON)  # type: ignore [arg-type]
+    yield path
+
+
+def test_load(json_path):
+    build_json = artifacts.load_compact_artifact(json_path)
+    assert isinstance(build_json, artifacts.LazyBuildJson)
+    assert build_json["contractName"] == "Foo"
+    assert build_json["offset"] == (0, 42)
+    assert build_json["pcMap"] == {0: BUILD_JSON["pcMap"]["0"]}
+
+
+def test_lazy_decode(json_path):
+    build_json = artifacts.load_compact_artifact(json_path)
+    assert dict.__contains__(build_json, "abi")
+    assert not dict.__contains__(build_json, "opcodes")
+    assert "opcodes" in build_json
+    assert len(build_json) == len(BUILD_JSON)
+
+    assert build_json.get("opcodes") == BUILD_JSON["opcodes"]
+    assert dict.__contains__(build_json, "opcodes")
+    assert not dict.__contains__(build_json, "pcMap")
+    assert build_json.get("bytecode", "default") == "default"
+    with pytest.raises(KeyError):
+        build_json["bytecode"]
+
+
+def test_materialize(json_path):
+    build_json = artifacts.load_compact_artifact(json_path)
+    materialized = artifacts.materialize(build_json)
+    assert type(materialized) is dict
+    assert sorted(materialized) == sorted(BUILD_JSON)
+    assert materialized["coverageMap"] == BUILD_JSON["coverageMap"]
+    assert artifacts.materialize(BUILD_JSON) is BUILD_JSON
+
+
+def test_copy_and_pickle(json_path):
+    build_json = artifacts.load_compact_artifact(json_path)
+    copied = build_json.copy()
+    del copied["opcodes"]
+    assert "opcodes" not in copied
+    assert build_json["opcodes"] == BUILD_JSON["opcodes"]
+    assert pickle.loads(pickle.dumps(build_json)) == build_json.materialize()
+
+
+def test_outdated(json_path):
+    with json_path.open("a") as fp:
+        fp.write("\n")
+    assert artifacts.load_compact_artifact(json_path) is None
+
+
+def test_missing_or_invalid(json_path):
+    compact_path = artifacts.get_compact_path(json_path)
+    compact_path.write_bytes(b"not a compact artifact")
+    assert artifacts.load_compact_artifact(json_path) is None
+    compact_path.write_bytes(artifacts.MAGIC + b"\x00")
+    assert artifacts.load_compact_artifact(json_path) is None
+    compact_path.unlink()
+    assert artifacts.load_compact_artifact(json_path) is None
+
+
+def test_unlink(json_path):
+    artifacts.unlink_artifact(json_path)
+    assert not json_path.exists()
+    assert not artifacts.get_compact_path(json_path).exists()
+    # a missing artifact is not an error
+    artifacts.unlink_artifact(json_path)
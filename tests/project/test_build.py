@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+
+import pytest
+
+from brownie._c_constants import ujson_dump
+from brownie.project import build as build_module
+from brownie.project.artifacts import get_revert_path, load_revert_data
+from brownie.project.build import Build
+from brownie.project.sources import Sources
+
+SOURCE = """pragma solidity ^0.8.0;
+
+contract Foo {
+    function foo() external {
+        revert(); // dev: yuss
+    }
+}
+"""
+
+
+@pytest.fixture
+def build_json():
+    offset = SOURCE.index("revert();")
+    yield {
+        "allSourcePaths": {"0": "contracts/Foo.sol"},
+        "bytecodeSha1": "a" * 40,
+        "contractName": "Foo",
+        "language": "Solidity",
+        "pcMap": {
+            "0": {"op": "PUSH1", "pc": 0},
+            "9999": {
+                "fn": "Foo.foo",
+                "offset": (offset, offset + 8),
+                "op": "REVERT",
+                "path": "0",
+                "pc": 9999,
+            },
+        },
+        "sha1": "b" * 40,
+        "sourcePath": "contracts/Foo.sol",
+        "type": "contract",
+    }
+
+
+@pytest.fixture
+def build():
+    yield Build(Sources({"contracts/Foo.sol": SOURCE}, {}))
+    build_module._pending_reverts.clear()
+    build_module._revert_data.clear()
+    build_module._revert_map.pop(9999, None)
+
+
+def test_revert_map_is_lazy(build, build_json):
+    build._add_contract(build_json)
+    assert 9999 not in build_module._revert_map
+    assert "dev" not in build_json["pcMap"][9999]
+
+    assert build_module._get_dev_revert(9999) == "dev: yuss"
+    assert build_json["pcMap"][9999]["dev"] == "dev: yuss"
+    assert not build_module._pending_reverts
+
+
+def test_revert_data_is_cached(build, build_json, tmp_path):
+    path = tmp_path.joinpath("Foo.json")
+    with path.open("w") as fp:
+        ujson_dump(build_json, fp)
+
+    build._add_contract(build_json, path=path)
+    assert not get_revert_path(path).exists()
+    assert build_module._get_dev_revert(9999) == "dev: yuss"
+    assert load_revert_data(path, build_module._get_revert_key(build_json))
+
+    # revert data is loaded from the cache without reading the pcMap
+    build_module._revert_map.pop(9999)
+    build_json["pcMap"] = {}
+    build._add_contract(build_json, path=path)
+    assert build_module._get_dev_revert(9999) == "dev: yuss"
+
+    # the cache is ignored for a different bytecode hash
+    assert load_revert_data(path, "c" * 40) is None
+
+
+def test_add_dev_revert_strings(build, build_json, tmp_path):
+    path = tmp_path.joinpath("Foo.json")
+    with path.open("w") as fp:
+        ujson_dump(build_json, fp)
+    build._add_contract(build_json.copy(), path=path)
+    build_module._load_pending_revert_data()
+
+    # a new copy of the pcMap is annotated from the cached revert data
+    build_json["pcMap"] = {9999: build_json["pcMap"]["9999"].copy()}
+    build_module._add_dev_revert_strings(build_json)
+    assert build_json["pcMap"][9999]["dev"] == "dev: yuss"
+
+
+def test_has_dev_revert_strings(build, build_json):
+    without_dev = {**build_json, "bytecodeSha1": "c" * 40, "pcMap": {"0": {"op": "STOP", "pc": 0}}}
+    assert not build_module._has_dev_revert_strings(build_json)
+
+    build._add_contract(build_json)
+    assert build_module._has_dev_revert_strings(build_json)
+    build._add_contract(without_dev)
+    assert not build_module._has_dev_revert_strings(without_dev)
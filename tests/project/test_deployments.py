@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+import sqlite3
+
+import pytest
+
+from brownie.project.deployments import DevDeployments
+
+
+@pytest.fixture
+def registry(tmp_path):
+    yield DevDeployments(tmp_path.joinpath("deployments/dev.db"))
+
+
+def _build(name="Token", bytecode="6060"):
+    return {"contractName": name, "bytecode": bytecode, "abi": [], "pcMap": {}}
+
+
+def test_add_remove(registry):
+    registry.add("0x01", "Token", 1, _build())
+    registry.add("0x02", "Token", 2, _build())
+    registry.add("0x03", "Other", 3, _build("Other"))
+    assert len(registry) == 3
+    assert registry.get_map() == {"Other": ["0x03"], "Token": ["0x02", "0x01"]}
+
+    registry.remove("0x02")
+    assert "0x02" not in registry
+    assert registry.get_map() == {"Other": ["0x03"], "Token": ["0x01"]}
+
+
+def test_nothing_written_until_flush(registry):
+    registry.add("0x01", "Token", 1, _build())
+    assert not registry.path.exists()
+    assert registry.flush()
+    assert registry.path.exists()
+    assert not registry.flush()
+
+
+def test_revert(registry):
+    registry.add("0x01", "Token", 1, _build())
+    registry.add("0x02", "Token", 5, _build())
+    registry.add("0x03", "Token", 3, _build())
+    registry.revert(5)
+    assert len(registry) == 3
+    registry.revert(3)
+    assert registry.get_map() == {"Token": ["0x03", "0x01"]}
+    assert registry.max_height == 3
+
+
+def test_flush_and_load(registry):
+    registry.add("0x01", "Token", 1, _build())
+    registry.add("0x02", "Other", 2, _build("Other"))
+    registry.add("0x03", "Token", 3, _build())
+    registry.flush()
+
+    loaded = DevDeployments(registry.path)
+    assert loaded.load() == [
+        ("0x01", "Token", 1, _build()),
+        ("0x02", "Other", 2, _build("Other")),
+        ("0x03", "Token", 3, _build()),
+    ]
+    assert loaded.get_map() == registry.get_map()
+    assert loaded.max_height == 3
+    assert not loaded.flush()
+
+
+def test_builds_deduplicated(registry):
+    for i in range(10):
+        registry.add(f"0x{i:02}", "Token", i, _build())
+    registry.add("0x10", "Token", 10, _build(bytecode="6080"))
+    registry.flush()
+
+    db = sqlite3.connect(registry.path)
+    assert db.execute("SELECT COUNT(*) FROM deployments").fetchone() == (11,)
+    assert db.execute("SELECT COUNT(*) FROM builds").fetchone() == (2,)
+
+    registry.revert(9)
+    registry.flush()
+    assert db.execute("SELECT COUNT(*) FROM deployments").fetchone() == (10,)
+    assert db.execute("SELECT COUNT(*) FROM builds").fetchone() == (1,)
+    db.close()
+
+
+def test_failed_flush_rolled_back(registry):
+    registry.add("0x01", "Token", 1, _build())
+    registry.flush()
+    registry.add("0x02", "Other", 2, {**_build("Other"), "abi": object()})
+    with pytest.raises(TypeError):
+        registry.flush()
+
+    db = sqlite3.connect(registry.path)
+    assert db.execute("SELECT address FROM deployments").fetchall() == [("0x01",)]
+    db.close()
+
+
+def test_clear(registry):
+    registry.add("0x01", "Token", 1, _build())
+    registry.flush()
+    registry.clear()
+    assert not len(registry)
+    assert not registry.path.exists()
+    assert DevDeployments(registry.path).load() == []
+
+
+def test_load_invalid(registry):
+    registry.path.parent.mkdir()
+    registry.path.write_bytes(b"not a database")
+    assert registry.load() == []
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+
+from brownie.test import coverage
+
+
+def test_bitmap_roundtrip():
+    assert coverage.to_bitmap([]) == 0
+    assert coverage.to_bitmap([0, 3, 3, 70]) == 1 | 1 << 3 | 1 << 70
+    assert coverage.from_bitmap(coverage.to_bitmap([70, 0, 3])) == [0, 3, 70]
+    assert coverage.is_set(1 << 70, "70")
+    assert not coverage.is_set(1 << 70, 69)
+
+
+def test_merge():
+    cov_eval = {
+        "0x01": {"Foo": {"0": (0b0011, 0b01, 0)}},
+        "0x02": {"Foo": {"0": (0b0110, 0, 0b10), "1": (1, 0, 0)}, "Bar": {"0": (1, 0, 0)}},
+    }
+    assert coverage.get_merged_coverage_eval(cov_eval) == {
+        "Foo": {"0": (0b0111, 0b01, 0b10), "1": (1, 0, 0)},
+        "Bar": {"0": (1, 0, 0)},
+    }
+    assert cov_eval["0x01"] == {"Foo": {"0": (0b0011, 0b01, 0)}}
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path.joinpath("coverage.bin")
+    cov_eval = {
+        "0x01": {"Foo": {"0": (1 << 200, 0b01, 0)}},
+        "0x02": {"Foo": {"0": (1 << 200, 0b01, 0)}},
+        "0x03": {"Bar": {"2": (0b110, 0, 0b10)}},
+    }
+    coverage.save_coverage_eval(path, cov_eval)
+    assert coverage.load_coverage_eval(path) == cov_eval
+
+
+def test_load_invalid(tmp_path):
+    path = tmp_path.joinpath("coverage.bin")
+    assert coverage.load_coverage_eval(path) == {}
+    path.write_bytes(b"{}")
+    assert coverage.load_coverage_eval(path) == {}
+    path.write_bytes(coverage.MAGIC + b"\x00")
+    assert coverage.load_coverage_eval(path) == {}
+
+
+def test_from_lists():
+    legacy = {"Foo": {"0": [[1, 4], [2], []]}}
+    assert coverage._from_lists(legacy) == {"Foo": {"0": (0b10010, 0b100, 0)}}
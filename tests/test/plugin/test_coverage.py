@@ -1,8 +1,7 @@
 #!/usr/bin/python3
 
-import json
-
 from brownie.network import contract
+from brownie.test import coverage
 
 test_source = """
 import pytest
@@ -33,18 +32,28 @@ def test_always_transact(plugintester, mocker, chain):
     result.assert_outcomes(passed=2)
     assert contract._revert_transact_call.call_count == 0
 
-    # with coverage eval, only one of the tests should transact-and-rollback a call
+    # with coverage eval, only one of the tests should trace a call
+    mocker.spy(contract, "evaluate_call_coverage")
+    result = plugintester.runpytest("--coverage")
+    result.assert_outcomes(passed=2)
+    assert contract.evaluate_call_coverage.call_count == 1
+    assert contract._revert_transact_call.call_count == 0
+
+
+def test_always_transact_without_trace_call(plugintester, mocker, chain):
+    mocker.spy(contract, "_revert_transact_call")
+    mocker.patch.object(contract, "evaluate_call_coverage", return_value=False)
+
+    # if the node cannot trace calls, the call is broadcast as a transaction and reverted
     result = plugintester.runpytest("--coverage")
     result.assert_outcomes(passed=2)
     assert contract._revert_transact_call.call_count == 1
 
 
 def test_coverage_tx(json_path, plugintester):
+    coverage_path = json_path.parent.joinpath("coverage.bin")
     plugintester.runpytest("-n 2")
-    with json_path.open() as fp:
-        build = json.load(fp)
-    assert not len(build["tx"])
+    assert not len(coverage.load_coverage_eval(coverage_path))
     plugintester.runpytest("--numprocesses=2", "--coverage")
-    with json_path.open() as fp:
-        build = json.load(fp)
-    assert len(build["tx"]) == 3
+    assert len(coverage.load_coverage_eval(coverage_path)) == 3
+    assert not list(json_path.parent.glob("coverage-*.bin"))
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+
+from types import SimpleNamespace
+
+import pytest
+
+from brownie.test.managers.scheduler import PytestBrownieScheduling
+
+
+class Node:
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+        self.steal_requests = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def send_steal(self, indices):
+        self.steal_requests.append(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+COLLECTION = [
+    "tests/test_a.py::test_1",
+    "tests/test_a.py::test_2",
+    "tests/test_b.py::test_1",
+    "tests/test_c.py::test_1",
+    "tests/test_c.py::test_2",
+    "tests/test_c.py::test_3",
+    "tests/test_d.py::test_1",
+]
+
+
+@pytest.fixture
+def scheduler():
+    config = SimpleNamespace(
+        getvalue=lambda key: ["2*popen"], option=SimpleNamespace(loadscopereorder=True)
+    )
+    costs = {"tests/test_a.py": 1.0, "tests/test_b.py": 10.0, "tests/test_c.py": 3.0}
+    sched = PytestBrownieScheduling(config, costs=costs)
+    nodes = [Node("gw0"), Node("gw1")]
+    for node in nodes:
+        sched.add_node(node)
+        sched.add_node_collection(node, COLLECTION)
+    sched.schedule()
+    yield sched, nodes
+
+
+def _complete(sched, node, nodeid):
+    sched.mark_test_complete(node, COLLECTION.index(nodeid))
+
+
+def test_longest_first(scheduler):
+    sched, (gw0, gw1) = scheduler
+
+    # test_d has no timing and is estimated from the cost per test of other modules
+    assert sched.unit_costs["tests/test_d.py"] == pytest.approx(14 / 6)
+    assert list(sched.assigned_work[gw0]) == ["tests/test_b.py", "tests/test_d.py"]
+    assert list(sched.assigned_work[gw1]) == ["tests/test_c.py"]
+    assert gw0.sent == [2, 6]
+    assert list(sched.workqueue) == ["tests/test_a.py"]
+
+
+def test_modules_kept_together(scheduler):
+    sched, (gw0, gw1) = scheduler
+    _complete(sched, gw1, "tests/test_c.py::test_1")
+
+    assert list(sched.assigned_work[gw1]) == ["tests/test_c.py", "tests/test_a.py"]
+    assert gw1.sent == [3, 4, 5, 0, 1]
+
+
+def test_work_stealing(scheduler):
+    sched, (gw0, gw1) = scheduler
+    _complete(sched, gw1, "tests/test_c.py::test_1")
+    _complete(sched, gw0, "tests/test_b.py::test_1")
+
+    # gw0 is almost out of work, and steals test_a which gw1 has not started
+    assert not sched.workqueue
+    assert not gw0.shutting_down
+    assert gw1.steal_requests == [[0, 1]]
+
+    sched.remove_pending_tests_from_node(gw1, [0, 1])
+    assert list(sched.assigned_work[gw1]) == ["tests/test_c.py"]
+    assert list(sched.assigned_work[gw0]) == [
+        "tests/test_b.py",
+        "tests/test_d.py",
+        "tests/test_a.py",
+    ]
+    assert gw0.sent == [2, 6, 0, 1]
+
+
+def test_steal_refused(scheduler):
+    sched, (gw0, gw1) = scheduler
+    _complete(sched, gw1, "tests/test_c.py::test_1")
+    _complete(sched, gw0, "tests/test_b.py::test_1")
+
+    # gw1 has already started test_a, so gw0 has nothing to steal and shuts down
+    sched.remove_pending_tests_from_node(gw1, [])
+    assert "tests/test_a.py" in sched.assigned_work[gw1]
+    assert gw0.shutting_down